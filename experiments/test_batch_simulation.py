@@ -0,0 +1,35 @@
+import subprocess
+import sys
+import time
+
+from uppyyl_simulator.backend.simulator.simulator import Simulator
+
+run_count = 20
+max_steps = 50
+test_model_path = "./res/models/example_system.xml"
+
+single_run_script = f'''
+from uppyyl_simulator.backend.simulator.simulator import Simulator
+simulator = Simulator()
+simulator.load_system(system_path="{test_model_path}")
+simulator.simulate_run(max_steps={max_steps})
+'''
+
+
+def test_batch_simulation():
+    start_time = time.perf_counter()
+    for _ in range(run_count):
+        subprocess.run([sys.executable, "-c", single_run_script], check=True)
+    process_per_run_time = time.perf_counter() - start_time
+
+    simulator = Simulator()
+    simulator.load_system(system_path=test_model_path)
+    start_time = time.perf_counter()
+    results = list(simulator.simulate_batch(n_runs=run_count, max_steps=max_steps, seed=0))
+    batch_time = time.perf_counter() - start_time
+
+    print(f'Simulation of {run_count} runs of "{test_model_path}" ({max_steps} steps each):')
+    print(f'  Process per run:  {process_per_run_time:.2f}s')
+    print(f'  Batch simulation: {batch_time:.2f}s')
+    assert len(results) == run_count
+    assert batch_time < process_per_run_time
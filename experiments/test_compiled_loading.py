@@ -0,0 +1,43 @@
+import os
+import tempfile
+import time
+
+from uppyyl_simulator.backend.ast.parsers.uppaal_c_ast_cache import (
+    set_ast_cache, get_ast_cache
+)
+from uppyyl_simulator.backend.ast.parsers.uppaal_compiled_model import (
+    save_compiled_system, load_compiled_system, get_source_hash
+)
+from uppyyl_simulator.backend.ast.parsers.uppaal_xml_model_parser import (
+    uppaal_xml_to_system
+)
+from test_parser_sharing import make_model_xml
+
+template_count = 100
+location_count = 5
+
+
+def test_compiled_loading():
+    system_xml_str = make_model_xml(template_count=template_count, location_count=location_count)
+    source_hash = get_source_hash(system_xml_str)
+    previous_ast_cache = get_ast_cache()
+    set_ast_cache(None)
+    try:
+        start_time = time.perf_counter()
+        system = uppaal_xml_to_system(system_xml_str)
+        xml_load_time = time.perf_counter() - start_time
+    finally:
+        set_ast_cache(previous_ast_cache)
+
+    with tempfile.TemporaryDirectory() as compiled_dir:
+        compiled_path = os.path.join(compiled_dir, "model.uppyc")
+        save_compiled_system(system, compiled_path, source_hash=source_hash)
+        start_time = time.perf_counter()
+        compiled_system = load_compiled_system(compiled_path, source_hash=source_hash)
+        compiled_load_time = time.perf_counter() - start_time
+
+    print(f'Model with {template_count} templates:')
+    print(f'  XML loading:      {xml_load_time * 1000:.1f}ms')
+    print(f'  Compiled loading: {compiled_load_time * 1000:.1f}ms')
+    assert len(compiled_system.templates) == len(system.templates)
+    assert compiled_load_time < xml_load_time
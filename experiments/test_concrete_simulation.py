@@ -0,0 +1,31 @@
+import random
+import time
+
+from uppyyl_simulator.backend.simulator.simulator import Simulator
+
+run_count = 10
+max_steps = 200
+test_model_path = "./res/models/example_system.xml"
+
+
+def measure_step_time(simulator):
+    random.seed(0)
+    step_count = 0
+    start_time = time.perf_counter()
+    for _ in range(run_count):
+        step_count += simulator.simulate_run(max_steps=max_steps)["steps"]
+    return (time.perf_counter() - start_time) / step_count
+
+
+def test_concrete_simulation():
+    print(f'Simulation of {run_count} runs of "{test_model_path}" ({max_steps} steps each):')
+    for settings in [{}, {"compact_variables": True, "code_generation": True}]:
+        step_times = {}
+        for semantics in ["symbolic", "concrete"]:
+            simulator = Simulator(semantics=semantics, **settings)
+            simulator.load_system(system_path=test_model_path)
+            step_times[semantics] = measure_step_time(simulator)
+        print(f'  Settings {settings}:')
+        print(f'    Symbolic: {step_times["symbolic"] * 1e6:.0f}us/step')
+        print(f'    Concrete: {step_times["concrete"] * 1e6:.0f}us/step')
+        assert step_times["concrete"] < step_times["symbolic"]
@@ -0,0 +1,30 @@
+import time
+
+from uppyyl_simulator.backend.simulator.simulator import Simulator
+
+copy_count = 2000
+test_model_path = "./res/models/example_system.xml"
+
+
+def copy_states(state, use_components):
+    start_time = time.perf_counter()
+    for _ in range(copy_count):
+        state_copy = state.copy()
+        if use_components:  # Forces the copies of all shared components
+            _ = state_copy.program_state, state_copy.dbm_state
+            state_copy.set_location(*next(iter(state.location_state.items())))
+    return (time.perf_counter() - start_time) / copy_count
+
+
+def test_copy_on_write_states():
+    simulator = Simulator()
+    simulator.load_system(system_path=test_model_path)
+    state = simulator.system_state
+
+    shared_copy_time = copy_states(state, use_components=False)
+    full_copy_time = copy_states(state, use_components=True)
+
+    print(f'State copies of "{test_model_path}":')
+    print(f'  Copy-on-write copy (unchanged): {shared_copy_time * 1e6:.1f}us')
+    print(f'  Copy-on-write copy (changed):   {full_copy_time * 1e6:.1f}us')
+    assert shared_copy_time < full_copy_time
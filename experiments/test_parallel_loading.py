@@ -0,0 +1,37 @@
+import os
+import time
+
+from uppyyl_simulator.backend.ast.parsers.uppaal_c_ast_cache import (
+    set_ast_cache, get_ast_cache
+)
+from uppyyl_simulator.backend.ast.parsers.uppaal_xml_model_parser import (
+    uppaal_xml_to_dict, uppaal_dict_to_system
+)
+from test_parser_sharing import make_model_xml
+
+template_count = 120
+location_count = 4
+
+
+def load(system_data, parallel):
+    start_time = time.perf_counter()
+    system = uppaal_dict_to_system(system_data, parallel=parallel)
+    return system, time.perf_counter() - start_time
+
+
+def test_parallel_loading():
+    system_data = uppaal_xml_to_dict(make_model_xml(template_count=template_count, location_count=location_count))
+    previous_ast_cache = get_ast_cache()
+    set_ast_cache(None)
+    try:
+        system, sequential_load_time = load(system_data, parallel=False)
+        parallel_system, parallel_load_time = load(system_data, parallel=True)
+    finally:
+        set_ast_cache(previous_ast_cache)
+
+    print(f'Model with {template_count} templates ({os.cpu_count()} processors):')
+    print(f'  Sequential loading: {sequential_load_time:.3f}s')
+    print(f'  Parallel loading:   {parallel_load_time:.3f}s')
+    assert parallel_system.templates.keys() == system.templates.keys()
+    if os.cpu_count() > 1:
+        assert parallel_load_time < sequential_load_time
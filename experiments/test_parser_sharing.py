@@ -0,0 +1,116 @@
+import gc
+import sys
+import time
+import tracemalloc
+from unittest import mock
+
+from uppyyl_simulator.backend.ast.parsers.generated.uppaal_c_language_parser import (
+    UppaalCLanguageParser
+)
+from uppyyl_simulator.backend.ast.parsers.uppaal_c_ast_cache import (
+    set_ast_cache, get_ast_cache
+)
+from uppyyl_simulator.backend.ast.parsers.uppaal_c_language_semantics import (
+    UppaalCLanguageSemantics
+)
+from uppyyl_simulator.backend.ast.parsers.uppaal_xml_model_parser import (
+    uppaal_xml_to_system
+)
+from uppyyl_simulator.backend.data_structures.ast.ast_code_element import ASTCodeElement
+
+template_count = 40
+location_count = 5
+
+template_xml = """<template>
+<name>P{tmpl_idx}</name>
+<parameter>const int id</parameter>
+<declaration>clock x; int c = 0;</declaration>
+{locations}
+<init ref="id{tmpl_idx}_0"/>
+{transitions}
+</template>"""
+
+location_xml = """<location id="id{tmpl_idx}_{loc_idx}" x="{loc_idx}" y="0">
+<name x="0" y="0">L{loc_idx}</name>
+<label kind="invariant" x="0" y="0">x &lt;= {bound}</label>
+</location>"""
+
+transition_xml = """<transition>
+<source ref="id{tmpl_idx}_{loc_idx}"/>
+<target ref="id{tmpl_idx}_{next_loc_idx}"/>
+<label kind="select" x="0" y="0">i : int[0,1]</label>
+<label kind="guard" x="0" y="0">x &gt;= {loc_idx} &amp;&amp; c &lt; 10 + id</label>
+<label kind="assignment" x="0" y="0">x = 0, c = c + i</label>
+</transition>"""
+
+system_xml = """<?xml version="1.0" encoding="utf-8"?>
+<nta>
+<declaration>int g = 0;</declaration>
+{templates}
+<system>system {instances};</system>
+</nta>"""
+
+
+def make_model_xml(template_count=template_count, location_count=location_count):
+    templates = []
+    for tmpl_idx in range(template_count):
+        locations = "\n".join(location_xml.format(tmpl_idx=tmpl_idx, loc_idx=loc_idx, bound=loc_idx + 5)
+                              for loc_idx in range(location_count))
+        transitions = "\n".join(transition_xml.format(tmpl_idx=tmpl_idx, loc_idx=loc_idx,
+                                                      next_loc_idx=(loc_idx + 1) % location_count)
+                                for loc_idx in range(location_count))
+        templates.append(template_xml.format(tmpl_idx=tmpl_idx, locations=locations, transitions=transitions))
+    instances = ", ".join(f'P{tmpl_idx}' for tmpl_idx in range(template_count))
+    return system_xml.format(templates="\n".join(templates), instances=instances)
+
+
+def measure_parser_memory():
+    tracemalloc.start()
+    parser = UppaalCLanguageParser(semantics=UppaalCLanguageSemantics())
+    parser_memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del parser
+    return parser_memory
+
+
+def load_and_measure(system_xml_str, parser_memory):
+    start_time = time.perf_counter()
+    system = uppaal_xml_to_system(system_xml_str)
+    load_time = time.perf_counter() - start_time
+
+    # Memory retained by the parsers of all code elements of the loaded system
+    gc.collect()
+    parser_ids = {id(obj.parser) for obj in gc.get_objects() if isinstance(obj, ASTCodeElement)}
+    return system, load_time, len(parser_ids) * parser_memory
+
+
+def test_parser_sharing():
+    system_xml_str = make_model_xml()
+    parser_memory = measure_parser_memory()
+    previous_ast_cache = get_ast_cache()
+    set_ast_cache(None)
+    try:
+        _, shared_load_time, shared_memory = load_and_measure(system_xml_str, parser_memory)
+
+        # Emulate one parser per element, as before the parser factory was introduced
+        modules = [module for module in list(sys.modules.values())
+                   if module is not None and hasattr(module, "get_uppaal_c_parser")
+                   and module.__name__.startswith("uppyyl_simulator.backend.") and
+                   not module.__name__.endswith("uppaal_c_parser_factory")]
+        patches = [mock.patch.object(module, "get_uppaal_c_parser",
+                                     lambda: UppaalCLanguageParser(semantics=UppaalCLanguageSemantics()))
+                   for module in modules]
+        for patch in patches:
+            patch.start()
+        try:
+            _, unshared_load_time, unshared_memory = load_and_measure(system_xml_str, parser_memory)
+        finally:
+            for patch in patches:
+                patch.stop()
+    finally:
+        set_ast_cache(previous_ast_cache)
+
+    print(f'Model with {template_count} templates:')
+    print(f'  Per-element parsers: load time {unshared_load_time:.3f}s, parser memory {unshared_memory / 1024:.0f} KiB')
+    print(f'  Shared parser:       load time {shared_load_time:.3f}s, parser memory {shared_memory / 1024:.0f} KiB')
+    assert shared_memory < unshared_memory
@@ -0,0 +1,47 @@
+import os
+import subprocess
+import sys
+import tempfile
+
+from test_parser_sharing import make_model_xml
+
+template_count = 20
+location_count = 600
+
+load_script = """
+import resource
+from uppyyl_simulator.backend.ast.parsers.uppaal_xml_model_parser import (
+    uppaal_xml_to_system, uppaal_xml_file_to_system
+)
+model_path, loader = {model_path!r}, {loader!r}
+if loader == "string":
+    with open(model_path) as file:
+        system = uppaal_xml_to_system(file.read(), lazy=True)
+elif loader == "stream":
+    system = uppaal_xml_file_to_system(model_path, lazy=True)
+print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+"""
+
+
+def measure_peak_memory(model_path, loader):
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+    output = subprocess.run([sys.executable, "-c", load_script.format(model_path=model_path, loader=loader)],
+                            env=env, capture_output=True, text=True, check=True).stdout
+    return int(output.split()[-1]) / 1024  # Peak resident memory in MB
+
+
+def test_streaming_loading():
+    with tempfile.TemporaryDirectory() as model_dir:
+        model_path = os.path.join(model_dir, "model.xml")
+        with open(model_path, "w") as file:
+            file.write(make_model_xml(template_count=template_count, location_count=location_count))
+        model_size = os.path.getsize(model_path) / 1024 ** 2
+
+        base_memory = measure_peak_memory(model_path, loader=None)
+        string_memory = measure_peak_memory(model_path, loader="string") - base_memory
+        stream_memory = measure_peak_memory(model_path, loader="stream") - base_memory
+
+    print(f'Model with {template_count} templates of {location_count} locations ({model_size:.1f}MB):')
+    print(f'  Peak load memory (string): {string_memory:.1f}MB')
+    print(f'  Peak load memory (stream): {stream_memory:.1f}MB')
+    assert stream_memory < string_memory
@@ -0,0 +1,126 @@
+import os
+import pprint
+
+import pytest
+
+from uppyyl_simulator.backend.ast.evaluators.uppaal_c_code_generator import (
+    UppaalCCodeGenerator, ScopeResolver, GENERATED_MODULE_HEADER, load_generated_module
+)
+from uppyyl_simulator.backend.data_structures.state.variable import UppaalVariable
+from uppyyl_simulator.backend.data_structures.types.int import UppaalInt
+from tests.ast.evaluators.test_uppaal_c_evaluator import (  # noqa: F401 (fixtures)
+    parser, evaluator, template_state
+)
+from tests.ast.uppaal_c_language_test_data import (
+    test_expr_data, test_assign_data
+)
+
+pp = pprint.PrettyPrinter(indent=4, compact=True)
+printExpectedResults = False
+printActualResults = False
+
+
+@pytest.fixture
+def generator():
+    return UppaalCCodeGenerator()
+
+
+@pytest.fixture
+def instance_state(template_state):
+    state = template_state
+    state.new_instance_scope("Inst")
+    state.activate_instance_scope("Inst")
+    return state
+
+
+def generate_and_load(generator, ast, state, local_names=None):
+    resolver = ScopeResolver(state=state, inst_name="Inst", local_names=local_names)
+    body_lines = [f'return {generator.generate_expr(ast, resolver)}']
+    source = GENERATED_MODULE_HEADER + generator.generate_function("func", body_lines, resolver)
+    return load_generated_module(source)["func"]
+
+
+###########
+# General #
+###########
+def test_unknown_ast_type(instance_state, generator):
+    with pytest.raises(Exception):
+        generate_and_load(generator, {'astType': 'NonExistingType'}, instance_state)
+
+
+def test_unresolved_name(instance_state, generator, parser):
+    with pytest.raises(Exception):
+        generate_and_load(generator, parser.parse(text="unknown + 1", rule_name="Expression"), instance_state)
+
+
+def test_scope_resolution(instance_state, generator, parser):
+    state = instance_state
+    state.add(key="i1", var=UppaalVariable(name="i1", val=UppaalInt(100)))  # Shadows the system variable "i1"
+    func = generate_and_load(generator, parser.parse(text="i1 + sel", rule_name="Expression"), state,
+                             local_names=["sel"])
+
+    state.add_local_scope(name="edge", scope={"sel": UppaalVariable(name="sel", val=UppaalInt(3))})
+    assert func(state) == UppaalInt(103)
+    state.remove_local_scope()
+
+
+def test_generate_once_evaluate_often(instance_state, generator, parser):
+    state = instance_state
+    func = generate_and_load(generator, parser.parse(text="i1 += 2", rule_name="Expression"), state)
+    for _ in range(3):
+        func(state)
+    assert state.get_compact_variable_state()["variable"]["system"]["i1"] == 11
+
+
+def test_assign_copy_on_write(instance_state, generator, parser):
+    resolver = ScopeResolver(state=instance_state, inst_name="Inst")
+    body_lines = [generator.generate_expr(parser.parse(text=text, rule_name="Expression"), resolver)
+                  for text in ["i1 = 9", "arr_1d[0]++"]]
+    source = GENERATED_MODULE_HEADER + generator.generate_function("func", body_lines, resolver)
+    func = load_generated_module(source)["func"]
+    state_copy = instance_state.copy()
+    func(state_copy)
+    system_vars, system_vars_copy = (s.get_compact_variable_state()["variable"]["system"]
+                                     for s in [instance_state, state_copy])
+    assert (system_vars["i1"], system_vars["arr_1d"][0]) == (5, 1)
+    assert (system_vars_copy["i1"], system_vars_copy["arr_1d"][0]) == (9, 2)
+
+
+def test_module_cache(instance_state, generator, parser, tmp_path):
+    resolver = ScopeResolver(state=instance_state, inst_name="Inst")
+    body_lines = [f'return {generator.generate_expr(parser.parse(text="i1 * 2", rule_name="Expression"), resolver)}']
+    source = GENERATED_MODULE_HEADER + generator.generate_function("func", body_lines, resolver)
+
+    namespace = load_generated_module(source, cache_dir=str(tmp_path))
+    module_files = [file for file in os.listdir(str(tmp_path)) if file.endswith(".py")]
+    assert len(module_files) == 1
+    assert namespace["func"](instance_state) == UppaalInt(10)
+
+    cached_namespace = load_generated_module(source, cache_dir=str(tmp_path))
+    assert [file for file in os.listdir(str(tmp_path)) if file.endswith(".py")] == module_files
+    assert cached_namespace["func"](instance_state) == UppaalInt(10)
+
+
+###############
+# Expressions #
+###############
+@pytest.mark.parametrize("data", test_expr_data.values(),
+                         ids=list(map(lambda kv: f'{kv[0]}: {kv[1]["text"]}', test_expr_data.items())))
+def test_expression(instance_state, generator, data):
+    state = instance_state
+    res = generate_and_load(generator, data["ast"], state)(state)
+    assert isinstance(res, type(data["val"]))
+    assert res == data["val"]
+
+
+@pytest.mark.parametrize("data", test_assign_data.values(),
+                         ids=list(map(lambda kv: f'{kv[0]}: {kv[1]["text"]}', test_assign_data.items())))
+def test_assign_expression(instance_state, generator, data):
+    state = instance_state
+    res = generate_and_load(generator, data["ast"], state)(state)
+
+    assert isinstance(res, type(data["val"]))
+    assert res == data["val"]
+    raw_variable_state = state.get_compact_variable_state()
+    for key, val in data["res_state"].items():
+        assert val == raw_variable_state["variable"]["system"][key]
@@ -0,0 +1,130 @@
+import pprint
+
+import pytest
+
+from uppyyl_simulator.backend.ast.evaluators.uppaal_c_compiler import UppaalCCompiler
+from uppyyl_simulator.backend.data_structures.state.system_state import SystemState
+from uppyyl_simulator.backend.data_structures.types.int import UppaalInt
+from tests.ast.evaluators.test_uppaal_c_evaluator import (  # noqa: F401 (fixtures)
+    parser, evaluator, template_state
+)
+from tests.ast.uppaal_c_language_test_data import (
+    test_expr_data, test_statement_data, test_return_statement_data, test_assign_data
+)
+
+pp = pprint.PrettyPrinter(indent=4, compact=True)
+printExpectedResults = False
+printActualResults = False
+
+
+@pytest.fixture
+def compiler(evaluator):
+    return UppaalCCompiler(evaluator=evaluator)
+
+
+###########
+# General #
+###########
+def test_none_input(compiler):
+    func = compiler.compile_ast(ast=None)
+    with pytest.raises(Exception):
+        func(SystemState())
+
+
+def test_list_input(compiler):
+    func = compiler.compile_ast(ast=[{'astType': 'Integer', 'val': 1}])
+    assert func(SystemState()) is None
+
+
+def test_unknown_ast_type(compiler):
+    func = compiler.compile_ast(ast={'astType': 'NonExistingType'})
+    with pytest.raises(Exception):
+        func(SystemState())
+
+
+def test_compile_once_evaluate_often(template_state, compiler, parser):
+    state = template_state
+    func = compiler.compile_ast(ast=parser.parse(text="i1 += 2", rule_name="Expression"))
+    for _ in range(3):
+        func(state)
+    assert state.get_compact_variable_state()["variable"]["system"]["i1"] == 11
+
+
+def test_compile_function(template_state, compiler, parser):
+    state = template_state
+    func_def_ast = parser.parse(text="int add(int a, int b) { return a + b; }", rule_name="Function")
+    compiler.evaluator.eval_ast(ast=func_def_ast, state=state)
+    func_obj = state.get("add")
+    assert func_obj.compiled_body is None
+
+    func = compiler.compile_ast(ast=parser.parse(text="add(i1, 3)", rule_name="Expression"))
+    res = func(state)
+    assert func_obj.compiled_body is not None
+    assert res == UppaalInt(8)
+    assert func(state) == UppaalInt(8)
+
+
+def test_assign_copy_on_write(template_state, compiler, parser):
+    func = compiler.compile_ast(ast=parser.parse(text="i1 = 9, arr_1d[0]++", rule_name="Updates"))
+    state_copy = template_state.copy()
+    func(state_copy)
+    system_vars, system_vars_copy = (s.get_compact_variable_state()["variable"]["system"]
+                                     for s in [template_state, state_copy])
+    assert (system_vars["i1"], system_vars["arr_1d"][0]) == (5, 1)
+    assert (system_vars_copy["i1"], system_vars_copy["arr_1d"][0]) == (9, 2)
+
+
+###############
+# Expressions #
+###############
+@pytest.mark.parametrize("data", test_expr_data.values(),
+                         ids=list(map(lambda kv: f'{kv[0]}: {kv[1]["text"]}', test_expr_data.items())))
+def test_expression(template_state, compiler, data):
+    state = template_state
+    res = compiler.compile_ast(ast=data["ast"])(state)
+    assert isinstance(res, type(data["val"]))
+    assert res == data["val"]
+
+
+@pytest.mark.parametrize("data", test_assign_data.values(),
+                         ids=list(map(lambda kv: f'{kv[0]}: {kv[1]["text"]}', test_assign_data.items())))
+def test_assign_expression(template_state, compiler, data):
+    state = template_state
+    res = compiler.compile_ast(ast=data["ast"])(state)
+
+    assert isinstance(res, type(data["val"]))
+    assert res == data["val"]
+    raw_variable_state = state.get_compact_variable_state()
+    for key, val in data["res_state"].items():
+        assert val == raw_variable_state["variable"]["system"][key]
+
+
+##############
+# Statements #
+##############
+@pytest.mark.parametrize("data", test_statement_data.values(),
+                         ids=list(map(lambda kv: f'{kv[0]}: {kv[1]["text"]}', test_statement_data.items())))
+def test_statements(template_state, compiler, data):
+    state = template_state
+    for pre in data["pre"]:
+        compiler.compile_ast(ast=pre["ast"])(state)
+    res, ret_status = compiler.compile_ast(ast=data["ast"])(state)
+
+    assert not ret_status
+    raw_variable_state = state.get_compact_variable_state()
+    for key, val in data["res_state"].items():
+        assert val == raw_variable_state["variable"]["system"][key]
+
+
+@pytest.mark.parametrize("data", test_return_statement_data.values(),
+                         ids=list(map(lambda kv: f'{kv[0]}: {kv[1]["text"]}', test_return_statement_data.items())))
+def test_return_statements(template_state, compiler, data):
+    state = template_state
+    for pre in data["pre"]:
+        compiler.compile_ast(ast=pre["ast"])(state)
+    res, ret_status = compiler.compile_ast(ast=data["ast"])(state)
+
+    assert ret_status
+    raw_variable_state = state.get_compact_variable_state()
+    for key, val in data["res_state"].items():
+        assert val == raw_variable_state["variable"]["system"][key]
@@ -0,0 +1,120 @@
+import pprint
+
+import pytest
+
+from uppyyl_simulator.backend.ast.evaluators.uppaal_c_constant_folder import UppaalCConstantFolder
+from uppyyl_simulator.backend.data_structures.state.variable import UppaalVariable
+from uppyyl_simulator.backend.data_structures.types.array import UppaalArray
+from uppyyl_simulator.backend.data_structures.types.int import UppaalInt
+from tests.ast.evaluators.test_uppaal_c_evaluator import (  # noqa: F401 (fixtures)
+    parser, evaluator, template_state
+)
+from tests.ast.uppaal_c_language_test_data import (
+    test_expr_data, test_assign_data
+)
+
+pp = pprint.PrettyPrinter(indent=4, compact=True)
+printExpectedResults = False
+printActualResults = False
+
+const_array_type = UppaalArray.make_new_type(name="array", dims=[3], clazz=UppaalInt)
+
+
+@pytest.fixture
+def folder(evaluator):
+    return UppaalCConstantFolder(evaluator=evaluator)
+
+
+@pytest.fixture
+def instance_state(template_state):
+    state = template_state
+    state.new_instance_scope("Inst")
+    state.activate_instance_scope("Inst")
+    state.add(key="N", var=UppaalVariable(name="N", val=UppaalInt(4)), const=True)
+    state.add(key="c_arr", var=UppaalVariable(name="c_arr", val=const_array_type(init=[1, 2, 3])), const=True)
+    return state
+
+
+def fold(folder, parser, text, state, local_names=None):
+    ast = parser.parse(text=text, rule_name="Expression")
+    return folder.fold_ast(ast, state=state, inst_name="Inst", local_names=local_names)
+
+
+###########
+# General #
+###########
+def test_fold_literals(instance_state, folder, parser):
+    folded_ast = fold(folder, parser, "i1 + 2 * (3 - 1)", instance_state)
+    assert folded_ast["left"] == {"astType": "Variable", "name": "i1"}
+    assert folded_ast["right"] == {"astType": "Integer", "val": 4}
+
+    assert fold(folder, parser, "!(1 < 2)", instance_state) == {"astType": "Boolean", "val": False}
+
+
+def test_inline_constants(instance_state, folder, parser):
+    assert fold(folder, parser, "N * 2 - 1", instance_state) == {"astType": "Integer", "val": 7}
+    assert fold(folder, parser, "c_arr[N - 2]", instance_state) == {"astType": "Integer", "val": 3}
+
+
+def test_keep_original_ast(instance_state, folder, parser):
+    ast = parser.parse(text="N + 1", rule_name="Expression")
+    folder.fold_ast(ast, state=instance_state, inst_name="Inst")
+    assert ast["left"]["astType"] == "Variable"
+
+
+def test_local_names_shadow_constants(instance_state, folder, parser):
+    folded_ast = fold(folder, parser, "N + 1", instance_state, local_names=["N"])
+    assert folded_ast["left"] == {"astType": "Variable", "name": "N"}
+
+
+def test_bound_names_shadow_constants(instance_state, folder, parser):
+    folded_ast = fold(folder, parser, "forall (N : int[0,2]) c_arr[N] == 1", instance_state)
+    assert folded_ast["expr"]["left"]["right"] == {"astType": "Variable", "name": "N"}
+
+    folded_ast = fold(folder, parser, "sum (N : int[0,2]) N + c_arr[0]", instance_state)
+    assert folded_ast["expr"]["left"] == {"astType": "Variable", "name": "N"}
+    assert folded_ast["expr"]["right"] == {"astType": "Integer", "val": 1}
+
+
+def test_keep_erroneous_expressions(instance_state, folder, parser):
+    assert fold(folder, parser, "N / 0", instance_state)["astType"] == "BinaryExpr"
+    assert fold(folder, parser, "c_arr[N]", instance_state)["astType"] == "BinaryExpr"
+
+
+def test_fold_ternary_expression(instance_state, folder, parser):
+    assert fold(folder, parser, "N > 2 ? i1 : i2", instance_state) == {"astType": "Variable", "name": "i1"}
+
+
+def test_keep_assigned_variables_and_arguments(instance_state, folder, parser):
+    folded_ast = fold(folder, parser, "i1 = N", instance_state)
+    assert folded_ast["left"] == {"astType": "Variable", "name": "i1"}
+    assert folded_ast["right"] == {"astType": "Integer", "val": 4}
+
+    folded_ast = fold(folder, parser, "f(N, N + 1)", instance_state)
+    assert folded_ast["args"][0] == {"astType": "Variable", "name": "N"}
+    assert folded_ast["args"][1] == {"astType": "Integer", "val": 5}
+
+
+###############
+# Expressions #
+###############
+@pytest.mark.parametrize("data", test_expr_data.values(),
+                         ids=list(map(lambda kv: f'{kv[0]}: {kv[1]["text"]}', test_expr_data.items())))
+def test_expression(instance_state, folder, evaluator, data):
+    state = instance_state
+    res = evaluator.eval_ast(folder.fold_ast(data["ast"], state=state, inst_name="Inst"), state)
+    if isinstance(res, UppaalVariable):
+        res = res.val
+    assert res == data["val"]
+
+
+@pytest.mark.parametrize("data", test_assign_data.values(),
+                         ids=list(map(lambda kv: f'{kv[0]}: {kv[1]["text"]}', test_assign_data.items())))
+def test_assign_expression(instance_state, folder, evaluator, data):
+    state = instance_state
+    res = evaluator.eval_ast(folder.fold_ast(data["ast"], state=state, inst_name="Inst"), state)
+
+    assert res == data["val"]
+    raw_variable_state = state.get_compact_variable_state()
+    for key, val in data["res_state"].items():
+        assert val == raw_variable_state["variable"]["system"][key]
@@ -191,6 +191,18 @@ def test_initialize_parameters_2(parser, evaluator):
         evaluator.initialize_parameters(param_asts=param_asts, args=args, state=SystemState())
 
 
+def test_assign_copy_on_write(template_state, evaluator, parser):
+    func_def_ast = parser.parse(text="void set(int &x) { x = 3; }", rule_name="Function")
+    evaluator.eval_ast(ast=func_def_ast, state=template_state)
+    state_copy = template_state.copy()
+    evaluator.eval_ast(ast=parser.parse(text="i1 = 9, arr_1d[0]++, set(i2)", rule_name="Updates"),
+                       state=state_copy)
+    system_vars, system_vars_copy = (s.get_compact_variable_state()["variable"]["system"]
+                                     for s in [template_state, state_copy])
+    assert (system_vars["i1"], system_vars["arr_1d"][0], system_vars["i2"]) == (5, 1, 7)
+    assert (system_vars_copy["i1"], system_vars_copy["arr_1d"][0], system_vars_copy["i2"]) == (9, 2, 3)
+
+
 ###############
 # Expressions #
 ###############
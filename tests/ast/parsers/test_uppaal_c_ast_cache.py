@@ -0,0 +1,113 @@
+import os
+import pprint
+import tempfile
+import unittest
+
+from uppyyl_simulator.backend.ast.parsers.generated.uppaal_c_language_parser import (
+    UppaalCLanguageParser
+)
+from uppyyl_simulator.backend.ast.parsers.uppaal_c_ast_cache import (
+    ASTCache, set_ast_cache, get_ast_cache
+)
+from uppyyl_simulator.backend.ast.parsers.uppaal_c_language_semantics import (
+    UppaalCLanguageSemantics
+)
+from uppyyl_simulator.backend.ast.parsers.uppaal_xml_model_parser import (
+    uppaal_xml_to_system
+)
+
+pp = pprint.PrettyPrinter(indent=4, compact=True)
+printExpectedResults = False
+printActualResults = False
+
+test_model_path = './res/tests/uppaal_xml_testmodel.xml'
+
+
+#############
+# AST Cache #
+#############
+class TestASTCache(unittest.TestCase):
+    def setUp(self):
+        self.cache_dir = tempfile.TemporaryDirectory()
+        self.parser = UppaalCLanguageParser(semantics=UppaalCLanguageSemantics())
+        self.previous_ast_cache = get_ast_cache()
+        print("")
+
+    def tearDown(self):
+        set_ast_cache(self.previous_ast_cache)
+        self.cache_dir.cleanup()
+        print("")
+
+    def test_parse(self):
+        ast_cache = ASTCache(cache_dir=self.cache_dir.name)
+        ast = ast_cache.parse(self.parser, "x <= 5", rule_name="Guard")
+        self.assertEqual(ast_cache.stats, {"hits": 0, "misses": 1})
+        cached_ast = ast_cache.parse(self.parser, "x <= 5", rule_name="Guard")
+        self.assertEqual(ast_cache.stats, {"hits": 1, "misses": 1})
+        self.assertEqual(cached_ast, ast)
+        self.assertIsNot(cached_ast, ast)
+
+        # The rule name is part of the key
+        ast_cache.parse(self.parser, "x <= 5", rule_name="Invariant")
+        self.assertEqual(ast_cache.stats, {"hits": 1, "misses": 2})
+
+    def test_persistence(self):
+        ASTCache(cache_dir=self.cache_dir.name).parse(self.parser, "x = 1", rule_name="Update")
+        ast_cache = ASTCache(cache_dir=self.cache_dir.name)
+        self.assertEqual(ast_cache.entry_count, 1)
+        self.assertIsNotNone(ast_cache.get(rule_name="Update", text="x = 1"))
+        self.assertIsNone(ast_cache.get(rule_name="Update", text="x = 2"))
+
+    def test_eviction(self):
+        ast_cache = ASTCache(cache_dir=self.cache_dir.name, max_entries=3)
+        for i in range(5):
+            ast_cache.parse(self.parser, f'x = {i}', rule_name="Update")
+            os.utime(ast_cache._get_entry_path(ast_cache.get_key("Update", f'x = {i}')), (i, i))
+        self.assertLessEqual(ast_cache.entry_count, 3)
+        self.assertIsNone(ast_cache.get(rule_name="Update", text="x = 0"))
+        self.assertIsNotNone(ast_cache.get(rule_name="Update", text="x = 4"))
+
+        ast_cache.clear()
+        self.assertEqual(ast_cache.entry_count, 0)
+
+    def test_eviction_low_water_mark(self):
+        ast_cache = ASTCache(cache_dir=self.cache_dir.name, max_entries=10)
+        for i in range(11):
+            ast_cache.put(rule_name="Update", text=f'x = {i}', ast={})
+        self.assertEqual(ast_cache.entry_count, 9)
+        self.assertEqual(len(ast_cache._get_entry_paths()), 9)
+
+        # No further entries are evicted until the maximum number of entries is exceeded again
+        ast_cache.put(rule_name="Update", text="x = 11", ast={})
+        self.assertEqual(len(ast_cache._get_entry_paths()), 10)
+
+    def test_overwrite_entry(self):
+        ast_cache = ASTCache(cache_dir=self.cache_dir.name)
+        for _ in range(3):
+            ast_cache.put(rule_name="Update", text="x = 1", ast={})
+        self.assertEqual(ast_cache.entry_count, 1)
+
+    def test_reload_model_without_parsing(self):
+        with open(test_model_path) as file:
+            system_xml_str = file.read()
+        set_ast_cache(ASTCache(cache_dir=self.cache_dir.name))
+        system = uppaal_xml_to_system(system_xml_str)
+
+        ast_cache = ASTCache(cache_dir=self.cache_dir.name)
+        set_ast_cache(ast_cache)
+        cached_system = uppaal_xml_to_system(system_xml_str)
+        self.assertEqual(ast_cache.stats["misses"], 0)
+        self.assertGreater(ast_cache.stats["hits"], 0)
+        self.assertEqual(cached_system.declaration.ast, system.declaration.ast)
+        self.assertEqual(get_label_texts(cached_system), get_label_texts(system))
+
+
+def get_label_texts(system):
+    label_texts = []
+    for tmpl in system.templates.values():
+        for loc in tmpl.locations.values():
+            label_texts.extend(inv.text for inv in loc.invariants)
+        for edge in tmpl.edges.values():
+            label_texts.extend(label.text for label in edge.clock_guards + edge.variable_guards + edge.updates +
+                               edge.resets + edge.selects)
+    return label_texts
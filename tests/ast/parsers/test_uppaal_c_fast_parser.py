@@ -0,0 +1,89 @@
+import pprint
+
+import pytest
+from uppyyl_simulator.backend.ast.parsers.generated.uppaal_c_language_parser import (
+    UppaalCLanguageParser
+)
+
+from uppyyl_simulator.backend.ast.parsers.uppaal_c_fast_parser import UppaalCFastParser
+from uppyyl_simulator.backend.ast.parsers.uppaal_c_language_semantics import (
+    UppaalCLanguageSemantics
+)
+from tests.ast.uppaal_c_language_test_data import test_expr_data, test_assign_data
+
+pp = pprint.PrettyPrinter(indent=4, compact=True)
+printExpectedResults = False
+printActualResults = False
+
+test_label_data = [
+    ("Guards", "x <= 5 && id == 0"),
+    ("Guards", "x >= 2 && (y < 3 || z > 4) && !b"),
+    ("Guards", "a[i][j+1] != -1 and f(i, 2) > 0"),
+    ("Guards", "id == 1 ? x < 3 : x <= 5"),
+    ("Invariants", "x <= 10 && y < c_arr[id] * 2"),
+    ("Invariants", "t <= 1.5e2 && c == .5"),
+    ("Updates", "x = 0, cnt++"),
+    ("Updates", "--i, a[i] += 2 * (j - 1), b = !b, k <<= 1, s.val = 3"),
+    ("Updates", "i = j = k = 1, x := y <? z >? 0"),
+    ("Updates", ""),
+    ("Selects", "i : int[0,3]"),
+    ("Selects", "i : int[0, N - 1], j : id_t"),
+]
+
+test_fallback_data = [
+    ("Guards", "forall (i : int[0,3]) a[i] > 0"),
+    ("Guards", "x <= 5 // comment"),
+    ("Guards", "notified == true"),
+    ("Updates", "5++"),
+    ("Invariants", "x <= 5 && x' == 2"),
+    ("Updates", "x = 0, y = 1 )"),
+    ("Selects", "i : const int"),
+]
+
+
+@pytest.fixture
+def tatsu_parser():
+    return UppaalCLanguageParser(semantics=UppaalCLanguageSemantics())
+
+
+@pytest.fixture
+def parser(tatsu_parser):
+    return UppaalCFastParser(fallback_parser=tatsu_parser)
+
+
+################################
+# Differential (TatSu vs Fast) #
+################################
+@pytest.mark.parametrize("rule", ["Guard", "Invariant", "Update"])
+@pytest.mark.parametrize("data", list(test_expr_data.values()) + list(test_assign_data.values()),
+                         ids=list(map(lambda kv: f'{kv[0]}: {kv[1]["text"]}',
+                                      list(test_expr_data.items()) + list(test_assign_data.items()))))
+def test_expression(parser, tatsu_parser, data, rule):
+    res = parser.parse_fast(text=data["text"], rule_name=rule)
+    assert res == tatsu_parser.parse(text=data["text"], rule_name=rule)
+    if data["rule"] == "Expression":
+        assert res == {"expr": data["ast"], "astType": rule}
+
+
+@pytest.mark.parametrize("rule, text", test_label_data, ids=[text for _, text in test_label_data])
+def test_label(parser, tatsu_parser, rule, text):
+    res = parser.parse_fast(text=text, rule_name=rule)
+    assert res is not None
+    assert res == tatsu_parser.parse(text=text, rule_name=rule)
+
+
+############
+# Fallback #
+############
+@pytest.mark.parametrize("rule, text", test_fallback_data, ids=[text for _, text in test_fallback_data])
+def test_fallback(parser, tatsu_parser, rule, text):
+    assert parser.parse_fast(text=text, rule_name=rule) is None
+    assert parser.parse(text=text, rule_name=rule) == tatsu_parser.parse(text=text, rule_name=rule)
+    assert parser.stats == {"fast": 0, "fallback": 1}
+
+
+def test_fallback_for_other_rules(parser, tatsu_parser):
+    text = "int a[2] = {1, 2};"
+    assert parser.parse(text=text, rule_name="VariableDecls") == tatsu_parser.parse(text=text,
+                                                                                     rule_name="VariableDecls")
+    assert parser.stats == {"fast": 0, "fallback": 1}
@@ -0,0 +1,33 @@
+import threading
+import unittest
+
+from uppyyl_simulator.backend.ast.parsers.uppaal_c_parser_factory import (
+    get_uppaal_c_parser
+)
+
+
+##################
+# Parser Factory #
+##################
+class TestParserFactory(unittest.TestCase):
+    def setUp(self):
+        print("")
+
+    def tearDown(self):
+        print("")
+
+    def test_shared_parser(self):
+        parser = get_uppaal_c_parser()
+        self.assertIs(get_uppaal_c_parser(), parser)
+        self.assertEqual(parser.parse("x <= 5", rule_name="Guard")["astType"], "Guard")
+
+    def test_parser_per_thread(self):
+        thread_parsers = []
+        thread = threading.Thread(target=lambda: thread_parsers.append(get_uppaal_c_parser()))
+        thread.start()
+        thread.join()
+        self.assertIsNot(thread_parsers[0], get_uppaal_c_parser())
+
+
+if __name__ == '__main__':
+    unittest.main()
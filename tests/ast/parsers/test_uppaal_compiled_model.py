@@ -0,0 +1,116 @@
+import os
+import pprint
+import struct
+import tempfile
+import unittest
+
+from uppyyl_simulator.backend.ast.parsers.uppaal_compiled_model import (
+    uppaal_system_to_compiled, uppaal_compiled_to_system, save_compiled_system, load_compiled_system,
+    get_source_hash, is_compiled_system, HEADER_SIZE
+)
+from uppyyl_simulator.backend.ast.parsers.uppaal_xml_model_parser import (
+    uppaal_xml_to_system
+)
+from uppyyl_simulator.backend.simulator.simulator import (
+    Simulator
+)
+
+pp = pprint.PrettyPrinter(indent=4, compact=True)
+printExpectedResults = False
+printActualResults = False
+
+test_model_path = './res/tests/uppaal_xml_testmodel.xml'
+test_simulator_model_path = './res/tests/transition-test.xml'
+
+
+##################
+# Compiled Model #
+##################
+class TestUppaalCompiledModel(unittest.TestCase):
+    def setUp(self):
+        with open(test_model_path) as file:
+            self.system_xml_str = file.read()
+        self.system = uppaal_xml_to_system(self.system_xml_str)
+        self.compiled_dir = tempfile.TemporaryDirectory()
+        print("")
+
+    def tearDown(self):
+        self.compiled_dir.cleanup()
+        print("")
+
+    def assert_systems_equal(self, restored_system, system):
+        self.assertEqual(restored_system.declaration.ast, system.declaration.ast)
+        self.assertEqual(restored_system.declaration.clocks, system.declaration.clocks)
+        self.assertEqual(restored_system.system_declaration.ast, system.system_declaration.ast)
+        self.assertEqual([query.formula.text for query in restored_system.queries],
+                         [query.formula.text for query in system.queries])
+        self.assertEqual([tmpl.name for tmpl in restored_system.templates.values()],
+                         [tmpl.name for tmpl in system.templates.values()])
+        for restored_tmpl, tmpl in zip(restored_system.templates.values(), system.templates.values()):
+            self.assertEqual(restored_tmpl.declaration.ast, tmpl.declaration.ast)
+            self.assertEqual(restored_tmpl.declaration.clocks, tmpl.declaration.clocks)
+            self.assertEqual([param.ast for param in restored_tmpl.parameters],
+                             [param.ast for param in tmpl.parameters])
+            for loc_id, loc in tmpl.locations.items():
+                self.assertEqual([inv.ast for inv in restored_tmpl.locations[loc_id].invariants],
+                                 [inv.ast for inv in loc.invariants])
+            self.assertEqual(len(restored_tmpl.edges), len(tmpl.edges))
+            for restored_edge, edge in zip(restored_tmpl.edges.values(), tmpl.edges.values()):
+                self.assertEqual(restored_edge.source.id, edge.source.id)
+                for attr in ["clock_guards", "variable_guards", "updates", "resets", "selects"]:
+                    self.assertEqual([label.ast for label in getattr(restored_edge, attr)],
+                                     [label.ast for label in getattr(edge, attr)])
+
+    def test_compiled_round_trip(self):
+        compiled_data = uppaal_system_to_compiled(self.system)
+        self.assertTrue(is_compiled_system(compiled_data))
+        self.assertFalse(is_compiled_system(self.system_xml_str.encode("utf-8")))
+        self.assert_systems_equal(uppaal_compiled_to_system(compiled_data), self.system)
+
+    def test_compiled_lazy_system(self):
+        lazy_system = uppaal_xml_to_system(self.system_xml_str, lazy=True)
+        restored_system = uppaal_compiled_to_system(uppaal_system_to_compiled(lazy_system))
+        self.assert_systems_equal(restored_system, self.system)
+
+    def test_save_and_load(self):
+        compiled_path = os.path.join(self.compiled_dir.name, "model.uppyc")
+        source_hash = get_source_hash(self.system_xml_str)
+        save_compiled_system(self.system, compiled_path, source_hash=source_hash)
+        self.assert_systems_equal(load_compiled_system(compiled_path, source_hash=source_hash), self.system)
+
+        with self.assertRaises(Exception):
+            load_compiled_system(compiled_path, source_hash=get_source_hash(self.system_xml_str + " "))
+
+    def test_invalid_header(self):
+        compiled_data = uppaal_system_to_compiled(self.system)
+        with self.assertRaises(Exception):
+            uppaal_compiled_to_system(b"UPPXX" + compiled_data[5:])
+        with self.assertRaises(Exception):
+            uppaal_compiled_to_system(compiled_data[:5] + struct.pack("<H", 999) + compiled_data[7:])
+        with self.assertRaises(Exception):
+            uppaal_compiled_to_system(compiled_data[:7] + bytes(32) + compiled_data[39:])
+        with self.assertRaises(Exception):
+            uppaal_compiled_to_system(compiled_data[:HEADER_SIZE - 1])
+
+    def test_simulator_with_compiled_system(self):
+        simulator = Simulator()
+        simulator.load_system(system_path=test_simulator_model_path)
+        compiled_data = uppaal_system_to_compiled(simulator.system)  # Compiled labels are not stored
+        compiled_path = os.path.join(self.compiled_dir.name, "transition-test.uppyc")
+        with open(compiled_path, "wb") as file:
+            file.write(compiled_data)
+
+        for compiled_system in [compiled_data, compiled_path]:
+            compiled_simulator = Simulator()
+            if isinstance(compiled_system, str):
+                compiled_simulator.load_system(system_path=compiled_system)
+            else:
+                compiled_simulator.set_system(compiled_system)
+            self.assertEqual(compiled_simulator.get_system_details(), simulator.get_system_details())
+            self.assertEqual(compiled_simulator.init_system_state.get_variable_state_string(),
+                             simulator.init_system_state.get_variable_state_string())
+            compiled_simulator.simulate(max_steps=20)
+
+
+if __name__ == '__main__':
+    unittest.main()
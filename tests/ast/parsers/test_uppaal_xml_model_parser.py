@@ -1,10 +1,15 @@
+import io
 import os
 import pathlib
 import pprint
+import threading
 import unittest
+from unittest import mock
 
+from uppyyl_simulator.backend.ast.parsers import uppaal_c_ast_cache, uppaal_xml_model_parser
 from uppyyl_simulator.backend.ast.parsers.uppaal_xml_model_parser import (
-    uppaal_xml_to_dict, uppaal_dict_to_system, uppaal_system_to_dict, uppaal_dict_to_xml
+    uppaal_xml_to_dict, uppaal_dict_to_system, uppaal_system_to_dict, uppaal_dict_to_xml, uppaal_xml_to_system,
+    uppaal_xml_file_to_system, parse_code_texts, _get_global_code_texts
 )
 
 pp = pprint.PrettyPrinter(indent=4, compact=True)
@@ -45,6 +50,122 @@ class TestUppaalDictToSystem(unittest.TestCase):
         _system = uppaal_dict_to_system(dict_data)
         # print(system)
 
+    def test_uppaal_dict_to_system_parallel(self):
+        dict_data = uppaal_xml_to_dict(self.system_xml_str)
+        system = uppaal_dict_to_system(dict_data)
+        parallel_system = uppaal_dict_to_system(dict_data, parallel=True, max_workers=2)
+        self.assertEqual(parallel_system.declaration.ast, system.declaration.ast)
+        self.assertEqual(parallel_system.system_declaration.ast, system.system_declaration.ast)
+        for tmpl_name, tmpl in system.templates.items():
+            parallel_tmpl = parallel_system.templates[tmpl_name]
+            self.assertEqual(parallel_tmpl.declaration.ast, tmpl.declaration.ast)
+            for loc_id, loc in tmpl.locations.items():
+                self.assertEqual([inv.ast for inv in parallel_tmpl.locations[loc_id].invariants],
+                                 [inv.ast for inv in loc.invariants])
+            for edge_id, edge in tmpl.edges.items():
+                parallel_edge = parallel_tmpl.edges[edge_id]
+                for attr in ["clock_guards", "variable_guards", "updates", "resets", "selects"]:
+                    self.assertEqual([label.ast for label in getattr(parallel_edge, attr)],
+                                     [label.ast for label in getattr(edge, attr)])
+
+    def test_uppaal_dict_to_system_parallel_explicit_cache(self):
+        dict_data = uppaal_xml_to_dict(self.system_xml_str)
+        parsed_texts = parse_code_texts(_get_global_code_texts(dict_data))
+        declaration_ast = next(ast for rule_name, _, ast in parsed_texts if rule_name == "UppaalDeclaration")
+        declaration_ast["marker"] = True  # Identifies the ASTs parsed in advance
+
+        # The ASTs parsed in advance are used without replacing the process-wide AST cache
+        with mock.patch.object(uppaal_xml_model_parser, "parse_system_code_in_parallel", return_value=parsed_texts), \
+                mock.patch.object(uppaal_c_ast_cache, "set_ast_cache", side_effect=AssertionError):
+            parallel_system = uppaal_dict_to_system(dict_data, parallel=True)
+        self.assertTrue(parallel_system.declaration.ast["marker"])
+        self.assertNotIn("marker", uppaal_dict_to_system(dict_data).declaration.ast)
+
+    def test_uppaal_dict_to_system_lazy(self):
+        dict_data = uppaal_xml_to_dict(self.system_xml_str)
+        system = uppaal_dict_to_system(dict_data)
+        lazy_system = uppaal_dict_to_system(dict_data, lazy=True)
+        label_count = system.label_parse_stats["labels"]
+        self.assertGreater(label_count, 0)
+        self.assertEqual(system.label_parse_stats, {"labels": label_count, "parsed": label_count})
+        self.assertEqual(lazy_system.label_parse_stats, {"labels": label_count, "parsed": 0})
+
+        # Labels are parsed once on first access, even if accessed concurrently
+        tmpl_name, tmpl = next((name, tmpl) for name, tmpl in system.templates.items()
+                               if any(edge.clock_guards or edge.variable_guards for edge in tmpl.edges.values()))
+        edge_id, edge = next((edge_id, edge) for edge_id, edge in tmpl.edges.items()
+                             if edge.clock_guards or edge.variable_guards)
+        lazy_edge = lazy_system.templates[tmpl_name].edges[edge_id]
+        threads = [threading.Thread(target=lambda: lazy_edge.variable_guards) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(lazy_system.label_parse_stats["parsed"], 1)
+        self.assertEqual([grd.ast for grd in lazy_edge.clock_guards], [grd.ast for grd in edge.clock_guards])
+        self.assertEqual([grd.ast for grd in lazy_edge.variable_guards], [grd.ast for grd in edge.variable_guards])
+        self.assertEqual(lazy_system.label_parse_stats["parsed"], 1)
+
+        for tmpl_name, tmpl in system.templates.items():
+            lazy_tmpl = lazy_system.templates[tmpl_name]
+            for loc_id, loc in tmpl.locations.items():
+                self.assertEqual([inv.ast for inv in lazy_tmpl.locations[loc_id].invariants],
+                                 [inv.ast for inv in loc.invariants])
+            for edge_id, edge in tmpl.edges.items():
+                lazy_edge = lazy_tmpl.edges[edge_id]
+                for attr in ["clock_guards", "variable_guards", "updates", "resets", "selects"]:
+                    self.assertEqual([label.ast for label in getattr(lazy_edge, attr)],
+                                     [label.ast for label in getattr(edge, attr)])
+                self.assertEqual(lazy_edge.sync.ast if lazy_edge.sync else None, edge.sync.ast if edge.sync else None)
+            self.assertEqual(lazy_tmpl.declaration.ast, tmpl.declaration.ast)
+            self.assertEqual([param.ast for param in lazy_tmpl.parameters], [param.ast for param in tmpl.parameters])
+        self.assertEqual(lazy_system.label_parse_stats, {"labels": label_count, "parsed": label_count})
+        self.assertEqual(lazy_system.declaration.ast, system.declaration.ast)
+
+    def test_uppaal_dict_to_system_lazy_parallel(self):
+        dict_data = uppaal_xml_to_dict(self.system_xml_str)
+        with self.assertRaises(Exception):
+            uppaal_dict_to_system(dict_data, parallel=True, lazy=True)
+
+
+#############################
+# Uppaal XML file to system #
+#############################
+class TestUppaalXMLFileToSystem(unittest.TestCase):
+    def setUp(self):
+        with open(test_model_path) as file:
+            uppaal_test_model_str = file.read()
+        self.system_xml_str = uppaal_test_model_str
+        print("")
+
+    def test_uppaal_xml_file_to_system(self):
+        system = uppaal_xml_to_system(self.system_xml_str)
+        with open(test_model_path, "rb") as file:
+            file_object_system = uppaal_xml_file_to_system(file)
+        for streamed_system in [uppaal_xml_file_to_system(test_model_path), file_object_system,
+                                uppaal_xml_file_to_system(io.BytesIO(self.system_xml_str.encode("utf-8")))]:
+            self.assertEqual(streamed_system.declaration.ast, system.declaration.ast)
+            self.assertEqual(streamed_system.system_declaration.ast, system.system_declaration.ast)
+            self.assertEqual([query.formula.text for query in streamed_system.queries],
+                             [query.formula.text for query in system.queries])
+            self.assertEqual([tmpl.name for tmpl in streamed_system.templates.values()],
+                             [tmpl.name for tmpl in system.templates.values()])
+            for streamed_tmpl, tmpl in zip(streamed_system.templates.values(), system.templates.values()):
+                self.assertEqual(streamed_tmpl.declaration.ast, tmpl.declaration.ast)
+                self.assertEqual([param.ast for param in streamed_tmpl.parameters],
+                                 [param.ast for param in tmpl.parameters])
+                self.assertEqual(list(streamed_tmpl.locations.keys()), list(tmpl.locations.keys()))
+                for loc_id, loc in tmpl.locations.items():
+                    self.assertEqual([inv.ast for inv in streamed_tmpl.locations[loc_id].invariants],
+                                     [inv.ast for inv in loc.invariants])
+                self.assertEqual(len(streamed_tmpl.edges), len(tmpl.edges))
+                for streamed_edge, edge in zip(streamed_tmpl.edges.values(), tmpl.edges.values()):
+                    self.assertEqual(streamed_edge.source.id, edge.source.id)
+                    self.assertEqual(streamed_edge.target.id, edge.target.id)
+                    for attr in ["clock_guards", "variable_guards", "updates", "resets", "selects"]:
+                        self.assertEqual([label.ast for label in getattr(streamed_edge, attr)],
+                                         [label.ast for label in getattr(edge, attr)])
+
 
 ######################
 # Uppaal dict to XML #
@@ -1,10 +1,15 @@
+import copy
 import pprint
+import random
 
 import numpy as np
 import pytest
 
 from uppyyl_simulator.backend.data_structures.dbm.dbm import DBMEntry, DBMConstraint, Interval, DBM, \
-    switch_relation
+    switch_relation, PackedDBM, BOUND_INF, BOUND_LE_ZERO, encode_bound, decode_bound, add_bounds, floyd_warshall, \
+    floyd_warshall_bounds, encode_matrix, decode_matrix, tighten_bounds, DBMInternTable
+from uppyyl_simulator.backend.data_structures.dbm.dbm_operations.dbm_operations import DBMOperationGenerator, \
+    ExtrapolateMaxBounds, ExtrapolateLU
 
 pp = pprint.PrettyPrinter(indent=4, compact=True)
 printExpectedResults = False
@@ -237,6 +242,23 @@ def test_dbm_interval_is_empty(interv, expected):
     assert interv.is_empty() == expected
 
 
+test_dbm_interval_contains_data = [
+    (Interval("[", 0, 2, "]"), 0, True),
+    (Interval("[", 0, 2, "]"), 2, True),
+    (Interval("(", 0, 2, ")"), 0, False),
+    (Interval("(", 0, 2, ")"), 2, False),
+    (Interval("(", 0, 2, ")"), 1.5, True),
+    (Interval("[", 0, 2, "]"), 3, False),
+]
+
+
+@pytest.mark.parametrize(
+    "interv,val,expected", test_dbm_interval_contains_data,
+    ids=list(map(lambda data: f'contains({data[0]},{data[1]}) = {data[2]}', test_dbm_interval_contains_data)))
+def test_dbm_interval_contains(interv, val, expected):
+    assert interv.contains(val) == expected
+
+
 test_dbm_interval_get_random_data = [
     (Interval("[", 0, 2, "]")),
     (Interval("[", 2, 2, "]")),
@@ -451,3 +473,294 @@ def test_dbm_str(dbm):
 
 def test_dbm_eq(dbm, dbm2):
     assert dbm != dbm2
+
+
+##################
+# Encoded Bounds #
+##################
+test_encode_bound_data = [
+    (5, "<=", 11),
+    (5, "<", 10),
+    (-5, "<=", -9),
+    (-5, "<", -10),
+    (0, "<=", BOUND_LE_ZERO),
+    (np.inf, "<", BOUND_INF),
+]
+
+
+@pytest.mark.parametrize(
+    "val,rel,expected", test_encode_bound_data,
+    ids=list(map(lambda data: f'encode({data[0]},{data[1]}) = {data[2]}', test_encode_bound_data)))
+def test_encode_bound(val, rel, expected):
+    assert encode_bound(val, rel) == expected
+    assert decode_bound(expected) == (val, rel)
+
+
+@pytest.mark.parametrize(
+    "left,right,expected", test_dbm_entry_add_data,
+    ids=list(map(lambda data: f'{data[0]} + {data[1]} = {data[2]}', test_dbm_entry_add_data)))
+def test_add_bounds(left, right, expected):
+    res = add_bounds(encode_bound(left.val, left.rel), encode_bound(right.val, right.rel))
+    assert res == encode_bound(expected.val, expected.rel)
+
+
+def test_add_bounds_inf():
+    assert add_bounds(BOUND_INF, encode_bound(-5, "<=")) == BOUND_INF
+
+
+@pytest.mark.parametrize(
+    "left,right,expected", test_dbm_entry_lt_data,
+    ids=list(map(lambda data: f'{data[0]} < {data[1]} = {data[2]}', test_dbm_entry_lt_data)))
+def test_encoded_bound_lt(left, right, expected):
+    assert (encode_bound(left.val, left.rel) < encode_bound(right.val, right.rel)) == expected
+
+
+##############
+# Packed DBM #
+##############
+@pytest.fixture
+def packed_dbm(dbm):
+    return PackedDBM.from_dbm(dbm)
+
+
+@pytest.fixture
+def packed_dbm2(dbm2):
+    return PackedDBM.from_dbm(dbm2)
+
+
+def test_packed_dbm_inf_init():
+    packed_dbm = PackedDBM(clocks=["t1", "t2"], add_ref_clock=True, zero_init=False)
+    dbm = DBM(clocks=["t1", "t2"], add_ref_clock=True, zero_init=False)
+    assert packed_dbm.clocks == ["T0_REF", "t1", "t2"]
+    assert packed_dbm.to_dbm() == dbm
+
+
+def test_packed_dbm_get_interval(packed_dbm):
+    interv = packed_dbm.get_interval("t1")
+    assert (interv.lower_incl, interv.lower_val, interv.upper_val, interv.upper_incl) == (True, 1, 3, True)
+
+
+def test_packed_dbm_get_set_entry(packed_dbm):
+    packed_dbm.set_entry(1, 2, DBMEntry(4, "<"))
+    assert packed_dbm.get_entry(1, 2) == DBMEntry(4, "<")
+
+
+def test_packed_dbm_close(dbm, packed_dbm):
+    assert packed_dbm.close().to_dbm() == dbm.close()
+
+
+def test_packed_dbm_is_empty(packed_dbm, packed_dbm2):
+    assert not packed_dbm.is_empty()
+    assert packed_dbm2.is_empty()
+
+
+def test_packed_dbm_includes(packed_dbm, packed_dbm2):
+    assert packed_dbm.includes(packed_dbm)
+    assert not packed_dbm2.includes(packed_dbm)
+
+
+def test_packed_dbm_delay(dbm, packed_dbm):
+    assert packed_dbm.copy().delay_future().to_dbm() == dbm.copy().delay_future()
+    assert packed_dbm.copy().delay_past().to_dbm() == dbm.copy().delay_past()
+
+
+def test_packed_dbm_conjugate_and_reset(dbm, packed_dbm):
+    constr = DBMConstraint("t1 - t2 < 1")
+    packed_dbm.conjugate(constr).reset(clock="t2", val=3)
+    dbm.conjugate(constr).reset(clock="t2", val=3)
+    assert packed_dbm.to_dbm() == dbm
+
+
+def test_packed_dbm_transpose_negate(dbm, packed_dbm):
+    assert packed_dbm.copy().transpose().to_dbm() == dbm.copy().transpose()
+    assert packed_dbm.copy().negate().to_dbm() == dbm.copy().negate()
+
+
+def test_packed_dbm_copy(packed_dbm):
+    packed_dbm_copy = packed_dbm.copy()
+    assert packed_dbm_copy == packed_dbm
+    packed_dbm_copy.reset(clock="t1", val=0)
+    assert packed_dbm_copy != packed_dbm
+
+
+def test_packed_dbm_str(packed_dbm):
+    assert str(packed_dbm) == str(packed_dbm.to_dbm())
+
+
+def _make_random_non_empty_matrix(clock_num, seed):
+    rng = random.Random(seed)
+    valuation = [0] + [rng.randint(0, 10) for _ in range(clock_num - 1)]
+    matrix = [[DBMEntry(0, '<=') for _ in range(clock_num)] for _ in range(clock_num)]
+    for i in range(clock_num):
+        for j in range(clock_num):
+            if i == j:
+                continue
+            if rng.random() < 0.3:
+                matrix[i][j] = DBMEntry(np.inf, '<')
+            else:
+                slack = rng.randint(0, 3)
+                rel = '<=' if slack == 0 else rng.choice(['<', '<='])
+                matrix[i][j] = DBMEntry(valuation[i] - valuation[j] + slack, rel)
+    return matrix
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_floyd_warshall_bounds(seed):
+    matrix = _make_random_non_empty_matrix(clock_num=6, seed=seed)
+    expected = floyd_warshall(copy.deepcopy(matrix))
+    res = decode_matrix(floyd_warshall_bounds(encode_matrix(matrix)))
+    assert res == expected
+
+
+def test_packed_dbm_close_empty(packed_dbm2):
+    assert packed_dbm2.close().is_empty()
+
+
+def test_dbm_close_empty(dbm2):
+    assert dbm2.close().is_empty()
+
+
+#######################
+# Incremental Closure #
+#######################
+@pytest.mark.parametrize("seed", range(20))
+def test_tighten_bounds(seed):
+    rng = random.Random(seed)
+    bounds = floyd_warshall_bounds(encode_matrix(_make_random_non_empty_matrix(clock_num=6, seed=seed)))
+    i, j = rng.sample(range(6), 2)
+    new_bound = encode_bound(rng.randint(-10, 10), rng.choice(['<', '<=']))
+    expected = bounds.copy()
+    expected[i, j] = min(expected[i, j], new_bound)
+    floyd_warshall_bounds(expected)
+    res = tighten_bounds(bounds, i, j, new_bound)
+    expected_empty = bool(np.any(np.diagonal(expected) < BOUND_LE_ZERO))
+    assert bool(np.any(np.diagonal(res) < BOUND_LE_ZERO)) == expected_empty
+    if not expected_empty:
+        assert np.array_equal(res, expected)
+
+
+@pytest.mark.parametrize("dbm_class", [DBM, PackedDBM])
+def test_dbm_conjugate_and_close(dbm_class):
+    for seed in range(20):
+        rng = random.Random(seed)
+        dbm_1 = dbm_class(clocks=["t1", "t2", "t3"])
+        dbm_1.conjugate(DBMConstraint("t1-t2<=3")).conjugate(DBMConstraint("t3<5")).close()
+        dbm_2 = dbm_1.copy()
+        clock1, clock2 = rng.sample(dbm_1.clocks, 2)
+        constraint = DBMConstraint(f'{clock1}-{clock2}{rng.choice(["<", "<="])}{rng.randint(-6, 6)}')
+        dbm_1.conjugate(constraint).close()
+        dbm_2.conjugate_and_close(constraint)
+        assert dbm_1.is_empty() == dbm_2.is_empty()
+        if not dbm_1.is_empty():
+            assert dbm_1 == dbm_2
+
+
+#################
+# Extrapolation #
+#################
+def _make_extrapolation_dbm(dbm_class):
+    extr_dbm = dbm_class(clocks=["t1", "t2"], zero_init=True)
+    extr_dbm.delay_future()
+    extr_dbm.conjugate(DBMConstraint("t1>=10")).conjugate(DBMConstraint("t1<=20")).close()
+    extr_dbm.reset("t2", 0)
+    return extr_dbm
+
+
+@pytest.mark.parametrize("dbm_class", [DBM, PackedDBM])
+def test_dbm_extrapolate_max_bounds(dbm_class):
+    extr_dbm = _make_extrapolation_dbm(dbm_class)
+    extr_dbm.extrapolate_max_bounds({"t1": 5, "t2": 3})
+    assert extr_dbm.get_interval("t1") == Interval(False, 5, np.inf, False)
+    assert extr_dbm.get_interval("t2") == Interval(True, 0, 0, True)
+
+
+@pytest.mark.parametrize("dbm_class", [DBM, PackedDBM])
+def test_dbm_extrapolate_max_bounds_unbounded_clock(dbm_class):
+    extr_dbm = _make_extrapolation_dbm(dbm_class)
+    extr_dbm.extrapolate_max_bounds({"t2": 3})
+    assert extr_dbm.get_interval("t1") == Interval(True, 0, np.inf, False)
+    assert not extr_dbm.is_empty()
+
+
+@pytest.mark.parametrize("dbm_class", [DBM, PackedDBM])
+def test_dbm_extrapolate_lu(dbm_class):
+    extr_dbm = _make_extrapolation_dbm(dbm_class)
+    extr_dbm.extrapolate_lu(lower_bounds={"t1": 30}, upper_bounds={"t1": 5, "t2": 3})
+    assert extr_dbm.get_interval("t1") == Interval(False, 5, 20, True)
+
+
+def test_dbm_extrapolate_equal_to_packed_dbm():
+    for seed in range(10):
+        matrix = floyd_warshall(_make_random_non_empty_matrix(clock_num=5, seed=seed))
+        rng = random.Random(seed)
+        dbm_1 = DBM(clocks=["t1", "t2", "t3", "t4"])
+        dbm_1.matrix = matrix
+        dbm_2 = PackedDBM.from_dbm(dbm_1)
+        lower_bounds = {clock: rng.randint(0, 10) for clock in rng.sample(dbm_1.clocks[1:], 3)}
+        upper_bounds = {clock: rng.randint(0, 10) for clock in rng.sample(dbm_1.clocks[1:], 3)}
+        dbm_1.extrapolate_lu(lower_bounds, upper_bounds)
+        dbm_2.extrapolate_lu(lower_bounds, upper_bounds)
+        assert dbm_2.to_dbm() == dbm_1
+
+
+def test_extrapolation_operations():
+    op_gen = DBMOperationGenerator()
+    max_op = op_gen.generate_from_program_line("ExtrapolateMaxBounds(t1=5, t2=3)")
+    assert isinstance(max_op, ExtrapolateMaxBounds)
+    assert max_op.max_bounds == {"t1": 5, "t2": 3}
+    assert str(max_op.copy()) == "ExtrapolateMaxBounds(t1=5, t2=3)"
+
+    lu_op = op_gen.generate_from_program_line("ExtrapolateLU(t1=30|5, t2=-inf|3)")
+    assert isinstance(lu_op, ExtrapolateLU)
+    assert lu_op.lower_bounds == {"t1": 30}
+    assert lu_op.upper_bounds == {"t1": 5, "t2": 3}
+    assert str(lu_op.copy()) == "ExtrapolateLU(t1=30|5, t2=-inf|3)"
+
+    extr_dbm = _make_extrapolation_dbm(DBM)
+    lu_op.apply(extr_dbm)
+    assert extr_dbm.get_interval("t1") == Interval(False, 5, 20, True)
+
+
+#######################
+# Hashing & Interning #
+#######################
+def test_packed_dbm_hash(dbm, packed_dbm):
+    packed_dbm_copy = packed_dbm.copy()
+    assert hash(packed_dbm) == hash(packed_dbm_copy)
+    assert hash(packed_dbm) == hash(dbm)
+    assert len({packed_dbm, packed_dbm_copy}) == 1
+
+
+def test_packed_dbm_hash_invalidation(packed_dbm):
+    packed_dbm_copy = packed_dbm.copy()
+    hash(packed_dbm_copy)
+    packed_dbm_copy.delay_future()
+    assert hash(packed_dbm_copy) == hash(packed_dbm.copy().delay_future())
+    assert packed_dbm_copy != packed_dbm
+    packed_dbm_copy.matrix = packed_dbm.copy_matrix()
+    assert hash(packed_dbm_copy) == hash(packed_dbm)
+    assert packed_dbm_copy == packed_dbm
+
+
+def test_packed_dbm_freeze(packed_dbm):
+    packed_dbm.freeze()
+    with pytest.raises(Exception):
+        packed_dbm.delay_future()
+    with pytest.raises(Exception):
+        packed_dbm.matrix[0, 0] = BOUND_INF
+    packed_dbm_copy = packed_dbm.copy()
+    assert not packed_dbm_copy.frozen
+    packed_dbm_copy.delay_future()
+
+
+def test_dbm_intern_table(packed_dbm, packed_dbm2):
+    intern_table = DBMInternTable()
+    shared_dbm = intern_table.intern(packed_dbm)
+    assert shared_dbm is not packed_dbm
+    assert shared_dbm.frozen
+    assert intern_table.intern(packed_dbm.copy()) is shared_dbm
+    assert intern_table.intern(packed_dbm2) is not shared_dbm
+    assert packed_dbm in intern_table
+    assert len(intern_table) == 2
+    intern_table.clear()
+    assert len(intern_table) == 0
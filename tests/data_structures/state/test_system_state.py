@@ -0,0 +1,94 @@
+import pprint
+
+import pytest
+
+from uppyyl_simulator.backend.simulator.simulator import (
+    Simulator
+)
+
+pp = pprint.PrettyPrinter(indent=4, compact=True)
+printExpectedResults = False
+printActualResults = False
+
+test_model_path = "./res/tests/transition-test.xml"
+
+
+@pytest.fixture(params=[False, True], ids=["scopes", "compact"])
+def state(request):
+    with open(test_model_path) as file:
+        system_xml_str = file.read()
+    system_xml_str = system_xml_str.replace(
+        "// Place global declarations here.", "int arr[3] = {1, 2, 3};\nint i = 2;", 1)
+    simulator = Simulator(compact_variables=request.param)
+    simulator.set_system(system_xml_str)
+    return simulator.system_state
+
+
+##################################
+# Copy-on-Write SystemState Copy #
+##################################
+def test_copy_shares_components(state):
+    state_copy = state.copy()
+    assert state_copy.location_state is state.location_state
+    assert state_copy._dbm_state is state._dbm_state
+    if state.variable_layout is None:
+        assert state_copy._program_state["variable"] is state._program_state["variable"]
+
+
+def test_copy_variables_on_write(state):
+    state_copy = state.copy()
+    state_copy.activate_system_scope()
+    state_copy.get("arr")[1].assign(7)
+    state_copy.assign("i", 5)
+    system_vars, system_vars_copy = (s.get_compact_variable_state()["variable"]["system"] for s in [state, state_copy])
+    assert (system_vars["arr"], system_vars["i"]) == ([1, 2, 3], 2)
+    assert (system_vars_copy["arr"], system_vars_copy["i"]) == ([1, 7, 3], 5)
+
+    # The source state copies its shared variables on its next modification as well
+    state.activate_system_scope()
+    state.assign("i", 4)
+    assert state_copy.get_compact_variable_state()["variable"]["system"]["i"] == 5
+    assert state.get_compact_variable_state()["variable"]["system"]["i"] == 4
+
+
+def test_copy_keeps_components_on_read(state):
+    source = state.copy()
+    source.unshare_variables()
+    source_dbm = source.dbm_state  # The source state uses own components, which are only shared with its copy
+    state_copy = source.copy()
+    variable_state, location_state = source._program_state["variable"], source.location_state
+    for s in [source, state_copy]:
+        s.activate_system_scope()
+        s.peek("i")
+        s.get_discrete_state_key()
+        s.peek_dbm_state().is_empty()
+        assert s.location_state is location_state
+        assert s._dbm_state is source_dbm
+        if state.variable_layout is None:
+            assert s._program_state["variable"] is variable_state
+
+    # Once the copy uses own components, the source state modifies its components in place
+    state_copy.unshare_variables()
+    state_copy.dbm_state.reset("t1", 5)
+    source.unshare_variables()
+    assert source.dbm_state is source_dbm
+    if state.variable_layout is None:
+        assert source._program_state["variable"] is variable_state
+
+
+def test_copy_location_state_on_write(state):
+    state_copy = state.copy()
+    inst_name, loc = next(iter(state.location_state.items()))
+    other_loc = next(other_loc for other_loc in loc.parent.locations.values() if other_loc is not loc)
+    state_copy.set_location(inst_name, other_loc)
+    assert state.location_state[inst_name] is loc
+    assert state_copy.location_state[inst_name] is other_loc
+    assert state.get_discrete_state_key() != state_copy.get_discrete_state_key()
+
+
+def test_copy_dbm_state_on_access(state):
+    state_copy = state.copy()
+    original_dbm = state.dbm_state.copy()
+    state_copy.dbm_state.reset("t1", 5)
+    assert state.dbm_state == original_dbm
+    assert state_copy.dbm_state != original_dbm
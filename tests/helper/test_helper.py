@@ -0,0 +1,27 @@
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+
+from uppyyl_simulator.backend.helper.helper import make_chunks, map_bounded
+
+
+###########
+# Helpers #
+###########
+def test_make_chunks():
+    assert list(make_chunks(range(5), 2)) == [[0, 1], [2, 3], [4]]
+
+
+def test_map_bounded():
+    submitted = []
+
+    def items():
+        for i in itertools.count():
+            submitted.append(i)
+            yield i
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        results = map_bounded(executor, lambda x: x * x, items(), workers=2)
+        assert list(itertools.islice(results, 3)) == [0, 1, 4]
+        # Only a bounded number of items is submitted ahead of the consumed results
+        assert len(submitted) <= 3 + 2 * 2
+        results.close()
@@ -1,4 +1,5 @@
 import pprint
+import threading
 import unittest
 
 from uppyyl_simulator.backend.models.ta.ta import (
@@ -204,6 +205,42 @@ class TestLocationFunctions(unittest.TestCase):
         self.loc.new_invariant("t <= 10")
         self.assertEqual(self.loc.invariants[0].text, "t <= 10")
 
+    def test_deferred_invariants(self):
+        loader_paused, loader_resumed = threading.Event(), threading.Event()
+
+        def loader():
+            self.loc.new_invariant("t <= 10")  # The loader accesses the deferred attribute itself
+            loader_paused.set()
+            loader_resumed.wait()
+            self.loc.new_invariant("t >= 2")
+
+        self.loc.defer_labels(["invariants"], loader)
+        self.addCleanup(loader_resumed.set)
+        loading_thread = threading.Thread(target=lambda: self.loc.invariants)
+        loading_thread.start()
+        loader_paused.wait()
+
+        # Another thread waits for the running loader instead of reading the partially loaded invariants
+        texts = []
+        reading_thread = threading.Thread(target=lambda: texts.extend(inv.text for inv in self.loc.invariants))
+        reading_thread.start()
+        reading_thread.join(timeout=0.2)
+        self.assertTrue(reading_thread.is_alive())
+        loader_resumed.set()
+        loading_thread.join()
+        reading_thread.join()
+        self.assertEqual(texts, ["t <= 10", "t >= 2"])
+        self.assertFalse(self.loc.deferred_label_loaders)
+
+    def test_deferred_invariants_failure(self):
+        def failing_loader():
+            raise Exception("Loading failed.")
+
+        self.loc.defer_labels(["invariants"], failing_loader)
+        with self.assertRaises(Exception):
+            self.loc.invariants
+        self.assertEqual(len(self.loc.deferred_label_loaders), 1)  # The loader is retried on the next access
+
     def test_str(self):
         res = str(self.loc)
         self.assertTrue(isinstance(res, str))
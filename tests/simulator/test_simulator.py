@@ -1,9 +1,11 @@
+import os
 import pprint
+import tempfile
 import unittest
 
 from uppyyl_simulator.backend.data_structures.state.system_state import SystemState
 from uppyyl_simulator.backend.simulator.simulator import (
-    Simulator
+    Simulator, get_delay_interval, draw_delay
 )
 
 pp = pprint.PrettyPrinter(indent=4, compact=True)
@@ -11,6 +13,7 @@ printExpectedResults = False
 printActualResults = False
 
 test_model_path = "./res/tests/transition-test.xml"
+deadlock_test_model_path = "./res/tests/deadlock-test.xml"
 
 
 ##################
@@ -45,6 +48,30 @@ class TestSimulator(unittest.TestCase):
 
             seq_len = new_seq_len
 
+    def test_simulate_batch(self):
+        trace_len = len(self.uppaal_simulator.transition_trace)
+        results = list(self.uppaal_simulator.simulate_batch(n_runs=6, max_steps=10, seed=3, workers=0, chunk_size=4))
+        self.assertEqual(len(results), 6)
+        self.assertEqual(len(self.uppaal_simulator.transition_trace), trace_len)
+        for result in results:
+            self.assertEqual(len(result["locations"]), 3)
+            self.assertIn("x", result["variables"]["system"])
+            self.assertLessEqual(result["steps"], 10)
+            self.assertFalse(result["global_time"].is_empty())
+
+        # Results only depend on the seed, not on the number of worker processes
+        pool_results = list(self.uppaal_simulator.simulate_batch(n_runs=6, max_steps=10, seed=3, workers=2,
+                                                                 chunk_size=4))
+        self.assertEqual([(r["locations"], r["variables"], r["steps"], r["global_time"]) for r in pool_results],
+                         [(r["locations"], r["variables"], r["steps"], r["global_time"]) for r in results])
+
+        time_scope_results = list(self.uppaal_simulator.simulate_batch(n_runs=2, time_scope=0, max_steps=10, seed=3,
+                                                                       workers=0))
+        self.assertTrue(all(r["steps"] <= 10 for r in time_scope_results))
+
+        with self.assertRaises(TypeError):
+            self.uppaal_simulator.simulate_batch(n_runs=2)
+
     def test_set_current_state(self):
         state = SystemState()
         self.uppaal_simulator.set_current_state(state=state)
@@ -59,6 +86,309 @@ class TestSimulator(unittest.TestCase):
         valid_transitions = self.uppaal_simulator.get_transitions()
         self.assertGreaterEqual(len(valid_transitions), 0)
 
+    def test_load_system_from_file_object(self):
+        simulator = Simulator()
+        with open(test_model_path, "rb") as file:
+            simulator.load_system(system_path=file)
+        self.assertEqual(simulator.get_system_details(), self.uppaal_simulator.get_system_details())
+        simulator.simulate(max_steps=20)
+
+    def test_compute_clock_bounds(self):
+        clock_bounds = self.uppaal_simulator.compute_clock_bounds()
+        self.assertEqual(clock_bounds["lower"], {"t1": 2, "t2": 2})
+        self.assertEqual(clock_bounds["upper"], {"t1": 10, "t2": 2})
+        self.assertEqual(clock_bounds["max"], {"t1": 10, "t2": 2})
+
+    def test_simulate_with_extrapolation(self):
+        for extrapolation in ["max_bounds", "lu"]:
+            simulator = Simulator(extrapolation=extrapolation)
+            simulator.load_system(system_path=test_model_path)
+            simulator.simulate(max_steps=20)
+            self.assertIn("Extrapolate", str(simulator.get_sequence()))
+            self.assertFalse(simulator.system_state.dbm_state.is_empty())
+
+    def test_potential_transition_cache(self):
+        state = self.uppaal_simulator.system_state
+        self.assertIn(state.get_discrete_state_key(), self.uppaal_simulator.potential_transition_cache)
+        cached_transitions = self.uppaal_simulator._get_all_potential_transitions(state=state)
+        computed_transitions = self.uppaal_simulator._compute_all_potential_transitions(state=state)
+        self.assertEqual([t.triggered_edges for t in cached_transitions],
+                         [t.triggered_edges for t in computed_transitions])
+        self.assertTrue(all(t.source_state is state for t in cached_transitions))
+
+    def test_enabled_transitions_two_phase(self):
+        with open(test_model_path) as file:
+            system_xml_str = file.read()
+        system_xml_str = system_xml_str.replace("t1 &gt;= 0", "t1 &gt;= 0 &amp;&amp; t1 &lt; 0", 1)  # Never enabled
+        simulator = Simulator()
+        simulator.set_system(system_xml_str)
+
+        disabled_count = 0
+        for _ in range(30):
+            state = simulator.system_state
+            dbm_before = str(state.peek_dbm_state())
+            pot_transitions = simulator._get_all_potential_transitions(state=state)
+            enabled_transitions = simulator._get_all_enabled_transitions(state=state, all_pot_trans=pot_transitions)
+            self.assertEqual(str(state.peek_dbm_state()), dbm_before)
+            for trans in pot_transitions:
+                if trans in enabled_transitions:
+                    self.assertFalse(trans.target_state.dbm_state.is_empty())
+                else:
+                    self.assertIsNone(trans.target_state)
+                    disabled_count += 1
+            simulator.simulate_step()
+        self.assertGreater(disabled_count, 0)
+
+    def test_potential_transition_cache_size(self):
+        simulator = Simulator(transition_cache_size=2)
+        simulator.load_system(system_path=test_model_path)
+        simulator.simulate(max_steps=20)
+        self.assertLessEqual(len(simulator.potential_transition_cache), 2)
+
+        simulator = Simulator(transition_cache_size=0)
+        simulator.load_system(system_path=test_model_path)
+        simulator.simulate(max_steps=20)
+        self.assertEqual(len(simulator.potential_transition_cache), 0)
+
+    def test_compile_edge_index(self):
+        edge_index = self.uppaal_simulator.edge_index
+        self.assertEqual(set(edge_index.keys()), {"P1", "P1_2", "P2"})
+        p2_init_loc = self.uppaal_simulator.system_state.location_state["P2"]
+        p2_init_edges = edge_index["P2"][p2_init_loc.id]
+        self.assertEqual(len(p2_init_edges["no_sync"]), 2)
+        self.assertEqual(len(p2_init_edges["caller"]), 3)
+        self.assertEqual(len(p2_init_edges["listener"]), 0)
+        # Select "y : int[0,1]" yields two edge scopes
+        self.assertEqual(sorted(len(edge_scopes) for _, edge_scopes, _ in p2_init_edges["no_sync"]), [1, 2])
+        # Channels referenced by name are resolved statically
+        self.assertTrue(all(chan_obj is not None for _, _, chan_obj in p2_init_edges["caller"]))
+
+    def test_compile_system(self):
+        labels = []
+        for tmpl in self.uppaal_simulator.system.templates.values():
+            for loc in tmpl.locations.values():
+                labels.extend(loc.invariants)
+            for edge in tmpl.edges.values():
+                labels.extend(edge.clock_guards + edge.variable_guards + edge.updates + edge.resets)
+        self.assertGreater(len(labels), 0)
+        self.assertTrue(all(label.compiled is not None for label in labels))
+
+        # Compiled labels yield the same successors as evaluated label ASTs
+        self.uppaal_simulator.simulate(max_steps=10)
+        compiled_transitions = self.uppaal_simulator.get_transitions()
+        for label in labels:
+            label.compiled = None
+        evaluated_transitions = self.uppaal_simulator.get_transitions()
+        self.assertEqual(len(compiled_transitions), len(evaluated_transitions))
+        for compiled_transition, evaluated_transition in zip(compiled_transitions, evaluated_transitions):
+            compiled_state = compiled_transition.target_state
+            evaluated_state = evaluated_transition.target_state
+            self.assertEqual(compiled_state.get_discrete_state_key(), evaluated_state.get_discrete_state_key())
+            self.assertEqual(compiled_state.dbm_state, evaluated_state.dbm_state)
+
+    def test_specialize_system(self):
+        simulator = Simulator(fold_constants=True)
+        simulator.load_system(system_path=test_model_path)
+        labels = []
+        for tmpl in simulator.system.templates.values():
+            for loc in tmpl.locations.values():
+                labels.extend(loc.invariants)
+            for edge in tmpl.edges.values():
+                labels.extend(edge.clock_guards + edge.variable_guards + edge.updates + edge.resets)
+        self.assertTrue(all(len(label.instance_asts) > 0 for label in labels))
+        self.assertEqual(simulator.compute_clock_bounds(), self.uppaal_simulator.compute_clock_bounds())
+
+        # Specialized labels yield the same successors as shared labels
+        simulator.simulate(max_steps=10)
+        specialized_transitions = simulator.get_transitions()
+        for label in labels:
+            label.instance_compiled = {}
+        shared_transitions = simulator.get_transitions()
+        self.assertEqual(len(specialized_transitions), len(shared_transitions))
+        for specialized_transition, shared_transition in zip(specialized_transitions, shared_transitions):
+            specialized_state = specialized_transition.target_state
+            shared_state = shared_transition.target_state
+            self.assertEqual(specialized_state.get_discrete_state_key(), shared_state.get_discrete_state_key())
+            self.assertEqual(specialized_state.dbm_state, shared_state.dbm_state)
+
+    def test_specialize_system_bound_names(self):
+        with open(deadlock_test_model_path) as file:
+            system_xml_str = file.read()
+        system_xml_str = system_xml_str.replace("clock T_GLOBAL;", "clock T_GLOBAL;\nconst int i = 0;\n"
+                                                                   "int a[3] = {0, 0, 1};", 1)
+        system_xml_str = system_xml_str.replace("x &lt;= 5", "forall (i : int[0,2]) a[i] == 0", 1)
+        for settings in [{}, {"fold_constants": True}, {"code_generation": True}]:
+            simulator = Simulator(**settings)
+            simulator.set_system(system_xml_str)
+            self.assertEqual(len(simulator.transitions), 0)
+
+    def test_lazy_loading(self):
+        with open(deadlock_test_model_path) as file:
+            system_xml_str = file.read()
+        # The location "B" is unreachable, so that its invariant and outgoing edge are never used
+        system_xml_str = system_xml_str.replace(
+            '<init ref="id0"/>',
+            '<location id="id1" x="100" y="0"><name x="90" y="-34">B</name>'
+            '<label kind="invariant" x="90" y="17">x &lt;= 10</label></location>'
+            '<init ref="id0"/>'
+            '<transition><source ref="id1"/><target ref="id0"/>'
+            '<label kind="guard" x="40" y="17">x &gt; 3</label>'
+            '<label kind="assignment" x="40" y="34">x = 0</label></transition>', 1)
+        simulator = Simulator(lazy_loading=True)
+        simulator.set_system(system_xml_str)
+        eager_simulator = Simulator()
+        eager_simulator.set_system(system_xml_str)
+        for _ in range(3):
+            simulator.simulate_step()
+            eager_simulator.simulate_step()
+        label_parse_stats = simulator.system.label_parse_stats
+        self.assertEqual(label_parse_stats["labels"], 4)
+        self.assertLess(label_parse_stats["parsed"], label_parse_stats["labels"])
+        self.assertEqual(set(simulator.edge_index["P"].keys()), {simulator.system_state.location_state["P"].id})
+
+        # Lazily loaded labels yield the same successors as eagerly loaded labels
+        lazy_transitions = simulator.get_transitions()
+        eager_transitions = eager_simulator.get_transitions()
+        self.assertEqual(len(lazy_transitions), len(eager_transitions))
+        for lazy_transition, eager_transition in zip(lazy_transitions, eager_transitions):
+            self.assertEqual(lazy_transition.target_state.dbm_state, eager_transition.target_state.dbm_state)
+
+        with self.assertRaises(Exception):
+            Simulator(parallel_loading=True, lazy_loading=True)
+
+    def test_generate_system_code(self):
+        with tempfile.TemporaryDirectory() as code_cache_dir:
+            simulator = Simulator(code_generation=True, code_cache_dir=code_cache_dir)
+            simulator.load_system(system_path=test_model_path)
+            self.assertTrue(all(len(funcs) > 0 for funcs in simulator.generated_code.values()))
+            module_files = [file for file in os.listdir(code_cache_dir) if file.endswith(".py")]
+            self.assertEqual(len(module_files), 1)
+
+            # The cached module is reused for the same system
+            Simulator(code_generation=True, code_cache_dir=code_cache_dir).load_system(system_path=test_model_path)
+            self.assertEqual([file for file in os.listdir(code_cache_dir) if file.endswith(".py")], module_files)
+
+        # Generated code yields the same successors as compiled labels
+        simulator.simulate(max_steps=10)
+        generated_transitions = simulator.get_transitions()
+        simulator.generated_code = None
+        compiled_transitions = simulator.get_transitions()
+        self.assertEqual(len(generated_transitions), len(compiled_transitions))
+        for generated_transition, compiled_transition in zip(generated_transitions, compiled_transitions):
+            generated_state = generated_transition.target_state
+            compiled_state = compiled_transition.target_state
+            self.assertEqual(generated_state.get_discrete_state_key(), compiled_state.get_discrete_state_key())
+            self.assertEqual(generated_state.dbm_state, compiled_state.dbm_state)
+
+    def test_compact_variables(self):
+        with open(test_model_path) as file:
+            system_xml_str = file.read()
+        system_xml_str = system_xml_str.replace(
+            "// Place global declarations here.",
+            "typedef struct { int a; bool b; } S;\nint arr[3] = {1, 2, 3};\nS s = {4, true};\nint[0,5] bi = 2;", 1)
+        simulator = Simulator()
+        simulator.set_system(system_xml_str)
+        compact_simulator = Simulator(compact_variables=True)
+        compact_simulator.set_system(system_xml_str)
+
+        state = compact_simulator.system_state
+        self.assertIsNotNone(state.variable_layout)
+        self.assertEqual(len(state.variable_buffer), state.variable_layout.slot_count)
+        self.assertEqual(state.get_compact_variable_state(), simulator.system_state.get_compact_variable_state())
+
+        state_copy = state.copy()
+        state_copy.activate_system_scope()
+        state_copy.get("arr")[1].assign(7)
+        state_copy.get("s")["b"].assign(False)
+        state_copy.assign("bi", 5)
+        with self.assertRaises(Exception):
+            state_copy.assign("bi", 6)
+        self.assertEqual(state.get_compact_variable_state()["variable"]["system"]["arr"], [1, 2, 3])
+        self.assertEqual(state_copy.get_compact_variable_state()["variable"]["system"]["arr"], [1, 7, 3])
+        self.assertEqual(state_copy.get_compact_variable_state()["variable"]["system"]["s"], {"a": 4, "b": False})
+        self.assertEqual(state_copy.get_compact_variable_state()["variable"]["system"]["bi"], 5)
+        self.assertNotEqual(state.get_discrete_state_key(), state_copy.get_discrete_state_key())
+        self.assertEqual(state.get_discrete_state_key(), state.copy().get_discrete_state_key())
+
+        compact_simulator.simulate(max_steps=20)
+        self.assertFalse(compact_simulator.system_state.dbm_state.is_empty())
+
+    def test_sample_concrete_step(self):
+        state = self.uppaal_simulator.generate_initial_concrete_state()
+        self.assertTrue(all(val == 0 for val in state.clock_valuation.values()))
+        for _ in range(20):
+            delay, transition = self.uppaal_simulator.sample_concrete_step(state)
+            if transition is None:
+                break
+            self.assertGreaterEqual(delay, 0)
+            state = transition.target_state
+            self.assertIsNotNone(state.clock_valuation)
+
+    def test_concrete_semantics(self):
+        simulator = Simulator(semantics="concrete")
+        simulator.load_system(system_path=test_model_path)
+        self.assertIsNotNone(simulator.system_state.clock_valuation)
+        self.assertLessEqual(len(simulator.transitions), 1)
+
+        simulator.simulate(max_steps=20)
+        global_time = 0
+        for transition in simulator.transition_trace[1:]:
+            self.assertGreaterEqual(transition.delay, 0)
+            global_time += transition.delay
+        self.assertAlmostEqual(simulator.get_global_time_interval(simulator.system_state).lower_val, global_time)
+
+        res = simulator.simulate_run(max_steps=20)
+        self.assertEqual(res["global_time"].lower_val, res["global_time"].upper_val)
+        results = list(simulator.simulate_batch(n_runs=4, max_steps=20, seed=0, workers=0))
+        self.assertEqual(results, list(simulator.simulate_batch(n_runs=4, max_steps=20, seed=0, workers=0)))
+
+        simulator.revert_to_state_by_index(2)
+        self.assertEqual(len(simulator.transition_trace), 3)
+        self.assertIs(simulator.transitions, simulator.system_state.transitions)
+
+        with self.assertRaises(Exception):
+            Simulator(semantics="unknown")
+
+    def test_get_delay_interval(self):
+        clock_valuation = {"x": 2, "y": 5}
+        interval = get_delay_interval([{"clock1": "x", "clock2": "T0_REF", "rel": ">=", "val": 4},
+                                       {"clock1": "y", "clock2": "T0_REF", "rel": "<", "val": 10}], clock_valuation)
+        self.assertEqual((interval.lower_incl, interval.lower_val, interval.upper_val, interval.upper_incl),
+                         (True, 2, 5, False))
+        interval = get_delay_interval([{"clock1": "T0_REF", "clock2": "x", "rel": "<", "val": -3}], clock_valuation)
+        self.assertEqual((interval.lower_incl, interval.lower_val, interval.upper_val, interval.upper_incl),
+                         (False, 1, float("inf"), False))
+        self.assertIsNone(get_delay_interval([{"clock1": "x", "clock2": "y", "rel": ">", "val": 0}], clock_valuation))
+        self.assertIsNone(get_delay_interval([{"clock1": "x", "clock2": "T0_REF", "rel": "<=", "val": 1}],
+                                             clock_valuation))
+
+    def test_get_settings(self):
+        simulator = Simulator(extrapolation="lu", semantics="concrete", fold_constants=False)
+        self.assertEqual(Simulator(**simulator.get_settings()).get_settings(), simulator.get_settings())
+
+    def test_draw_delay(self):
+        # Guards "x <= 1" and "x > 5" under the invariant "x <= 10" leave a gap, and the bound at 5 is strict
+        clock_valuation = {"x": 0}
+        inv_interval = get_delay_interval([{"clock1": "x", "clock2": "T0_REF", "rel": "<=", "val": 10}],
+                                          clock_valuation)
+        intervals = [get_delay_interval([{"clock1": "x", "clock2": "T0_REF", "rel": rel, "val": val}],
+                                        clock_valuation, interval=inv_interval) for rel, val in (("<=", 1), (">", 5))]
+        delays = [draw_delay(intervals) for _ in range(2000)]
+        self.assertTrue(all(0 <= delay <= 1 or 5 < delay <= 10 for delay in delays))
+        self.assertAlmostEqual(sum(delay <= 1 for delay in delays) / len(delays), 1 / 6, delta=0.05)
+
+        point_intervals = [get_delay_interval([{"clock1": "x", "clock2": "T0_REF", "rel": "==", "val": val}],
+                                              clock_valuation) for val in (2, 4)]
+        self.assertEqual({draw_delay(point_intervals) for _ in range(100)}, {2, 4})
+
+        unbounded_interval = get_delay_interval([{"clock1": "x", "clock2": "T0_REF", "rel": ">", "val": 3}],
+                                                clock_valuation)
+        self.assertTrue(all(draw_delay([unbounded_interval]) > 3 for _ in range(100)))
+
+    def test_unsupported_extrapolation(self):
+        with self.assertRaises(Exception):
+            Simulator(extrapolation="unknown")
+
 
 if __name__ == '__main__':
     unittest.main()
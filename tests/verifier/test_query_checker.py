@@ -0,0 +1,103 @@
+import pprint
+import unittest
+
+from uppyyl_simulator.backend.data_structures.dbm.dbm import DBM, DBMConstraint, Interval, PackedDBM
+from uppyyl_simulator.backend.simulator.simulator import Simulator
+from uppyyl_simulator.backend.verifier.query_checker import (
+    QueryChecker, subtract_zone
+)
+from uppyyl_simulator.backend.verifier.verifier import Verifier
+
+pp = pprint.PrettyPrinter(indent=4, compact=True)
+printExpectedResults = False
+printActualResults = False
+
+test_model_path = "./res/tests/uppaal_xml_testmodel.xml"
+deadlock_test_model_path = "./res/tests/deadlock-test.xml"
+
+
+######################
+# Test Query Checker #
+######################
+class TestQueryChecker(unittest.TestCase):
+    def setUp(self):
+        self.query_checker = QueryChecker()
+        self.query_checker.load_system(system_path=test_model_path)
+        print("")
+
+    def tearDown(self):
+        print("")
+
+    def test_check_query_exists_finally(self):
+        res = self.query_checker.check_query("E<> A1.Deadlock and A2.Deadlock")
+        self.assertTrue(res["satisfied"])
+        self.assertEqual(len(res["trace"]), 3)
+
+        res = self.query_checker.check_query("E<> A1.Unreach_Guard")
+        self.assertFalse(res["satisfied"])
+        self.assertIsNone(res["trace"])
+
+    def test_check_query_all_globally(self):
+        res = self.query_checker.check_query("A[] not (A1.Deadlock and A2.Deadlock)")
+        self.assertFalse(res["satisfied"])
+        self.assertEqual(len(res["trace"]), 3)
+
+        res = self.query_checker.check_query("A[] not A1.Unreach_Reset")
+        self.assertTrue(res["satisfied"])
+
+    def test_check_query_early_termination(self):
+        res = self.query_checker.check_query("E<> A1.L1 and t >= 2")
+        self.assertTrue(res["satisfied"])
+        self.assertEqual(res["stats"]["explored"], 1)
+
+    def test_check_query_clock_constraints(self):
+        self.assertTrue(self.query_checker.check_query("E<> t > 2")["satisfied"])
+        self.assertFalse(self.query_checker.check_query("A[] t <= 2")["satisfied"])
+        self.assertTrue(self.query_checker.check_query("A[] B1.w == B2.w")["satisfied"])
+        self.assertFalse(self.query_checker.check_query("E<> B1.w != B2.w")["satisfied"])
+        self.assertTrue(self.query_checker.check_query("E<> B1.w > 100 or A1.Unreach_Guard")["satisfied"])
+
+    def test_check_query_deadlock(self):
+        self.assertTrue(self.query_checker.check_query("E<> deadlock")["satisfied"])
+        self.assertFalse(self.query_checker.check_query("A[] not deadlock")["satisfied"])
+
+    def test_check_query_partial_deadlock(self):
+        # The self-loop of P.A is only enabled for P.x <= 5, so that all states with P.x > 5 are deadlocked
+        for dbm_class in [DBM, PackedDBM]:
+            query_checker = QueryChecker(verifier=Verifier(simulator=Simulator(dbm_class=dbm_class)))
+            query_checker.load_system(system_path=deadlock_test_model_path)
+            self.assertTrue(query_checker.check_query("E<> deadlock")["satisfied"])
+            self.assertFalse(query_checker.check_query("A[] not deadlock")["satisfied"])
+            self.assertFalse(query_checker.check_query("E<> deadlock and P.x <= 5")["satisfied"])
+            self.assertTrue(query_checker.check_query("E<> not deadlock and P.x <= 5")["satisfied"])
+            self.assertFalse(query_checker.check_query("E<> not deadlock and P.x > 5")["satisfied"])
+
+    def test_subtract_zone(self):
+        dbm = DBM(clocks=["x"])
+        dbm.conjugate_and_close(DBMConstraint("x >= 0"))
+        dbm.conjugate_and_close(DBMConstraint("x <= 10"))
+        other = DBM(clocks=["x"])
+        other.conjugate_and_close(DBMConstraint("x >= 2"))
+        other.conjugate_and_close(DBMConstraint("x <= 5"))
+        intervals = [str(zone.get_interval("x")) for zone in subtract_zone(dbm, other)]
+        self.assertEqual(sorted(intervals), sorted([str(Interval(True, 0, 2, False)),
+                                                    str(Interval(False, 5, 10, True))]))
+        self.assertEqual(subtract_zone(other, dbm), [])
+
+    def test_check_query_unsupported(self):
+        with self.assertRaises(Exception):
+            self.query_checker.check_query("A<> A1.L1")
+
+    def test_check_queries(self):
+        results = self.query_checker.check_queries()
+        self.assertEqual(len(results), 7)
+        # The model queries refer to instances not contained in the model, or use unsupported query types
+        for res in results[:-1]:
+            self.assertIsNone(res["satisfied"])
+            self.assertIn("error", res)
+        self.assertEqual(results[-1]["query"].formula.text.strip(), "A[] not deadlock")
+        self.assertFalse(results[-1]["satisfied"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+import pprint
+import unittest
+
+from uppyyl_simulator.backend.verifier.smc_checker import (
+    SMCChecker
+)
+
+pp = pprint.PrettyPrinter(indent=4, compact=True)
+printExpectedResults = False
+printActualResults = False
+
+test_model_path = "./res/tests/smc-test.xml"
+
+
+####################
+# Test SMC Checker #
+####################
+class TestSMCChecker(unittest.TestCase):
+    def setUp(self):
+        self.smc_checker = SMCChecker(workers=0, seed=0)
+        self.smc_checker.load_system(system_path=test_model_path)
+        print("")
+
+    def tearDown(self):
+        print("")
+
+    def test_estimate_probability(self):
+        # The delay in P.A is uniformly distributed in [4, 10]
+        res = self.smc_checker.check_query("Pr[<=7](<> P.B)")
+        self.assertEqual(res["runs"], 738)
+        self.assertAlmostEqual(res["probability"], 1 / 2, delta=0.05)
+        self.assertLessEqual(res["interval"][0], res["probability"])
+        self.assertGreaterEqual(res["interval"][1], res["probability"])
+
+        res = self.smc_checker.check_query("Pr[<=7]([] P.A)")
+        self.assertAlmostEqual(res["probability"], 1 / 2, delta=0.05)
+
+    def test_estimate_probability_continuous(self):
+        # Clock constraints are also checked during delays, i.e., P.x > 5 holds for each run of at least 5 time units
+        res = self.smc_checker.check_query("Pr[<=7](<> P.A && P.x > 5)")
+        self.assertAlmostEqual(res["probability"], 5 / 6, delta=0.05)
+
+    def test_estimate_probability_bounds(self):
+        self.assertEqual(self.smc_checker.check_query("Pr[#<=1](<> P.B)")["probability"], 1)
+        self.assertEqual(self.smc_checker.check_query("Pr[#<=0](<> P.B)")["probability"], 0)
+        self.assertEqual(self.smc_checker.check_query("Pr[T_GLOBAL<=3](<> P.B)")["probability"], 0)
+        with self.assertRaises(Exception):
+            self.smc_checker.check_query("Pr[n<=3](<> P.B)")
+
+    def test_test_hypothesis(self):
+        res = self.smc_checker.check_query("Pr[<=7](<> P.B) >= 0.3")
+        self.assertTrue(res["satisfied"])
+        self.assertLess(res["runs"], 738)
+
+        self.assertFalse(self.smc_checker.check_query("Pr[<=5](<> P.B) >= 0.3")["satisfied"])
+        self.assertTrue(self.smc_checker.check_query("Pr[<=5](<> P.B) <= 0.3")["satisfied"])
+
+    def test_compare_probabilities(self):
+        self.assertTrue(self.smc_checker.check_query("Pr[<=9](<> P.B) >= Pr[<=5](<> P.B)")["satisfied"])
+        self.assertFalse(self.smc_checker.check_query("Pr[<=9](<> P.B) <= Pr[<=5](<> P.B)")["satisfied"])
+
+    def test_compare_probabilities_inconclusive(self):
+        # Identical properties never yield discordant run pairs, so the test stops after the maximum number of runs
+        smc_checker = SMCChecker(workers=0, seed=1, max_runs=200)
+        smc_checker.load_system(system_path=test_model_path)
+        res = smc_checker.check_query("Pr[<=10](<> true) >= Pr[<=10](<> true)")
+        self.assertIsNone(res["satisfied"])
+        self.assertEqual(res["runs"], 200)
+
+    def test_estimate_value(self):
+        res = self.smc_checker.check_query("E[<=7; 100](max: n)")
+        self.assertEqual(res["runs"], 100)
+        self.assertAlmostEqual(res["value"], 1 / 2, delta=0.15)
+
+        res = self.smc_checker.check_query("E[<=7; 50](max: P.x)")
+        self.assertEqual(res["value"], 7)
+
+    def test_simulate(self):
+        res = self.smc_checker.check_query("simulate 3 [<=7] {n, P.x}")
+        self.assertEqual(len(res["trajectories"]), 3)
+        for trajectory in res["trajectories"]:
+            self.assertEqual(trajectory[0], (0, [0, 0]))
+            self.assertEqual(trajectory[-1][0], 7)
+
+        res = self.smc_checker.check_query("simulate 10 [<=10] {n} : 2 : (P.B)")
+        self.assertEqual(len(res["trajectories"]), 2)
+        for trajectory in res["trajectories"]:
+            self.assertEqual(trajectory[-1][1], [1])
+
+    def test_check_queries(self):
+        results = self.smc_checker.check_queries()
+        self.assertEqual(len(results), 5)
+        self.assertTrue(results[1]["satisfied"])
+        self.assertTrue(results[2]["satisfied"])
+
+    def test_check_query_unsupported(self):
+        with self.assertRaises(Exception):
+            self.smc_checker.check_query("E<> P.B")
+
+    def test_worker_processes(self):
+        in_process_res = self.smc_checker.check_query("Pr[<=7](<> P.B) >= 0.3")
+        self.smc_checker.workers = 2
+        pool_res = self.smc_checker.check_query("Pr[<=7](<> P.B) >= 0.3")
+        self.assertEqual(pool_res["satisfied"], in_process_res["satisfied"])
+        self.assertEqual(pool_res["runs"], in_process_res["runs"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import pprint
+import unittest
+
+from uppyyl_simulator.backend.simulator.simulator import Simulator
+from uppyyl_simulator.backend.verifier.verifier import (
+    Verifier
+)
+
+pp = pprint.PrettyPrinter(indent=4, compact=True)
+printExpectedResults = False
+printActualResults = False
+
+test_model_path = "./res/tests/uppaal_xml_testmodel.xml"
+
+
+def both_deadlocked(state):
+    return all(state.location_state[inst_name].name == "Deadlock" for inst_name in ["A1", "A2"])
+
+
+#################
+# Test Verifier #
+#################
+class TestVerifier(unittest.TestCase):
+    def setUp(self):
+        self.verifier = Verifier()
+        self.verifier.load_system(system_path=test_model_path)
+        print("")
+
+    def tearDown(self):
+        print("")
+
+    def test_explore(self):
+        res = self.verifier.explore()
+        self.assertTrue(res["complete"])
+        self.assertFalse(res["reachable"])
+        self.assertEqual(res["stats"]["explored"], 4)
+        self.assertEqual(res["stats"]["stored"], 4)
+
+    def test_explore_compact_variables(self):
+        verifier = Verifier(simulator=Simulator(extrapolation="max_bounds", compact_variables=True))
+        verifier.load_system(system_path=test_model_path)
+        res = verifier.explore()
+        self.assertTrue(res["complete"])
+        self.assertEqual(res["stats"]["explored"], 4)
+        self.assertEqual(res["stats"]["stored"], 4)
+        res = verifier.check_reachability(predicate=both_deadlocked)
+        self.assertTrue(res["reachable"])
+
+    def test_check_reachability_reachable(self):
+        for search_order in ["bfs", "dfs"]:
+            self.verifier.search_order = search_order
+            res = self.verifier.check_reachability(predicate=both_deadlocked)
+            self.assertTrue(res["reachable"])
+            self.assertEqual(len(res["trace"]), 3)
+            self.assertIsNone(res["trace"][0].source_state)
+            self.assertTrue(both_deadlocked(res["trace"][-1].target_state))
+
+    def test_check_reachability_unreachable(self):
+        res = self.verifier.check_reachability(predicate=lambda state: False)
+        self.assertFalse(res["reachable"])
+        self.assertIsNone(res["trace"])
+
+    def test_check_reachability_max_states(self):
+        res = self.verifier.check_reachability(predicate=lambda state: False, max_states=2)
+        self.assertFalse(res["complete"])
+        self.assertEqual(res["stats"]["explored"], 2)
+
+    def test_track_memory(self):
+        res = self.verifier.explore(track_memory=True)
+        self.assertGreater(res["stats"]["peak_memory"], 0)
+
+    def test_unsupported_search_order(self):
+        with self.assertRaises(Exception):
+            Verifier(search_order="unknown")
+
+
+if __name__ == '__main__':
+    unittest.main()
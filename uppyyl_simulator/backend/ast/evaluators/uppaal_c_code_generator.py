@@ -0,0 +1,446 @@
+"""The implementation of a generator which turns Uppaal C expression ASTs into Python source code."""
+
+import hashlib
+import importlib.util
+import os
+import sys
+
+from uppyyl_simulator.backend.ast.evaluators.uppaal_c_evaluator import get_assign_target_name
+from uppyyl_simulator.backend.data_structures.state.variable import UppaalVariable
+from uppyyl_simulator.backend.data_structures.types.bool import UppaalBool
+from uppyyl_simulator.backend.data_structures.types.function import UppaalFunction
+from uppyyl_simulator.backend.data_structures.types.int import UppaalInt
+from uppyyl_simulator.backend.data_structures.types.reference import UppaalReference
+
+CODE_GENERATOR_VERSION = 1
+
+GENERATED_MODULE_HEADER = (
+    f'"""Generated code of a Uppaal system (code generator version {CODE_GENERATOR_VERSION})."""\n'
+    f'from uppyyl_simulator.backend.ast.evaluators.uppaal_c_code_generator import (\n'
+    f'    UppaalBool, UppaalInt, assign, in_place_op, post_incr_decr, pre_incr_decr\n'
+    f')\n'
+)
+
+
+##################################
+# Generated Code Runtime Helpers #
+##################################
+def assign(var, val):
+    """Evaluates "var = val" (see UppaalCEvaluator)."""
+    var.assign(val)
+    return var.val
+
+
+def in_place_op(op, var, val):
+    """Evaluates "var (op)= val" (see UppaalCEvaluator)."""
+    var = in_place_ops[op](var, val)
+    return var.val
+
+
+def post_incr_decr(op, var):
+    """Evaluates "var++" and "var--" (see UppaalCEvaluator)."""
+    ret = var.val.copy()
+    in_place_ops[op](var, 1)
+    return ret
+
+
+def pre_incr_decr(op, var):
+    """Evaluates "++var" and "--var" (see UppaalCEvaluator)."""
+    var = in_place_ops[op](var, 1)
+    return var.val
+
+
+def _iadd(var, val):
+    var += val
+    return var
+
+
+def _isub(var, val):
+    var -= val
+    return var
+
+
+def _imul(var, val):
+    var *= val
+    return var
+
+
+def _itruediv(var, val):
+    var /= val
+    return var
+
+
+def _imod(var, val):
+    var %= val
+    return var
+
+
+def _ilshift(var, val):
+    var <<= val
+    return var
+
+
+def _irshift(var, val):
+    var >>= val
+    return var
+
+
+def _iand(var, val):
+    var &= val
+    return var
+
+
+def _ior(var, val):
+    var |= val
+    return var
+
+
+def _ixor(var, val):
+    var ^= val
+    return var
+
+
+in_place_ops = {
+    "+": _iadd, "-": _isub, "*": _imul, "/": _itruediv, "%": _imod,
+    "<<": _ilshift, ">>": _irshift, "&": _iand, "|": _ior, "^": _ixor,
+}
+
+
+##################
+# Scope Resolver #
+##################
+class ScopeResolver:
+    """A resolver which maps variable names to fixed scope accesses, based on the scopes of a given system state.
+
+    Names are resolved in the same order as in "SystemState.get" for an active instance scope, i.e., local (edge)
+    scope, constant and variable instance scope, and constant and variable system scope.
+    """
+
+    def __init__(self, state, inst_name, local_names=None):
+        """Initializes ScopeResolver.
+
+        Args:
+            state: The system state whose scopes are used for name resolution.
+            inst_name: The name of the active instance.
+            local_names: The names of the variables in the local (edge) scope.
+        """
+        program_state = state.peek_program_state()
+        self.inst_name = inst_name
+        self.local_names = set(local_names) if local_names else set()
+        self.scopes = [
+            ("const_inst_scope", f'ps["constant"]["instances"][{inst_name!r}]',
+             program_state["constant"]["instances"][inst_name]),
+            ("var_inst_scope", f'ps["variable"]["instances"][{inst_name!r}]',
+             program_state["variable"]["instances"][inst_name]),
+            ("const_sys_scope", 'ps["constant"]["system"]', program_state["constant"]["system"]),
+            ("var_sys_scope", 'ps["variable"]["system"]', program_state["variable"]["system"]),
+        ]
+        self.used_scopes = set()
+        self.modifies_variables = False
+
+    def add_assign_target(self, target_ast):
+        """Registers the target of an assignment, so that the generated function unshares the variable scopes of the
+        state before binding them, unless only local variables are modified (see SystemState.unshare_variables_for).
+
+        Args:
+            target_ast: The target expression AST (or None for function calls, which may modify any variable).
+        """
+        if target_ast is None or get_assign_target_name(target_ast) not in self.local_names:
+            self.modifies_variables = True
+
+    def resolve(self, name):
+        """Resolves a variable name.
+
+        Args:
+            name: The variable name.
+
+        Returns:
+            The Python source code of the scope access, and the resolved object.
+        """
+        if name in self.local_names:
+            self.used_scopes.add("local_scope")
+            return f'local_scope[{name!r}]', None
+        for scope_var, _, scope in self.scopes:
+            if name in scope:
+                self.used_scopes.add(scope_var)
+                return f'{scope_var}[{name!r}]', scope[name]
+        raise Exception(f'Name "{name}" cannot be resolved statically.')
+
+    def get_scope_source_lines(self, indent="    "):
+        """Gets the source code lines which bind all used scopes to local variables of a generated function.
+
+        Args:
+            indent: The indentation of each line.
+
+        Returns:
+            The list of source code lines.
+        """
+        if self.modifies_variables:
+            lines = [f'{indent}ps = state.program_state']
+        else:
+            lines = [f'{indent}ps = state.peek_program_state()']
+        if "local_scope" in self.used_scopes:
+            lines.append(f'{indent}local_scope = ps["local"][-1][1]')
+        for scope_var, scope_source, _ in self.scopes:
+            if scope_var in self.used_scopes:
+                lines.append(f'{indent}{scope_var} = {scope_source}')
+        return lines
+
+
+###########################
+# Uppaal C Code Generator #
+###########################
+class UppaalCCodeGenerator:
+    """The Uppaal C code generator class.
+
+    An expression AST is translated into the source code of a Python expression with the same semantics as
+    "UppaalCEvaluator.eval_ast", where all variable accesses are resolved to fixed scope keys via a ScopeResolver.
+    Unsupported AST types raise an exception, so that the caller can fall back to evaluation or compiled closures.
+    """
+
+    def generate_expr(self, ast, resolver):
+        """Generates the Python source code of an expression AST.
+
+        Args:
+            ast: The expression AST.
+            resolver: The resolver for variable names.
+
+        Returns:
+            The Python expression source code.
+        """
+        ast_type = ast["astType"]
+        if ast_type not in generate_funcs:
+            raise Exception(f'AST type "{ast_type}" not supported by UppaalCCodeGenerator.')
+        return generate_funcs[ast_type](self, ast, resolver)
+
+    def generate_clock_name(self, ast, resolver):
+        """Generates the Python source code of the name of a clock expression AST.
+
+        Clocks are constants, so the name of a clock referenced directly by its variable name is inlined.
+
+        Args:
+            ast: The clock expression AST.
+            resolver: The resolver for variable names.
+
+        Returns:
+            The Python expression source code.
+        """
+        if ast["astType"] == "Variable":
+            source, obj = resolver.resolve(ast["name"])
+            if (source.startswith("const_") and isinstance(obj, UppaalVariable)
+                    and not isinstance(obj.val, UppaalReference)):
+                return repr(obj.name)
+        return f'{self.generate_expr(ast, resolver)}.name'
+
+    @staticmethod
+    def generate_function(func_name, body_lines, resolver):
+        """Generates the Python source code of a function "func_name(state)".
+
+        Args:
+            func_name: The function name.
+            body_lines: The (unindented) source code lines of the function body.
+            resolver: The resolver which was used to generate the body.
+
+        Returns:
+            The Python function source code.
+        """
+        lines = [f'def {func_name}(state):']
+        lines.extend(resolver.get_scope_source_lines())
+        lines.extend(f'    {line}' for line in body_lines)
+        return "\n".join(lines) + "\n"
+
+
+def variable(_generator, ast, resolver):
+    """Generates a variable access."""
+    source, obj = resolver.resolve(ast["name"])
+    if obj is None or isinstance(obj, UppaalFunction):
+        return source
+    if not isinstance(obj, UppaalVariable):
+        raise Exception(f'Name "{ast["name"]}" does not refer to a variable.')
+    if isinstance(obj.val, UppaalReference):
+        return f'{source}.val.pointee'
+    return source
+
+
+def integer(_generator, ast, _resolver):
+    """Generates an integer value."""
+    return f'UppaalInt({int(ast["val"])!r})'
+
+
+def boolean(_generator, ast, _resolver):
+    """Generates a boolean value."""
+    return f'UppaalBool({bool(ast["val"])!r})'
+
+
+def bracket_expr(generator, ast, resolver):
+    """Generates expression "(expr)"."""
+    return generator.generate_expr(ast["expr"], resolver)
+
+
+def unary_expr(generator, ast, resolver):
+    """Generates a unary expression."""
+    expr = generator.generate_expr(ast["expr"], resolver)
+    op = ast["op"]
+    if op == "Plus":
+        return f'(+{expr})'
+    if op == "Minus":
+        return f'(-{expr})'
+    if op == "LogNot":
+        return f'UppaalBool(not {expr})'
+    raise Exception(f'Unary operator "{op}" not supported by UppaalCCodeGenerator.')
+
+
+def binary_expr(generator, ast, resolver):
+    """Generates a binary expression."""
+    op = ast["op"]
+    left = generator.generate_expr(ast["left"], resolver)
+    if op == "Dot":
+        return f'{left}[{ast["right"]["name"]!r}]'
+    right = generator.generate_expr(ast["right"], resolver)
+    if op == "ArrayAccess":
+        return f'{left}[int({right})]'
+    if op in binary_ops:
+        return f'({left} {binary_ops[op]} {right})'
+    if op in comparison_ops:
+        return f'UppaalBool({left} {comparison_ops[op]} {right})'
+    if op == "LogAnd":
+        return f'UppaalBool({left} and {right})'
+    if op == "LogOr":
+        return f'UppaalBool({left} or {right})'
+    if op == "LogImply":
+        return f'UppaalBool({right} or not {left})'
+    if op == "Minimum":
+        return f'min({left}, {right})'
+    if op == "Maximum":
+        return f'max({left}, {right})'
+    raise Exception(f'Binary operator "{op}" not supported by UppaalCCodeGenerator.')
+
+
+def ternary_expr(generator, ast, resolver):
+    """Generates a ternary expression."""
+    cond = generator.generate_expr(ast["left"], resolver)
+    then_expr = generator.generate_expr(ast["middle"], resolver)
+    else_expr = generator.generate_expr(ast["right"], resolver)
+    return f'({then_expr} if {cond} else {else_expr})'
+
+
+def assign_expr(generator, ast, resolver):
+    """Generates expression "var (op)= expr"."""
+    resolver.add_assign_target(ast["left"])
+    left = generator.generate_expr(ast["left"], resolver)
+    right = generator.generate_expr(ast["right"], resolver)
+    op = ast["op"]
+    if op == "Assign":
+        return f'assign({left}, {right})'
+    if op in assign_ops:
+        return f'in_place_op({assign_ops[op]!r}, {left}, {right})'
+    raise Exception(f'Assignment operator "{op}" not supported by UppaalCCodeGenerator.')
+
+
+def post_incr_assign_expr(generator, ast, resolver):
+    """Generates expression "expr++"."""
+    resolver.add_assign_target(ast["expr"])
+    return f'post_incr_decr("+", {generator.generate_expr(ast["expr"], resolver)})'
+
+
+def post_decr_assign_expr(generator, ast, resolver):
+    """Generates expression "expr--"."""
+    resolver.add_assign_target(ast["expr"])
+    return f'post_incr_decr("-", {generator.generate_expr(ast["expr"], resolver)})'
+
+
+def pre_incr_assign_expr(generator, ast, resolver):
+    """Generates expression "++expr"."""
+    resolver.add_assign_target(ast["expr"])
+    return f'pre_incr_decr("+", {generator.generate_expr(ast["expr"], resolver)})'
+
+
+def pre_decr_assign_expr(generator, ast, resolver):
+    """Generates expression "--expr"."""
+    resolver.add_assign_target(ast["expr"])
+    return f'pre_incr_decr("-", {generator.generate_expr(ast["expr"], resolver)})'
+
+
+def func_call_expr(generator, ast, resolver):
+    """Generates expression "func(args)"."""
+    resolver.add_assign_target(None)
+    func_source, _ = resolver.resolve(ast["funcName"])
+    args = [generator.generate_expr(arg, resolver) for arg in ast["args"]]
+    return f'{func_source}(arg_asts=[{", ".join(args)}], state=state)'
+
+
+################################
+# Function Lookup Dictionaries #
+################################
+
+binary_ops = {
+    "Add": "+", "Sub": "-", "Mult": "*", "Div": "/", "Mod": "%", "LShift": "<<", "RShift": ">>",
+    "BitAnd": "&", "BitOr": "|", "BitXor": "^",
+}
+
+comparison_ops = {
+    "GreaterEqual": ">=", "GreaterThan": ">", "LessEqual": "<=", "LessThan": "<", "Equal": "==", "NotEqual": "!=",
+}
+
+assign_ops = {
+    "AddAssign": "+", "SubAssign": "-", "MultAssign": "*", "DivAssign": "/", "ModAssign": "%",
+    "LShiftAssign": "<<", "RShiftAssign": ">>", "BitAndAssign": "&", "BitOrAssign": "|", "BitXorAssign": "^",
+}
+
+generate_funcs = {
+    "Variable": variable,
+    "Integer": integer,
+    "Boolean": boolean,
+
+    "BracketExpr": bracket_expr,
+    "PostIncrAssignExpr": post_incr_assign_expr,
+    "PostDecrAssignExpr": post_decr_assign_expr,
+    "PreIncrAssignExpr": pre_incr_assign_expr,
+    "PreDecrAssignExpr": pre_decr_assign_expr,
+    "AssignExpr": assign_expr,
+    "FuncCallExpr": func_call_expr,
+
+    "UnaryExpr": unary_expr,
+    "BinaryExpr": binary_expr,
+    "TernaryExpr": ternary_expr,
+}
+
+
+###################
+# Module Handling #
+###################
+def load_generated_module(source, cache_dir=None):
+    """Loads a generated module from source code.
+
+    If a cache directory is given, the source is stored there under a name derived from its hash, and imported as
+    regular module, so that its bytecode is cached (in "__pycache__") and reused on the next start.
+
+    Args:
+        source: The module source code.
+        cache_dir: An optional directory in which the module is cached.
+
+    Returns:
+        The namespace dict of the loaded module.
+    """
+    if cache_dir is None:
+        namespace = {}
+        exec(compile(source, "<uppyyl-generated>", "exec"), namespace)
+        return namespace
+
+    source_hash = hashlib.sha256(source.encode("utf-8")).hexdigest()[:24]
+    module_name = f'uppyyl_generated_{source_hash}'
+    module_path = os.path.join(cache_dir, f'{module_name}.py')
+    if not os.path.isfile(module_path):
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_module_path = f'{module_path}.{os.getpid()}.tmp'
+        with open(tmp_module_path, "w") as file:
+            file.write(source)
+        os.replace(tmp_module_path, module_path)
+
+    if module_name in sys.modules:
+        return vars(sys.modules[module_name])
+    spec = importlib.util.spec_from_file_location(module_name, module_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    sys.modules[module_name] = module
+    return vars(module)
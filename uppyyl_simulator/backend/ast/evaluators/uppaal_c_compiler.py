@@ -0,0 +1,590 @@
+"""The implementation of a compiler which turns Uppaal C code ASTs into Python closures."""
+
+import operator
+
+from uppyyl_simulator.backend.ast.evaluators.uppaal_c_evaluator import UppaalCEvaluator, get_assign_target_name
+from uppyyl_simulator.backend.data_structures.state.variable import UppaalVariable
+from uppyyl_simulator.backend.data_structures.types.bool import UppaalBool
+from uppyyl_simulator.backend.data_structures.types.function import UppaalFunction
+from uppyyl_simulator.backend.data_structures.types.int import UppaalInt
+from uppyyl_simulator.backend.data_structures.types.reference import UppaalReference
+
+
+#####################
+# Uppaal C Compiler #
+#####################
+class UppaalCCompiler:
+    """The Uppaal C code compiler class.
+
+    An AST is compiled once into a nested Python closure "func(state)", which returns the same result as
+    "UppaalCEvaluator.eval_ast(ast, state)", but without dispatching on the AST type of each node on every evaluation.
+    AST types without a dedicated compile function (e.g., declarations) are delegated to the evaluator.
+    """
+
+    def __init__(self, evaluator=None):
+        """Initializes UppaalCCompiler.
+
+        Args:
+            evaluator: The evaluator used for AST types without dedicated compile function (a new one by default).
+        """
+        self.evaluator = evaluator if evaluator else UppaalCEvaluator(do_log_details=False)
+
+    def compile_ast(self, ast):
+        """Compiles an AST into a closure.
+
+        Args:
+            ast: The AST that is compiled.
+
+        Returns:
+            The closure "func(state)" which evaluates the AST in the context of a given system state.
+        """
+        if ast is None:
+            def undefined_func(_state):
+                raise Exception("AST and state need to be defined.")
+            return undefined_func
+
+        if isinstance(ast, list):
+            elem_funcs = [self.compile_ast(elem) for elem in ast]
+
+            def list_func(state):
+                for elem_func in elem_funcs:
+                    elem_func(state)
+            return list_func
+        assert isinstance(ast, dict)
+
+        if ast["astType"] in compile_funcs:
+            return compile_funcs[ast["astType"]](self, ast)
+        return self._compile_fallback(ast)
+
+    def compile_function(self, func_obj):
+        """Compiles the body of a function object, unless it was already compiled.
+
+        Args:
+            func_obj: The function object.
+        """
+        if func_obj.compiled_body is None:
+            func_obj.compiled_body = self.compile_ast(func_obj.func_ast["body"])
+
+    def _compile_fallback(self, ast):
+        """Compiles an AST into a closure which delegates the evaluation to the evaluator.
+
+        Args:
+            ast: The AST that is compiled.
+
+        Returns:
+            The closure.
+        """
+        eval_ast = self.evaluator.eval_ast
+
+        def fallback_func(state):
+            return eval_ast(ast, state)
+        return fallback_func
+
+
+#####################
+# Unary Expressions #
+#####################
+def plus(compiler, ast):
+    """Compiles "+expr"."""
+    expr_func = compiler.compile_ast(ast["expr"])
+    return lambda state: +expr_func(state)
+
+
+def minus(compiler, ast):
+    """Compiles "-expr"."""
+    expr_func = compiler.compile_ast(ast["expr"])
+    return lambda state: -expr_func(state)
+
+
+def log_not(compiler, ast):
+    """Compiles "!expr"."""
+    expr_func = compiler.compile_ast(ast["expr"])
+    return lambda state: UppaalBool(not expr_func(state))
+
+
+######################
+# Binary Expressions #
+######################
+def dot(compiler, ast):
+    """Compiles "left.right"."""
+    left_func = compiler.compile_ast(ast["left"])
+    right = ast["right"]["name"]
+    return lambda state: left_func(state)[right]
+
+
+def array_access(compiler, ast):
+    """Compiles "left[right]"."""
+    left_func = compiler.compile_ast(ast["left"])
+    right_func = compiler.compile_ast(ast["right"])
+
+    def array_access_func(state):
+        left = left_func(state)
+        return left[int(right_func(state))]
+    return array_access_func
+
+
+def make_binary_op_compile_func(op_func, result_clazz=None):
+    """Creates a compile function for a binary operation which evaluates the left operand first.
+
+    Args:
+        op_func: The binary operation function (e.g., "operator.add").
+        result_clazz: An optional class into which the operation result is converted (e.g., UppaalBool).
+
+    Returns:
+        The compile function.
+    """
+    def compile_func(compiler, ast):
+        left_func = compiler.compile_ast(ast["left"])
+        right_func = compiler.compile_ast(ast["right"])
+        if result_clazz is None:
+            return lambda state: op_func(left_func(state), right_func(state))
+        return lambda state: result_clazz(op_func(left_func(state), right_func(state)))
+    return compile_func
+
+
+def log_and(compiler, ast):
+    """Compiles "left && right"."""
+    left_func = compiler.compile_ast(ast["left"])
+    right_func = compiler.compile_ast(ast["right"])
+    return lambda state: UppaalBool(left_func(state) and right_func(state))
+
+
+def log_or(compiler, ast):
+    """Compiles "left || right"."""
+    left_func = compiler.compile_ast(ast["left"])
+    right_func = compiler.compile_ast(ast["right"])
+    return lambda state: UppaalBool(left_func(state) or right_func(state))
+
+
+def log_imply(compiler, ast):
+    """Compiles "left imply right"."""
+    left_func = compiler.compile_ast(ast["left"])
+    right_func = compiler.compile_ast(ast["right"])
+    return lambda state: UppaalBool(right_func(state) or not left_func(state))
+
+
+###
+
+def make_assign_compile_func(op_func):
+    """Creates a compile function for an (augmented) assignment "left (op)= right".
+
+    Args:
+        op_func: The in-place operation function (e.g., "operator.iadd"), or None for a plain assignment.
+
+    Returns:
+        The compile function.
+    """
+    def compile_func(compiler, ast):
+        left_func = compiler.compile_ast(ast["left"])
+        right_func = compiler.compile_ast(ast["right"])
+        target_name = get_assign_target_name(ast["left"])
+        if op_func is None:
+            def assign_func(state):
+                state.unshare_variables_for(target_name)
+                var = left_func(state)
+                var.assign(right_func(state))
+                return var.val
+        else:
+            def assign_func(state):
+                state.unshare_variables_for(target_name)
+                var = left_func(state)
+                var = op_func(var, right_func(state))
+                return var.val
+        return assign_func
+    return compile_func
+
+
+##########
+# Others #
+##########
+def statement_block(compiler, ast):
+    """Compiles statement block "{ ... }"."""
+    decl_funcs = [compiler.compile_ast(decl) for decl in ast["decls"]]
+    stmt_funcs = [compiler.compile_ast(stmt) for stmt in ast["stmts"]]
+
+    def statement_block_func(state):
+        state.new_local_scope()
+        for decl_func in decl_funcs:
+            decl_func(state)
+        for stmt_func in stmt_funcs:
+            res, do_return = stmt_func(state)
+            if do_return:
+                state.remove_local_scope()
+                return res, True
+        state.remove_local_scope()
+        return None, False
+    return statement_block_func
+
+
+def empty_statement(_compiler, _ast):
+    """Compiles empty statement."""
+    return lambda _state: (None, False)
+
+
+def expr_statement(compiler, ast):
+    """Compiles "expr;"."""
+    expr_func = compiler.compile_ast(ast["expr"])
+    return lambda state: (expr_func(state), False)
+
+
+def for_loop(compiler, ast):
+    """Compiles "for (init; cond; after) {body}"."""
+    init_func = compiler.compile_ast(ast["init"])
+    cond_func = compiler.compile_ast(ast["cond"])
+    body_func = compiler.compile_ast(ast["body"])
+    after_func = compiler.compile_ast(ast["after"])
+
+    def for_loop_func(state):
+        init_func(state)
+        while cond_func(state):
+            res, do_return = body_func(state)
+            if do_return:
+                return res, True
+            after_func(state)
+        return None, False
+    return for_loop_func
+
+
+def iteration(compiler, ast):
+    """Compiles "for (name : type) {body}"."""
+    var_name = ast["name"]
+    type_func = compiler.compile_ast(ast["type"])
+    body_func = compiler.compile_ast(ast["body"])
+
+    def iteration_func(state):
+        prefixes, clazz = type_func(state)
+        state.new_local_scope()
+        state.define(var_name, clazz)
+        for val in clazz:
+            state.assign(var_name, val)
+            res, do_return = body_func(state)
+            if do_return:
+                return res, True
+        state.remove_local_scope()
+        return None, False
+    return iteration_func
+
+
+def while_loop(compiler, ast):
+    """Compiles "while (cond) {body}"."""
+    cond_func = compiler.compile_ast(ast["cond"])
+    body_func = compiler.compile_ast(ast["body"])
+
+    def while_loop_func(state):
+        while cond_func(state):
+            res, do_return = body_func(state)
+            if do_return:
+                return res, True
+        return None, False
+    return while_loop_func
+
+
+def do_while_loop(compiler, ast):
+    """Compiles "do {body} while (cond)"."""
+    cond_func = compiler.compile_ast(ast["cond"])
+    body_func = compiler.compile_ast(ast["body"])
+
+    def do_while_loop_func(state):
+        while True:
+            res, do_return = body_func(state)
+            if do_return:
+                return res, True
+            if not cond_func(state):
+                break
+        return None, False
+    return do_while_loop_func
+
+
+def if_statement(compiler, ast):
+    """Compiles "if (cond) {thenBody} [else {elseBody}]"."""
+    cond_func = compiler.compile_ast(ast["cond"])
+    then_func = compiler.compile_ast(ast["thenBody"])
+    else_func = compiler.compile_ast(ast["elseBody"]) if ast.get("elseBody") else None
+
+    def if_statement_func(state):
+        if cond_func(state):
+            res, do_return = then_func(state)
+            if do_return:
+                return res, True
+        elif else_func is not None:
+            res, do_return = else_func(state)
+            if do_return:
+                return res, True
+        return None, False
+    return if_statement_func
+
+
+def return_statement(compiler, ast):
+    """Compiles "return expr;"."""
+    if not ast.get("expr"):
+        return lambda _state: (None, True)
+    expr_func = compiler.compile_ast(ast["expr"])
+    return lambda state: (expr_func(state), True)
+
+
+###
+
+def variable(_compiler, ast):
+    """Compiles a variable in an expression."""
+    name_str = ast["name"]
+
+    def variable_func(state):
+        var = state.peek(name_str)
+        if isinstance(var, UppaalVariable) and isinstance(var.val, UppaalReference):
+            var = var.val.pointee
+        return var
+    return variable_func
+
+
+def integer(_compiler, ast):
+    """Compiles an integer value."""
+    val = ast["val"]
+    return lambda _state: UppaalInt(val)
+
+
+def double(_compiler, _ast):
+    """Compiles a double value."""
+    return lambda _state: None  # TODO: Uppaal_double(float(ast["val"]))
+
+
+def boolean(_compiler, ast):
+    """Compiles a boolean value."""
+    val = ast["val"]
+    return lambda _state: UppaalBool(val)
+
+
+###
+
+def bracket_expr(compiler, ast):
+    """Compiles expression "(expr)"."""
+    return compiler.compile_ast(ast["expr"])
+
+
+def make_incr_decr_compile_func(op_func, is_post):
+    """Creates a compile function for an increment or decrement expression.
+
+    Args:
+        op_func: The in-place operation function ("operator.iadd" or "operator.isub").
+        is_post: Choose whether the value before (post-increment/decrement) or after the operation is returned.
+
+    Returns:
+        The compile function.
+    """
+    def compile_func(compiler, ast):
+        expr_func = compiler.compile_ast(ast["expr"])
+        target_name = get_assign_target_name(ast["expr"])
+        if is_post:
+            def incr_decr_func(state):
+                state.unshare_variables_for(target_name)
+                var = expr_func(state)
+                ret = var.val.copy()
+                op_func(var, 1)
+                return ret
+        else:
+            def incr_decr_func(state):
+                state.unshare_variables_for(target_name)
+                var = expr_func(state)
+                var = op_func(var, 1)
+                return var.val
+        return incr_decr_func
+    return compile_func
+
+
+def assign_expr(compiler, ast):
+    """Compiles expression "var = expr"."""
+    return assign_compile_funcs[ast["op"]](compiler, ast)
+
+
+def func_call_expr(compiler, ast):
+    """Compiles expression "func(args)"."""
+    func_name = ast["funcName"]
+    arg_funcs = [compiler.compile_ast(arg) for arg in ast["args"]]
+
+    def func_call_func(state):
+        func_obj = state.peek(func_name)
+        args = [arg_func(state) for arg_func in arg_funcs]
+        if isinstance(func_obj, UppaalFunction):
+            compiler.compile_function(func_obj)
+        return func_obj(arg_asts=args, state=state)
+    return func_call_func
+
+
+###
+
+def unary_expr(compiler, ast):
+    """Compiles a unary expression."""
+    return unary_compile_funcs[ast["op"]](compiler, ast)
+
+
+def binary_expr(compiler, ast):
+    """Compiles a binary expression."""
+    return binary_compile_funcs[ast["op"]](compiler, ast)
+
+
+def ternary_expr(compiler, ast):
+    """Compiles a ternary expression."""
+    cond_func = compiler.compile_ast(ast["left"])
+    then_func = compiler.compile_ast(ast["middle"])
+    else_func = compiler.compile_ast(ast["right"])
+    return lambda state: then_func(state) if cond_func(state) else else_func(state)
+
+
+###
+
+def for_all_expr(compiler, ast):
+    """Compiles expression "forall (name:type) expr"."""
+    var_name = ast["varName"]
+    type_func = compiler.compile_ast(ast["type"])
+    expr_func = compiler.compile_ast(ast["expr"])
+
+    def for_all_func(state):
+        prefixes, clazz = type_func(state)
+        state.new_local_scope()
+        state.define(var_name, clazz)
+        for val in clazz:
+            state.assign(var_name, val)
+            if not expr_func(state):
+                state.remove_local_scope()
+                return UppaalBool(False)
+        state.remove_local_scope()
+        return UppaalBool(True)
+    return for_all_func
+
+
+def exists_expr(compiler, ast):
+    """Compiles expression "exists (name:type) expr"."""
+    var_name = ast["varName"]
+    type_func = compiler.compile_ast(ast["type"])
+    expr_func = compiler.compile_ast(ast["expr"])
+
+    def exists_func(state):
+        prefixes, clazz = type_func(state)
+        state.new_local_scope()
+        state.define(var_name, clazz)
+        for val in clazz:
+            state.assign(var_name, val)
+            if expr_func(state):
+                state.remove_local_scope()
+                return UppaalBool(True)
+        state.remove_local_scope()
+        return UppaalBool(False)
+    return exists_func
+
+
+def sum_expr(compiler, ast):
+    """Compiles expression "sum (name:type) expr"."""
+    var_name = ast["varName"]
+    type_func = compiler.compile_ast(ast["type"])
+    expr_func = compiler.compile_ast(ast["expr"])
+
+    def sum_func(state):
+        prefixes, clazz = type_func(state)
+        state.new_local_scope()
+        state.define(var_name, clazz)
+        res = UppaalInt(0)
+        for val in clazz:
+            state.assign(var_name, val)
+            res += expr_func(state)
+        state.remove_local_scope()
+        return res
+    return sum_func
+
+
+###
+
+def update(compiler, ast):
+    """Compiles an update "var = expr" or "func()"."""
+    expr_func = compiler.compile_ast(ast["expr"])
+
+    def update_func(state):
+        expr_func(state)
+    return update_func
+
+
+################################
+# Function Lookup Dictionaries #
+################################
+
+unary_compile_funcs = {
+    "Plus": plus,
+    "Minus": minus,
+    "LogNot": log_not,
+}
+
+binary_compile_funcs = {
+    "Dot": dot,
+    "ArrayAccess": array_access,
+
+    "Add": make_binary_op_compile_func(operator.add),
+    "Sub": make_binary_op_compile_func(operator.sub),
+    "Mult": make_binary_op_compile_func(operator.mul),
+    "Div": make_binary_op_compile_func(operator.truediv),
+    "Mod": make_binary_op_compile_func(operator.mod),
+    "LShift": make_binary_op_compile_func(operator.lshift),
+    "RShift": make_binary_op_compile_func(operator.rshift),
+
+    "LogAnd": log_and,
+    "LogOr": log_or,
+    "LogImply": log_imply,
+    "BitAnd": make_binary_op_compile_func(operator.and_),
+    "BitOr": make_binary_op_compile_func(operator.or_),
+    "BitXor": make_binary_op_compile_func(operator.xor),
+
+    "Minimum": make_binary_op_compile_func(min),
+    "Maximum": make_binary_op_compile_func(max),
+    "GreaterEqual": make_binary_op_compile_func(operator.ge, UppaalBool),
+    "GreaterThan": make_binary_op_compile_func(operator.gt, UppaalBool),
+    "LessEqual": make_binary_op_compile_func(operator.le, UppaalBool),
+    "LessThan": make_binary_op_compile_func(operator.lt, UppaalBool),
+    "Equal": make_binary_op_compile_func(operator.eq, UppaalBool),
+    "NotEqual": make_binary_op_compile_func(operator.ne, UppaalBool),
+}
+
+assign_compile_funcs = {
+    "Assign": make_assign_compile_func(None),
+    "AddAssign": make_assign_compile_func(operator.iadd),
+    "SubAssign": make_assign_compile_func(operator.isub),
+    "MultAssign": make_assign_compile_func(operator.imul),
+    "DivAssign": make_assign_compile_func(operator.itruediv),
+    "ModAssign": make_assign_compile_func(operator.imod),
+    "LShiftAssign": make_assign_compile_func(operator.ilshift),
+    "RShiftAssign": make_assign_compile_func(operator.irshift),
+    "BitAndAssign": make_assign_compile_func(operator.iand),
+    "BitOrAssign": make_assign_compile_func(operator.ior),
+    "BitXorAssign": make_assign_compile_func(operator.ixor),
+}
+
+compile_funcs = {
+    "StatementBlock": statement_block,
+    "EmptyStatement": empty_statement,
+    "ExprStatement": expr_statement,
+    "ForLoop": for_loop,
+    "Iteration": iteration,
+    "WhileLoop": while_loop,
+    "DoWhileLoop": do_while_loop,
+    "IfStatement": if_statement,
+    "ReturnStatement": return_statement,
+
+    "Variable": variable,
+    "Integer": integer,
+    "Double": double,
+    "Boolean": boolean,
+
+    "BracketExpr": bracket_expr,
+    "PostIncrAssignExpr": make_incr_decr_compile_func(operator.iadd, is_post=True),
+    "PostDecrAssignExpr": make_incr_decr_compile_func(operator.isub, is_post=True),
+    "PreIncrAssignExpr": make_incr_decr_compile_func(operator.iadd, is_post=False),
+    "PreDecrAssignExpr": make_incr_decr_compile_func(operator.isub, is_post=False),
+    "AssignExpr": assign_expr,
+    "FuncCallExpr": func_call_expr,
+
+    "UnaryExpr": unary_expr,
+    "BinaryExpr": binary_expr,
+    "TernaryExpr": ternary_expr,
+
+    "ForAllExpr": for_all_expr,
+    "ExistsExpr": exists_expr,
+    "SumExpr": sum_expr,
+
+    "Update": update,
+}
@@ -0,0 +1,196 @@
+"""The implementation of an AST optimization pass which folds constant subexpressions and inlines constants."""
+
+import copy
+
+from uppyyl_simulator.backend.ast.evaluators.uppaal_c_code_generator import ScopeResolver
+from uppyyl_simulator.backend.ast.evaluators.uppaal_c_evaluator import UppaalCEvaluator
+from uppyyl_simulator.backend.data_structures.ast.ast_code_element import apply_func_to_ast
+from uppyyl_simulator.backend.data_structures.state.system_state import SystemState
+from uppyyl_simulator.backend.data_structures.state.variable import UppaalVariable
+from uppyyl_simulator.backend.data_structures.types.bool import UppaalBool
+from uppyyl_simulator.backend.data_structures.types.int import UppaalInt
+from uppyyl_simulator.backend.data_structures.types.scalar import UppaalScalar
+
+LITERAL_AST_TYPES = ["Integer", "Boolean"]
+BINDER_AST_TYPES = {  # The AST types which bind a name within a subexpression, with the name and scope fields
+    "ForAllExpr": ("varName", "expr"),
+    "ExistsExpr": ("varName", "expr"),
+    "SumExpr": ("varName", "expr"),
+    "Iteration": ("name", "body"),
+}
+
+
+############################
+# Uppaal C Constant Folder #
+############################
+class UppaalCConstantFolder:
+    """The Uppaal C constant folder class.
+
+    The folder specializes an AST for a given instance by inlining the values of int and bool constants (including
+    constant template parameters and constant array elements or struct fields), and by folding all unary, binary,
+    bracket, and ternary expressions whose operands are literals. Subexpressions which would raise an error on
+    evaluation (e.g., a division by zero) are kept, so that the error is still raised during simulation.
+    """
+
+    def __init__(self, evaluator=None):
+        """Initializes UppaalCConstantFolder.
+
+        Args:
+            evaluator: The evaluator used to compute the values of constant subexpressions.
+        """
+        self.evaluator = evaluator if evaluator else UppaalCEvaluator(do_log_details=False)
+        self.literal_state = SystemState()  # Used to evaluate expressions over literals only
+
+    def fold_ast(self, ast, state, inst_name, local_names=None):
+        """Creates a specialized copy of an AST for a given instance.
+
+        Args:
+            ast: The AST.
+            state: The system state which holds the constants (the instance scope is activated in this state).
+            inst_name: The instance name.
+            local_names: The names of the variables in the local (edge) scope, which shadow all constants.
+
+        Returns:
+            The specialized AST.
+        """
+        ast = copy.deepcopy(ast)
+        _, non_foldable_ast_ids = apply_func_to_ast(ast, collect_non_foldable_asts)
+        non_foldable_ast_ids = set(non_foldable_ast_ids)
+        resolver = ScopeResolver(state=state, inst_name=inst_name, local_names=local_names)
+        state.activate_instance_scope(inst_name)
+
+        def fold_func(ast_, _acc):
+            if not isinstance(ast_.get("astType"), str) or id(ast_) in non_foldable_ast_ids:
+                return ast_
+            return self._fold(ast_, state, resolver)
+
+        ast, _ = apply_func_to_ast(ast, fold_func)
+        return ast
+
+    def _fold(self, ast, state, resolver):
+        """Folds a single AST node whose child nodes are already folded.
+
+        Args:
+            ast: The AST node.
+            state: The system state which holds the constants.
+            resolver: The resolver for variable names.
+
+        Returns:
+            The folded AST node.
+        """
+        ast_type = ast["astType"]
+        if ast_type in ["Variable", "BinaryExpr"] and self._is_constant_access(ast, resolver):
+            return self._make_literal_ast(ast, state)
+        if ast_type == "BracketExpr" and is_literal_ast(ast["expr"]):
+            return ast["expr"]
+        if ast_type == "UnaryExpr" and is_literal_ast(ast["expr"]):
+            return self._make_literal_ast(ast, self.literal_state)
+        if ast_type == "BinaryExpr" and is_literal_ast(ast["left"]) and is_literal_ast(ast["right"]):
+            return self._make_literal_ast(ast, self.literal_state)
+        if ast_type == "TernaryExpr" and is_literal_ast(ast["left"]):
+            return ast["middle"] if ast["left"]["val"] else ast["right"]
+        return ast
+
+    def _is_constant_access(self, ast, resolver):
+        """Checks whether an AST accesses a constant value, i.e., a constant variable, or an element or field of a
+        constant array or struct with literal indices.
+
+        Args:
+            ast: The AST node.
+            resolver: The resolver for variable names.
+
+        Returns:
+            True if the AST accesses a constant value, and False otherwise.
+        """
+        if ast["astType"] == "Variable":
+            try:
+                source, obj = resolver.resolve(ast["name"])
+            except Exception:
+                return False
+            return source.startswith("const_") and isinstance(obj, UppaalVariable)
+        if ast["astType"] == "BinaryExpr" and ast["op"] == "Dot":
+            return self._is_constant_access(ast["left"], resolver)
+        if ast["astType"] == "BinaryExpr" and ast["op"] == "ArrayAccess":
+            return is_literal_ast(ast["right"]) and self._is_constant_access(ast["left"], resolver)
+        return False
+
+    def _make_literal_ast(self, ast, state):
+        """Evaluates an AST, and creates the literal AST of its value.
+
+        Args:
+            ast: The AST node.
+            state: The system state in which the AST is evaluated.
+
+        Returns:
+            The literal AST, or the original AST if its value is neither an int nor a bool.
+        """
+        try:
+            val = self.evaluator.eval_ast(ast, state)
+        except Exception:
+            return ast
+        if isinstance(val, UppaalVariable):
+            val = val.val
+        if isinstance(val, UppaalBool):
+            return {"astType": "Boolean", "val": bool(val)}
+        if isinstance(val, UppaalInt) and not isinstance(val, UppaalScalar):
+            return {"astType": "Integer", "val": int(val)}
+        return ast
+
+
+def is_literal_ast(ast):
+    """Checks whether an AST is a literal.
+
+    Args:
+        ast: The AST.
+
+    Returns:
+        True if the AST is a literal, and False otherwise.
+    """
+    return isinstance(ast, dict) and ast.get("astType") in LITERAL_AST_TYPES
+
+
+def collect_non_foldable_asts(ast, acc):
+    """Collects the IDs of all AST nodes which must not be replaced by their value, i.e., struct field names,
+    assigned variables, function arguments (which may be passed by reference), and the variables bound by "forall",
+    "exists", "sum", and "for (name : type)" (which shadow all constants).
+
+    Args:
+        ast: The AST node.
+        acc: The list of collected AST node IDs.
+
+    Returns:
+        The unchanged AST node.
+    """
+    ast_type = ast.get("astType")
+    if ast_type == "BinaryExpr" and ast["op"] == "Dot":
+        acc.append(id(ast["right"]))
+    elif ast_type == "AssignExpr":
+        acc.append(id(ast["left"]))
+    elif ast_type in ["PostIncrAssignExpr", "PostDecrAssignExpr", "PreIncrAssignExpr", "PreDecrAssignExpr"]:
+        acc.append(id(ast["expr"]))
+    elif ast_type == "FuncCallExpr":
+        acc.extend(id(arg) for arg in ast["args"] if is_access_ast(arg))
+    elif ast_type in BINDER_AST_TYPES:
+        name_field, scope_field = BINDER_AST_TYPES[ast_type]
+        bound_name = ast[name_field]
+
+        def collect_bound_variables(ast_, acc_):
+            if ast_.get("astType") == "Variable" and ast_.get("name") == bound_name:
+                acc_.append(id(ast_))
+            return ast_
+
+        _, bound_ast_ids = apply_func_to_ast(ast[scope_field], collect_bound_variables)
+        acc.extend(bound_ast_ids)
+    return ast
+
+
+def is_access_ast(ast):
+    """Checks whether an AST accesses a variable (or an element or field of it).
+
+    Args:
+        ast: The AST.
+
+    Returns:
+        True if the AST is a variable access, and False otherwise.
+    """
+    return ast["astType"] == "Variable" or (ast["astType"] == "BinaryExpr" and ast["op"] in ["Dot", "ArrayAccess"])
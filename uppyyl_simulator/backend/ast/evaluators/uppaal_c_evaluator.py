@@ -83,7 +83,7 @@ class UppaalCEvaluator(ASTCodeEvaluator):
 
             if param_ast["isRef"]:  # If variable is a reference
                 ref = UppaalReference(pointee_path=(arg.scope_path + arg.var_path))
-                ref.init_pointee(state.program_state)
+                ref.init_pointee(state.peek_program_state())
                 ref_var = UppaalVariable(name=param_name, val=ref)
                 state.set(param_name, ref_var, const=False)  # ('const' in param_ast["type"]["prefixes"]))
 
@@ -274,9 +274,36 @@ def not_equal(evaluator, ast, state):
 
 ###
 
+def get_assign_target_name(target_ast):
+    """Gets the name of the variable which is modified by an assignment to a target expression (e.g., "a" for
+    "a[i].x").
+
+    Args:
+        target_ast: The target expression AST.
+
+    Returns:
+        The variable name, or None if the target expression is no (part of a) variable.
+    """
+    while target_ast["astType"] in ("BracketExpr", "BinaryExpr"):
+        if target_ast["astType"] == "BracketExpr":
+            target_ast = target_ast["expr"]
+        elif target_ast["op"] in ("Dot", "ArrayAccess"):
+            target_ast = target_ast["left"]
+        else:
+            return None
+    return target_ast["name"] if target_ast["astType"] == "Variable" else None
+
+
+def eval_assign_target(evaluator, target_ast, state):
+    """Evaluates the target variable of an assignment, which is modified in place, so that shared variable scopes are
+    copied first (see SystemState.unshare_variables_for)."""
+    state.unshare_variables_for(get_assign_target_name(target_ast))
+    return evaluator.eval_ast(target_ast, state)
+
+
 def assign(evaluator, ast, state):
     """Evaluates "left = right"."""
-    var = evaluator.eval_ast(ast["left"], state)
+    var = eval_assign_target(evaluator, ast["left"], state)
     val = evaluator.eval_ast(ast["right"], state)
     var.assign(val)
     return var.val
@@ -284,7 +311,7 @@ def assign(evaluator, ast, state):
 
 def add_assign(evaluator, ast, state):
     """Evaluates "left += right"."""
-    var = evaluator.eval_ast(ast["left"], state)
+    var = eval_assign_target(evaluator, ast["left"], state)
     val = evaluator.eval_ast(ast["right"], state)
     var += val
     return var.val
@@ -292,7 +319,7 @@ def add_assign(evaluator, ast, state):
 
 def sub_assign(evaluator, ast, state):
     """Evaluates "left -= right"."""
-    var = evaluator.eval_ast(ast["left"], state)
+    var = eval_assign_target(evaluator, ast["left"], state)
     val = evaluator.eval_ast(ast["right"], state)
     var -= val
     return var.val
@@ -300,7 +327,7 @@ def sub_assign(evaluator, ast, state):
 
 def mult_assign(evaluator, ast, state):
     """Evaluates "left *= right"."""
-    var = evaluator.eval_ast(ast["left"], state)
+    var = eval_assign_target(evaluator, ast["left"], state)
     val = evaluator.eval_ast(ast["right"], state)
     var *= val
     return var.val
@@ -308,7 +335,7 @@ def mult_assign(evaluator, ast, state):
 
 def div_assign(evaluator, ast, state):
     """Evaluates "left /= right"."""
-    var = evaluator.eval_ast(ast["left"], state)
+    var = eval_assign_target(evaluator, ast["left"], state)
     val = evaluator.eval_ast(ast["right"], state)
     var /= val
     return var.val
@@ -316,7 +343,7 @@ def div_assign(evaluator, ast, state):
 
 def mod_assign(evaluator, ast, state):
     """Evaluates "left %= right"."""
-    var = evaluator.eval_ast(ast["left"], state)
+    var = eval_assign_target(evaluator, ast["left"], state)
     val = evaluator.eval_ast(ast["right"], state)
     var %= val
     return var.val
@@ -324,7 +351,7 @@ def mod_assign(evaluator, ast, state):
 
 def l_shift_assign(evaluator, ast, state):
     """Evaluates "left <<= right"."""
-    var = evaluator.eval_ast(ast["left"], state)
+    var = eval_assign_target(evaluator, ast["left"], state)
     val = evaluator.eval_ast(ast["right"], state)
     var <<= val
     return var.val
@@ -332,7 +359,7 @@ def l_shift_assign(evaluator, ast, state):
 
 def r_shift_assign(evaluator, ast, state):
     """Evaluates "left >>= right"."""
-    var = evaluator.eval_ast(ast["left"], state)
+    var = eval_assign_target(evaluator, ast["left"], state)
     val = evaluator.eval_ast(ast["right"], state)
     var >>= val
     return var.val
@@ -340,7 +367,7 @@ def r_shift_assign(evaluator, ast, state):
 
 def bit_and_assign(evaluator, ast, state):
     """Evaluates "left &= right"."""
-    var = evaluator.eval_ast(ast["left"], state)
+    var = eval_assign_target(evaluator, ast["left"], state)
     val = evaluator.eval_ast(ast["right"], state)
     var &= val
     return var.val
@@ -348,7 +375,7 @@ def bit_and_assign(evaluator, ast, state):
 
 def bit_or_assign(evaluator, ast, state):
     """Evaluates "left |= right"."""
-    var = evaluator.eval_ast(ast["left"], state)
+    var = eval_assign_target(evaluator, ast["left"], state)
     val = evaluator.eval_ast(ast["right"], state)
     var |= val
     return var.val
@@ -356,7 +383,7 @@ def bit_or_assign(evaluator, ast, state):
 
 def bit_xor_assign(evaluator, ast, state):
     """Evaluates "left ^= right"."""
-    var = evaluator.eval_ast(ast["left"], state)
+    var = eval_assign_target(evaluator, ast["left"], state)
     val = evaluator.eval_ast(ast["right"], state)
     var ^= val
     return var.val
@@ -502,7 +529,7 @@ def custom_type(_evaluator, ast, state):
     """Evaluates int, bool, ... type."""
     custom_type_name = ast["type"]
     base_clazz_name = f'{custom_type_name}'  # f'Uppaal_{custom_type_name}'
-    base_clazz = state.get(base_clazz_name)
+    base_clazz = state.peek(base_clazz_name)
 
     # TODO: Implement another concept to handle type quantifiers (so that copying classes each time is not required)
     # new_clazz = base_clazz.make_new_type(name=base_clazz_name)
@@ -736,8 +763,8 @@ def instantiation(evaluator, ast, state):
 def variable(_evaluator, ast, state):
     """Evaluates a variable in an expression."""
     name_str = ast["name"]
-    var = state.get(name_str)
-    if isinstance(var.val, UppaalReference):
+    var = state.peek(name_str)
+    if isinstance(var, UppaalVariable) and isinstance(var.val, UppaalReference):
         var = var.val.pointee
     return var
 
@@ -772,7 +799,7 @@ def derivative_expr(_evaluator, _ast, _state):
 
 def post_incr_assign_expr(evaluator, ast, state):
     """Evaluates expression "expr++"."""
-    var = evaluator.eval_ast(ast["expr"], state)
+    var = eval_assign_target(evaluator, ast["expr"], state)
     ret = var.val.copy()
     var += 1
     return ret
@@ -780,7 +807,7 @@ def post_incr_assign_expr(evaluator, ast, state):
 
 def post_decr_assign_expr(evaluator, ast, state):
     """Evaluates expression "expr--"."""
-    var = evaluator.eval_ast(ast["expr"], state)
+    var = eval_assign_target(evaluator, ast["expr"], state)
     ret = var.val.copy()
     var -= 1
     return ret
@@ -788,14 +815,14 @@ def post_decr_assign_expr(evaluator, ast, state):
 
 def pre_incr_assign_expr(evaluator, ast, state):
     """Evaluates expression "++expr"."""
-    var = evaluator.eval_ast(ast["expr"], state)
+    var = eval_assign_target(evaluator, ast["expr"], state)
     var += 1
     return var.val
 
 
 def pre_decr_assign_expr(evaluator, ast, state):
     """Evaluates expression "--expr"."""
-    var = evaluator.eval_ast(ast["expr"], state)
+    var = eval_assign_target(evaluator, ast["expr"], state)
     var -= 1
     return var.val
 
@@ -808,7 +835,7 @@ def assign_expr(evaluator, ast, state):
 def func_call_expr(evaluator, ast, state):
     """Evaluates expression "func(args)"."""
     func_name = ast["funcName"]
-    func_obj = state.get(func_name)
+    func_obj = state.peek(func_name)
     args = list(map(lambda arg: evaluator.eval_ast(arg, state), ast["args"]))
     res = func_obj(arg_asts=args, state=state)
     return res
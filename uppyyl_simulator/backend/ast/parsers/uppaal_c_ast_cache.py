@@ -0,0 +1,285 @@
+"""A persistent cache of parsed Uppaal C ASTs, keyed by a hash of grammar version, rule name, and source text."""
+
+import copy
+import hashlib
+import os
+import pickle
+
+AST_CACHE_DIR_ENV_VAR = "UPPYYL_AST_CACHE_DIR"
+DEFAULT_MAX_ENTRIES = 10000
+EVICTION_LOW_WATER_RATIO = 0.9  # The share of the maximum number of entries kept on eviction
+
+_grammar_version = None
+_ast_cache = None
+_ast_cache_initialized = False
+
+
+def get_grammar_version():
+    """Gets the grammar version, i.e., a hash of the generated parser, fast path parser, and semantics source files.
+
+    Returns:
+        The grammar version string.
+    """
+    global _grammar_version
+    if _grammar_version is None:
+        parsers_dir = os.path.dirname(os.path.abspath(__file__))
+        source_paths = [
+            os.path.join(parsers_dir, "generated", "uppaal_c_language_parser.py"),
+            os.path.join(parsers_dir, "uppaal_c_language_semantics.py"),
+            os.path.join(parsers_dir, "uppaal_c_fast_parser.py"),
+        ]
+        source_hash = hashlib.sha256()
+        for source_path in source_paths:
+            with open(source_path, "rb") as file:
+                source_hash.update(file.read())
+        _grammar_version = source_hash.hexdigest()
+    return _grammar_version
+
+
+#############
+# AST Cache #
+#############
+class ASTCache:
+    """A persistent AST cache, which stores each parsed AST in a separate pickle file of a cache directory.
+
+    If the number of cached ASTs exceeds the maximum number of entries, the least recently used ASTs are evicted down
+    to a low-water mark, so that the cache directory is only scanned once per batch of evicted entries.
+    """
+
+    def __init__(self, cache_dir, max_entries=DEFAULT_MAX_ENTRIES):
+        """Initializes ASTCache.
+
+        Args:
+            cache_dir: The cache directory (created if it does not exist).
+            max_entries: The maximum number of cached ASTs.
+        """
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        os.makedirs(cache_dir, exist_ok=True)
+        self.entry_count = len(self._get_entry_paths())
+        self.stats = {"hits": 0, "misses": 0}
+
+    def get_key(self, rule_name, text):
+        """Gets the cache key of a source text parsed with a given rule.
+
+        Args:
+            rule_name: The parser rule name.
+            text: The source text.
+
+        Returns:
+            The cache key.
+        """
+        key_data = "\0".join([get_grammar_version(), rule_name, text])
+        return hashlib.sha256(key_data.encode("utf-8")).hexdigest()
+
+    def get(self, rule_name, text):
+        """Gets a cached AST.
+
+        Args:
+            rule_name: The parser rule name.
+            text: The source text.
+
+        Returns:
+            The cached AST, or None if no AST is cached.
+        """
+        entry_path = self._get_entry_path(self.get_key(rule_name, text))
+        try:
+            with open(entry_path, "rb") as file:
+                ast = pickle.load(file)
+            os.utime(entry_path)  # Mark entry as recently used
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return None
+        return ast
+
+    def put(self, rule_name, text, ast):
+        """Caches an AST.
+
+        Args:
+            rule_name: The parser rule name.
+            text: The source text.
+            ast: The parsed AST.
+        """
+        entry_path = self._get_entry_path(self.get_key(rule_name, text))
+        tmp_entry_path = f'{entry_path}.{os.getpid()}.tmp'
+        with open(tmp_entry_path, "wb") as file:
+            pickle.dump(ast, file, protocol=pickle.HIGHEST_PROTOCOL)
+        is_new_entry = not os.path.exists(entry_path)
+        os.replace(tmp_entry_path, entry_path)
+        if is_new_entry:
+            self.entry_count += 1
+        if self.entry_count > self.max_entries:
+            self._evict()
+
+    def parse(self, parser, text, rule_name, **kwargs):
+        """Parses a source text, or gets its AST from the cache if it was parsed before.
+
+        Args:
+            parser: The parser used on a cache miss.
+            text: The source text.
+            rule_name: The parser rule name.
+            **kwargs: Further arguments passed to the parser.
+
+        Returns:
+            The AST.
+        """
+        ast = self.get(rule_name, text)
+        if ast is not None:
+            self.stats["hits"] += 1
+            return ast
+        self.stats["misses"] += 1
+        ast = parser.parse(text, rule_name=rule_name, **kwargs)
+        self.put(rule_name, text, ast)
+        return ast
+
+    def clear(self):
+        """Removes all cached ASTs."""
+        for entry_path in self._get_entry_paths():
+            os.remove(entry_path)
+        self.entry_count = 0
+
+    def _evict(self):
+        """Evicts the least recently used ASTs, so that the cache holds at most the low-water mark of entries."""
+        entry_mtimes = {}
+        for entry_path in self._get_entry_paths():
+            try:
+                entry_mtimes[entry_path] = os.stat(entry_path).st_mtime
+            except OSError:
+                pass  # Already removed, e.g., by another process
+        entry_paths = sorted(entry_mtimes, key=entry_mtimes.get)
+        evict_count = max(0, len(entry_paths) - int(self.max_entries * EVICTION_LOW_WATER_RATIO))
+        for entry_path in entry_paths[:evict_count]:
+            try:
+                os.remove(entry_path)
+            except OSError:
+                pass  # Already removed, e.g., by another process
+        self.entry_count = len(entry_paths) - evict_count
+
+    def _get_entry_path(self, key):
+        return os.path.join(self.cache_dir, f'{key}.ast.pickle')
+
+    def _get_entry_paths(self):
+        return [os.path.join(self.cache_dir, file_name) for file_name in os.listdir(self.cache_dir)
+                if file_name.endswith(".ast.pickle")]
+
+
+#######################
+# In-Memory AST Cache #
+#######################
+class InMemoryASTCache:
+    """An in-memory AST cache, e.g., for ASTs parsed in advance by worker processes.
+
+    The first lookup of a cached AST returns the AST itself, later lookups return copies, so that elements with equal
+    source texts never share an AST. Misses are delegated to an optional fallback cache.
+    """
+
+    def __init__(self, fallback_cache=None):
+        """Initializes InMemoryASTCache.
+
+        Args:
+            fallback_cache: An optional AST cache used on misses (e.g., a persistent ASTCache).
+        """
+        self.fallback_cache = fallback_cache
+        self.asts = {}
+        self.used_keys = set()
+        self.stats = {"hits": 0, "misses": 0}
+
+    def get(self, rule_name, text):
+        """Gets a cached AST.
+
+        Args:
+            rule_name: The parser rule name.
+            text: The source text.
+
+        Returns:
+            The cached AST, or None if no AST is cached.
+        """
+        key = (rule_name, text)
+        ast = self.asts.get(key)
+        if ast is None:
+            return None
+        if key in self.used_keys:
+            return copy.deepcopy(ast)
+        self.used_keys.add(key)
+        return ast
+
+    def put(self, rule_name, text, ast):
+        """Caches an AST.
+
+        Args:
+            rule_name: The parser rule name.
+            text: The source text.
+            ast: The parsed AST.
+        """
+        key = (rule_name, text)
+        self.asts[key] = ast
+        self.used_keys.discard(key)
+
+    def parse(self, parser, text, rule_name, **kwargs):
+        """Parses a source text, or gets its AST from the cache if it was parsed before.
+
+        Args:
+            parser: The parser used on a cache miss.
+            text: The source text.
+            rule_name: The parser rule name.
+            **kwargs: Further arguments passed to the parser.
+
+        Returns:
+            The AST.
+        """
+        ast = self.get(rule_name, text)
+        if ast is not None:
+            self.stats["hits"] += 1
+            return ast
+        self.stats["misses"] += 1
+        if self.fallback_cache is not None:
+            return self.fallback_cache.parse(parser, text, rule_name=rule_name, **kwargs)
+        return parser.parse(text, rule_name=rule_name, **kwargs)
+
+
+############################
+# Process-wide Cache Setup #
+############################
+def set_ast_cache(ast_cache):
+    """Sets the process-wide AST cache used by "parse_cached".
+
+    Args:
+        ast_cache: The AST cache, or None to disable caching.
+    """
+    global _ast_cache, _ast_cache_initialized
+    _ast_cache = ast_cache
+    _ast_cache_initialized = True
+
+
+def get_ast_cache():
+    """Gets the process-wide AST cache.
+
+    Unless set explicitly, a cache is created in the directory given by the environment variable
+    "UPPYYL_AST_CACHE_DIR", if defined.
+
+    Returns:
+        The AST cache, or None if caching is disabled.
+    """
+    if not _ast_cache_initialized:
+        cache_dir = os.environ.get(AST_CACHE_DIR_ENV_VAR)
+        set_ast_cache(ASTCache(cache_dir=cache_dir) if cache_dir else None)
+    return _ast_cache
+
+
+def parse_cached(parser, text, rule_name, cache=None, **kwargs):
+    """Parses a source text, consulting the process-wide AST cache if enabled.
+
+    Args:
+        parser: The parser.
+        text: The source text.
+        rule_name: The parser rule name.
+        cache: An optional AST cache consulted instead of the process-wide AST cache (e.g., an InMemoryASTCache of
+            ASTs parsed in advance, whose fallback cache is the process-wide AST cache).
+        **kwargs: Further arguments passed to the parser.
+
+    Returns:
+        The AST.
+    """
+    ast_cache = cache if cache is not None else get_ast_cache()
+    if ast_cache is None:
+        return parser.parse(text, rule_name=rule_name, **kwargs)
+    return ast_cache.parse(parser, text, rule_name=rule_name, **kwargs)
@@ -0,0 +1,342 @@
+"""A hand-written fast path parser for the Uppaal C expressions of guard, invariant, update, and select labels.
+
+The parser mirrors the ordered choices of the corresponding rules of the TatSu grammar, builds the same raw ASTs, and
+applies the same semantics (including the associativity / precedence rotations) as the generated parser, so that the
+resulting AST dicts are identical. Whenever the input leaves the supported subset, or a grammar choice would require
+backtracking, parsing falls back to the generated TatSu parser.
+"""
+
+import re
+
+from uppyyl_simulator.backend.ast.parsers.uppaal_c_language_semantics import (
+    ast_rotate_left_while_assoc_prec, split_logic_conjunction
+)
+
+WHITESPACE_REGEX = re.compile(r'\s+')
+ID_REGEX = re.compile(r'[a-zA-Z_][a-zA-Z0-9_]*')
+DOUBLE_REGEX = re.compile(r'[-+]?[0-9]*\.[0-9]+([Ee][-+]?[0-9]+)?')
+INTEGER_REGEX = re.compile(r'[-+]?[0-9]+')
+
+# Ordered as the alternatives of the corresponding grammar rules
+ASSIGN_OPS = [
+    ('=', 'Assign'), (':=', 'Assign'), ('+=', 'AddAssign'), ('-=', 'SubAssign'), ('*=', 'MultAssign'),
+    ('/=', 'DivAssign'), ('%=', 'ModAssign'), ('|=', 'BitOrAssign'), ('&=', 'BitAndAssign'), ('^=', 'BitXorAssign'),
+    ('<<=', 'LShiftAssign'), ('>>=', 'RShiftAssign'),
+]
+BINARY_OPS = [
+    ('<<', 'LShift'), ('>>', 'RShift'), ('&&', 'LogAnd'), ('and', 'LogAnd'), ('||', 'LogOr'), ('or', 'LogOr'),
+    ('imply', 'LogImply'), ('&', 'BitAnd'), ('|', 'BitOr'), ('^', 'BitXor'), ('<?', 'Minimum'), ('>?', 'Maximum'),
+    ('<=', 'LessEqual'), ('<', 'LessThan'), ('==', 'Equal'), ('!=', 'NotEqual'), ('>=', 'GreaterEqual'),
+    ('>', 'GreaterThan'), ('+', 'Add'), ('-', 'Sub'), ('*', 'Mult'), ('/', 'Div'), ('%', 'Mod'), ('.', 'Dot'),
+]
+UNARY_OPS = [('!', 'LogNot'), ('+', 'Plus'), ('-', 'Minus')]
+WORD_BINARY_OPS = {'and', 'or', 'imply'}
+
+RESERVED_KEYWORDS = {
+    'commit', 'const', 'urgent', 'broadcast', 'meta', 'init',
+    'and', 'or', 'not', 'imply', 'true', 'false', 'forall', 'exists',
+    'while', 'do', 'if', 'else', 'return', 'for',
+    'deadlock', 'process', 'state', 'invariant', 'guard', 'sync', 'assign', 'select', 'before_update', 'after_update',
+    'location', 'system', 'trans', 'rate', 'priority', 'progress', 'default',
+    'switch', 'case', 'continue', 'break', 'enum',
+    'chan', 'clock', 'double', 'bool', 'int', 'scalar', 'struct', 'void', 'typedef',
+}
+
+# Words which the grammar matches as (unguarded) prefixes of identifiers in operand / type positions
+OPERAND_PREFIX_WORDS = ('forall', 'exists', 'sum', 'deadlock', 'not', 'true', 'false')
+TYPE_PREFIX_WORDS = ('urgent', 'broadcast', 'meta', 'const', 'scalar', 'struct')
+
+FAST_PATH_RULES = {'Guard', 'Guards', 'Invariant', 'Invariants', 'Update', 'Updates', 'Select', 'Selects'}
+
+
+class FastPathNotApplicable(Exception):
+    """An exception raised if a text cannot be parsed safely by the fast path parser."""
+    pass
+
+
+########################
+# Uppaal C Fast Parser #
+########################
+class UppaalCFastParser:
+    """A fast path parser for label expressions, which falls back to the generated parser for all other inputs."""
+
+    def __init__(self, fallback_parser):
+        """Initializes UppaalCFastParser.
+
+        Args:
+            fallback_parser: The generated parser used for unsupported rules and texts.
+        """
+        self.fallback_parser = fallback_parser
+        self.text = ""
+        self.pos = 0
+        self.stats = {"fast": 0, "fallback": 0}
+
+    def parse(self, text, rule_name, **kwargs):
+        """Parses a text with a given rule, using the fast path if possible.
+
+        Args:
+            text: The source text.
+            rule_name: The parser rule name.
+            **kwargs: Further arguments passed to the fallback parser.
+
+        Returns:
+            The AST.
+        """
+        if rule_name in FAST_PATH_RULES:
+            ast = self.parse_fast(text, rule_name)
+            if ast is not None:
+                self.stats["fast"] += 1
+                return ast
+        self.stats["fallback"] += 1
+        return self.fallback_parser.parse(text, rule_name=rule_name, **kwargs)
+
+    def parse_fast(self, text, rule_name):
+        """Parses a text with a given rule using only the fast path.
+
+        Args:
+            text: The source text.
+            rule_name: The parser rule name (one of "FAST_PATH_RULES").
+
+        Returns:
+            The AST, or None if the text cannot be parsed safely by the fast path.
+        """
+        if "//" in text or "/*" in text:
+            return None
+        self.text = text
+        self.pos = 0
+        try:
+            ast = getattr(self, f'_parse_{rule_name.lower()}')()
+            self._skip_whitespace()
+            if self.pos != len(self.text):
+                raise FastPathNotApplicable()
+        except (FastPathNotApplicable, KeyError):  # Semantic errors are reported by the fallback parser
+            ast = None
+        self.text = ""
+        return ast
+
+    ###############
+    # Label Rules #
+    ###############
+    def _parse_guard(self):
+        return {'expr': self._parse_expression(), 'astType': 'Guard'}
+
+    def _parse_guards(self):
+        ast = self._parse_guard()
+        return [{'astType': 'Guard', 'expr': grd} for grd in split_logic_conjunction(ast)]
+
+    def _parse_invariant(self):
+        return {'expr': self._parse_expression(), 'astType': 'Invariant'}
+
+    def _parse_invariants(self):
+        ast = self._parse_invariant()
+        return [{'astType': 'Invariant', 'expr': inv} for inv in split_logic_conjunction(ast)]
+
+    def _parse_update(self):
+        return {'expr': self._parse_expression(), 'astType': 'Update'}
+
+    def _parse_updates(self):
+        return self._parse_list(self._parse_update)
+
+    def _parse_select(self):
+        name = self._parse_id()
+        self._expect(':')
+        return {'name': name, 'type': self._parse_type(), 'astType': 'Select'}
+
+    def _parse_selects(self):
+        return self._parse_list(self._parse_select)
+
+    def _parse_list(self, parse_item):
+        self._skip_whitespace()
+        if self.pos == len(self.text):
+            return []
+        items = [parse_item()]
+        while self._match(','):
+            items.append(parse_item())
+        return items
+
+    ###############
+    # Expressions #
+    ###############
+    def _parse_expression(self):
+        """Parses "Expression = TernaryExpr | BinaryExpr | BasicExpression" and applies its semantics."""
+        left = self._parse_basic_expression()
+        if self._match('?'):
+            middle = self._parse_expression()
+            self._expect(':')
+            right = self._parse_expression()
+            ast = {'left': left, 'middle': middle, 'right': right, 'op': 'Ternary', 'astType': 'TernaryExpr'}
+        else:
+            op = self._match_binary_op()
+            if op is None:
+                return ast_rotate_left_while_assoc_prec(left)
+            ast = {'left': left, 'op': op, 'right': self._parse_expression(), 'astType': 'BinaryExpr'}
+        return ast_rotate_left_while_assoc_prec(ast)
+
+    def _parse_basic_expression(self):
+        """Parses "BasicExpression", following the order of its alternatives."""
+        self._skip_whitespace()
+        text, pos = self.text, self.pos
+        if pos == len(text):
+            raise FastPathNotApplicable()
+        char = text[pos]
+
+        # BracketExpr
+        if char == '(':
+            self.pos += 1
+            ast = {'expr': self._parse_expression(), 'astType': 'BracketExpr'}
+            self._expect(')')
+            return ast
+
+        # PostIncrAssignExpr / PostDecrAssignExpr on numbers (incl. signed ones) are not supported
+        number_match = DOUBLE_REGEX.match(text, pos) or INTEGER_REGEX.match(text, pos)
+        if number_match and self._peek_any(('++', '--'), number_match.end()):
+            raise FastPathNotApplicable()
+
+        if ID_REGEX.match(text, pos):
+            return self._parse_word_expression()
+
+        # PreIncrAssignExpr / PreDecrAssignExpr (only on variables)
+        for op, ast_type in [('++', 'PreIncrAssignExpr'), ('--', 'PreDecrAssignExpr')]:
+            if text.startswith(op, pos):
+                self.pos += len(op)
+                self._skip_whitespace()
+                if not ID_REGEX.match(self.text, self.pos):
+                    raise FastPathNotApplicable()
+                return {'expr': self._parse_variable(), 'astType': ast_type}
+
+        # UnaryExpr
+        for op, op_name in UNARY_OPS:
+            if char == op:
+                self.pos += 1
+                return {'op': op_name, 'expr': self._parse_expression(), 'astType': 'UnaryExpr'}
+
+        # Value
+        if number_match:
+            self.pos = number_match.end()
+            if number_match.re is DOUBLE_REGEX:
+                return {'val': float(number_match.group()), 'astType': 'Double'}
+            return {'val': int(number_match.group()), 'astType': 'Integer'}
+
+        raise FastPathNotApplicable()
+
+    def _parse_word_expression(self):
+        """Parses a basic expression starting with an identifier character."""
+        word = ID_REGEX.match(self.text, self.pos).group()
+        if word in ('true', 'false', 'not'):
+            self.pos += len(word)
+            if word == 'not':
+                return {'op': 'LogNot', 'expr': self._parse_expression(), 'astType': 'UnaryExpr'}
+            return {'val': word == 'true', 'astType': 'Boolean'}
+        if word.startswith(OPERAND_PREFIX_WORDS) or word in RESERVED_KEYWORDS:
+            raise FastPathNotApplicable()
+
+        variable = self._parse_variable()
+
+        # DerivativeExpr
+        if self._peek_any(("'",)):
+            raise FastPathNotApplicable()
+
+        # PostIncrAssignExpr / PostDecrAssignExpr
+        if self._match('++'):
+            return {'expr': variable, 'astType': 'PostIncrAssignExpr'}
+        if self._match('--'):
+            return {'expr': variable, 'astType': 'PostDecrAssignExpr'}
+
+        # AssignExpr (an expression never starts with "=", so "==" is no assignment)
+        self._skip_whitespace()
+        for op, op_name in ASSIGN_OPS:
+            if self.text.startswith(op, self.pos) and not (op == '=' and self.text.startswith('==', self.pos)):
+                self.pos += len(op)
+                return {'left': variable, 'op': op_name, 'right': self._parse_expression(), 'astType': 'AssignExpr'}
+
+        # FuncCallExpr
+        if variable.get('astType') == 'Variable' and self._match('('):
+            args = []
+            if not self._match(')'):
+                args.append(self._parse_expression())
+                while self._match(','):
+                    args.append(self._parse_expression())
+                self._expect(')')
+            return {'funcName': word, 'args': args, 'astType': 'FuncCallExpr'}
+
+        # Variable
+        return variable
+
+    def _parse_variable(self):
+        """Parses "Variable = name:ID indices:{VariableIndex}*" and applies its semantics."""
+        ast = {'name': self._parse_id(), 'astType': 'Variable'}
+        while self._match('['):
+            index = self._parse_expression()
+            self._expect(']')
+            ast = {'left': ast, 'op': 'ArrayAccess', 'right': index, 'astType': 'BinaryExpr'}
+        return ast
+
+    def _match_binary_op(self):
+        self._skip_whitespace()
+        text, pos = self.text, self.pos
+        id_match = ID_REGEX.match(text, pos)
+        if id_match:
+            word = id_match.group()
+            if word not in WORD_BINARY_OPS:
+                raise FastPathNotApplicable()
+        for op, op_name in BINARY_OPS:
+            if text.startswith(op, pos):
+                self.pos += len(op)
+                return op_name
+        return None
+
+    #########
+    # Types #
+    #########
+    def _parse_type(self):
+        """Parses a "Type" without prefixes, i.e., a bounded integer type or a custom type."""
+        self._skip_whitespace()
+        id_match = ID_REGEX.match(self.text, self.pos)
+        if not id_match:
+            raise FastPathNotApplicable()
+        word = id_match.group()
+        if word.startswith(TYPE_PREFIX_WORDS):
+            raise FastPathNotApplicable()
+        if word == 'int':
+            self.pos = id_match.end()
+            self._expect('[')
+            lower = self._parse_expression()
+            self._expect(',')
+            upper = self._parse_expression()
+            self._expect(']')
+            type_id = {'lower': lower, 'upper': upper, 'astType': 'BoundedIntType'}
+        else:
+            type_id = {'type': self._parse_id(), 'astType': 'CustomType'}
+        return {'prefixes': [], 'typeId': type_id, 'astType': 'Type'}
+
+    ##########
+    # Tokens #
+    ##########
+    def _parse_id(self):
+        self._skip_whitespace()
+        id_match = ID_REGEX.match(self.text, self.pos)
+        if not id_match or id_match.group() in RESERVED_KEYWORDS:
+            raise FastPathNotApplicable()
+        self.pos = id_match.end()
+        return id_match.group()
+
+    def _skip_whitespace(self):
+        whitespace_match = WHITESPACE_REGEX.match(self.text, self.pos)
+        if whitespace_match:
+            self.pos = whitespace_match.end()
+
+    def _peek_any(self, tokens, pos=None):
+        whitespace_match = WHITESPACE_REGEX.match(self.text, self.pos if pos is None else pos)
+        pos = whitespace_match.end() if whitespace_match else (self.pos if pos is None else pos)
+        return any(self.text.startswith(token, pos) for token in tokens)
+
+    def _match(self, token):
+        self._skip_whitespace()
+        if self.text.startswith(token, self.pos):
+            self.pos += len(token)
+            return True
+        return False
+
+    def _expect(self, token):
+        if not self._match(token):
+            raise FastPathNotApplicable()
@@ -0,0 +1,29 @@
+"""A factory which lazily creates the Uppaal C language parser and shares it among all users."""
+
+import threading
+
+from uppyyl_simulator.backend.ast.parsers.generated.uppaal_c_language_parser import (
+    UppaalCLanguageParser
+)
+from uppyyl_simulator.backend.ast.parsers.uppaal_c_fast_parser import UppaalCFastParser
+from uppyyl_simulator.backend.ast.parsers.uppaal_c_language_semantics import (
+    UppaalCLanguageSemantics
+)
+
+_thread_parsers = threading.local()
+
+
+def get_uppaal_c_parser():
+    """Gets the shared Uppaal C language parser, which is created on first use.
+
+    A TatSu parser holds the state of the currently running parse, so a separate parser is shared among all users
+    within each thread. Label expressions are parsed by the fast path parser, which falls back to the TatSu parser.
+
+    Returns:
+        The Uppaal C language parser.
+    """
+    parser = getattr(_thread_parsers, "uppaal_c_parser", None)
+    if parser is None:
+        parser = UppaalCFastParser(fallback_parser=UppaalCLanguageParser(semantics=UppaalCLanguageSemantics()))
+        _thread_parsers.uppaal_c_parser = parser
+    return parser
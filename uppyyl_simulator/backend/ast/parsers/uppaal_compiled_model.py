@@ -0,0 +1,119 @@
+"""A compiled binary format (".uppyc") of fully loaded Uppaal systems, which can be reloaded without parsing.
+
+A compiled model consists of a fixed-size header (i.e., a magic string, the format version, the grammar version of
+the parsed ASTs, and a hash of the model source) followed by the pickled system object, which includes all parsed
+ASTs, the identified clocks of all declarations, and the template parameters.
+"""
+
+import hashlib
+import mmap
+import pickle
+import struct
+
+from uppyyl_simulator.backend.ast.parsers.uppaal_c_ast_cache import get_grammar_version
+
+COMPILED_MODEL_EXTENSION = ".uppyc"
+COMPILED_MODEL_MAGIC = b"UPPYC"
+COMPILED_MODEL_FORMAT_VERSION = 1
+
+_header_struct = struct.Struct("<5sH32s32s")  # Magic, format version, grammar version, source hash
+HEADER_SIZE = _header_struct.size
+
+
+def get_source_hash(system_xml):
+    """Gets the hash of a model source.
+
+    Args:
+        system_xml: The Uppaal system XML string (or bytes).
+
+    Returns:
+        The source hash (32 bytes).
+    """
+    if isinstance(system_xml, str):
+        system_xml = system_xml.encode("utf-8")
+    return hashlib.sha256(system_xml).digest()
+
+
+def is_compiled_system(data):
+    """Checks whether given data is a compiled system (i.e., starts with the compiled model magic string).
+
+    Args:
+        data: The data (any bytes-like object).
+
+    Returns:
+        True if the data is a compiled system, False otherwise.
+    """
+    return bytes(data[:len(COMPILED_MODEL_MAGIC)]) == COMPILED_MODEL_MAGIC
+
+
+#############################
+# Uppaal system to compiled #
+#############################
+def uppaal_system_to_compiled(system, source_hash=None):
+    """Compiles a system object into the binary compiled model format.
+
+    Args:
+        system: The Uppaal system object.
+        source_hash: The hash of the model source (see get_source_hash), or None if unknown.
+
+    Returns:
+        The compiled system bytes.
+    """
+    header = _header_struct.pack(COMPILED_MODEL_MAGIC, COMPILED_MODEL_FORMAT_VERSION,
+                                 bytes.fromhex(get_grammar_version()), source_hash or bytes(32))
+    return header + pickle.dumps(system, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def save_compiled_system(system, path, source_hash=None):
+    """Compiles a system object, and saves it to a file.
+
+    Args:
+        system: The Uppaal system object.
+        path: The path of the compiled model file (usually with extension ".uppyc").
+        source_hash: The hash of the model source (see get_source_hash), or None if unknown.
+    """
+    with open(path, "wb") as file:
+        file.write(uppaal_system_to_compiled(system, source_hash=source_hash))
+
+
+#############################
+# Uppaal compiled to system #
+#############################
+def uppaal_compiled_to_system(compiled_data, source_hash=None):
+    """Restores a system object from its binary compiled model format.
+
+    Args:
+        compiled_data: The compiled system (any bytes-like object, e.g., bytes or a memory map).
+        source_hash: The expected hash of the model source, or None to skip the source check.
+
+    Returns:
+        The Uppaal system object.
+    """
+    if len(compiled_data) < HEADER_SIZE or not is_compiled_system(compiled_data):
+        raise Exception("Data is not a compiled Uppaal system.")
+    _magic, format_version, grammar_version, compiled_source_hash = _header_struct.unpack_from(compiled_data)
+    if format_version != COMPILED_MODEL_FORMAT_VERSION:
+        raise Exception(f'Compiled system format version {format_version} not supported '
+                        f'(expected {COMPILED_MODEL_FORMAT_VERSION}).')
+    if grammar_version.hex() != get_grammar_version():
+        raise Exception("Compiled system was created with a different grammar version.")
+    if source_hash is not None and compiled_source_hash != source_hash:
+        raise Exception("Compiled system was created from a different model source.")
+
+    with memoryview(compiled_data) as view, view[HEADER_SIZE:] as pickled_system:
+        return pickle.loads(pickled_system)
+
+
+def load_compiled_system(path, source_hash=None):
+    """Loads a compiled system object from a memory-mapped file.
+
+    Args:
+        path: The path of the compiled model file.
+        source_hash: The expected hash of the model source, or None to skip the source check.
+
+    Returns:
+        The Uppaal system object.
+    """
+    with open(path, "rb") as file:
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as compiled_data:
+            return uppaal_compiled_to_system(compiled_data, source_hash=source_hash)
@@ -1,25 +1,29 @@
 """The parsers for transformation of Uppaal XML models to system objects, and vice versa."""
 
 from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 from copy import deepcopy
+from functools import partial
 
 from lxml import etree
 
 import uppyyl_simulator.backend.models.ta.nta as nta
+import uppyyl_simulator.backend.models.ta.ta as ta
 from uppyyl_simulator.backend.data_structures.ast.ast_code_element import (
     apply_func_to_ast
 )
+from uppyyl_simulator.backend.models.base.declaration import Declaration
 from uppyyl_simulator.backend.helper.helper import (
     unique_id
 )
 from uppyyl_simulator.backend.models.base.query import (
     Query
 )
-from uppyyl_simulator.backend.ast.parsers.generated.uppaal_c_language_parser import (
-    UppaalCLanguageParser
+from uppyyl_simulator.backend.ast.parsers.uppaal_c_parser_factory import (
+    get_uppaal_c_parser
 )
-from uppyyl_simulator.backend.ast.parsers.uppaal_c_language_semantics import (
-    UppaalCLanguageSemantics
+from uppyyl_simulator.backend.ast.parsers.uppaal_c_ast_cache import (
+    InMemoryASTCache, get_ast_cache, parse_cached
 )
 
 
@@ -60,159 +64,185 @@ def uppaal_xml_to_dict(system_xml_str):
     system["templates"] = []
     template_elements = nta_element.findall("template")
     for template_element in template_elements:
-        template = OrderedDict()
+        system["templates"].append(_template_element_to_dict(template_element))
 
-        template["id"] = unique_id("tmpl")
+    #################
+    # Parse queries #
+    #################
+    system["queries"] = _queries_element_to_list(nta_element.find("queries"))
 
-        # Parse template name
-        template_name_element = template_element.find("name")
-        if template_name_element is not None:
-            template["name"] = template_name_element.text
-        else:
-            template["name"] = ""
+    # print(json.dumps(system, indent=2))
+    return system
 
-        # Parse template parameters
-        template_parameters_element = template_element.find("parameter")
-        if template_parameters_element is not None:
-            template["parameters"] = template_parameters_element.text
-        else:
-            template["parameters"] = ""
 
-        # Parse local template declaration
-        template_declaration_element = template_element.find("declaration")
-        if template_declaration_element is not None:
-            template["declaration"] = template_declaration_element.text
-        else:
-            template["declaration"] = ""
+def _template_element_to_dict(template_element):
+    """Transforms the XML element of a Uppaal template into a data dictionary.
 
-        ###################
-        # Parse locations #
-        ###################
-        template["locations"] = []
-        location_elements = template_element.findall("location")
-        for location_element in location_elements:
-            location = OrderedDict()
-            location["id"] = location_element.attrib["id"]
-            location["pos"] = {
-                "x": int(location_element.attrib["x"]),
-                "y": int(location_element.attrib["y"])
-            }
+    Args:
+        template_element: The template XML element.
 
-            # Parse location name
-            location["name"] = None
-            location["name_label"] = None
-            location_name_element = location_element.find("name")
-            if location_name_element is not None:
-                label = OrderedDict()
-                label["id"] = unique_id("label")
-                label["pos"] = {
-                    "x": int(location_name_element.attrib["x"]),
-                    "y": int(location_name_element.attrib["y"])
-                }
-                location["name"] = location_name_element.text
-                location["name_label"] = label
+    Returns:
+        The data dictionary of the template.
+    """
+    template = OrderedDict()
 
-            # Parse urgent / committed
-            urgent_element = location_element.find("urgent")
-            location["urgent"] = (urgent_element is not None)
+    template["id"] = unique_id("tmpl")
 
-            committed_element = location_element.find("committed")
-            location["committed"] = (committed_element is not None)
+    # Parse template name
+    template_name_element = template_element.find("name")
+    if template_name_element is not None:
+        template["name"] = template_name_element.text
+    else:
+        template["name"] = ""
 
-            # Parse location labels
-            location["invariant"] = None
-            location["invariant_label"] = None
-            label_elements = location_element.findall("label")
-            for label_element in label_elements:
-                label = OrderedDict()
-                label["id"] = unique_id("label")
-                label["pos"] = {
-                    "x": int(label_element.attrib["x"]),
-                    "y": int(label_element.attrib["y"])
-                }
-
-                if label_element.attrib["kind"] == "invariant":
-                    location["invariant"] = label_element.text
-                    location["invariant_label"] = label
-
-            template["locations"].append(location)
+    # Parse template parameters
+    template_parameters_element = template_element.find("parameter")
+    if template_parameters_element is not None:
+        template["parameters"] = template_parameters_element.text
+    else:
+        template["parameters"] = ""
 
-        # Parse initial location
-        init_location_element = template_element.find("init")
-        if init_location_element is not None:
-            template["init_loc_id"] = init_location_element.attrib["ref"]
+    # Parse local template declaration
+    template_declaration_element = template_element.find("declaration")
+    if template_declaration_element is not None:
+        template["declaration"] = template_declaration_element.text
+    else:
+        template["declaration"] = ""
 
-        ###############
-        # Parse edges #
-        ###############
-        template["edges"] = []  # OrderedDict()
-        edge_elements = template_element.findall("transition")
-        for edge_element in edge_elements:
-            edge = OrderedDict()
-            edge["id"] = unique_id("edge")
-
-            # Parse edge source location
-            edge_source_element = edge_element.find("source")
-            if edge_source_element is not None:
-                edge["source_loc_id"] = edge_source_element.attrib["ref"]
-
-            # Parse edge target location
-            edge_target_element = edge_element.find("target")
-            if edge_target_element is not None:
-                edge["target_loc_id"] = edge_target_element.attrib["ref"]
+    ###################
+    # Parse locations #
+    ###################
+    template["locations"] = []
+    location_elements = template_element.findall("location")
+    for location_element in location_elements:
+        location = OrderedDict()
+        location["id"] = location_element.attrib["id"]
+        location["pos"] = {
+            "x": int(location_element.attrib["x"]),
+            "y": int(location_element.attrib["y"])
+        }
+
+        # Parse location name
+        location["name"] = None
+        location["name_label"] = None
+        location_name_element = location_element.find("name")
+        if location_name_element is not None:
+            label = OrderedDict()
+            label["id"] = unique_id("label")
+            label["pos"] = {
+                "x": int(location_name_element.attrib["x"]),
+                "y": int(location_name_element.attrib["y"])
+            }
+            location["name"] = location_name_element.text
+            location["name_label"] = label
+
+        # Parse urgent / committed
+        urgent_element = location_element.find("urgent")
+        location["urgent"] = (urgent_element is not None)
+
+        committed_element = location_element.find("committed")
+        location["committed"] = (committed_element is not None)
+
+        # Parse location labels
+        location["invariant"] = None
+        location["invariant_label"] = None
+        label_elements = location_element.findall("label")
+        for label_element in label_elements:
+            label = OrderedDict()
+            label["id"] = unique_id("label")
+            label["pos"] = {
+                "x": int(label_element.attrib["x"]),
+                "y": int(label_element.attrib["y"])
+            }
 
-            # Parse edge labels
-            edge["guard"] = None
-            edge["guard_label"] = None
-            edge["update"] = None
-            edge["update_label"] = None
-            edge["synchronisation"] = None
-            edge["sync_label"] = None
-            edge["select"] = None
-            edge["select_label"] = None
-            label_elements = edge_element.findall("label")
-            for label_element in label_elements:
-                label = OrderedDict()
-                label["id"] = unique_id("label")
-                label["pos"] = {
-                    "x": int(label_element.attrib["x"]),
-                    "y": int(label_element.attrib["y"])
-                }
-
-                if label_element.attrib["kind"] == "guard":
-                    edge["guard"] = label_element.text
-                    edge["guard_label"] = label
-                elif label_element.attrib["kind"] == "assignment":
-                    edge["update"] = label_element.text
-                    edge["update_label"] = label
-                elif label_element.attrib["kind"] == "synchronisation":
-                    edge["synchronisation"] = label_element.text
-                    edge["sync_label"] = label
-                elif label_element.attrib["kind"] == "select":
-                    edge["select"] = label_element.text
-                    edge["select_label"] = label
+            if label_element.attrib["kind"] == "invariant":
+                location["invariant"] = label_element.text
+                location["invariant_label"] = label
+
+        template["locations"].append(location)
+
+    # Parse initial location
+    init_location_element = template_element.find("init")
+    if init_location_element is not None:
+        template["init_loc_id"] = init_location_element.attrib["ref"]
+
+    ###############
+    # Parse edges #
+    ###############
+    template["edges"] = []  # OrderedDict()
+    edge_elements = template_element.findall("transition")
+    for edge_element in edge_elements:
+        edge = OrderedDict()
+        edge["id"] = unique_id("edge")
+
+        # Parse edge source location
+        edge_source_element = edge_element.find("source")
+        if edge_source_element is not None:
+            edge["source_loc_id"] = edge_source_element.attrib["ref"]
+
+        # Parse edge target location
+        edge_target_element = edge_element.find("target")
+        if edge_target_element is not None:
+            edge["target_loc_id"] = edge_target_element.attrib["ref"]
+
+        # Parse edge labels
+        edge["guard"] = None
+        edge["guard_label"] = None
+        edge["update"] = None
+        edge["update_label"] = None
+        edge["synchronisation"] = None
+        edge["sync_label"] = None
+        edge["select"] = None
+        edge["select_label"] = None
+        label_elements = edge_element.findall("label")
+        for label_element in label_elements:
+            label = OrderedDict()
+            label["id"] = unique_id("label")
+            label["pos"] = {
+                "x": int(label_element.attrib["x"]),
+                "y": int(label_element.attrib["y"])
+            }
 
-            # Parse edge nails
-            edge["nails"] = []
-            nail_elements = edge_element.findall("nail")
-            for nail_element in nail_elements:
-                nail = OrderedDict()
-                nail["id"] = unique_id("nail")
-                nail["pos"] = {
-                    "x": int(nail_element.attrib["x"]),
-                    "y": int(nail_element.attrib["y"])
-                }
-                edge["nails"].append(nail)
+            if label_element.attrib["kind"] == "guard":
+                edge["guard"] = label_element.text
+                edge["guard_label"] = label
+            elif label_element.attrib["kind"] == "assignment":
+                edge["update"] = label_element.text
+                edge["update_label"] = label
+            elif label_element.attrib["kind"] == "synchronisation":
+                edge["synchronisation"] = label_element.text
+                edge["sync_label"] = label
+            elif label_element.attrib["kind"] == "select":
+                edge["select"] = label_element.text
+                edge["select_label"] = label
+
+        # Parse edge nails
+        edge["nails"] = []
+        nail_elements = edge_element.findall("nail")
+        for nail_element in nail_elements:
+            nail = OrderedDict()
+            nail["id"] = unique_id("nail")
+            nail["pos"] = {
+                "x": int(nail_element.attrib["x"]),
+                "y": int(nail_element.attrib["y"])
+            }
+            edge["nails"].append(nail)
 
-            template["edges"].append(edge)
+        template["edges"].append(edge)
 
-        system["templates"].append(template)
+    return template
 
-    #################
-    # Parse queries #
-    #################
-    system["queries"] = []
-    root_query_element = nta_element.find("queries")
+
+def _queries_element_to_list(root_query_element):
+    """Transforms the XML element of Uppaal queries into a list of query data dictionaries.
+
+    Args:
+        root_query_element: The queries XML element (or None).
+
+    Returns:
+        The list of query data dictionaries.
+    """
+    queries = []
     if root_query_element is not None:
         query_elements = root_query_element.findall("query")
         for query_element in query_elements:
@@ -227,169 +257,382 @@ def uppaal_xml_to_dict(system_xml_str):
             if comment_element is not None:
                 query["comment"] = comment_element.text.strip()
 
-            system["queries"].append(query)
+            queries.append(query)
 
-    # print(json.dumps(system, indent=2))
-    return system
+    return queries
 
 
 #########################
 # Uppaal dict to system #
 #########################
-def uppaal_dict_to_system(system_data):
+def uppaal_dict_to_system(system_data, parallel=False, max_workers=None, lazy=False):
     """Transforms the data dictionary of a Uppaal system into a system object.
 
     Args:
         system_data: The Uppaal system data dictionary.
+        parallel: Choose whether the code texts of the templates are parsed in parallel by a pool of worker processes
+            before the system object is assembled (see parse_system_code_in_parallel).
+        max_workers: The maximum number of worker processes (defaults to the number of processors).
+        lazy: Choose whether the declarations, template parameters, and location and edge labels are only parsed on
+            first access (see DeferredLabels). The numbers of loaded and actually parsed labels are given by
+            "system.label_parse_stats".
 
     Returns:
         The Uppaal system object.
     """
+    if parallel and lazy:
+        raise Exception("Parallel and lazy loading cannot be combined.")
+
+    # The ASTs parsed in advance are passed down explicitly, so that no global state is changed during assembly
+    ast_cache = None
+    if parallel:
+        ast_cache = InMemoryASTCache(fallback_cache=get_ast_cache())
+        for rule_name, text, ast in parse_system_code_in_parallel(system_data, max_workers=max_workers):
+            ast_cache.put(rule_name, text, ast)
 
     system = nta.System()
-    uppaal_c_parser = UppaalCLanguageParser(semantics=UppaalCLanguageSemantics())
 
-    system.set_declaration(system_data["global_declaration"])
-    system.set_system_declaration(system_data["system_declaration"])
+    system.set_declaration(Declaration(system_data["global_declaration"], lazy=lazy, ast_cache=ast_cache))
+    system.set_system_declaration(system_data["system_declaration"], ast_cache=ast_cache)
 
     ###################
     # Parse templates #
     ###################
     for template_data in system_data["templates"]:
-        id_ = template_data["id"] if ("id" in template_data) else None
-        name = template_data["name"] if ("name" in template_data) else ""
-
-        template = system.new_template(name, id_)
-
-        if template_data["parameters"] != "":
-            parameter_asts = uppaal_c_parser.parse(template_data["parameters"], rule_name='Parameters')
-            for parameter_ast in parameter_asts:
-                template.new_parameter(parameter_ast)
-
-        template.set_declaration(template_data["declaration"])
+        _add_template_from_dict(system, template_data, lazy, ast_cache=ast_cache)
 
-        # Clock check function
-        template_scope_clocks = system.declaration.clocks + template.declaration.clocks
+    #################
+    # Parse queries #
+    #################
+    _add_queries_from_list(system, system_data["queries"], ast_cache=ast_cache)
 
-        def get_clocks(ast, acc):  # TODO: Handle clocks among template parameters
-            """Adds the ast to acc if it is a clock variable.
+    # # print(json.dumps(system, indent=2))
+    return system
 
-            Args:
-                ast: The AST dict.
-                acc: A list of values accumulated during search.
 
-            Returns:
-                The original AST dict.
-            """
-            if ast["astType"] == "Variable":
-                if ast["name"] in template_scope_clocks:
-                    acc.append(ast["name"])
-            return ast
+def _add_template_from_dict(system, template_data, lazy, ast_cache=None):
+    """Creates a template from its data dictionary and adds it to the system.
 
-        ###################
-        # Parse locations #
-        ###################
-        for location_data in template_data["locations"]:
-            id_ = location_data["id"] if ("id" in location_data) else ""
-            name = location_data["name"] if ("name" in location_data) else ""
+    Args:
+        system: The Uppaal system object.
+        template_data: The data dictionary of the template.
+        lazy: Choose whether the template parameters, declaration, and labels are only parsed on first access.
+        ast_cache: An optional AST cache consulted instead of the process-wide AST cache (e.g., of ASTs parsed in
+            advance).
+    """
+    id_ = template_data["id"] if ("id" in template_data) else None
+    name = template_data["name"] if ("name" in template_data) else ""
 
-            location = template.new_location(name, id_)
-            location.view["self"] = {"pos": location_data["pos"].copy()}
+    template = system.new_template(name, id_)
 
-            if location_data["name_label"]:
-                location.view["name_label"] = location_data["name_label"].copy()
+    if template_data["parameters"] != "":
+        _load_or_defer(template, ["parameters"], partial(_add_parameters, template, template_data["parameters"],
+                                                               ast_cache),
+                       lazy)
 
-            if location_data["invariant"]:
-                invariants = uppaal_c_parser.parse(location_data["invariant"], rule_name='Invariants')
-                for inv in invariants:
-                    location.new_invariant(inv)
-            if location_data["invariant_label"]:
-                location.view["invariant_label"] = location_data["invariant_label"].copy()
+    template.set_declaration(Declaration(template_data["declaration"] or "", lazy=lazy, ast_cache=ast_cache))
 
-            if location_data["urgent"]:
-                location.set_urgent(True)
+    # The clocks are identified when the labels are loaded, so that lazy declarations are not parsed beforehand
+    scope_declarations = (system.declaration, template.declaration)  # TODO: Handle clock params
 
-            if location_data["committed"]:
-                location.set_committed(True)
+    def add_labels(obj, attr_names, load_func, *args):
+        """Loads labels of a location or edge, or defers the loading until first access if lazy.
 
-        # Parse initial location
-        template.set_init_location_by_id(template_data["init_loc_id"])
+        Args:
+            obj: The location or edge object.
+            attr_names: The names of the label attributes filled by the load function.
+            load_func: The function which parses and adds the labels.
+            *args: The arguments of the load function.
+        """
+        system.label_parse_stats["labels"] += 1
+        _load_or_defer(obj, attr_names, partial(_load_labels, system.label_parse_stats, load_func, obj, *args), lazy)
 
-        ###############
-        # Parse edges #
-        ###############
-        for edge_data in template_data["edges"]:
-            id_ = edge_data["id"] if ("id" in edge_data) else ""
-            source_loc_id = edge_data["source_loc_id"]
-            target_loc_id = edge_data["target_loc_id"]
-
-            edge = template.new_edge_by_loc_ids(source_loc_id, target_loc_id, id_)
-
-            # Add guards
-            if edge_data["guard"]:
-                guards = uppaal_c_parser.parse(edge_data["guard"], rule_name='Guards')
-                for guard in guards:
-                    if len(apply_func_to_ast(guard, get_clocks)[1]) > 0:
-                        edge.new_clock_guard(guard)
-                    else:
-                        edge.new_variable_guard(guard)
-            if edge_data["guard_label"]:
-                edge.view["guard_label"] = edge_data["guard_label"].copy()
-
-            # Add updates
-            if edge_data["update"]:
-                updates = uppaal_c_parser.parse(edge_data["update"], rule_name='Updates')
-                for update in updates:
-                    if len(apply_func_to_ast(update, get_clocks)[1]) > 0:
-                        edge.new_reset(update)
-                    else:
-                        edge.new_update(update)
-            if edge_data["update_label"]:
-                edge.view["update_label"] = edge_data["update_label"].copy()
-
-            # Add synchronization
-            if edge_data["synchronisation"]:
-                edge.set_sync(edge_data["synchronisation"])
-            if edge_data["sync_label"]:
-                edge.view["sync_label"] = edge_data["sync_label"].copy()
-
-            # Add selects
-            if edge_data["select"]:
-                edge.new_select(edge_data["select"])
-            if edge_data["select_label"]:
-                edge.view["select_label"] = edge_data["select_label"].copy()
-
-            edge.view["nails"] = OrderedDict()
-            for nail in edge_data["nails"]:
-                edge.view["nails"][nail["id"]] = nail
+    ###################
+    # Parse locations #
+    ###################
+    for location_data in template_data["locations"]:
+        id_ = location_data["id"] if ("id" in location_data) else ""
+        name = location_data["name"] if ("name" in location_data) else ""
+
+        location = template.new_location(name, id_)
+        location.view["self"] = {"pos": location_data["pos"].copy()}
+
+        if location_data["name_label"]:
+            location.view["name_label"] = location_data["name_label"].copy()
+
+        if location_data["invariant"]:
+            add_labels(location, ["invariants"], _add_invariants, location_data["invariant"], ast_cache)
+        if location_data["invariant_label"]:
+            location.view["invariant_label"] = location_data["invariant_label"].copy()
+
+        if location_data["urgent"]:
+            location.set_urgent(True)
+
+        if location_data["committed"]:
+            location.set_committed(True)
+
+    # Parse initial location
+    template.set_init_location_by_id(template_data["init_loc_id"])
+
+    ###############
+    # Parse edges #
+    ###############
+    for edge_data in template_data["edges"]:
+        id_ = edge_data["id"] if ("id" in edge_data) else ""
+        source_loc_id = edge_data["source_loc_id"]
+        target_loc_id = edge_data["target_loc_id"]
+
+        edge = template.new_edge_by_loc_ids(source_loc_id, target_loc_id, id_)
+
+        # Add guards
+        if edge_data["guard"]:
+            add_labels(edge, ["clock_guards", "variable_guards"], _add_guards, edge_data["guard"],
+                       scope_declarations, ast_cache)
+        if edge_data["guard_label"]:
+            edge.view["guard_label"] = edge_data["guard_label"].copy()
+
+        # Add updates
+        if edge_data["update"]:
+            add_labels(edge, ["updates", "resets"], _add_updates, edge_data["update"], scope_declarations,
+                       ast_cache)
+        if edge_data["update_label"]:
+            edge.view["update_label"] = edge_data["update_label"].copy()
+
+        # Add synchronization
+        if edge_data["synchronisation"]:
+            add_labels(edge, ["sync"], ta.Edge.set_sync, edge_data["synchronisation"], ast_cache)
+        if edge_data["sync_label"]:
+            edge.view["sync_label"] = edge_data["sync_label"].copy()
+
+        # Add selects
+        if edge_data["select"]:
+            add_labels(edge, ["selects"], ta.Edge.new_select, edge_data["select"], ast_cache)
+        if edge_data["select_label"]:
+            edge.view["select_label"] = edge_data["select_label"].copy()
+
+        edge.view["nails"] = OrderedDict()
+        for nail in edge_data["nails"]:
+            edge.view["nails"][nail["id"]] = nail
+
+
+def _add_queries_from_list(system, queries_data, ast_cache=None):
+    """Creates queries from their data dictionaries and adds them to the system.
 
-    #################
-    # Parse queries #
-    #################
-    for query_data in system_data["queries"]:
+    Args:
+        system: The Uppaal system object.
+        queries_data: The list of query data dictionaries.
+        ast_cache: An optional AST cache consulted instead of the process-wide AST cache.
+    """
+    for query_data in queries_data:
         formula = query_data["formula"]
         comment = query_data["comment"]
-        query = Query(formula, comment)
+        query = Query(formula, comment, ast_cache=ast_cache)
         system.add_query(query)
 
-    # # print(json.dumps(system, indent=2))
-    return system
+
+def _load_or_defer(obj, attr_names, loader, lazy):
+    if lazy:
+        obj.defer_labels(attr_names, loader)
+    else:
+        loader()
+
+
+def _load_labels(label_parse_stats, load_func, obj, *args):
+    load_func(obj, *args)
+    label_parse_stats["parsed"] += 1
+
+
+def _add_parameters(template, parameter_text, ast_cache=None):
+    parameter_asts = parse_cached(get_uppaal_c_parser(), parameter_text, rule_name='Parameters', cache=ast_cache)
+    for parameter_ast in parameter_asts:
+        template.new_parameter(parameter_ast)
+
+
+def _add_invariants(location, invariant_text, ast_cache=None):
+    invariants = parse_cached(get_uppaal_c_parser(), invariant_text, rule_name='Invariants', cache=ast_cache)
+    for inv in invariants:
+        location.new_invariant(inv)
+
+
+def _add_guards(edge, guard_text, scope_declarations, ast_cache=None):
+    clocks = _get_scope_clocks(scope_declarations)
+    guards = parse_cached(get_uppaal_c_parser(), guard_text, rule_name='Guards', cache=ast_cache)
+    for guard in guards:
+        if len(_get_clock_names(guard, clocks)) > 0:
+            edge.new_clock_guard(guard)
+        else:
+            edge.new_variable_guard(guard)
+
+
+def _add_updates(edge, update_text, scope_declarations, ast_cache=None):
+    clocks = _get_scope_clocks(scope_declarations)
+    updates = parse_cached(get_uppaal_c_parser(), update_text, rule_name='Updates', cache=ast_cache)
+    for update in updates:
+        if len(_get_clock_names(update, clocks)) > 0:
+            edge.new_reset(update)
+        else:
+            edge.new_update(update)
+
+
+def _get_scope_clocks(scope_declarations):
+    return [clock for decl in scope_declarations for clock in decl.clocks]
+
+
+def _get_clock_names(ast, clocks):
+    def get_clocks(sub_ast, acc):
+        """Adds the ast to acc if it is a clock variable.
+
+        Args:
+            sub_ast: The AST dict.
+            acc: A list of values accumulated during search.
+
+        Returns:
+            The original AST dict.
+        """
+        if sub_ast["astType"] == "Variable":
+            if sub_ast["name"] in clocks:
+                acc.append(sub_ast["name"])
+        return sub_ast
+
+    return apply_func_to_ast(ast, get_clocks)[1]
+
+
+#########################
+# Parallel Code Parsing #
+#########################
+def parse_system_code_in_parallel(system_data, max_workers=None):
+    """Parses the code texts of a Uppaal system data dictionary in a pool of worker processes.
+
+    The code texts of each template, as well as the global code texts (declarations and queries), are parsed as
+    separate tasks. Texts which cannot be parsed are skipped, so that their parse errors are raised during assembly.
+
+    Args:
+        system_data: The Uppaal system data dictionary.
+        max_workers: The maximum number of worker processes (defaults to the number of processors).
+
+    Returns:
+        A list of (rule name, text, AST) tuples.
+    """
+    tasks = [_get_global_code_texts(system_data)]
+    tasks.extend(_get_template_code_texts(template_data) for template_data in system_data["templates"])
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        results = list(executor.map(parse_code_texts, tasks))
+    return [parsed_text for parsed_texts in results for parsed_text in parsed_texts]
+
+
+def parse_code_texts(texts):
+    """Parses a list of code texts, e.g., within a worker process.
+
+    Args:
+        texts: A list of (rule name, text) tuples.
+
+    Returns:
+        A list of (rule name, text, AST) tuples of all texts that could be parsed.
+    """
+    uppaal_c_parser = get_uppaal_c_parser()
+    parsed_texts = []
+    for rule_name, text in texts:
+        try:
+            ast = parse_cached(uppaal_c_parser, text, rule_name=rule_name)
+        except Exception:
+            continue
+        parsed_texts.append((rule_name, text, ast))
+    return parsed_texts
+
+
+def _get_global_code_texts(system_data):
+    texts = []
+    if system_data["global_declaration"]:
+        texts.append(("UppaalDeclaration", system_data["global_declaration"]))
+    texts.append(("UppaalSystemDeclaration", system_data["system_declaration"] or ""))
+    for query_data in system_data["queries"]:
+        if query_data.get("formula"):
+            texts.append(("UppaalProp", query_data["formula"]))
+    return texts
+
+
+def _get_template_code_texts(template_data):
+    texts = []
+    if template_data["parameters"] != "":
+        texts.append(("Parameters", template_data["parameters"]))
+    if template_data["declaration"]:
+        texts.append(("UppaalDeclaration", template_data["declaration"]))
+    for location_data in template_data["locations"]:
+        if location_data["invariant"]:
+            texts.append(("Invariants", location_data["invariant"]))
+    for edge_data in template_data["edges"]:
+        for key, rule_name in [("guard", "Guards"), ("update", "Updates"), ("synchronisation", "Sync"),
+                               ("select", "Select")]:
+            if edge_data[key]:
+                texts.append((rule_name, edge_data[key]))
+    return texts
 
 
 ########################
 # Uppaal XML to system #
 ########################
-def uppaal_xml_to_system(system_xml_str):
+def uppaal_xml_to_system(system_xml_str, parallel=False, max_workers=None, lazy=False):
     """Transforms the XML description of a Uppaal system into a system object.
 
     Args:
         system_xml_str: The Uppaal system XML string.
+        parallel: Choose whether the code texts of the templates are parsed in parallel by a pool of worker processes.
+        max_workers: The maximum number of worker processes (defaults to the number of processors).
+        lazy: Choose whether the declarations, template parameters, and labels are only parsed on first access.
 
     Returns:
         The Uppaal system object.
     """
     system_data = uppaal_xml_to_dict(system_xml_str)
-    system = uppaal_dict_to_system(system_data)
+    system = uppaal_dict_to_system(system_data, parallel=parallel, max_workers=max_workers, lazy=lazy)
+    return system
+
+
+#############################
+# Uppaal XML file to system #
+#############################
+def uppaal_xml_file_to_system(source, lazy=False):
+    """Transforms the XML description of a Uppaal system into a system object while streaming it from a file.
+
+    In contrast to uppaal_xml_to_system, neither the XML string, nor the whole XML tree, nor the data dictionaries of
+    all templates are held in memory. Instead, each template is added to the system as soon as its XML element is
+    parsed, and processed elements are discarded.
+
+    Args:
+        source: The path of the Uppaal system XML file, or a file object to read it from.
+        lazy: Choose whether the declarations, template parameters, and labels are only parsed on first access.
+
+    Returns:
+        The Uppaal system object.
+    """
+    system = nta.System()
+    system_declaration = ""
+
+    for _event, element in etree.iterparse(source, events=("end",)):
+        parent = element.getparent()
+        if parent is None or parent.getparent() is not None:
+            continue  # Only top-level elements (i.e., children of the "nta" element) are processed as a whole
+
+        if element.tag == "declaration":
+            system.set_declaration(Declaration(element.text or "", lazy=lazy))
+        elif element.tag == "template":
+            if system.declaration is None:
+                system.set_declaration(Declaration("", lazy=lazy))
+            _add_template_from_dict(system, _template_element_to_dict(element), lazy)
+        elif element.tag == "system":
+            system_declaration = element.text
+        elif element.tag == "queries":
+            _add_queries_from_list(system, _queries_element_to_list(element))
+
+        # Discard the processed element and all preceding ones
+        element.clear()
+        while element.getprevious() is not None:
+            del parent[0]
+
+    if system.declaration is None:
+        system.set_declaration(Declaration("", lazy=lazy))
+    system.set_system_declaration(system_declaration)
+
     return system
 
 
@@ -1,16 +1,21 @@
 """Abstract class for an AST code element."""
 
 import abc
+import threading
+
+lazy_parse_lock = threading.RLock()
 
 
 class ASTCodeElement(abc.ABC):
     """An abstract AST code element."""
 
-    def __init__(self, data):
+    def __init__(self, data, lazy=False, ast_cache=None):
         """Initializes ASTCodeElement.
 
         Args:
             data: The AST data in string form or as AST dict.
+            lazy: Choose whether AST data in string form is only parsed on first access of the AST.
+            ast_cache: An optional AST cache consulted instead of the process-wide AST cache when parsing.
         """
         self.printer = None
         self.parser = None
@@ -19,11 +24,29 @@ class ASTCodeElement(abc.ABC):
 
         self.text = None
         self.ast = None
+        self.compiled = None  # An optional compiled form of the AST (reset whenever the AST changes)
+        self.compile_pending = True  # Whether the AST has not been compiled yet (reset as well)
+        self.instance_asts = {}  # Optional instance-specific ASTs, e.g., with inlined constants (reset as well)
+        self.instance_compiled = {}  # Optional compiled forms of the instance-specific ASTs (reset as well)
         if isinstance(data, str):
-            self.set_text(data)
+            self.set_text(data, lazy=lazy, ast_cache=ast_cache)
         else:
             self.set_ast(data)
 
+    @property
+    def ast(self):
+        """The AST dict, which is parsed from the AST text string on first access if set lazily."""
+        if self._ast_pending:
+            with lazy_parse_lock:
+                if self._ast_pending:
+                    self.update_ast()
+        return self._ast
+
+    @ast.setter
+    def ast(self, ast):
+        self._ast = ast
+        self._ast_pending = False
+
     @abc.abstractmethod
     def init_parser(self):
         """Initializes the AST code parser.
@@ -49,21 +72,33 @@ class ASTCodeElement(abc.ABC):
         self.text = self.printer.ast_to_string(self.ast)
 
     @abc.abstractmethod
-    def update_ast(self):
+    def update_ast(self, ast_cache=None):
         """Updates the AST dict from the AST text string.
 
+        Args:
+            ast_cache: An optional AST cache consulted instead of the process-wide AST cache.
+
         Returns:
             None
         """
 
-    def set_text(self, text):
+    def set_text(self, text, lazy=False, ast_cache=None):
         """Sets the AST text string, and update the AST dict accordingly.
 
+        Args:
+            text: The AST text string.
+            lazy: Choose whether the AST dict is only updated on first access.
+            ast_cache: An optional AST cache consulted instead of the process-wide AST cache.
+
         Returns:
             None
         """
         self.text = text if (text is not None) else ""
-        self.update_ast()
+        if lazy:
+            self._ast_pending = True
+        else:
+            self.update_ast(ast_cache=ast_cache)
+        self.reset_compiled()
 
         # if text == "":
         #     self.ast = None
@@ -78,6 +113,39 @@ class ASTCodeElement(abc.ABC):
         """
         self.ast = ast
         self.update_text()
+        self.reset_compiled()
+
+    def reset_compiled(self):
+        """Resets the compiled form and all instance-specific forms of the AST.
+
+        Returns:
+            None
+        """
+        self.compiled = None
+        self.compile_pending = True
+        self.instance_asts = {}
+        self.instance_compiled = {}
+
+    def __getstate__(self):
+        """Gets the state for pickling, which excludes the parser, the printer, and all compiled forms.
+
+        Returns:
+            The state dict.
+        """
+        self.ast  # Parse a lazily set AST text string first
+        state = self.__dict__.copy()
+        state.update(parser=None, printer=None, compiled=None, compile_pending=True, instance_compiled={})
+        return state
+
+    def __setstate__(self, state):
+        """Sets the state on unpickling, and re-initializes the parser and the printer.
+
+        Args:
+            state: The state dict.
+        """
+        self.__dict__.update(state)
+        self.init_parser()
+        self.init_printer()
 
     @abc.abstractmethod
     def copy(self):
@@ -51,6 +51,172 @@ def switch_relation(rel):
         raise Exception("Unknown relation type.")
 
 
+##################
+# Encoded Bounds #
+##################
+# A bound (val, rel) is encoded as a single integer "(val << 1) | strictness", where the strictness bit is 1 for "<="
+# and 0 for "<". The natural integer order of encoded bounds then equals the order of DBM entries.
+BOUND_INF = 1 << 61  # Encodes (inf, "<"); chosen so that the sum of two bounds cannot overflow int64
+BOUND_LE_ZERO = 1  # Encodes (0, "<=")
+
+
+def encode_bound(val, rel):
+    """Encodes a bound value and relation into a single integer.
+
+    Args:
+        val: The bound value.
+        rel: The relation string of the bound (i.e., "<" or "<=").
+
+    Returns:
+        The encoded bound.
+    """
+    if val == np.inf:
+        return BOUND_INF
+    return (int(val) << 1) | (1 if rel == '<=' else 0)
+
+
+def decode_bound(bound):
+    """Decodes an encoded bound into its value and relation.
+
+    Args:
+        bound: The encoded bound.
+
+    Returns:
+        The bound value and relation string.
+    """
+    bound = int(bound)
+    if bound >= BOUND_INF:
+        return np.inf, '<'
+    return bound >> 1, ('<=' if bound & 1 else '<')
+
+
+def add_bounds(bound1, bound2):
+    """Adds two encoded bounds (i.e., the values are added, and the result is strict if any operand is strict).
+
+    Args:
+        bound1: The first encoded bound.
+        bound2: The second encoded bound.
+
+    Returns:
+        The encoded sum.
+    """
+    if bound1 >= BOUND_INF or bound2 >= BOUND_INF:
+        return BOUND_INF
+    return bound1 + bound2 - ((bound1 | bound2) & 1)
+
+
+def add_bound_arrays(bounds1, bounds2):
+    """Adds two (broadcastable) arrays of encoded bounds element-wise.
+
+    Args:
+        bounds1: The first encoded bound array.
+        bounds2: The second encoded bound array.
+
+    Returns:
+        The array of encoded sums.
+    """
+    bound_sums = bounds1 + bounds2 - ((bounds1 | bounds2) & 1)
+    return np.where((bounds1 == BOUND_INF) | (bounds2 == BOUND_INF), BOUND_INF, bound_sums)
+
+
+def encode_matrix(matrix):
+    """Encodes a DBM matrix of DBMEntry objects into an int64 array of encoded bounds.
+
+    Args:
+        matrix: The DBM matrix.
+
+    Returns:
+        The encoded bound array.
+    """
+    return np.array([[encode_bound(entry.val, entry.rel) for entry in row] for row in matrix], dtype=np.int64)
+
+
+def floyd_warshall_bounds(bounds):
+    """Applies the Floyd-Warshall shortest paths algorithm to an array of encoded bounds (in place).
+
+    Each iteration relaxes all entries via clock k at once, i.e., bounds = min(bounds, bounds[:,k] + bounds[k,:]).
+
+    Args:
+        bounds: The encoded bound array.
+
+    Returns:
+        The closed form of the encoded bound array.
+    """
+    for k in range(len(bounds)):
+        path_bounds = add_bound_arrays(bounds[:, k, None], bounds[None, k, :])
+        np.minimum(bounds, path_bounds, out=bounds)
+    return bounds
+
+
+def tighten_bounds(bounds, i, j, bound):
+    """Tightens a single entry of a closed array of encoded bounds, and restores its closed form (in place).
+
+    Only paths via the tightened entry can become shorter, so a single relaxation step
+    bounds = min(bounds, bounds[:,i] + bound + bounds[j,:]) suffices (i.e., O(n^2) instead of O(n^3)). If the new
+    bound closes a negative cycle with bounds[j,i], the zone is empty; this is marked by a negative diagonal entry
+    bounds[i,i] and the relaxation step is skipped.
+
+    Args:
+        bounds: The closed encoded bound array.
+        i: The row index of the tightened entry.
+        j: The column index of the tightened entry.
+        bound: The new encoded bound.
+
+    Returns:
+        The closed form of the tightened encoded bound array.
+    """
+    if bound >= bounds[i, j]:
+        return bounds
+    cycle_bound = add_bounds(bound, int(bounds[j, i]))
+    if cycle_bound < BOUND_LE_ZERO:
+        bounds[i, i] = cycle_bound
+        return bounds
+    bounds[i, j] = bound
+    path_bounds = add_bound_arrays(add_bound_arrays(bounds[:, i, None], bound), bounds[None, j, :])
+    np.minimum(bounds, path_bounds, out=bounds)
+    return bounds
+
+
+def extrapolate_bounds(bounds, lower_bounds, upper_bounds):
+    """Applies the LU-extrapolation (Extra_LU) to an array of encoded bounds, and closes it (in place).
+
+    Entries bounds[i,j] > (L_i, "<=") are relaxed to infinity, and entries bounds[i,j] < (-U_j, "<") are relaxed to
+    (-U_j, "<"). For L = U, this equals the classic maximal bounds extrapolation (Extra_M). Lower clock bounds in
+    the first row are relaxed to (0, "<=") at most, so that clocks remain non-negative.
+
+    Args:
+        bounds: The encoded bound array.
+        lower_bounds: The maximal lower bound constants L per clock index (-np.inf if a clock has no lower bound).
+        upper_bounds: The maximal upper bound constants U per clock index (-np.inf if a clock has no upper bound).
+
+    Returns:
+        The extrapolated encoded bound array in closed form.
+    """
+    row_limits = np.array([-BOUND_INF if val == -np.inf else encode_bound(val, '<=') for val in lower_bounds],
+                          dtype=np.int64)
+    col_limits = np.array([encode_bound(-val, '<') for val in upper_bounds], dtype=np.int64)
+    col_limits = np.tile(col_limits, (len(bounds), 1))
+    col_limits[0] = np.minimum(col_limits[0], BOUND_LE_ZERO)
+    diagonal = np.diagonal(bounds).copy()
+    extrapolated = np.where(bounds < col_limits, col_limits, bounds)
+    extrapolated = np.where(bounds > row_limits[:, None], BOUND_INF, extrapolated)
+    np.fill_diagonal(extrapolated, diagonal)
+    bounds[:, :] = extrapolated
+    return floyd_warshall_bounds(bounds)
+
+
+def decode_matrix(bounds):
+    """Decodes an int64 array of encoded bounds into a DBM matrix of DBMEntry objects.
+
+    Args:
+        bounds: The encoded bound array.
+
+    Returns:
+        The DBM matrix.
+    """
+    return [[DBMEntry(*decode_bound(bound)) for bound in row] for row in bounds.tolist()]
+
+
 #############
 # DBM Entry #
 #############
@@ -263,6 +429,18 @@ class Interval:
                 ((self.upper_val == self.lower_val) and
                  (not self.lower_incl or not self.upper_incl)))
 
+    def contains(self, val):
+        """Checks if a value lies in the DBM interval.
+
+        Args:
+            val: The value.
+
+        Returns:
+            The checking result.
+        """
+        return ((self.lower_val < val or (self.lower_val == val and self.lower_incl)) and
+                (val < self.upper_val or (val == self.upper_val and self.upper_incl)))
+
     def get_random(self):
         """Provides a random integer value drawn from the interval.
 
@@ -331,6 +509,18 @@ class DBM:
             for i in range(clock_num):
                 self.matrix[i][i] = DBMEntry(0, '<=')
 
+    def get_entry(self, i, j):
+        """Provides the DBM entry at a given position.
+
+        Args:
+            i: The row index.
+            j: The column index.
+
+        Returns:
+            The DBM entry.
+        """
+        return self.matrix[i][j]
+
     def get_interval(self, clock):
         """Provides the value interval for a given clock.
 
@@ -401,7 +591,7 @@ class DBM:
         Returns:
             The DBM in closed form.
         """
-        self.matrix = floyd_warshall(self.matrix)
+        self.matrix = decode_matrix(floyd_warshall_bounds(encode_matrix(self.matrix)))
         return self
 
     def canonicalize(self):
@@ -425,6 +615,9 @@ class DBM:
             up = self.matrix[i][0]
             if lo.val < -up.val or (up.val == -lo.val and (lo.rel == '<' or up.rel == '<')):
                 return True
+            # If a negative cycle was detected during closure
+            if self.matrix[i][i] < DBMEntry(0, '<='):
+                return True
         return False
 
     def includes(self, other):
@@ -513,6 +706,62 @@ class DBM:
             self.matrix[clock_1_index][clock_2_index] = new_entry
         return self
 
+    def conjugate_and_close(self, constraint):
+        """Conjugates a closed DBM with a constraint, and incrementally restores its closed form in O(n^2).
+
+        Args:
+            constraint: The constraint that should be applied to the DBM.
+
+        Returns:
+            The constrained DBM in closed form.
+        """
+        clock_1_index = self.clocks.index(constraint.clock1)
+        clock_2_index = self.clocks.index(constraint.clock2)
+        new_entry = DBMEntry(constraint.val, constraint.rel)
+        curr_entry = self.matrix[clock_1_index][clock_2_index]
+        if new_entry < curr_entry:
+            bounds = encode_matrix(self.matrix)
+            tighten_bounds(bounds, clock_1_index, clock_2_index, encode_bound(new_entry.val, new_entry.rel))
+            self.matrix = decode_matrix(bounds)
+        return self
+
+    def _get_clock_bound_list(self, clock_bounds):
+        """Arranges clock bound constants by clock index (the reference clock is bounded by 0).
+
+        Args:
+            clock_bounds: A dict of bound constants per clock name (missing clocks are unbounded).
+
+        Returns:
+            The list of bound constants per clock index (-np.inf for unbounded clocks).
+        """
+        return [0] + [clock_bounds.get(clock, -np.inf) for clock in self.clocks[1:]]
+
+    def extrapolate_lu(self, lower_bounds, upper_bounds):
+        """Extrapolates the DBM w.r.t. the maximal lower and upper bound constants of the clocks (Extra_LU).
+
+        Args:
+            lower_bounds: A dict of maximal lower bound constants per clock name (missing clocks are unbounded).
+            upper_bounds: A dict of maximal upper bound constants per clock name (missing clocks are unbounded).
+
+        Returns:
+            The extrapolated DBM in closed form.
+        """
+        bounds = extrapolate_bounds(encode_matrix(self.matrix), self._get_clock_bound_list(lower_bounds),
+                                    self._get_clock_bound_list(upper_bounds))
+        self.matrix = decode_matrix(bounds)
+        return self
+
+    def extrapolate_max_bounds(self, max_bounds):
+        """Extrapolates the DBM w.r.t. the maximal bound constants of the clocks (Extra_M).
+
+        Args:
+            max_bounds: A dict of maximal bound constants per clock name (missing clocks are unbounded).
+
+        Returns:
+            The extrapolated DBM in closed form.
+        """
+        return self.extrapolate_lu(lower_bounds=max_bounds, upper_bounds=max_bounds)
+
     def reset(self, clock, val):
         """Resets a given clock of the DBM, adapting the differences to the remaining clocks.
 
@@ -572,3 +821,386 @@ class DBM:
 
     def __ne__(self, other):
         return not self.__eq__(other)
+
+    def __hash__(self):
+        # Computed on every call, as DBMEntry objects of the matrix may be modified in place
+        return hash(encode_matrix(self.matrix).tobytes())
+
+
+###################################
+# Packed Difference Bounds Matrix #
+###################################
+class PackedDBM(DBM):
+    """A difference bound matrix (DBM) storing all bounds encoded as integers in a contiguous int64 array.
+
+    In contrast to DBM, no DBMEntry object is allocated per entry, so that copying is a single buffer copy and
+    operations can be applied to whole rows and columns at once.
+    """
+
+    def __init__(self, clocks, add_ref_clock=True, zero_init=False):
+        """Initializes PackedDBM.
+
+        Args:
+            clocks: A list of clock names based on which the DBM is created.
+            add_ref_clock: Optionally adds the artificial reference clock "T0_REF" to the DBM.
+            zero_init: Optionally initializes all DBM entries to 0 (e.g., as in Uppaal).
+        """
+        self._matrix = None
+        self._hash = None
+        self.frozen = False
+        super().__init__(clocks=clocks, add_ref_clock=add_ref_clock, zero_init=zero_init)
+        self.clock_indices = {clock: i for i, clock in enumerate(self.clocks)}
+
+    @property
+    def matrix(self):
+        """The encoded bound matrix."""
+        return self._matrix
+
+    @matrix.setter
+    def matrix(self, matrix):
+        self._modify()
+        self._matrix = matrix
+
+    def _modify(self):
+        """Prepares the DBM for a modification by invalidating its cached hash."""
+        if self.frozen:
+            raise Exception("A frozen DBM cannot be modified.")
+        self._hash = None
+
+    def freeze(self):
+        """Freezes the DBM, so that it cannot be modified anymore (e.g., for sharing it via an intern table).
+
+        Returns:
+            The frozen DBM.
+        """
+        self._matrix.flags.writeable = False
+        self.frozen = True
+        return self
+
+    @classmethod
+    def from_dbm(cls, dbm):
+        """Creates a PackedDBM from a DBM with DBMEntry objects.
+
+        Args:
+            dbm: The source DBM.
+
+        Returns:
+            The PackedDBM instance.
+        """
+        packed_dbm = cls(clocks=dbm.clocks, add_ref_clock=False)
+        packed_dbm.matrix = encode_matrix(dbm.matrix)
+        return packed_dbm
+
+    def to_dbm(self):
+        """Creates a DBM with DBMEntry objects from the PackedDBM.
+
+        Returns:
+            The DBM instance.
+        """
+        dbm = DBM(clocks=self.clocks, add_ref_clock=False)
+        dbm.matrix = decode_matrix(self.matrix)
+        return dbm
+
+    def init_matrix(self, zero_init=False):
+        """Initializes the bound matrix.
+
+        Args:
+            zero_init: Optionally initializes all DBM entries to 0 (e.g., as in Uppaal).
+        """
+        clock_num = len(self.clocks)
+        if zero_init:
+            self.matrix = np.full((clock_num, clock_num), BOUND_LE_ZERO, dtype=np.int64)
+        else:
+            self.matrix = np.full((clock_num, clock_num), BOUND_INF, dtype=np.int64)
+            np.fill_diagonal(self.matrix, BOUND_LE_ZERO)
+
+    def get_entry(self, i, j):
+        """Provides the DBM entry at a given position.
+
+        Args:
+            i: The row index.
+            j: The column index.
+
+        Returns:
+            The decoded DBM entry.
+        """
+        return DBMEntry(*decode_bound(self.matrix[i, j]))
+
+    def set_entry(self, i, j, entry):
+        """Sets the DBM entry at a given position.
+
+        Args:
+            i: The row index.
+            j: The column index.
+            entry: The DBM entry.
+        """
+        self._modify()
+        self.matrix[i, j] = encode_bound(entry.val, entry.rel)
+
+    def get_interval(self, clock):
+        """Provides the value interval for a given clock.
+
+        Args:
+            clock: The clock for which the interval is requested.
+
+        Returns:
+            The value interval.
+        """
+        clock_index = self.clock_indices[clock]
+
+        lower_val, lower_rel = decode_bound(self.matrix[0, clock_index])
+        upper_val, upper_rel = decode_bound(self.matrix[clock_index, 0])
+
+        interval = Interval(lower_val=-lower_val, lower_incl=(lower_rel == "<="),
+                            upper_val=upper_val, upper_incl=(upper_rel == "<="))
+
+        return interval
+
+    def make_graph(self):
+        """Generates a graph representation of the DBM.
+
+        Returns:
+            The graph representation of the DBM.
+        """
+        graph = WeightedGraph()
+        for clock in self.clocks:
+            graph.new_node(clock)
+        for i in range(len(self.matrix)):
+            for j in range(len(self.matrix)):
+                if i != j:
+                    graph.new_edge_by_node_names(source_name=self.clocks[j], target_name=self.clocks[i],
+                                                 weight=decode_bound(self.matrix[i, j])[0])
+
+        return graph
+
+    def transpose(self):
+        """Transposes the DBM (i.e., swaps rows and columns (DBM^T))
+
+        Returns:
+            The transposed DBM.
+        """
+        self._modify()
+        self.matrix = np.ascontiguousarray(self.matrix.T)
+        return self
+
+    def negate(self):
+        """Inverts the DBM (i.e., multiplies all finite values with -1, keeping the relations)
+
+        Returns:
+            The inverted DBM.
+        """
+        self._modify()
+        finite = self.matrix != BOUND_INF
+        negated = (-(self.matrix >> 1) << 1) | (self.matrix & 1)
+        self.matrix = np.where(finite, negated, self.matrix)
+        return self
+
+    def close(self):
+        """Transforms the DBM into closed form.
+
+        Returns:
+            The DBM in closed form.
+        """
+        self._modify()
+        floyd_warshall_bounds(self.matrix)
+        return self
+
+    def is_empty(self):
+        """Checks if the DBM is empty (i.e., for all intervals, the lower bound is smaller-equal the upper bound).
+
+        Returns:
+            The emptiness checking result.
+        """
+        cycle_bounds = add_bound_arrays(self.matrix[0, :], self.matrix[:, 0])
+        return bool(np.any(cycle_bounds < BOUND_LE_ZERO) or np.any(np.diagonal(self.matrix) < BOUND_LE_ZERO))
+
+    def includes(self, other):
+        """Checks if the DBM includes another DBM (i.e., it is a super region of the other DBM)
+
+        Args:
+            other: The other DBM.
+
+        Returns:
+            The inclusion checking result.
+        """
+        return bool(np.all(other.matrix <= self.matrix))
+
+    def intersect(self, other):
+        """Intersects the DBM with another DBM.
+
+        Args:
+            other: The other DBM.
+
+        Returns:
+            The intersected DBM.
+        """
+        self._modify()
+        np.minimum(self.matrix, other.matrix, out=self.matrix)
+        self.canonicalize()
+        return self
+
+    def delay_future(self):
+        """Delays the DBM into the future by setting all upper clock bounds (DBM[i,0]) to infinity.
+
+        Returns:
+            The delayed DBM.
+        """
+        self._modify()
+        self.matrix[1:, 0] = BOUND_INF
+        return self
+
+    def delay_past(self):
+        """Delays the DBM into the past by setting all lower clock bounds (DBM[0,i]) to 0.
+
+        Returns:
+            The delayed DBM.
+        """
+        self._modify()
+        self.matrix[0, 1:] = BOUND_LE_ZERO
+        return self
+
+    def conjugate(self, constraint):
+        """Conjugates the DBM with a constraint, restricting its region.
+
+        Args:
+            constraint: The constraint that should be applied to the DBM.
+
+        Returns:
+            The constrained DBM.
+        """
+        self._modify()
+        clock_1_index = self.clock_indices[constraint.clock1]
+        clock_2_index = self.clock_indices[constraint.clock2]
+        new_bound = encode_bound(constraint.val, constraint.rel)
+        if new_bound < self.matrix[clock_1_index, clock_2_index]:
+            self.matrix[clock_1_index, clock_2_index] = new_bound
+        return self
+
+    def conjugate_and_close(self, constraint):
+        """Conjugates a closed DBM with a constraint, and incrementally restores its closed form in O(n^2).
+
+        Args:
+            constraint: The constraint that should be applied to the DBM.
+
+        Returns:
+            The constrained DBM in closed form.
+        """
+        self._modify()
+        clock_1_index = self.clock_indices[constraint.clock1]
+        clock_2_index = self.clock_indices[constraint.clock2]
+        tighten_bounds(self.matrix, clock_1_index, clock_2_index, encode_bound(constraint.val, constraint.rel))
+        return self
+
+    def extrapolate_lu(self, lower_bounds, upper_bounds):
+        """Extrapolates the DBM w.r.t. the maximal lower and upper bound constants of the clocks (Extra_LU).
+
+        Args:
+            lower_bounds: A dict of maximal lower bound constants per clock name (missing clocks are unbounded).
+            upper_bounds: A dict of maximal upper bound constants per clock name (missing clocks are unbounded).
+
+        Returns:
+            The extrapolated DBM in closed form.
+        """
+        self._modify()
+        extrapolate_bounds(self.matrix, self._get_clock_bound_list(lower_bounds),
+                           self._get_clock_bound_list(upper_bounds))
+        return self
+
+    def reset(self, clock, val):
+        """Resets a given clock of the DBM, adapting the differences to the remaining clocks.
+
+        Args:
+            clock: The clock that should be reset.
+            val: The reset value.
+
+        Returns:
+            The DBM after reset.
+        """
+        self._modify()
+        clock_index = self.clock_indices[clock]
+        self.matrix[:, clock_index] = add_bound_arrays(encode_bound(-val, '<='), self.matrix[:, 0])
+        self.matrix[clock_index, :] = add_bound_arrays(encode_bound(val, '<='), self.matrix[0, :])
+        return self
+
+    def copy_matrix(self):
+        """Copies the bound matrix of the DBM.
+
+        Returns:
+            The copied bound matrix.
+        """
+        return self.matrix.copy()
+
+    def copy(self):
+        """Copies the PackedDBM instance.
+
+        Returns:
+            The copied PackedDBM instance.
+        """
+        copy_obj = self.__class__.__new__(self.__class__)
+        # The clock list and indices are never modified after initialization, and can therefore be shared
+        copy_obj.clocks = self.clocks
+        copy_obj.clock_indices = self.clock_indices
+        copy_obj._matrix = self.copy_matrix()
+        copy_obj._hash = self._hash
+        copy_obj.frozen = False
+        return copy_obj
+
+    def __repr__(self):
+        s = [[""] + self.clocks]
+        s += [([self.clocks[i]] + [str(DBMEntry(*decode_bound(bound))) for bound in row])
+              for i, row in enumerate(self.matrix.tolist())]
+        lens = [max(map(len, col)) for col in zip(*s)]
+        fmt = ' '.join('{{:{}}}'.format(x) for x in lens)
+        table = [fmt.format(*row) for row in s]
+        return '\n'.join(table)
+
+    def __eq__(self, other):
+        if self is other:
+            return True
+        if self._hash is not None and getattr(other, "_hash", None) is not None and self._hash != other._hash:
+            return False
+        return np.array_equal(self.matrix, other.matrix)
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        if self._hash is None:
+            self._hash = hash(self.matrix.tobytes())
+        return self._hash
+
+
+####################
+# DBM Intern Table #
+####################
+class DBMInternTable:
+    """An intern table which maps identical DBMs to a single shared, frozen PackedDBM instance."""
+
+    def __init__(self):
+        """Initializes DBMInternTable."""
+        self.dbms = {}
+
+    def intern(self, dbm):
+        """Gets the shared instance of a DBM, adding a frozen copy of the DBM if no identical DBM is contained yet.
+
+        Args:
+            dbm: The PackedDBM.
+
+        Returns:
+            The shared, frozen PackedDBM instance.
+        """
+        shared_dbm = self.dbms.get(dbm)
+        if shared_dbm is None:
+            shared_dbm = dbm.copy().freeze()
+            self.dbms[shared_dbm] = shared_dbm
+        return shared_dbm
+
+    def clear(self):
+        """Removes all DBMs from the intern table."""
+        self.dbms.clear()
+
+    def __contains__(self, dbm):
+        return dbm in self.dbms
+
+    def __len__(self):
+        return len(self.dbms)
@@ -74,6 +74,31 @@ class DBMOperationGenerator:
         """
         return Close()
 
+    @staticmethod
+    def generate_extrapolate_max_bounds(max_bounds):
+        """Generates an "extrapolate max bounds" DBM operation instance.
+
+        Args:
+            max_bounds: A dict of maximal bound constants per clock name.
+
+        Returns:
+            An "extrapolate max bounds" DBM operation instance.
+        """
+        return ExtrapolateMaxBounds(max_bounds)
+
+    @staticmethod
+    def generate_extrapolate_lu(lower_bounds, upper_bounds):
+        """Generates an "extrapolate LU" DBM operation instance.
+
+        Args:
+            lower_bounds: A dict of maximal lower bound constants per clock name.
+            upper_bounds: A dict of maximal upper bound constants per clock name.
+
+        Returns:
+            An "extrapolate LU" DBM operation instance.
+        """
+        return ExtrapolateLU(lower_bounds, upper_bounds)
+
     def generate_from_program_line(self, program_line):
         """Derives a DBM operation from a program line.
 
@@ -95,6 +120,23 @@ class DBMOperationGenerator:
             return self.generate_reset(clock=args[0], val=int(args[1]))
         elif command == "Constraint":
             return self.generate_constraint(clock1=args[0], clock2=args[1], rel=args[2], val=int(args[3]))
+        elif command == "ExtrapolateMaxBounds":
+            max_bounds = {}
+            for arg in filter(None, args):
+                clock, val = arg.split("=")
+                max_bounds[clock.strip()] = int(val)
+            return self.generate_extrapolate_max_bounds(max_bounds=max_bounds)
+        elif command == "ExtrapolateLU":
+            lower_bounds = {}
+            upper_bounds = {}
+            for arg in filter(None, args):
+                clock, vals = arg.split("=")
+                lower_val, upper_val = vals.split("|")
+                if lower_val.strip() != "-inf":
+                    lower_bounds[clock.strip()] = int(lower_val)
+                if upper_val.strip() != "-inf":
+                    upper_bounds[clock.strip()] = int(upper_val)
+            return self.generate_extrapolate_lu(lower_bounds=lower_bounds, upper_bounds=upper_bounds)
         else:
             raise Exception(f'Command type {command} not supported.')
 
@@ -364,11 +406,12 @@ class Constraint(DBMOperation):  # "<=" constraint
         else:
             raise Exception(f'Relation "{rel}" not supported for Constraint operation.')
 
-    def apply(self, dbm):
+    def apply(self, dbm, close=False):
         """Applies the Constraint operation to a DBM.
 
         Args:
             dbm: The target DBM.
+            close: Optionally restores the closed form incrementally (requires the DBM to be closed beforehand).
 
         Returns:
             The resulting DBM.
@@ -379,7 +422,10 @@ class Constraint(DBMOperation):  # "<=" constraint
         dbm_constr.rel = self.rel
         dbm_constr.val = self.val
 
-        dbm.conjugate(dbm_constr)
+        if close:
+            dbm.conjugate_and_close(dbm_constr)
+        else:
+            dbm.conjugate(dbm_constr)
         return dbm
 
     def copy(self):
@@ -481,3 +527,87 @@ class Close(DBMOperation):
 
     def __str__(self):
         return f'Close()'
+
+
+########################
+# ExtrapolateMaxBounds #
+########################
+class ExtrapolateMaxBounds(DBMOperation):
+    """An ExtrapolateMaxBounds operation."""
+
+    def __init__(self, max_bounds):
+        """Initializes ExtrapolateMaxBounds.
+
+        Args:
+            max_bounds: A dict of maximal bound constants per clock name (missing clocks are unbounded).
+        """
+        super().__init__()
+        self.max_bounds = dict(max_bounds)
+
+    def apply(self, dbm):
+        """Applies the ExtrapolateMaxBounds operation to a DBM.
+
+        Args:
+            dbm: The target DBM.
+
+        Returns:
+            The resulting DBM.
+        """
+        dbm.extrapolate_max_bounds(self.max_bounds)
+        return dbm
+
+    def copy(self):
+        """Copies the ExtrapolateMaxBounds instance.
+
+        Returns:
+            The copied ExtrapolateMaxBounds instance.
+        """
+        return ExtrapolateMaxBounds(self.max_bounds)
+
+    def __str__(self):
+        bound_strs = [f'{clock}={val}' for clock, val in self.max_bounds.items()]
+        return f'ExtrapolateMaxBounds({", ".join(bound_strs)})'
+
+
+#################
+# ExtrapolateLU #
+#################
+class ExtrapolateLU(DBMOperation):
+    """An ExtrapolateLU operation."""
+
+    def __init__(self, lower_bounds, upper_bounds):
+        """Initializes ExtrapolateLU.
+
+        Args:
+            lower_bounds: A dict of maximal lower bound constants per clock name (missing clocks are unbounded).
+            upper_bounds: A dict of maximal upper bound constants per clock name (missing clocks are unbounded).
+        """
+        super().__init__()
+        self.lower_bounds = dict(lower_bounds)
+        self.upper_bounds = dict(upper_bounds)
+
+    def apply(self, dbm):
+        """Applies the ExtrapolateLU operation to a DBM.
+
+        Args:
+            dbm: The target DBM.
+
+        Returns:
+            The resulting DBM.
+        """
+        dbm.extrapolate_lu(self.lower_bounds, self.upper_bounds)
+        return dbm
+
+    def copy(self):
+        """Copies the ExtrapolateLU instance.
+
+        Returns:
+            The copied ExtrapolateLU instance.
+        """
+        return ExtrapolateLU(self.lower_bounds, self.upper_bounds)
+
+    def __str__(self):
+        clocks = list(dict.fromkeys(list(self.lower_bounds) + list(self.upper_bounds)))
+        bound_strs = [f'{clock}={self.lower_bounds.get(clock, "-inf")}|{self.upper_bounds.get(clock, "-inf")}'
+                      for clock in clocks]
+        return f'ExtrapolateLU({", ".join(bound_strs)})'
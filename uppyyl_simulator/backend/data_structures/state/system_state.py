@@ -1,6 +1,5 @@
 """All classes for a system state representation, including location state, variable state, and clock state."""
 import collections
-import copy
 import itertools
 import pprint
 from typing import Dict
@@ -8,6 +7,7 @@ from typing import Dict
 from uppyyl_simulator.backend.ast.evaluators.uppaal_c_evaluator import UppaalCEvaluator
 from uppyyl_simulator.backend.data_structures.dbm.dbm import DBM
 from uppyyl_simulator.backend.data_structures.state.variable import UppaalVariable
+from uppyyl_simulator.backend.data_structures.state.variable_layout import VariableLayout
 from uppyyl_simulator.backend.data_structures.types.reference import UppaalReference
 from uppyyl_simulator.backend.data_structures.types.array import UppaalArray
 from uppyyl_simulator.backend.data_structures.types.bool import UppaalBool
@@ -18,7 +18,7 @@ from uppyyl_simulator.backend.data_structures.types.int import UppaalInt
 from uppyyl_simulator.backend.data_structures.types.scalar import UppaalScalar
 from uppyyl_simulator.backend.data_structures.types.struct import UppaalStruct
 from uppyyl_simulator.backend.data_structures.types.void import UppaalVoid
-from uppyyl_simulator.backend.helper.helper import prepend_to_lines
+from uppyyl_simulator.backend.helper.helper import prepend_to_lines, make_hashable
 from uppyyl_simulator.backend.models.ta.ta import (
     Location
 )
@@ -58,8 +58,9 @@ class InstanceScopeAccessor(collections.abc.MutableMapping):
         raise Exception("Cannot set value via instance scope accessor.")
 
     def __getitem__(self, key):
-        constants_scope = self.system_state.program_state["constant"]["instances"][self.inst_name]
-        variable_scope = self.system_state.program_state["variable"]["instances"][self.inst_name]
+        program_state = self.system_state.peek_program_state()
+        constants_scope = program_state["constant"]["instances"][self.inst_name]
+        variable_scope = program_state["variable"]["instances"][self.inst_name]
         if key in constants_scope:
             return constants_scope[key]
         elif key in variable_scope:
@@ -88,13 +89,15 @@ class InstanceScopeAccessor(collections.abc.MutableMapping):
             raise Exception(f'Variable "{key}" cannot be remove from scope of instance "{self.inst_name}".')
 
     def __iter__(self):
-        constants_scope = self.system_state.program_state["constant"]["instances"][self.inst_name]
-        variable_scope = self.system_state.program_state["variable"]["instances"][self.inst_name]
+        program_state = self.system_state.peek_program_state()
+        constants_scope = program_state["constant"]["instances"][self.inst_name]
+        variable_scope = program_state["variable"]["instances"][self.inst_name]
         return itertools.chain(iter(constants_scope), iter(variable_scope))
 
     def __len__(self):
-        constants_scope = self.system_state.program_state["constant"]["instances"][self.inst_name]
-        variable_scope = self.system_state.program_state["variable"]["instances"][self.inst_name]
+        program_state = self.system_state.peek_program_state()
+        constants_scope = program_state["constant"]["instances"][self.inst_name]
+        variable_scope = program_state["variable"]["instances"][self.inst_name]
         return len(constants_scope) + len(variable_scope)
 
     def copy(self):
@@ -154,6 +157,32 @@ class MultiInstanceAccessor:
         return f'MultiInstanceAccessor(name={name_str})'
 
 
+def _acquire_share(share_count):
+    """Registers an additional state sharing a state component.
+
+    Args:
+        share_count: The share count of the component.
+
+    Returns:
+        The share count of the component for the additional state.
+    """
+    share_count[0] += 1
+    return share_count
+
+
+def _release_share(share_count):
+    """Unregisters a state from sharing a state component (e.g., before it uses an own copy of the component).
+
+    Args:
+        share_count: The share count of the component.
+
+    Returns:
+        A new share count for the own component of the state.
+    """
+    share_count[0] -= 1
+    return [1]
+
+
 ################
 # System State #
 ################
@@ -163,7 +192,7 @@ class SystemState:
     def __init__(self):
         """Initializes SystemState."""
         self.system = None
-        self.program_state = {
+        self._program_state = {
             "constant": {
                 "system": {},
                 "instances": {},
@@ -174,8 +203,9 @@ class SystemState:
             },
             "local": []
         }
-        self.location_state: Dict[str, Location] = {}
-        self.dbm_state = None
+        self._location_state: Dict[str, Location] = {}
+        self._dbm_state = None
+        self.clock_valuation = None  # The concrete clock values (by clock name) of concrete-time runs
 
         self.instance_data = {}
         self.instance_scope_accessors = {}
@@ -185,6 +215,101 @@ class SystemState:
         # (e.g., allows "Inst.var" to access variable "var" of instance "Inst")
         self.access_instance_scopes = False
 
+        # If a variable layout is used, all variable values are stored in a flat buffer, and the variable scopes
+        # are only built from the buffer once they are accessed
+        self.variable_layout = None
+        self.variable_buffer = None
+
+        # Copies of a state share its variable scopes, location state, and DBM (see "copy"). Each component has a
+        # share count (i.e., a single-item list referenced by all states sharing the component), and a state only
+        # copies a component before modifying it if other states still share it
+        self._variables_share_count = [1]
+        self._location_state_share_count = [1]
+        self._dbm_state_share_count = [1]
+
+    @property
+    def program_state(self):
+        """The program state dict for modification (with the variable scopes being copied if shared, or built from
+        the value buffer, if necessary)."""
+        self.unshare_variables()
+        return self.peek_program_state()
+
+    @program_state.setter
+    def program_state(self, program_state):
+        self._program_state = program_state
+        self._variables_share_count = _release_share(self._variables_share_count)
+
+    def peek_program_state(self):
+        """Gets the program state dict without copying the variable scopes if shared.
+
+        Returns:
+            The program state dict, whose variables must not be modified.
+        """
+        if self._program_state["variable"] is None:
+            self.variable_layout.build_variable_scopes(self.variable_buffer, self._program_state)
+        return self._program_state
+
+    @property
+    def location_state(self):
+        """The dict of active locations per instance name (which must only be changed via "set_location")."""
+        return self._location_state
+
+    @location_state.setter
+    def location_state(self, location_state):
+        self._location_state = location_state
+        self._location_state_share_count = _release_share(self._location_state_share_count)
+
+    @property
+    def dbm_state(self):
+        """The DBM of the clock state for modification (copied if shared, as DBM operations modify it in place)."""
+        if self._dbm_state_share_count[0] > 1:
+            self._dbm_state = self._dbm_state.copy()
+            self._dbm_state_share_count = _release_share(self._dbm_state_share_count)
+        return self._dbm_state
+
+    @dbm_state.setter
+    def dbm_state(self, dbm_state):
+        self._dbm_state = dbm_state
+        self._dbm_state_share_count = _release_share(self._dbm_state_share_count)
+
+    def peek_dbm_state(self):
+        """Gets the DBM of the clock state without copying it if shared.
+
+        Returns:
+            The DBM, which must not be modified.
+        """
+        return self._dbm_state
+
+    def set_location(self, inst_name, loc):
+        """Sets the active location of an instance.
+
+        Args:
+            inst_name: The instance name.
+            loc: The location.
+        """
+        if self._location_state_share_count[0] > 1:
+            self._location_state = self._location_state.copy()
+            self._location_state_share_count = _release_share(self._location_state_share_count)
+        self._location_state[inst_name] = loc
+
+    def use_variable_layout(self, variable_layout=None):
+        """Switches the variable part of the program state to a compact layout stored in a flat value buffer.
+
+        Args:
+            variable_layout: The variable layout (derived from the current program state if None).
+
+        Returns:
+            The used variable layout.
+        """
+        if self.program_state["local"]:
+            raise Exception("Cannot switch to a variable layout while local scopes exist.")
+        if variable_layout is None:
+            variable_layout = VariableLayout(self.program_state)
+        self.variable_buffer = variable_layout.pack(self.program_state)
+        self.variable_layout = variable_layout
+        self._program_state["variable"] = None
+        return variable_layout
+
     def activate_system_scope(self, access_instance_scopes=False):
         """Activates the system scope, so that new variables are defined on system level.
 
@@ -200,8 +325,11 @@ class SystemState:
         Args:
             inst_name: The name of the instance.
         """
-        if (inst_name in self.program_state["constant"]["instances"] and
-                inst_name in self.program_state["variable"]["instances"]):
+        # The scopes are looked up without copying shared variable scopes
+        variable_state = self._program_state["variable"]
+        variable_instance_scopes = (self.variable_layout.scopes["instances"] if variable_state is None
+                                    else variable_state["instances"])
+        if inst_name in self._program_state["constant"]["instances"] and inst_name in variable_instance_scopes:
             self.active_instance_name = inst_name
             self.access_instance_scopes = False  # Disable access to other instances from within an instance
         else:
@@ -262,10 +390,26 @@ class SystemState:
             var.update_path(scope_path=scope_path, var_path=[key])
 
     def get(self, key):
-        """Provides the value of a given variable name.
+        """Provides the value of a given variable name, which may be modified in place.
+
+        Shared variable scopes are copied first unless the variable is local (see "unshare_variables_for"). Use
+        "peek" for read-only access.
+
+        Args:
+            key: The variable name.
+
+        Returns:
+            The variable value.
+        """
+        self.unshare_variables_for(key)
+        return self.peek(key)
+
+    def peek(self, key):
+        """Provides the value of a given variable name for read-only access.
 
         The function first checks the local scopes, then the instance scopes, followed by potential references to
-        instance scopes as variables (e.g., Inst.x), and finally the global scope.
+        instance scopes as variables (e.g., Inst.x), and finally the global scope. Shared variable scopes are not
+        copied, so that the returned variable must not be modified (see "get").
 
         Args:
             key: The variable name.
@@ -273,23 +417,24 @@ class SystemState:
         Returns:
             The variable value.
         """
-        for i in range(len(self.program_state["local"]) - 1, -1, -1):
-            local_scope_name, local_scope = self.program_state["local"][i]
+        program_state = self.peek_program_state()
+        for i in range(len(program_state["local"]) - 1, -1, -1):
+            local_scope_name, local_scope = program_state["local"][i]
             if key in local_scope:
                 return local_scope[key]
         if self.active_instance_name is not None:
-            const_instance_scope = self.program_state["constant"]["instances"][self.active_instance_name]
+            const_instance_scope = program_state["constant"]["instances"][self.active_instance_name]
             if key in const_instance_scope:
                 return const_instance_scope[key]
-            var_instance_scope = self.program_state["variable"]["instances"][self.active_instance_name]
+            var_instance_scope = program_state["variable"]["instances"][self.active_instance_name]
             if key in var_instance_scope:
                 return var_instance_scope[key]
         if self.access_instance_scopes and (key in self.instance_scope_accessors):
             return self.instance_scope_accessors[key]
-        if key in self.program_state["constant"]["system"]:
-            return self.program_state["constant"]["system"][key]
-        if key in self.program_state["variable"]["system"]:
-            return self.program_state["variable"]["system"][key]
+        if key in program_state["constant"]["system"]:
+            return program_state["constant"]["system"][key]
+        if key in program_state["variable"]["system"]:
+            return program_state["variable"]["system"][key]
         if key in base_classes:
             return base_classes[key]
 
@@ -304,25 +449,27 @@ class SystemState:
         Returns:
             The active scope.
         """
-        if len(self.program_state["local"]) > 0:
-            scope_index = len(self.program_state["local"])-1
-            scope_name, scope = self.program_state["local"][scope_index]
+        # Local and constant scopes are not shared copy-on-write (see "copy")
+        program_state = self.peek_program_state() if (const or self._program_state["local"]) else self.program_state
+        if len(program_state["local"]) > 0:
+            scope_index = len(program_state["local"])-1
+            scope_name, scope = program_state["local"][scope_index]
             scope_path = ["variable", "instances", scope_index]
             return scope_name, scope, scope_path
         elif self.active_instance_name is not None:
             if const:
-                active_instance_scope = self.program_state["constant"]["instances"][self.active_instance_name]
+                active_instance_scope = program_state["constant"]["instances"][self.active_instance_name]
                 scope_path = ["constant", "instances", self.active_instance_name]
             else:
-                active_instance_scope = self.program_state["variable"]["instances"][self.active_instance_name]
+                active_instance_scope = program_state["variable"]["instances"][self.active_instance_name]
                 scope_path = ["variable", "instances", self.active_instance_name]
             return self.active_instance_name, active_instance_scope, scope_path
         else:
             if const:
-                global_scope = self.program_state["constant"]["system"]
+                global_scope = program_state["constant"]["system"]
                 scope_path = ["constant", "system"]
             else:
-                global_scope = self.program_state["variable"]["system"]
+                global_scope = program_state["variable"]["system"]
                 scope_path = ["variable", "system"]
             return "__GLOBAL__", global_scope, scope_path
 
@@ -348,7 +495,7 @@ class SystemState:
         Returns:
             The new scope.
         """
-        self.program_state["local"].append((name, scope))
+        self._program_state["local"].append((name, scope))
         return scope
 
     def new_local_scope(self, name=None):
@@ -371,7 +518,7 @@ class SystemState:
             The removed scope.
         """
         try:
-            scope = self.program_state["local"].pop()
+            scope = self._program_state["local"].pop()
         except IndexError:
             raise IndexError("No local scope to remove exists.")
         return scope
@@ -382,6 +529,7 @@ class SystemState:
         Returns:
             The string representation of the current state.
         """
+        program_state = self.peek_program_state()
         string = ""
         string += f'--------------------\n'
         string += f'--- System State ---\n'
@@ -389,12 +537,12 @@ class SystemState:
 
         body_string = ""
         body_string += f'============== System Scope [Const] ==============\n\n'
-        for key, var in self.program_state["constant"]["system"].items():
+        for key, var in program_state["constant"]["system"].items():
             body_string += f'{key} = {var}\n'
         body_string += "\n"
 
         body_string += f'============== Instance Scopes [Const] ==============\n\n'
-        for scope_name, scope in self.program_state["constant"]["instances"].items():
+        for scope_name, scope in program_state["constant"]["instances"].items():
             active_str = f'[active] ' if self.active_instance_name == scope_name else f''
             body_string += f'== Instance Scope "{scope_name}" {active_str}==\n'
             for key, var in scope.items():
@@ -402,12 +550,12 @@ class SystemState:
             body_string += "\n"
 
         body_string += f'============== System Scope [Variable] ==============\n\n'
-        for key, var in self.program_state["variable"]["system"].items():
+        for key, var in program_state["variable"]["system"].items():
             body_string += f'{key} = {var}\n'
         body_string += "\n"
 
         body_string += f'============== Instance Scopes [Variable] ==============\n\n'
-        for scope_name, scope in self.program_state["variable"]["instances"].items():
+        for scope_name, scope in program_state["variable"]["instances"].items():
             active_str = f'[active] ' if self.active_instance_name == scope_name else f''
             body_string += f'== Instance Scope "{scope_name}" {active_str}==\n'
             for key, var in scope.items():
@@ -420,7 +568,7 @@ class SystemState:
         body_string += "\n"
 
         body_string += f'============== Local Scopes ==============\n\n'
-        for i, (scope_name, scope) in enumerate(self.program_state["local"]):
+        for i, (scope_name, scope) in enumerate(program_state["local"]):
             scope_name_str = f'["{scope_name}"]' if scope_name else f''
             body_string += f'== Local Scope {i} {scope_name_str}==\n'
             for key, var in scope.items():
@@ -446,11 +594,12 @@ class SystemState:
         Returns:
             A list of all clock names.
         """
+        program_state = self.peek_program_state()
         clock_names = []
 
-        relevant_scopes = [self.program_state["constant"]["system"], self.program_state["variable"]["system"]]
-        relevant_scopes.extend(self.program_state["constant"]["instances"].values())
-        relevant_scopes.extend(self.program_state["variable"]["instances"].values())
+        relevant_scopes = [program_state["constant"]["system"], program_state["variable"]["system"]]
+        relevant_scopes.extend(program_state["constant"]["instances"].values())
+        relevant_scopes.extend(program_state["variable"]["instances"].values())
 
         for scope in relevant_scopes:
             for key, var in scope.items():
@@ -574,10 +723,14 @@ class SystemState:
                                                                   param_count=len(param_clazzes))
                         self.instance_scope_accessors[inst_name] = instance_accessor
 
-    def _init_dbm_state(self):
-        """Initializes the DBM state."""
+    def _init_dbm_state(self, dbm_class=DBM):
+        """Initializes the DBM state.
+
+        Args:
+            dbm_class: The DBM implementation used for the clock state (e.g., DBM or PackedDBM).
+        """
         clock_names = self.get_clock_names()
-        self.dbm_state = DBM(clocks=clock_names, zero_init=True)
+        self.dbm_state = dbm_class(clocks=clock_names, zero_init=True)
 
     def _init_location_state_from_system(self, system):
         """Initializes the location state from a system instance."""
@@ -586,15 +739,16 @@ class SystemState:
             tmpl_name = inst_data["template_name"]
             self.location_state[inst_name] = system.get_template_by_name(tmpl_name).init_loc
 
-    def init_from_system(self, system):
+    def init_from_system(self, system, dbm_class=DBM):
         """Initializes the system state from a system instance.
 
         Args:
             system: The TA system.
+            dbm_class: The DBM implementation used for the clock state (e.g., DBM or PackedDBM).
         """
         self.system = system
         self._init_program_state_from_system(system)
-        self._init_dbm_state()
+        self._init_dbm_state(dbm_class=dbm_class)
         self._init_location_state_from_system(system)
 
     def get_variable_state_string(self):
@@ -603,11 +757,12 @@ class SystemState:
         Returns:
             The variable program state string.
         """
+        program_state = self.peek_program_state()
         var_strs = []
-        for key, var in self.program_state["variable"]["system"].items():
+        for key, var in program_state["variable"]["system"].items():
             if not isinstance(var.val, UppaalReference):
                 var_strs.append(f'{key}={var.val}')
-        for inst_name, inst_scope in self.program_state["variable"]["instances"].items():
+        for inst_name, inst_scope in program_state["variable"]["instances"].items():
             for key, var in inst_scope.items():
                 if not isinstance(var.val, UppaalReference):
                     var_strs.append(f'{inst_name}.{key}={var.val}')
@@ -620,6 +775,10 @@ class SystemState:
         Returns:
             The compact variable program state dict.
         """
+        if self.variable_layout is not None:
+            return self.variable_layout.get_compact_variable_state(self.variable_buffer, self._program_state)
+
+        program_state = self.peek_program_state()
         compact_state = {
             "variable": {
                 "system": {},
@@ -627,10 +786,10 @@ class SystemState:
             }
         }
 
-        for key, var in self.program_state["variable"]["system"].items():
+        for key, var in program_state["variable"]["system"].items():
             compact_val = var.val.get_raw_data()
             compact_state["variable"]["system"][key] = compact_val
-        for inst_scope_name, inst_scope in self.program_state["variable"]["instances"].items():
+        for inst_scope_name, inst_scope in program_state["variable"]["instances"].items():
             compact_state["variable"]["instances"][inst_scope_name] = {}
             for key, var in inst_scope.items():
                 compact_val = var.val.get_raw_data()
@@ -638,6 +797,17 @@ class SystemState:
 
         return compact_state
 
+    def get_discrete_state_key(self):
+        """Gets a hashable key of the discrete part of the state (i.e., the active locations and variable values).
+
+        Returns:
+            The discrete state key.
+        """
+        location_ids = tuple(loc.id for loc in self.location_state.values())
+        if self.variable_layout is not None:
+            return location_ids, self.variable_buffer.tobytes()
+        return location_ids, make_hashable(self.get_compact_variable_state())
+
     def assign_from_compact_variable_state(self, compact_var_state):  # TODO: Test and revise
         """Assigns the variable part of the program state from a compact data dict.
 
@@ -653,10 +823,82 @@ class SystemState:
                 var = self_inst_scope[key]
                 var.val = var.clazz(init=val)
 
-    def _copy_program_state(self):
+    def unshare_variables(self):
+        """Replaces the variable scopes shared with other states by an own copy, so that the variables can be
+        modified in place (e.g., by updates)."""
+        if self._variables_share_count[0] <= 1:
+            return
+        self._variables_share_count = _release_share(self._variables_share_count)
+        shared_variable_state = self._program_state["variable"]
+        self._program_state["variable"] = {"system": {}, "instances": {}}
+        self._copy_variable_scopes(shared_variable_state, self._program_state)
+
+        # Let the local references (e.g., reference parameters) point to the copied variables
+        for _, local_scope in self._program_state["local"]:
+            for var in local_scope.values():
+                if isinstance(var, UppaalVariable) and isinstance(var.val, UppaalReference):
+                    var.val.init_pointee(self._program_state)
+
+    def unshare_variables_for(self, key):
+        """Unshares the variable scopes before a variable is modified in place, unless the variable is local (i.e.,
+        not part of the shared scopes) and no reference.
+
+        Args:
+            key: The variable name (or None if unknown, which always unshares the variable scopes).
+        """
+        if self._variables_share_count[0] <= 1:
+            return
+        for i in range(len(self._program_state["local"]) - 1, -1, -1):
+            local_scope_name, local_scope = self._program_state["local"][i]
+            if key in local_scope:
+                var = local_scope[key]
+                if not (isinstance(var, UppaalVariable) and isinstance(var.val, UppaalReference)):
+                    return
+                break
+        self.unshare_variables()
+
+    @staticmethod
+    def _copy_variable_scopes(variable_state, program_state_copy):
+        """Copies the variable scopes of a program state into another program state.
+
+        Args:
+            variable_state: The dict of variable scopes (i.e., the "variable" part of a program state).
+            program_state_copy: The program state dict in which the copied variable scopes are set.
+        """
+        references = []
+
+        def copy_var(orig_var):
+            var_copy = orig_var.copy()
+            if isinstance(orig_var.val, UppaalReference):
+                references.append(var_copy.val)
+            return var_copy
+
+        # Copy system scope
+        for key, orig_var in variable_state["system"].items():
+            program_state_copy["variable"]["system"][key] = copy_var(orig_var)
+
+        # Copy instance scopes
+        for inst_scope_name, inst_scope in variable_state["instances"].items():
+            program_state_copy["variable"]["instances"][inst_scope_name] = {
+                key: copy_var(orig_var) for key, orig_var in inst_scope.items()}
+
+        # Set the correct (new) pointee for all references once all other variables exist
+        for ref in references:
+            ref.init_pointee(program_state_copy)
+
+    def _copy_program_state(self, variable_buffer=None):
+        """Copies the program state, including the local scopes.
+
+        Args:
+            variable_buffer: The (copied) value buffer to which the variables are bound if a variable layout is used.
+
+        Returns:
+            The copied program state dict.
+        """
+        program_state = self.peek_program_state()
         # Shallow copy constant part
         program_state_copy = {
-            "constant": self.program_state["constant"],
+            "constant": program_state["constant"],
             "variable": {
                 "system": {},
                 "instances": {},
@@ -664,26 +906,13 @@ class SystemState:
             "local": []
         }
 
-        # Copy system scope
-        for section in ["variable"]:  # ["constant", "variable"]
-            for key, orig_var in self.program_state[section]["system"].items():
-                copy_var = orig_var.copy()
-                if isinstance(orig_var.val, UppaalReference):  # Set the correct (new) pointee for a reference
-                    copy_var.val.init_pointee(program_state_copy)
-                program_state_copy[section]["system"][key] = copy_var
-
-        # Copy instance scopes
-        for section in ["variable"]:  # ["constant", "variable"]
-            for inst_scope_name, inst_scope in self.program_state[section]["instances"].items():
-                program_state_copy[section]["instances"][inst_scope_name] = {}
-                for key, orig_var in inst_scope.items():
-                    copy_var = orig_var.copy()
-                    if isinstance(orig_var.val, UppaalReference):  # Set the correct (new) pointee for a reference
-                        copy_var.val.init_pointee(program_state_copy)
-                    program_state_copy[section]["instances"][inst_scope_name][key] = copy_var
+        if self.variable_layout is not None:
+            self.variable_layout.build_variable_scopes(variable_buffer, program_state_copy)
+        else:
+            self._copy_variable_scopes(program_state["variable"], program_state_copy)
 
         # Copy local scopes
-        for local_scope_name, local_scope in self.program_state["local"]:
+        for local_scope_name, local_scope in program_state["local"]:
             copy_local_scope = {}
             for key, orig_var in local_scope.items():
                 copy_var = orig_var.copy()
@@ -697,17 +926,42 @@ class SystemState:
     def copy(self):
         """Copies the SystemState instance.
 
+        The copy is a copy-on-write copy: the variable scopes, the location state, and the DBM are shared between
+        both states, and only copied by a state before it modifies them while still shared (see "get",
+        "unshare_variables", "set_location", and "dbm_state"). Reading them (e.g., via "peek" or "peek_dbm_state")
+        never copies them, and the copied state itself is left unchanged. Only if local scopes exist, the program
+        state is copied right away. If a variable layout is used, only the value buffer is copied.
+
         Returns:
             The copied SystemState instance.
         """
         copy_obj = SystemState()
 
-        # Copy state data
-        copy_obj.program_state = self._copy_program_state()
-        copy_obj.location_state = copy.copy(self.location_state)
-        copy_obj.dbm_state = self.dbm_state.copy()
+        # Share or copy state data
+        if self.variable_layout is not None:
+            # The value buffer is cheap to copy, and the variable scopes are built from the copy once accessed
+            copy_obj.variable_layout = self.variable_layout
+            copy_obj.variable_buffer = self.variable_buffer[:]
+        if self._program_state["local"]:
+            copy_obj.program_state = self._copy_program_state(variable_buffer=copy_obj.variable_buffer)
+        else:
+            copy_obj._program_state = {
+                "constant": self._program_state["constant"],
+                "variable": None if (self.variable_layout is not None) else self._program_state["variable"],
+                "local": []
+            }
+            if self.variable_layout is None:
+                copy_obj._variables_share_count = _acquire_share(self._variables_share_count)
+        copy_obj._location_state = self._location_state
+        copy_obj._location_state_share_count = _acquire_share(self._location_state_share_count)
+        copy_obj._dbm_state = self._dbm_state
+        if self._dbm_state is not None:
+            copy_obj._dbm_state_share_count = _acquire_share(self._dbm_state_share_count)
+        if self.clock_valuation is not None:
+            copy_obj.clock_valuation = self.clock_valuation.copy()
 
         # Copy instance data
+        copy_obj.system = self.system
         copy_obj.instance_data = self.instance_data
 
         # Copy instance scope accessors
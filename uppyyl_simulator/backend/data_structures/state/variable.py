@@ -104,6 +104,7 @@ class UppaalVariable(collections.abc.MutableMapping):
         """
         copy_val = self.val.copy() if (self.val is not None) else None
         copy_obj = self.__class__(name=self.name, val=copy_val)
+        copy_obj.scope_path, copy_obj.var_path = self.scope_path, self.var_path  # Keep the path for references
         return copy_obj
 
     def __int__(self):
@@ -0,0 +1,307 @@
+"""A compact, array-backed layout for the variable part of the program state."""
+from array import array
+
+from uppyyl_simulator.backend.data_structures.state.variable import UppaalVariable
+from uppyyl_simulator.backend.data_structures.types.array import UppaalArray
+from uppyyl_simulator.backend.data_structures.types.bool import UppaalBool
+from uppyyl_simulator.backend.data_structures.types.int import UppaalInt
+from uppyyl_simulator.backend.data_structures.types.reference import UppaalReference
+from uppyyl_simulator.backend.data_structures.types.struct import UppaalStruct
+
+
+#################
+# Slot Variable #
+#################
+class SlotVariable(UppaalVariable):
+    """A Uppaal variable whose scalar values are stored in the slots of a shared value buffer.
+
+    A leaf variable (i.e., an int or bool) reads and writes its value directly from and to its buffer slot. An
+    aggregate variable (i.e., an array or struct) holds a regular array or struct value whose elements are slot
+    variables again.
+    """
+
+    def __init__(self, name, clazz, buffer=None, slot=None, val=None, scope_path=None, var_path=None):
+        """Initializes SlotVariable.
+
+        Args:
+            name: The variable name.
+            clazz: The variable type.
+            buffer: The value buffer (only for leaf variables).
+            slot: The slot index of the value in the buffer (only for leaf variables).
+            val: The aggregate value (only for aggregate variables).
+            scope_path: The list of scope path segments (e.g., ["variable", "instances", "Inst1"]).
+            var_path: The list of variable path segments (e.g., ["c", "field1", 1]).
+        """
+        self.clazz = clazz
+        self.buffer = buffer
+        self.slot = slot
+        self._val = val
+        self.name = name
+        self.scope_path = scope_path
+        self.var_path = var_path
+
+    @property
+    def val(self):
+        """The variable value (for leaf variables, a new value object is created from the buffer slot)."""
+        if self.slot is None:
+            return self._val
+        return self.clazz(init=self.buffer[self.slot])
+
+    @val.setter
+    def val(self, value):
+        if self.slot is None:
+            self._val = value
+        else:
+            self.buffer[self.slot] = int(value)
+
+    def get_raw_data(self):
+        """Gets the raw data.
+
+        Returns:
+            The raw data.
+        """
+        if self.slot is None:
+            return self._val.get_raw_data()
+        raw_val = self.buffer[self.slot]
+        return bool(raw_val) if issubclass(self.clazz, UppaalBool) else raw_val
+
+    def assign(self, other):
+        """Assigns another value to this variable object.
+
+        Args:
+            other: The assigned value.
+        """
+        if isinstance(other, UppaalVariable):
+            other = other.val
+        if self.slot is None:
+            if hasattr(other, "assign_from"):
+                self._val.assign_from(other)
+            else:
+                self._val.assign(other)
+        else:
+            self.buffer[self.slot] = int(self.clazz(init=other).val)
+
+    def copy(self):
+        """Copies the variable into a regular (i.e., not buffer-backed) UppaalVariable instance.
+
+        Returns:
+            The copied UppaalVariable instance.
+        """
+        return UppaalVariable(name=self.name, val=self.val.copy())
+
+
+########################
+# Variable Layout Node #
+########################
+class VariableLayoutNode:
+    """A node of a variable layout, describing a (sub-)variable and its buffer slots."""
+    __slots__ = ["name", "clazz", "scope_path", "var_path", "slot", "children", "pointee_path"]
+
+    def __init__(self, name, clazz, scope_path, var_path, slot=None, children=None, pointee_path=None):
+        """Initializes VariableLayoutNode.
+
+        Args:
+            name: The (full) variable name.
+            clazz: The variable type.
+            scope_path: The list of scope path segments.
+            var_path: The list of variable path segments.
+            slot: The buffer slot index (only for leaf nodes).
+            children: The list of (key, child node) pairs (only for array and struct nodes).
+            pointee_path: The pointee path (only for reference nodes).
+        """
+        self.name = name
+        self.clazz = clazz
+        self.scope_path = scope_path
+        self.var_path = var_path
+        self.slot = slot
+        self.children = children
+        self.pointee_path = pointee_path
+
+
+###################
+# Variable Layout #
+###################
+class VariableLayout:
+    """A layout assigning every scalar int and bool value of the variable program state a slot in a flat buffer.
+
+    The layout is computed once per system. States using the layout store all variable values in a single
+    "array('q')" buffer, so that copying the variable state reduces to a buffer copy, and state keys and compact
+    variable states can be read from the buffer directly. References are not stored in the buffer, but re-initialized
+    from their pointee path whenever the variable scopes of a state are built.
+    """
+
+    def __init__(self, program_state):
+        """Initializes VariableLayout.
+
+        Args:
+            program_state: The program state dict from which the layout is derived.
+        """
+        self.scopes = {"system": {}, "instances": {}}
+        self.nodes = {}
+        self.leaves = []
+
+        for key, var in program_state["variable"]["system"].items():
+            self.scopes["system"][key] = self._make_node(var, ["variable", "system"], [key])
+        for inst_name, inst_scope in program_state["variable"]["instances"].items():
+            scope_layout = self.scopes["instances"][inst_name] = {}
+            for key, var in inst_scope.items():
+                scope_layout[key] = self._make_node(var, ["variable", "instances", inst_name], [key])
+
+    @property
+    def slot_count(self):
+        """The number of buffer slots."""
+        return len(self.leaves)
+
+    def _make_node(self, var, scope_path, var_path):
+        """Recursively creates the layout node of a variable, assigning new slots to all its scalar values.
+
+        Args:
+            var: The variable.
+            scope_path: The list of scope path segments.
+            var_path: The list of variable path segments.
+
+        Returns:
+            The layout node.
+        """
+        val = var.val
+        clazz = val.__class__
+        if isinstance(val, UppaalReference):
+            node = VariableLayoutNode(name=var.name, clazz=clazz, scope_path=scope_path, var_path=var_path,
+                                      pointee_path=val.pointee_path)
+        elif isinstance(val, UppaalArray):
+            children = [(i, self._make_node(elem_var, scope_path, var_path + [i]))
+                        for i, elem_var in enumerate(val.data)]
+            node = VariableLayoutNode(name=var.name, clazz=clazz, scope_path=scope_path, var_path=var_path,
+                                      children=children)
+        elif isinstance(val, UppaalStruct):
+            children = [(field_key, self._make_node(field_var, scope_path, var_path + [field_key]))
+                        for field_key, field_var in val.fields.items()]
+            node = VariableLayoutNode(name=var.name, clazz=clazz, scope_path=scope_path, var_path=var_path,
+                                      children=children)
+        elif isinstance(val, (UppaalInt, UppaalBool)):
+            node = VariableLayoutNode(name=var.name, clazz=clazz, scope_path=scope_path, var_path=var_path,
+                                      slot=len(self.leaves))
+            self.leaves.append(node)
+        else:
+            raise Exception(f'Variable "{var.name}" of type "{clazz.__name__}" is not supported by the compact '
+                            f'variable layout.')
+        self.nodes[tuple(scope_path + var_path)] = node
+        return node
+
+    def pack(self, program_state):
+        """Packs the variable values of a program state into a new buffer.
+
+        Args:
+            program_state: The program state dict.
+
+        Returns:
+            The value buffer.
+        """
+        buffer = array("q", bytes(8 * self.slot_count))
+        for node in self.leaves:
+            var = program_state
+            for path_part in node.scope_path + node.var_path:
+                var = var[path_part]
+            buffer[node.slot] = int(var.get_raw_data())
+        return buffer
+
+    def build_variable_scopes(self, buffer, program_state):
+        """Builds the variable scopes of a program state, with all scalar values bound to the slots of a buffer.
+
+        Args:
+            buffer: The value buffer.
+            program_state: The program state dict in which the variable scopes are set.
+        """
+        variable_state = {"system": {}, "instances": {}}
+        program_state["variable"] = variable_state
+
+        references = []
+        for key, node in self.scopes["system"].items():
+            variable_state["system"][key] = self._build_variable(node, buffer, references)
+        for inst_name, scope_layout in self.scopes["instances"].items():
+            inst_scope = variable_state["instances"][inst_name] = {}
+            for key, node in scope_layout.items():
+                inst_scope[key] = self._build_variable(node, buffer, references)
+
+        # Set the correct (new) pointee for all references once all other variables exist
+        for ref in references:
+            ref.init_pointee(program_state)
+
+    def _build_variable(self, node, buffer, references):
+        """Recursively builds the variable of a layout node.
+
+        Args:
+            node: The layout node.
+            buffer: The value buffer.
+            references: The list to which all created references are added.
+
+        Returns:
+            The variable.
+        """
+        if node.slot is not None:
+            return SlotVariable(name=node.name, clazz=node.clazz, buffer=buffer, slot=node.slot,
+                                scope_path=node.scope_path, var_path=node.var_path)
+        if node.pointee_path is not None:
+            ref = UppaalReference(pointee_path=node.pointee_path)
+            references.append(ref)
+            return UppaalVariable(name=node.name, val=ref)
+
+        val = node.clazz.__new__(node.clazz)
+        if issubclass(node.clazz, UppaalArray):
+            val.data = [self._build_variable(child, buffer, references) for _, child in node.children]
+        else:
+            val.fields = {key: self._build_variable(child, buffer, references) for key, child in node.children}
+        return SlotVariable(name=node.name, clazz=node.clazz, val=val, scope_path=node.scope_path,
+                            var_path=node.var_path)
+
+    def get_compact_variable_state(self, buffer, program_state):
+        """Gets a compact representation dict of the variable values stored in a buffer.
+
+        Args:
+            buffer: The value buffer.
+            program_state: The program state dict (only required to resolve references to constants).
+
+        Returns:
+            The compact variable program state dict.
+        """
+        compact_state = {
+            "variable": {
+                "system": {},
+                "instances": {}
+            }
+        }
+
+        for key, node in self.scopes["system"].items():
+            compact_state["variable"]["system"][key] = self._get_raw_data(node, buffer, program_state)
+        for inst_name, scope_layout in self.scopes["instances"].items():
+            compact_inst_scope = compact_state["variable"]["instances"][inst_name] = {}
+            for key, node in scope_layout.items():
+                compact_inst_scope[key] = self._get_raw_data(node, buffer, program_state)
+
+        return compact_state
+
+    def _get_raw_data(self, node, buffer, program_state):
+        """Recursively gets the raw data of a layout node from a buffer.
+
+        Args:
+            node: The layout node.
+            buffer: The value buffer.
+            program_state: The program state dict (only required to resolve references to constants).
+
+        Returns:
+            The raw data.
+        """
+        if node.slot is not None:
+            raw_val = buffer[node.slot]
+            return bool(raw_val) if issubclass(node.clazz, UppaalBool) else raw_val
+        if node.pointee_path is not None:
+            pointee_path = tuple(node.pointee_path)
+            if pointee_path in self.nodes:
+                return self._get_raw_data(self.nodes[pointee_path], buffer, program_state)
+            var = program_state
+            for path_part in pointee_path:
+                var = var[path_part]
+            return var.get_raw_data()
+        if issubclass(node.clazz, UppaalArray):
+            return [self._get_raw_data(child, buffer, program_state) for _, child in node.children]
+        return {key: self._get_raw_data(child, buffer, program_state) for key, child in node.children}
@@ -20,6 +20,7 @@ class UppaalFunction(UppaalType):
         self.func_ast = func_ast
         self.c_evaluator = c_evaluator
         self.return_clazz = return_clazz
+        self.compiled_body = None  # The body compiled into a closure (set by UppaalCCompiler on first call)
 
     def copy(self):
         """Copies the UppaalFunction instance.
@@ -29,13 +30,17 @@ class UppaalFunction(UppaalType):
         """
         copy_obj = self.__class__(name=self.name, func_ast=self.func_ast, return_clazz=self.return_clazz,
                                   c_evaluator=self.c_evaluator)
+        copy_obj.compiled_body = self.compiled_body
         return copy_obj
 
     def __call__(self, arg_asts, state):
         state.new_local_scope()
         self.c_evaluator.initialize_parameters(param_asts=self.func_ast["params"], args=arg_asts, state=state)
-        ret, do_return = self.c_evaluator.eval_ast(self.func_ast["body"],
-                                                   state)  # Ignore second tuple entry, i.e., the "do_return" state
+        if self.compiled_body is not None:
+            ret, do_return = self.compiled_body(state)
+        else:
+            ret, do_return = self.c_evaluator.eval_ast(self.func_ast["body"],
+                                                       state)  # Ignore second tuple entry, i.e., the "do_return" state
         state.remove_local_scope()
 
         res = self.return_clazz(ret) if (not issubclass(self.return_clazz, UppaalVoid)) else None
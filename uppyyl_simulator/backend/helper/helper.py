@@ -1,5 +1,8 @@
 """A module with several helper functions."""
 
+import collections
+import itertools
+import os
 import random
 import string
 
@@ -43,3 +46,66 @@ def unique_id(prefix, size=16, chars=string.ascii_lowercase + string.digits):
         The generated ID.
     """
     return f'{prefix}-{"".join(random.choice(chars) for _ in range(size))}'
+
+
+def make_hashable(data):
+    """Converts nested dicts and lists into nested tuples, so that the data can be used as dict key.
+
+    Args:
+        data: The (nested) data.
+
+    Returns:
+        The hashable representation of the data.
+    """
+    if isinstance(data, dict):
+        return tuple((key, make_hashable(val)) for key, val in data.items())
+    if isinstance(data, list):
+        return tuple(make_hashable(val) for val in data)
+    return data
+
+
+def make_chunks(iterable, chunk_size):
+    """Splits an iterable into chunks (i.e., lists) of a given size, with a smaller last chunk if necessary.
+
+    Args:
+        iterable: The iterable.
+        chunk_size: The chunk size.
+
+    Returns:
+        A generator of the chunks.
+    """
+    iterator = iter(iterable)
+    chunk = list(itertools.islice(iterator, chunk_size))
+    while chunk:
+        yield chunk
+        chunk = list(itertools.islice(iterator, chunk_size))
+
+
+def map_bounded(executor, func, iterable, workers=None):
+    """Applies a function to the items of an iterable in an executor, with at most two pending items per worker.
+
+    In contrast to "executor.map", the items are only submitted once earlier results are consumed, so that neither
+    unbounded iterables nor all pending results are held in memory. Pending items are cancelled once the generator
+    is closed.
+
+    Args:
+        executor: The executor (e.g., a ProcessPoolExecutor).
+        func: The function.
+        iterable: The iterable of function arguments.
+        workers: The number of workers of the executor (defaults to the number of processors).
+
+    Returns:
+        A generator of the function results in item order.
+    """
+    max_pending_items = 2 * (workers or os.cpu_count() or 1)
+    pending_items = collections.deque()
+    try:
+        for item in iterable:
+            pending_items.append(executor.submit(func, item))
+            if len(pending_items) >= max_pending_items:
+                yield pending_items.popleft().result()
+        while pending_items:
+            yield pending_items.popleft().result()
+    finally:
+        for pending_item in pending_items:
+            pending_item.cancel()
@@ -5,15 +5,13 @@ import copy
 from uppyyl_simulator.backend.data_structures.ast.ast_code_element import (
     ASTCodeElement, apply_func_to_ast
 )
-from uppyyl_simulator.backend.ast.parsers.generated.uppaal_c_language_parser import (
-    UppaalCLanguageParser
+from uppyyl_simulator.backend.ast.parsers.uppaal_c_parser_factory import (
+    get_uppaal_c_parser
 )
+from uppyyl_simulator.backend.ast.parsers.uppaal_c_ast_cache import parse_cached
 from uppyyl_simulator.backend.ast.printers.uppaal_c_language_printer import (
     UppaalCPrinter
 )
-from uppyyl_simulator.backend.ast.parsers.uppaal_c_language_semantics import (
-    UppaalCLanguageSemantics
-)
 
 
 ###############
@@ -25,14 +23,25 @@ class Declaration(ASTCodeElement):
     In the declaration, all functions, types and data variables used by the system are defined.
     """
 
-    def __init__(self, decl_data):
+    def __init__(self, decl_data, lazy=False, ast_cache=None):
         """Initializes Declaration.
 
         Args:
             decl_data: The declaration string or AST data.
+            lazy: Choose whether a declaration string is only parsed on first access of the AST or clocks.
+            ast_cache: An optional AST cache consulted instead of the process-wide AST cache when parsing.
         """
-        super().__init__(decl_data)
-        self._identify_clocks()
+        self._clocks = None
+        super().__init__(decl_data, lazy=lazy, ast_cache=ast_cache)
+        if not lazy:
+            self._identify_clocks()
+
+    @property
+    def clocks(self):
+        """The names of all clocks declared in the declaration."""
+        if self._clocks is None:
+            self._identify_clocks()
+        return self._clocks
 
     def init_parser(self):
         """Initializes the AST code parser.
@@ -40,7 +49,7 @@ class Declaration(ASTCodeElement):
         Returns:
             None
         """
-        self.parser = UppaalCLanguageParser(semantics=UppaalCLanguageSemantics())
+        self.parser = get_uppaal_c_parser()
 
     def init_printer(self):
         """Initializes the AST code printer.
@@ -59,9 +68,12 @@ class Declaration(ASTCodeElement):
         copy_decl = Declaration(copy.deepcopy(self.ast))
         return copy_decl
 
-    def update_ast(self):
+    def update_ast(self, ast_cache=None):
         """Updates the AST dict from the AST text string.
 
+        Args:
+            ast_cache: An optional AST cache consulted instead of the process-wide AST cache.
+
         Returns:
             None
         """
@@ -71,14 +83,15 @@ class Declaration(ASTCodeElement):
                 "decls": []
             }
         else:
-            self.ast = self.parser.parse(self.text, rule_name='UppaalDeclaration', trace=False)
+            self.ast = parse_cached(get_uppaal_c_parser(), self.text, rule_name='UppaalDeclaration', cache=ast_cache,
+                                    trace=False)
 
     def __str__(self):
         return f'Declaration(\n{self.text}\n)'
 
     def _identify_clocks(self):
         _, clocks = apply_func_to_ast(self.ast, _get_clock)
-        self.clocks = clocks
+        self._clocks = clocks
 
 
 def _get_clock(ast, acc):
@@ -5,15 +5,13 @@ import copy
 from uppyyl_simulator.backend.data_structures.ast.ast_code_element import (
     ASTCodeElement
 )
-from uppyyl_simulator.backend.ast.parsers.generated.uppaal_c_language_parser import (
-    UppaalCLanguageParser
+from uppyyl_simulator.backend.ast.parsers.uppaal_c_parser_factory import (
+    get_uppaal_c_parser
 )
+from uppyyl_simulator.backend.ast.parsers.uppaal_c_ast_cache import parse_cached
 from uppyyl_simulator.backend.ast.printers.uppaal_query_language_printer import (
     UppaalQueryPrinter
 )
-from uppyyl_simulator.backend.ast.parsers.uppaal_c_language_semantics import (
-    UppaalCLanguageSemantics
-)
 
 
 #########
@@ -22,28 +20,30 @@ from uppyyl_simulator.backend.ast.parsers.uppaal_c_language_semantics import (
 class Query:
     """A representation of Uppaal query."""
 
-    def __init__(self, formula, comment):
+    def __init__(self, formula, comment, ast_cache=None):
         """Initializes Query.
 
         Args:
             formula: The query formula string (e.g., A[] phi)
             comment: An optional comment for the query.
+            ast_cache: An optional AST cache consulted instead of the process-wide AST cache when parsing.
         """
         self.formula = None
-        self.set_formula(formula)
+        self.set_formula(formula, ast_cache=ast_cache)
         self.comment = comment
 
-    def set_formula(self, formula):
+    def set_formula(self, formula, ast_cache=None):
         """Sets the formula of the query object.
 
         Args:
             formula: The formula object or string.
+            ast_cache: An optional AST cache consulted instead of the process-wide AST cache when parsing.
 
         Returns:
             The formula object.
         """
         if isinstance(formula, str):
-            formula = QueryFormula(formula)
+            formula = QueryFormula(formula, ast_cache=ast_cache)
         self.formula = formula
         return formula
 
@@ -54,13 +54,14 @@ class Query:
 class QueryFormula(ASTCodeElement):
     """A representation of Uppaal query formula."""
 
-    def __init__(self, formula_data):
+    def __init__(self, formula_data, ast_cache=None):
         """Initializes QueryFormula.
 
         Args:
             formula_data: The formula data string or AST dict.
+            ast_cache: An optional AST cache consulted instead of the process-wide AST cache when parsing.
         """
-        super().__init__(formula_data)
+        super().__init__(formula_data, ast_cache=ast_cache)
 
     def init_parser(self):
         """Initializes the AST code parser.
@@ -68,7 +69,7 @@ class QueryFormula(ASTCodeElement):
         Returns:
             None
         """
-        self.parser = UppaalCLanguageParser(semantics=UppaalCLanguageSemantics())
+        self.parser = get_uppaal_c_parser()
 
     def init_printer(self):
         """Initializes the AST code printer.
@@ -87,16 +88,20 @@ class QueryFormula(ASTCodeElement):
         copy_query = QueryFormula(copy.deepcopy(self.ast))
         return copy_query
 
-    def update_ast(self):
+    def update_ast(self, ast_cache=None):
         """Updates the AST dict from the AST text string.
 
+        Args:
+            ast_cache: An optional AST cache consulted instead of the process-wide AST cache.
+
         Returns:
             None
         """
         if not self.text:
             self.ast = None
         else:
-            self.ast = self.parser.parse(self.text, rule_name='UppaalProp', trace=False)
+            self.ast = parse_cached(get_uppaal_c_parser(), self.text, rule_name='UppaalProp', cache=ast_cache,
+                                    trace=False)
 
     def __str__(self):
         return f'QueryFormula(\n{self.text}\n)'
@@ -2,9 +2,9 @@
 
 import copy
 
-from uppyyl_simulator.backend.ast.parsers.generated.uppaal_c_language_parser import UppaalCLanguageParser
+from uppyyl_simulator.backend.ast.parsers.uppaal_c_parser_factory import get_uppaal_c_parser
+from uppyyl_simulator.backend.ast.parsers.uppaal_c_ast_cache import parse_cached
 
-from uppyyl_simulator.backend.ast.parsers.uppaal_c_language_semantics import UppaalCLanguageSemantics
 from uppyyl_simulator.backend.ast.printers.uppaal_c_language_printer import UppaalCPrinter
 from uppyyl_simulator.backend.data_structures.ast.ast_code_element import ASTCodeElement
 
@@ -33,7 +33,7 @@ class Update(ASTCodeElement):
         Returns:
             None
         """
-        self.parser = UppaalCLanguageParser(semantics=UppaalCLanguageSemantics())
+        self.parser = get_uppaal_c_parser()
 
     def init_printer(self):
         """Initializes the AST code printer.
@@ -52,13 +52,16 @@ class Update(ASTCodeElement):
         copy_updt = Update(copy.deepcopy(self.ast))
         return copy_updt
 
-    def update_ast(self):
+    def update_ast(self, ast_cache=None):
         """Updates the AST dict from the AST text string.
 
+        Args:
+            ast_cache: An optional AST cache consulted instead of the process-wide AST cache.
+
         Returns:
             None
         """
-        self.ast = self.parser.parse(self.text, rule_name='Update')
+        self.ast = parse_cached(get_uppaal_c_parser(), self.text, rule_name='Update', cache=ast_cache)
 
     def __str__(self):
         return f'Update({self.text})'
@@ -87,7 +90,7 @@ class Reset(ASTCodeElement):
         Returns:
             None
         """
-        self.parser = UppaalCLanguageParser(semantics=UppaalCLanguageSemantics())
+        self.parser = get_uppaal_c_parser()
 
     def init_printer(self):
         """Initializes the AST code printer.
@@ -106,13 +109,16 @@ class Reset(ASTCodeElement):
         copy_reset = Reset(copy.deepcopy(self.ast))
         return copy_reset
 
-    def update_ast(self):
+    def update_ast(self, ast_cache=None):
         """Updates the AST dict from the AST text string.
 
+        Args:
+            ast_cache: An optional AST cache consulted instead of the process-wide AST cache.
+
         Returns:
             None
         """
-        self.ast = self.parser.parse(self.text, rule_name='Update')
+        self.ast = parse_cached(get_uppaal_c_parser(), self.text, rule_name='Update', cache=ast_cache)
 
     def __str__(self):
         return f'Reset({self.text})'
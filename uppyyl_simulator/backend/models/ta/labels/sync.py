@@ -2,9 +2,9 @@
 
 import copy
 
-from uppyyl_simulator.backend.ast.parsers.generated.uppaal_c_language_parser import UppaalCLanguageParser
+from uppyyl_simulator.backend.ast.parsers.uppaal_c_parser_factory import get_uppaal_c_parser
+from uppyyl_simulator.backend.ast.parsers.uppaal_c_ast_cache import parse_cached
 
-from uppyyl_simulator.backend.ast.parsers.uppaal_c_language_semantics import UppaalCLanguageSemantics
 from uppyyl_simulator.backend.ast.printers.uppaal_c_language_printer import UppaalCPrinter
 from uppyyl_simulator.backend.data_structures.ast.ast_code_element import ASTCodeElement
 
@@ -18,13 +18,14 @@ class Synchronization(ASTCodeElement):
     Via a channel synchronization, multiple edge can be synchronized and triggered simultaneously.
     """
 
-    def __init__(self, sync_data, autom=None):
+    def __init__(self, sync_data, autom=None, ast_cache=None):
         """Initializes Synchronization.
 
         Args:
             sync_data: The edge channel synchronization string or AST data.
+            ast_cache: An optional AST cache consulted instead of the process-wide AST cache when parsing.
         """
-        super().__init__(sync_data)
+        super().__init__(sync_data, ast_cache=ast_cache)
         self.autom = autom
 
     def init_parser(self):
@@ -33,7 +34,7 @@ class Synchronization(ASTCodeElement):
         Returns:
             None
         """
-        self.parser = UppaalCLanguageParser(semantics=UppaalCLanguageSemantics())
+        self.parser = get_uppaal_c_parser()
 
     def init_printer(self):
         """Initializes the AST code printer.
@@ -52,13 +53,16 @@ class Synchronization(ASTCodeElement):
         copy_sync = Synchronization(copy.deepcopy(self.ast))
         return copy_sync
 
-    def update_ast(self):
+    def update_ast(self, ast_cache=None):
         """Updates the AST dict from the AST text string.
 
+        Args:
+            ast_cache: An optional AST cache consulted instead of the process-wide AST cache.
+
         Returns:
             None
         """
-        self.ast = self.parser.parse(self.text, rule_name='Sync')
+        self.ast = parse_cached(get_uppaal_c_parser(), self.text, rule_name='Sync', cache=ast_cache)
 
     def __str__(self):
         return f'Sync({self.text})'
@@ -22,19 +22,21 @@ class System(automaton_network.System):
         self.templates = OrderedDict()
         self.automata = OrderedDict()
         self.system_declaration = None
+        self.label_parse_stats = {"labels": 0, "parsed": 0}  # Counts of loaded and actually parsed labels
 
-    def set_system_declaration(self, decl):
+    def set_system_declaration(self, decl, ast_cache=None):
         """Sets the system declaration.
 
         Args:
             decl: The system declaration code string (or object)
+            ast_cache: An optional AST cache consulted instead of the process-wide AST cache when parsing.
 
         Returns:
             The system declaration object.
         """
 
         if isinstance(decl, str):
-            decl = SystemDeclaration(decl)
+            decl = SystemDeclaration(decl, ast_cache=ast_cache)
         self.system_declaration = decl
         return decl
 
@@ -2,9 +2,9 @@
 
 import copy
 
-from uppyyl_simulator.backend.ast.parsers.generated.uppaal_c_language_parser import UppaalCLanguageParser
+from uppyyl_simulator.backend.ast.parsers.uppaal_c_parser_factory import get_uppaal_c_parser
+from uppyyl_simulator.backend.ast.parsers.uppaal_c_ast_cache import parse_cached
 
-from uppyyl_simulator.backend.ast.parsers.uppaal_c_language_semantics import UppaalCLanguageSemantics
 from uppyyl_simulator.backend.ast.printers.uppaal_c_language_printer import UppaalCPrinter
 from uppyyl_simulator.backend.data_structures.ast.ast_code_element import ASTCodeElement
 
@@ -18,13 +18,14 @@ class SystemDeclaration(ASTCodeElement):
     In the system declaration, template instances are defined and composed into a system.
     """
 
-    def __init__(self, decl_data):
+    def __init__(self, decl_data, ast_cache=None):
         """Initializes SystemDeclaration.
 
         Args:
             decl_data: The system declaration string or AST data.
+            ast_cache: An optional AST cache consulted instead of the process-wide AST cache when parsing.
         """
-        super().__init__(decl_data)
+        super().__init__(decl_data, ast_cache=ast_cache)
 
     def init_parser(self):
         """Initializes the AST code parser.
@@ -32,7 +33,7 @@ class SystemDeclaration(ASTCodeElement):
         Returns:
             None
         """
-        self.parser = UppaalCLanguageParser(semantics=UppaalCLanguageSemantics())
+        self.parser = get_uppaal_c_parser()
 
     def init_printer(self):
         """Initializes the AST code printer.
@@ -51,13 +52,16 @@ class SystemDeclaration(ASTCodeElement):
         copy_decl = SystemDeclaration(copy.deepcopy(self.ast))
         return copy_decl
 
-    def update_ast(self):
+    def update_ast(self, ast_cache=None):
         """Updates the AST dict from the AST text string.
 
+        Args:
+            ast_cache: An optional AST cache consulted instead of the process-wide AST cache.
+
         Returns:
             None
         """
-        self.ast = self.parser.parse(self.text, rule_name='UppaalSystemDeclaration')
+        self.ast = parse_cached(get_uppaal_c_parser(), self.text, rule_name='UppaalSystemDeclaration', cache=ast_cache)
 
     def __str__(self):
         return f'SystemDeclaration(\n{self.text}\n)'
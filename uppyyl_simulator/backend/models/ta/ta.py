@@ -1,5 +1,6 @@
 """A Uppaal timed automaton (TA) implementation."""
 
+import threading
 from collections import OrderedDict
 
 import uppyyl_simulator.backend.models.base.automaton as basic_automaton
@@ -8,6 +9,85 @@ from uppyyl_simulator.backend.helper.helper import (
 )
 
 
+###################
+# Deferred Labels #
+###################
+deferred_label_lock = threading.RLock()
+
+
+class DeferredLabels:
+    """A descriptor of a label attribute, whose deferred labels are loaded (e.g., parsed) on first access."""
+
+    def __init__(self):
+        """Initializes DeferredLabels."""
+        self.name = None
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        if obj.deferred_label_loaders:
+            obj.load_deferred_labels(self.name)
+        return obj.__dict__[self.name]
+
+    def __set__(self, obj, value):
+        obj.__dict__[self.name] = value
+
+
+class DeferredLabelsMixin:
+    """A mixin for templates, locations, and edges whose labels can be loaded on first access instead of on creation."""
+
+    deferred_label_loaders = ()
+    running_label_loaders = ()
+
+    def defer_labels(self, attr_names, loader):
+        """Defers the loading of labels until one of the given label attributes is accessed first.
+
+        Args:
+            attr_names: The names of the label attributes filled by the loader.
+            loader: A function without arguments which loads the labels.
+        """
+        with deferred_label_lock:
+            if not self.deferred_label_loaders:
+                self.deferred_label_loaders = []
+            self.deferred_label_loaders.append((attr_names, loader))
+
+    def load_deferred_labels(self, attr_name=None):
+        """Loads the deferred labels of a given label attribute (thread-safe).
+
+        A loader is only removed once it has finished, so that other threads wait for it instead of reading partially
+        loaded labels. Accesses by the running loader itself return the labels loaded so far.
+
+        Args:
+            attr_name: The label attribute name, or None to load all deferred labels.
+        """
+        with deferred_label_lock:
+            entries = [entry for entry in self.deferred_label_loaders if attr_name is None or attr_name in entry[0]]
+            for entry in entries:
+                if entry not in self.deferred_label_loaders or entry in self.running_label_loaders:
+                    continue  # Already loaded by another access, or accessed by the loader itself
+                if not self.running_label_loaders:
+                    self.running_label_loaders = []
+                self.running_label_loaders.append(entry)
+                try:
+                    entry[1]()
+                finally:
+                    self.running_label_loaders.remove(entry)
+                self.deferred_label_loaders.remove(entry)
+
+    def __getstate__(self):
+        """Gets the state for pickling, for which all deferred labels are loaded first.
+
+        Returns:
+            The state dict.
+        """
+        if self.deferred_label_loaders:
+            self.load_deferred_labels()
+        return self.__dict__.copy()
+
+
 ############
 # Template #
 ############
@@ -19,12 +99,14 @@ from uppyyl_simulator.backend.models.ta.labels.select import Select
 from uppyyl_simulator.backend.models.ta.labels.sync import Synchronization
 
 
-class Template(basic_automaton.Automaton):
+class Template(DeferredLabelsMixin, basic_automaton.Automaton):
     """A Uppaal model template class.
 
     It is used as a template to derive concrete automaton instances from.
     """
 
+    parameters = DeferredLabels()
+
     def __init__(self, name, id_=None):
         """Initializes Template.
 
@@ -193,9 +275,11 @@ class Template(basic_automaton.Automaton):
 ############
 # Location #
 ############
-class Location(basic_automaton.Location):
+class Location(DeferredLabelsMixin, basic_automaton.Location):
     """An Uppaal automaton location class."""
 
+    invariants = DeferredLabels()
+
     def __init__(self, name=None, parent=None, id_=None):
         """Initializes Location.
 
@@ -323,7 +407,7 @@ class Location(basic_automaton.Location):
 ########
 # Edge #
 ########
-class Edge(basic_automaton.Edge):
+class Edge(DeferredLabelsMixin, basic_automaton.Edge):
     """An Uppaal automaton edge class."""
     """
     Create an instance of Edge.
@@ -338,6 +422,13 @@ class Edge(basic_automaton.Edge):
     @inner
     """
 
+    clock_guards = DeferredLabels()
+    variable_guards = DeferredLabels()
+    updates = DeferredLabels()
+    resets = DeferredLabels()
+    sync = DeferredLabels()
+    selects = DeferredLabels()
+
     def __init__(self, source, target, parent=None, id_=None):
         """Initializes Edge.
 
@@ -439,16 +530,17 @@ class Edge(basic_automaton.Edge):
         self.selects.append(sel)
         return sel
 
-    def new_select(self, sel_data):
+    def new_select(self, sel_data, ast_cache=None):
         """Creates a new select object and add it to the edge.
 
         Args:
             sel_data: The select text or AST dict.
+            ast_cache: An optional AST cache consulted instead of the process-wide AST cache when parsing.
 
         Returns:
             The select object.
         """
-        sel = Select(sel_data, self.parent)
+        sel = Select(sel_data, self.parent, ast_cache=ast_cache)
         self.add_select(sel)
         return sel
 
@@ -502,17 +594,18 @@ class Edge(basic_automaton.Edge):
         self.add_reset(rst)
         return rst
 
-    def set_sync(self, sync):
+    def set_sync(self, sync, ast_cache=None):
         """Sets the synchronization label.
 
         Args:
             sync: The synchronization text or AST dict.
+            ast_cache: An optional AST cache consulted instead of the process-wide AST cache when parsing.
 
         Returns:
             The synchronization object.
         """
         if not isinstance(sync, Synchronization):
-            sync = Synchronization(sync, self.parent)
+            sync = Synchronization(sync, self.parent, ast_cache=ast_cache)
         self.sync = sync
         return sync
 
@@ -16,6 +16,7 @@ class Transition:
         self.urgent = urgent
         self.committed = committed
         self.dbm_op_sequence = DBMOperationSequence()
+        self.delay = None  # The delay before the transition (only set in concrete simulations)
 
     def short_string(self):
         """Generates a short string representation of the transition.
@@ -2,22 +2,35 @@
 
 import copy
 import itertools
+import math
+import operator
 import random
 from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 
-from uppyyl_simulator.backend.ast.parsers.generated.uppaal_c_language_parser import (
-    UppaalCLanguageParser
+from uppyyl_simulator.backend.ast.parsers.uppaal_c_parser_factory import (
+    get_uppaal_c_parser
 )
 
+from uppyyl_simulator.backend.ast.evaluators.uppaal_c_code_generator import (
+    UppaalCCodeGenerator, ScopeResolver, GENERATED_MODULE_HEADER, load_generated_module
+)
+from uppyyl_simulator.backend.ast.evaluators.uppaal_c_compiler import (
+    UppaalCCompiler
+)
+from uppyyl_simulator.backend.ast.evaluators.uppaal_c_constant_folder import (
+    UppaalCConstantFolder
+)
 from uppyyl_simulator.backend.ast.evaluators.uppaal_c_evaluator import (
     UppaalCEvaluator
 )
-from uppyyl_simulator.backend.ast.parsers.uppaal_c_language_semantics import (
-    UppaalCLanguageSemantics
+from uppyyl_simulator.backend.ast.parsers.uppaal_compiled_model import (
+    COMPILED_MODEL_EXTENSION, uppaal_compiled_to_system, uppaal_system_to_compiled, load_compiled_system
 )
 from uppyyl_simulator.backend.ast.parsers.uppaal_xml_model_parser import (
-    uppaal_xml_to_system
+    uppaal_xml_to_system, uppaal_xml_file_to_system
 )
+from uppyyl_simulator.backend.data_structures.dbm.dbm import PackedDBM, Interval, switch_relation
 from uppyyl_simulator.backend.data_structures.dbm.dbm_operations.dbm_operations import DBMOperationSequence, \
     DBMOperationGenerator
 from uppyyl_simulator.backend.data_structures.state.system_state import (
@@ -25,10 +38,25 @@ from uppyyl_simulator.backend.data_structures.state.system_state import (
 )
 from uppyyl_simulator.backend.data_structures.state.variable import UppaalVariable
 from uppyyl_simulator.backend.data_structures.types.chan import UppaalChan
+from uppyyl_simulator.backend.data_structures.types.function import UppaalFunction
+from uppyyl_simulator.backend.helper.helper import make_chunks, map_bounded
 from uppyyl_simulator.backend.models.ta.transition import Transition
 
 dbm_op_gen = DBMOperationGenerator()
 
+# Up to this number of constraints, each constraint is applied with an incremental O(n^2) closure instead of a
+# single full O(n^3) closure after all constraints
+MAX_INCREMENTAL_CLOSE_CONSTRAINTS = 3
+
+# The number of runs of a batch simulation that are sent to a worker process as a single task
+DEFAULT_BATCH_CHUNK_SIZE = 64
+
+_batch_simulator = None  # The simulator of a batch simulation worker process
+
+# The rate of the exponential distribution from which delays are drawn if no invariant bounds them (see
+# draw_delay)
+DEFAULT_DELAY_RATE = 1.0
+
 
 class Error(Exception):
     """Base class for exceptions."""
@@ -64,6 +92,15 @@ relation_from_ast_op = {
     "GreaterThan": ">",
 }
 
+relation_funcs = {
+    "<=": operator.le,
+    "<": operator.lt,
+    "==": operator.eq,
+    "!=": operator.ne,
+    ">=": operator.ge,
+    ">": operator.gt,
+}
+
 
 def adapt_dbm_constraint_ast(dbm_constr_ast):
     """Transforms the expression ast of a constraint into a clock constraint ast.
@@ -95,6 +132,99 @@ def adapt_dbm_constraint_ast(dbm_constr_ast):
     return {"clock1": clock1, "clock2": clock2, "rel": rel, "val": val, "astType": "ClockConstraint"}
 
 
+def clock_constraint_holds(constr_data, clock_valuation, delay=0):
+    """Checks whether a clock valuation satisfies a clock constraint.
+
+    Args:
+        constr_data: The constraint data dict (i.e., "clock1", "clock2", "rel", and "val").
+        clock_valuation: The clock valuation dict (with the reference clock "T0_REF" being 0).
+        delay: An optional delay added to all clock values.
+
+    Returns:
+        The checking result.
+    """
+    clock1, clock2 = constr_data["clock1"], constr_data["clock2"]
+    clock1_val = clock_valuation[clock1] + delay if clock1 != "T0_REF" else 0
+    clock2_val = clock_valuation[clock2] + delay if clock2 != "T0_REF" else 0
+    return relation_funcs[constr_data["rel"]](clock1_val - clock2_val, int(constr_data["val"]))
+
+
+def get_delay_interval(constr_data_list, clock_valuation, interval=None):
+    """Gets the interval of delays after which a clock valuation satisfies all given clock constraints.
+
+    Args:
+        constr_data_list: The list of constraint data dicts (i.e., "clock1", "clock2", "rel", and "val").
+        clock_valuation: The clock valuation dict.
+        interval: An optional delay interval to restrict (all delays d >= 0 by default).
+
+    Returns:
+        The delay interval, or None if no delay satisfies all constraints.
+    """
+    if interval is None:
+        interval = Interval(lower_incl=True, lower_val=0, upper_val=math.inf, upper_incl=False)
+    lower_val, lower_incl, upper_val, upper_incl = (interval.lower_val, interval.lower_incl,
+                                                    interval.upper_val, interval.upper_incl)
+    for constr_data in constr_data_list:
+        clock1, clock2, rel, val = (constr_data["clock1"], constr_data["clock2"], constr_data["rel"],
+                                    int(constr_data["val"]))
+        if clock1 != "T0_REF" and clock2 != "T0_REF":
+            # Clock differences do not change with a delay
+            if not clock_constraint_holds(constr_data, clock_valuation):
+                return None
+            continue
+        if clock2 == "T0_REF":
+            bound = val - clock_valuation[clock1]  # "t1 + d ~ c" turns into "d ~ c - t1"
+        else:
+            bound = -val - clock_valuation[clock2]  # "-(t2 + d) ~ c" turns into "d ~' -c - t2"
+            rel = switch_relation(rel)
+        if rel in ("<", "<=", "==") and (bound < upper_val or (bound == upper_val and rel == "<")):
+            upper_val, upper_incl = bound, (rel != "<")
+        if rel in (">", ">=", "==") and (bound > lower_val or (bound == lower_val and rel == ">")):
+            lower_val, lower_incl = bound, (rel != ">")
+    if upper_val < lower_val or (upper_val == lower_val and not (lower_incl and upper_incl)):
+        return None
+    return Interval(lower_incl=lower_incl, lower_val=lower_val, upper_val=upper_val, upper_incl=upper_incl)
+
+
+def draw_delay(intervals):
+    """Draws a random delay from the union of delay intervals.
+
+    The delay is drawn uniformly from the union, i.e., the gaps between the intervals are skipped. If the union is
+    unbounded, the delay is drawn from an exponential distribution over the length of the union instead. If the union
+    only consists of single points, one of them is chosen uniformly.
+
+    Args:
+        intervals: The list of (non-empty) delay intervals.
+
+    Returns:
+        The delay, which lies in at least one of the intervals.
+    """
+    # Merge the overlapping intervals into segments
+    segments = []
+    for interval in sorted(intervals, key=lambda interv: interv.lower_val):
+        if segments and interval.lower_val <= segments[-1][1]:
+            segments[-1][1] = max(segments[-1][1], interval.upper_val)
+        else:
+            segments.append([interval.lower_val, interval.upper_val])
+    total_length = sum(upper_val - lower_val for lower_val, upper_val in segments)
+    if total_length == 0:
+        return random.choice(segments)[0]
+
+    # Map a random offset along the union onto its segments, and redraw if the delay hits an excluded bound
+    while True:
+        if total_length == math.inf:
+            offset = random.expovariate(DEFAULT_DELAY_RATE)
+        else:
+            offset = random.uniform(0, total_length)
+        for lower_val, upper_val in segments:
+            if offset <= upper_val - lower_val:
+                delay = lower_val + offset
+                if any(interval.contains(delay) for interval in intervals):
+                    return delay
+                break
+            offset -= upper_val - lower_val
+
+
 def adapt_dbm_reset_ast(dbm_reset_ast):
     """Transforms the expression ast of a reset into a clock reset ast.
 
@@ -115,8 +245,51 @@ def adapt_dbm_reset_ast(dbm_reset_ast):
 class Simulator:
     """A simulator for Uppaal model systems."""
 
-    def __init__(self):
-        """Initializes UppaalSimulator."""
+    def __init__(self, dbm_class=PackedDBM, extrapolation=None, transition_cache_size=1024, compact_variables=False,
+                 fold_constants=False, code_generation=False, code_cache_dir=None, parallel_loading=False,
+                 semantics="symbolic", lazy_loading=False):
+        """Initializes UppaalSimulator.
+
+        Args:
+            dbm_class: The DBM implementation used for the clock states (e.g., DBM or PackedDBM).
+            extrapolation: The zone extrapolation applied to each reached state ("max_bounds", "lu", or None).
+            transition_cache_size: The maximum number of discrete states whose potential transitions are cached.
+            compact_variables: Choose whether the variable values of all states are stored in a flat value buffer
+                (see VariableLayout), which makes state copies and state keys cheaper.
+            fold_constants: Choose whether all labels are specialized for each instance by inlining constants and
+                folding constant subexpressions (see specialize_system).
+            code_generation: Choose whether Python code is generated for the guards, updates, clock constraints, and
+                resets of all edges and the invariants of all locations (see generate_system_code).
+            code_cache_dir: An optional directory in which the generated code is cached across runs.
+            parallel_loading: Choose whether the templates of loaded systems are parsed in parallel by a pool of
+                worker processes (see uppaal_xml_to_system).
+            semantics: The clock semantics of the simulation, i.e., "symbolic" (states with zones, and all valid
+                transitions) or "concrete" (states with clock values, and a single transition after a random delay,
+                see sample_concrete_step).
+            lazy_loading: Choose whether the location and edge labels of loaded systems are only parsed on first access
+                (see uppaal_xml_to_system), and compiled and indexed only when first used during simulation. Constant
+                folding, code generation, and extrapolation still process all labels when a system is set.
+        """
+        if extrapolation not in (None, "max_bounds", "lu"):
+            raise Exception(f'Extrapolation "{extrapolation}" not supported.')
+        if semantics not in ("symbolic", "concrete"):
+            raise Exception(f'Semantics "{semantics}" not supported.')
+        if parallel_loading and lazy_loading:
+            raise Exception("Parallel and lazy loading cannot be combined.")
+        self.dbm_class = dbm_class
+        self.extrapolation = extrapolation
+        self.clock_bounds = None
+        self.transition_cache_size = transition_cache_size
+        self.compact_variables = compact_variables
+        self.fold_constants = fold_constants
+        self.code_generation = code_generation
+        self.code_cache_dir = code_cache_dir
+        self.parallel_loading = parallel_loading
+        self.semantics = semantics
+        self.lazy_loading = lazy_loading
+        self.generated_code = None
+        self.potential_transition_cache = OrderedDict()
+        self.edge_index = None
         self.init_system_state = None
         self.system_state = None
         self.transitions = None
@@ -132,29 +305,54 @@ class Simulator:
 
         self.system = None
 
-        self.c_language_parser = UppaalCLanguageParser(semantics=UppaalCLanguageSemantics())
+        self.c_language_parser = get_uppaal_c_parser()
         self.c_evaluator = UppaalCEvaluator(do_log_details=False)
+        self.c_compiler = UppaalCCompiler(evaluator=self.c_evaluator)
+        self.c_constant_folder = UppaalCConstantFolder(evaluator=self.c_evaluator)
+        self.c_code_generator = UppaalCCodeGenerator()
 
     def load_system(self, system_path):
-        """Loads a system at a given path into the simulator.
+        """Loads a system at a given path (or from a file object) into the simulator.
+
+        Paths with extension ".uppyc" are loaded as compiled systems (see load_compiled_system). Otherwise, unless the
+        system is parsed in parallel, the system XML is streamed from the file (see uppaal_xml_file_to_system), so
+        that the whole XML document is never held in memory.
 
         Args:
-            system_path: The system path.
+            system_path: The system path, or a binary file object to read the system XML from.
         """
-        with open(system_path) as file:
-            system_xml_str = file.read()
+        if isinstance(system_path, str) and system_path.endswith(COMPILED_MODEL_EXTENSION):
+            self.set_system(load_compiled_system(system_path))
+            return
+        if not self.parallel_loading:
+            self.set_system(uppaal_xml_file_to_system(system_path, lazy=self.lazy_loading))
+            return
+        if hasattr(system_path, "read"):
+            system_xml_str = system_path.read().decode("utf-8")
+        else:
+            with open(system_path) as file:
+                system_xml_str = file.read()
         self.set_system(system_xml_str)
 
     def set_system(self, system):
         """Sets the system of the simulator.
 
         Args:
-            system: The system as string or system object.
+            system: The system as XML string, compiled system data (see uppaal_system_to_compiled), or system object.
         """
         if isinstance(system, str):
-            system = uppaal_xml_to_system(system)
+            system = uppaal_xml_to_system(system, parallel=self.parallel_loading, lazy=self.lazy_loading)
+        elif isinstance(system, (bytes, bytearray, memoryview)):
+            system = uppaal_compiled_to_system(system)
         self.system = system
+        self.potential_transition_cache.clear()
         self.init_system_state = self.generate_init_system_state()
+        self.compile_system()
+        if self.fold_constants:
+            self.specialize_system()
+        self.generated_code = self.generate_system_code() if self.code_generation else None
+        self.edge_index = {} if self.lazy_loading else self.compile_edge_index()
+        self.clock_bounds = self.compute_clock_bounds() if self.extrapolation else None
         self.init_simulator()
 
     def get_system_details(self):
@@ -167,7 +365,7 @@ class Simulator:
         edge_count = 0
 
         instance_count = len(self.system_state.instance_data)
-        clock_count = len(self.system_state.dbm_state.clocks[1:])
+        clock_count = len(self.system_state.peek_dbm_state().clocks[1:])
         for inst_name, inst_data in self.system_state.instance_data.items():
             tmpl_name = inst_data["template_name"]
             tmpl = self.system.get_template_by_name(tmpl_name)
@@ -192,21 +390,269 @@ class Simulator:
         system_state = SystemState()
 
         # Init const and variable state
-        system_state.init_from_system(self.system)
+        system_state.init_from_system(self.system, dbm_class=self.dbm_class)
+        if self.compact_variables:
+            system_state.use_variable_layout()
         system_state.activate_system_scope(access_instance_scopes=True)
 
         return system_state
 
+    def compile_system(self):
+        """Compiles all guards, updates, resets, invariants, and function bodies of the system into closures.
+
+        The compiled form of each label is cached in the label itself (i.e., "label.compiled"), and used instead of
+        evaluating the label AST during simulation. If loaded lazily, labels are only compiled on first use instead
+        (see _get_compiled_label), so that labels which are never used are neither parsed nor compiled.
+        """
+        if not self.lazy_loading:
+            for tmpl in self.system.templates.values():
+                for loc in tmpl.locations.values():
+                    self._compile_labels(loc.invariants, self._compile_constraint_ast)
+                for edge in tmpl.edges.values():
+                    self._compile_labels(edge.clock_guards, self._compile_constraint_ast)
+                    self._compile_labels(edge.variable_guards, self._compile_variable_guard_ast)
+                    self._compile_labels(edge.updates, self.c_compiler.compile_ast)
+                    self._compile_labels(edge.resets, self._compile_reset_ast)
+
+        program_state = self.init_system_state.peek_program_state()
+        const_scopes = [program_state["constant"]["system"]]
+        const_scopes.extend(program_state["constant"]["instances"].values())
+        for scope in const_scopes:
+            for val in scope.values():
+                if isinstance(val, UppaalFunction):
+                    self.c_compiler.compile_function(val)
+
+    @staticmethod
+    def _compile_labels(labels, compile_func):
+        """Compiles the ASTs of labels, and caches the compiled form in each label.
+
+        Args:
+            labels: The list of labels.
+            compile_func: The function which compiles a label AST.
+        """
+        for label in labels:
+            label.reset_compiled()
+            Simulator._compile_label(label, compile_func)
+
+    @staticmethod
+    def _compile_label(label, compile_func):
+        """Compiles the AST of a label, and caches the compiled form in the label.
+
+        Args:
+            label: The label.
+            compile_func: The function which compiles a label AST.
+        """
+        try:
+            label.compiled = compile_func(label.ast)
+        except Exception:
+            label.compiled = None  # The label AST is evaluated instead (i.e., errors are raised on evaluation)
+        label.compile_pending = False
+
+    def _compile_variable_guard_ast(self, guard_ast):
+        """Compiles a variable guard AST into a closure which yields the guard value.
+
+        Args:
+            guard_ast: The variable guard AST.
+
+        Returns:
+            The compiled guard.
+        """
+        return self.c_compiler.compile_ast(guard_ast["expr"])
+
+    def specialize_system(self):
+        """Specializes all guards, updates, resets, and invariants of the system for each instance.
+
+        In the specialized label ASTs, all int and bool constants (e.g., constant template parameters) are inlined, and
+        constant subexpressions are folded, so that constant clock bounds become plain integers. The specialized ASTs
+        and their compiled forms are cached per instance name in each label (i.e., "label.instance_asts" and
+        "label.instance_compiled"), and used instead of the shared label AST during simulation.
+        """
+        state = self.init_system_state.copy()
+        for inst_name, inst_data in state.instance_data.items():
+            tmpl = self.system.get_template_by_name(inst_data["template_name"])
+            for loc in tmpl.locations.values():
+                self._specialize_labels(loc.invariants, state, inst_name, None, self._compile_constraint_ast)
+            for edge in tmpl.edges.values():
+                select_names = [select.ast["name"] for select in edge.selects]
+                self._specialize_labels(edge.clock_guards, state, inst_name, select_names,
+                                        self._compile_constraint_ast)
+                self._specialize_labels(edge.variable_guards, state, inst_name, select_names,
+                                        self._compile_variable_guard_ast)
+                self._specialize_labels(edge.updates, state, inst_name, select_names, self.c_compiler.compile_ast)
+                self._specialize_labels(edge.resets, state, inst_name, select_names, self._compile_reset_ast)
+
+    def _specialize_labels(self, labels, state, inst_name, local_names, compile_func):
+        """Specializes the ASTs of labels for an instance, and caches the specialized and compiled forms in each label.
+
+        Args:
+            labels: The list of labels.
+            state: The state which holds the constants.
+            inst_name: The instance name.
+            local_names: The names of the variables in the local (edge) scope.
+            compile_func: The function which compiles a label AST.
+        """
+        for label in labels:
+            try:
+                instance_ast = self.c_constant_folder.fold_ast(label.ast, state=state, inst_name=inst_name,
+                                                               local_names=local_names)
+                instance_compiled = compile_func(instance_ast)
+            except Exception:
+                continue  # The shared label AST is used instead
+            label.instance_asts[inst_name] = instance_ast
+            label.instance_compiled[inst_name] = instance_compiled
+
+    @staticmethod
+    def _get_label_ast(label, inst_name):
+        """Gets the AST of a label specialized for an instance, or the shared label AST if not specialized.
+
+        Args:
+            label: The label.
+            inst_name: The instance name.
+
+        Returns:
+            The label AST.
+        """
+        return label.instance_asts.get(inst_name, label.ast)
+
+    @staticmethod
+    def _get_compiled_label(label, inst_name, compile_func):
+        """Gets the compiled form of a label specialized for an instance, or the shared compiled form if not
+        specialized. The shared compiled form is created on first use if not compiled yet (e.g., if loaded lazily).
+
+        Args:
+            label: The label.
+            inst_name: The instance name.
+            compile_func: The function which compiles the label AST.
+
+        Returns:
+            The compiled label, or None if the label cannot be compiled.
+        """
+        compiled = label.instance_compiled.get(inst_name)
+        if compiled is not None:
+            return compiled
+        if label.compile_pending:
+            Simulator._compile_label(label, compile_func)
+        return label.compiled
+
+    def generate_system_code(self):
+        """Generates a Python module with functions for the guards, updates, clock guards, and resets of each edge and
+        the invariants of each location of each instance.
+
+        All variable accesses are resolved to fixed scope keys of the instance, so that no name resolution is
+        required during simulation. Labels for which no code can be generated (e.g., due to unsupported expressions)
+        are handled by their compiled closures instead. If a code cache directory is set, the generated module is
+        stored there, so that its bytecode is reused on the next start.
+
+        Returns:
+            A dict of generated functions per label kind ("guards", "updates", "clock_guards", "resets", and
+            "invariants"), each keyed by instance name and edge or location ID.
+        """
+        state = self.init_system_state.copy()
+        sources = [GENERATED_MODULE_HEADER]
+        func_names = {"guards": {}, "updates": {}, "clock_guards": {}, "resets": {}, "invariants": {}}
+
+        def add_function(kind, key, local_names, labels, generate_body_func):
+            if len(labels) == 0:
+                return
+            resolver = ScopeResolver(state=state, inst_name=key[0], local_names=local_names)
+            try:
+                body_lines = generate_body_func(labels, resolver)
+            except Exception:
+                return  # The compiled closures of the labels are used instead
+            func_name = f'{kind}_{len(sources)}'
+            sources.append(self.c_code_generator.generate_function(func_name, body_lines, resolver))
+            func_names[kind][key] = func_name
+
+        for inst_name, inst_data in state.instance_data.items():
+            tmpl = self.system.get_template_by_name(inst_data["template_name"])
+            for loc in tmpl.locations.values():
+                add_function("invariants", (inst_name, loc.id), None, loc.invariants, self._generate_constraints_body)
+            for edge in tmpl.edges.values():
+                key = (inst_name, edge.id)
+                select_names = [select.ast["name"] for select in edge.selects]
+                add_function("guards", key, select_names, edge.variable_guards, self._generate_guards_body)
+                add_function("updates", key, select_names, edge.updates, self._generate_updates_body)
+                add_function("clock_guards", key, select_names, edge.clock_guards, self._generate_constraints_body)
+                add_function("resets", key, select_names, edge.resets, self._generate_resets_body)
+
+        namespace = load_generated_module(source="\n\n".join(sources), cache_dir=self.code_cache_dir)
+        generated_code = {kind: {key: namespace[func_name] for key, func_name in kind_func_names.items()}
+                          for kind, kind_func_names in func_names.items()}
+        return generated_code
+
+    def _generate_guards_body(self, guards, resolver):
+        # All guards are evaluated, equivalent to _evaluate_variable_guards
+        body_lines = ["res = True"]
+        for guard in guards:
+            guard_ast = self._get_label_ast(guard, resolver.inst_name)
+            body_lines.append(f'ret = {self.c_code_generator.generate_expr(guard_ast["expr"], resolver)}')
+            body_lines.append("res = res and ret")
+        body_lines.append("return res")
+        return body_lines
+
+    def _generate_updates_body(self, updates, resolver):
+        return [self.c_code_generator.generate_expr(self._get_label_ast(update, resolver.inst_name)["expr"], resolver)
+                for update in updates]
+
+    def _generate_constraints_body(self, constraints, resolver):
+        constr_sources = []
+        for constr in constraints:
+            dbm_constr_ast = adapt_dbm_constraint_ast(self._get_label_ast(constr, resolver.inst_name))
+            clock1 = self.c_code_generator.generate_clock_name(dbm_constr_ast["clock1"], resolver)
+            clock2 = (self.c_code_generator.generate_clock_name(dbm_constr_ast["clock2"], resolver)
+                      if dbm_constr_ast["clock2"] is not None else repr("T0_REF"))
+            rel = relation_from_ast_op[dbm_constr_ast["rel"]]
+            val = self.c_code_generator.generate_expr(dbm_constr_ast["val"], resolver)
+            constr_sources.append(f'{{"clock1": {clock1}, "clock2": {clock2}, "rel": {rel!r}, "val": {val}}}')
+        return [f'return [{", ".join(constr_sources)}]']
+
+    def _generate_resets_body(self, resets, resolver):
+        reset_sources = []
+        for reset in resets:
+            dbm_reset_ast = adapt_dbm_reset_ast(self._get_label_ast(reset, resolver.inst_name))
+            clock = self.c_code_generator.generate_clock_name(dbm_reset_ast["clock"], resolver)
+            val = self.c_code_generator.generate_expr(dbm_reset_ast["val"], resolver)
+            reset_sources.append(f'{{"clock": {clock}, "val": {val}}}')
+        return [f'return [{", ".join(reset_sources)}]']
+
+    def _get_generated_function(self, kind, key):
+        """Gets the generated function of a label kind for an instance edge or location.
+
+        Args:
+            kind: The label kind (e.g., "guards").
+            key: The tuple of instance name and edge or location ID.
+
+        Returns:
+            The generated function, or None if no function was generated.
+        """
+        if self.generated_code is None:
+            return None
+        return self.generated_code[kind].get(key)
+
     def init_simulator(self):
         """Initializes the simulator."""
         self.transition_trace = []
         self.dbm_op_sequence = DBMOperationSequence()
 
+        initial_transition = self.generate_initial_transition()
+        self.execute_transition(initial_transition)
+
+    def generate_initial_transition(self):
+        """Generates the transition into the initial state (i.e., the initial system state after delay and
+        invariant evaluation).
+
+        Returns:
+            The initial transition.
+        """
+        if self.semantics == "concrete":
+            init_state = self.generate_initial_concrete_state()
+            return Transition(source_state=None, triggered_edges=None, target_state=init_state)
+
         init_state = self.init_system_state.copy()
         initial_transition = Transition(source_state=None, triggered_edges=None, target_state=init_state)
         loc_res = self._evaluate_locations(initial_transition.target_state)
         initial_transition.dbm_op_sequence.extend(loc_res["dbm_op_seq"])
-        self.execute_transition(initial_transition)
+        return initial_transition
 
     def get_sequence(self):
         """Gets the sequence of applied DBM operations.
@@ -234,37 +680,36 @@ class Simulator:
         return urgent, committed
 
     def _get_all_potential_transitions(self, state):
+        # Potential transitions only depend on the discrete state (i.e., the locations and variable values)
+        if self.transition_cache_size > 0:
+            key = state.get_discrete_state_key()
+            skeletons = self.potential_transition_cache.get(key)
+            if skeletons is None:
+                transitions = self._compute_all_potential_transitions(state=state)
+                skeletons = [(trans.triggered_edges, trans.edge_scopes, trans.urgent, trans.committed)
+                             for trans in transitions]
+                self.potential_transition_cache[key] = skeletons
+                if len(self.potential_transition_cache) > self.transition_cache_size:
+                    self.potential_transition_cache.popitem(last=False)
+                return transitions
+            self.potential_transition_cache.move_to_end(key)
+            return [Transition(source_state=state, triggered_edges=triggered_edges, target_state=None,
+                               urgent=urgent, committed=committed, edge_scopes=edge_scopes)
+                    for triggered_edges, edge_scopes, urgent, committed in skeletons]
+        return self._compute_all_potential_transitions(state=state)
+
+    def _compute_all_potential_transitions(self, state):
         # Get all possible outgoing edges classified by synchronization type
         all_out_edges = {}
         for inst_name, loc in state.location_state.items():
             state.activate_instance_scope(inst_name)
-            no_sync_edges = []
-            caller_edges = {}
-            listener_edges = {}
-            for _, edge in loc.out_edges.items():
-                select_val_combinations = self._get_select_val_combinations(edge=edge, state=state)
-                for select_val_comb in select_val_combinations:
-                    edge_scope = {k: UppaalVariable(name=k, val=v) for k, v in select_val_comb.items()}
-                    state.add_local_scope(name='edge', scope=edge_scope)
-                    if edge.sync is None:
-                        no_sync_edges.append((edge_scope, edge))
-                    else:
-                        chan_obj: UppaalChan = self.c_evaluator.eval_ast(edge.sync.ast["channel"], state).val
-                        if edge.sync.ast["op"] == '!':
-                            if chan_obj not in caller_edges:
-                                caller_edges[chan_obj] = []
-                            caller_edges[chan_obj].append((edge_scope, edge))
-                        else:
-                            if chan_obj not in listener_edges:
-                                listener_edges[chan_obj] = []
-                            listener_edges[chan_obj].append((edge_scope, edge))
-
-                    state.remove_local_scope()
-
+            loc_edges = self._get_location_edges(inst_name=inst_name, loc=loc)
+            no_sync_edges = [(edge_scope, edge) for edge, edge_scopes, _ in loc_edges["no_sync"]
+                             for edge_scope in edge_scopes]
             all_out_edges[inst_name] = {
                 "no_sync": no_sync_edges,
-                "caller": caller_edges,
-                "listener": listener_edges
+                "caller": self._group_sync_edges_by_channel(sync_edges=loc_edges["caller"], state=state),
+                "listener": self._group_sync_edges_by_channel(sync_edges=loc_edges["listener"], state=state)
             }
 
         # Get all potential transitions (target states do not need to be known at this point)
@@ -355,6 +800,89 @@ class Simulator:
         # print(f'Potential transitions: {len(all_pot_trans)}')
         return all_pot_trans
 
+    def _group_sync_edges_by_channel(self, sync_edges, state):
+        grouped_edges = {}
+        for edge, edge_scopes, static_chan_obj in sync_edges:
+            for edge_scope in edge_scopes:
+                chan_obj = static_chan_obj
+                if chan_obj is None:
+                    state.add_local_scope(name='edge', scope=edge_scope)
+                    chan_obj: UppaalChan = self.c_evaluator.eval_ast(edge.sync.ast["channel"], state).val
+                    state.remove_local_scope()
+                if chan_obj not in grouped_edges:
+                    grouped_edges[chan_obj] = []
+                grouped_edges[chan_obj].append((edge_scope, edge))
+        return grouped_edges
+
+    def compile_edge_index(self):
+        """Compiles the outgoing edges of each location of each instance, grouped by synchronization type.
+
+        The select value combinations of all edges are enumerated once. Channels referenced by name are resolved
+        once as well, so that only channels depending on the state (e.g., "ch[i]") are evaluated during simulation.
+
+        Returns:
+            The edge index, i.e., a dict of "no_sync", "caller", and "listener" edges per instance name and location ID
+            (with each edge given as tuple of edge, edge scopes, and statically resolved channel or None).
+        """
+        state = self.init_system_state.copy()
+        state_copy = state.copy()  # Used to detect channels which are not shared among states
+        edge_index = {}
+        for inst_name, inst_data in state.instance_data.items():
+            tmpl = self.system.get_template_by_name(inst_data["template_name"])
+            state.activate_instance_scope(inst_name)
+            state_copy.activate_instance_scope(inst_name)
+            edge_index[inst_name] = {}
+            for loc in tmpl.locations.values():
+                edge_index[inst_name][loc.id] = self._compile_location_edges(loc=loc, state=state,
+                                                                             state_copy=state_copy)
+        return edge_index
+
+    def _get_location_edges(self, inst_name, loc):
+        """Gets the outgoing edges of a location of an instance from the edge index, grouped by synchronization type.
+        If loaded lazily, the edges of each location are only indexed on its first visit.
+
+        Args:
+            inst_name: The instance name.
+            loc: The location.
+
+        Returns:
+            The "no_sync", "caller", and "listener" edges of the location (see compile_edge_index).
+        """
+        inst_edge_index = self.edge_index.get(inst_name)
+        if inst_edge_index is None:
+            inst_edge_index = self.edge_index[inst_name] = {}
+        loc_edges = inst_edge_index.get(loc.id)
+        if loc_edges is None:
+            state = self.init_system_state.copy()
+            state_copy = state.copy()
+            state.activate_instance_scope(inst_name)
+            state_copy.activate_instance_scope(inst_name)
+            loc_edges = self._compile_location_edges(loc=loc, state=state, state_copy=state_copy)
+            inst_edge_index[loc.id] = loc_edges
+        return loc_edges
+
+    def _compile_location_edges(self, loc, state, state_copy):
+        loc_edges = {"no_sync": [], "caller": [], "listener": []}
+        for edge in loc.out_edges.values():
+            edge_scopes = [{k: UppaalVariable(name=k, val=v) for k, v in select_val_comb.items()}
+                           for select_val_comb in self._get_select_val_combinations(edge=edge, state=state)]
+            if edge.sync is None:
+                loc_edges["no_sync"].append((edge, edge_scopes, None))
+            else:
+                chan_obj = self._resolve_static_channel(chan_ast=edge.sync.ast["channel"], state=state,
+                                                        state_copy=state_copy)
+                sync_type = "caller" if edge.sync.ast["op"] == '!' else "listener"
+                loc_edges[sync_type].append((edge, edge_scopes, chan_obj))
+        return loc_edges
+
+    def _resolve_static_channel(self, chan_ast, state, state_copy):
+        if chan_ast["astType"] != "Variable":
+            return None
+        chan_obj = self.c_evaluator.eval_ast(chan_ast, state).val
+        if chan_obj is not self.c_evaluator.eval_ast(chan_ast, state_copy).val:
+            return None
+        return chan_obj
+
     def _get_select_val_combinations(self, edge, state):
         select_val_iterators = OrderedDict()
         for select in edge.selects:
@@ -368,20 +896,33 @@ class Simulator:
     def _get_all_enabled_transitions(self, state, all_pot_trans=None):
         if all_pot_trans is None:
             all_pot_trans = self._get_all_potential_transitions(state=state)
-        enabled_transitions = []
+
+        # Phase 1 (read-only): Variable guards are evaluated on the source state, and clock guards are applied to a
+        # scratch copy of the source DBM, so that target states are only created for enabled transitions. As guards
+        # only read the source state, none of its components shared with other states are copied.
+        enabled_transitions_data = []
         for trans in all_pot_trans:
-            # Init target state from source state
+            if not self._evaluate_variable_guards(transition=trans, state=trans.source_state):
+                continue
+            grd_res = self._evaluate_clock_guards(transition=trans, state=trans.source_state)
+            guarded_dbm = grd_res["dbm"] if grd_res["dbm"] is not None else trans.source_state.peek_dbm_state()
+            if not guarded_dbm.is_empty():
+                enabled_transitions_data.append((trans, grd_res))
+
+        # Phase 2 (construction): Create the target states of all enabled transitions
+        enabled_transitions = []
+        for trans, grd_res in enabled_transitions_data:
+            # Init target state from source state (as copy-on-write copy)
             trans.target_state = trans.source_state.copy()
             # Update target locations from triggered edges
             for inst_name, edge in trans.triggered_edges.items():
                 if edge is None:
                     continue
-                trans.target_state.location_state[inst_name] = edge.target
-
-            grd_res = self._evaluate_guards(transition=trans)
+                trans.target_state.set_location(inst_name, edge.target)
+            if grd_res["dbm"] is not None:
+                trans.target_state.dbm_state = grd_res["dbm"]
             trans.dbm_op_sequence.extend(grd_res["dbm_op_seq"])
-            if not trans.target_state.dbm_state.is_empty() and grd_res["var_guard_res"]:
-                enabled_transitions.append(trans)
+            enabled_transitions.append(trans)
         return enabled_transitions
 
     def _get_all_valid_transitions(self, state, all_enabled_trans=None):
@@ -393,16 +934,23 @@ class Simulator:
             trans.dbm_op_sequence.extend(reset_res["dbm_op_seq"])
             loc_res = self._evaluate_locations(state=trans.target_state)
             trans.dbm_op_sequence.extend(loc_res["dbm_op_seq"])
-            if not trans.target_state.dbm_state.is_empty():
+            if not trans.target_state.peek_dbm_state().is_empty():
                 valid_transitions.append(trans)
         return valid_transitions
 
-    def _evaluate_guards(self, transition: Transition):
-        dbm_op_seq = DBMOperationSequence()
-        state = transition.target_state
+    def _evaluate_variable_guards(self, transition: Transition, state):
+        """Evaluates the variable guards of all triggered edges of a transition.
 
-        # Get guard operations
-        grd_operations = []
+        The active scope of the state is restored afterwards, so that the guards can be evaluated on the source state.
+
+        Args:
+            transition: The transition.
+            state: The state on which the guards are evaluated.
+
+        Returns:
+            True if all variable guards hold, False otherwise.
+        """
+        active_instance_name, access_instance_scopes = state.active_instance_name, state.access_instance_scopes
         var_guard_res = True
         for inst_name, edge in transition.triggered_edges.items():
             if edge is None:
@@ -411,51 +959,94 @@ class Simulator:
             has_edge_scope = inst_name in transition.edge_scopes
             if has_edge_scope:
                 state.add_local_scope(name="edge", scope=transition.edge_scopes[inst_name])
-            for guard in edge.clock_guards:
-                # if isinstance(guard, ClockGuard):
-                # TODO: Remove distinguishing clock and variables guards in separate lists, as it affects the order
-
-                constr_operation = self._make_constraint_operation_from_ast(constr_ast=guard.ast, state=state)
-                grd_operations.append(constr_operation)
-            for guard in edge.variable_guards:
-                ret = self.c_evaluator.eval_ast(ast=guard.ast["expr"], state=state)
+            guards_func = self._get_generated_function("guards", (inst_name, edge.id))
+            if guards_func is not None:
+                ret = guards_func(state)
                 var_guard_res = var_guard_res and ret
+            else:
+                for guard in edge.variable_guards:
+                    compiled = self._get_compiled_label(guard, inst_name, self._compile_variable_guard_ast)
+                    if compiled is not None:
+                        ret = compiled(state)
+                    else:
+                        ret = self.c_evaluator.eval_ast(ast=guard.ast["expr"], state=state)
+                    var_guard_res = var_guard_res and ret
             if has_edge_scope:
                 state.remove_local_scope()
+        state.active_instance_name, state.access_instance_scopes = active_instance_name, access_instance_scopes
+        return var_guard_res
 
-        # Apply guards
-        dbm_op_seq.extend(grd_operations)
-        for guard in grd_operations:
-            guard.apply(state.dbm_state)
+    def _evaluate_clock_guards(self, transition: Transition, state):
+        """Evaluates the clock guards of all triggered edges of a transition on a scratch copy of the state DBM.
 
-        # Close DBM if any guards were applied
-        if len(grd_operations) > 0:
-            close_operation = dbm_op_gen.generate_close()
-            dbm_op_seq.append(close_operation)
-            close_operation.apply(state.dbm_state)
+        The active scope of the state is restored afterwards, so that the guards can be evaluated on the source state.
 
-        return {"dbm_op_seq": dbm_op_seq, "var_guard_res": var_guard_res}
+        Args:
+            transition: The transition.
+            state: The state on which the guards are evaluated.
 
-    def _evaluate_resets(self, transition: Transition):
+        Returns:
+            A dict of the guard operation sequence ("dbm_op_seq") and the guarded DBM copy ("dbm"), which is None if
+            the transition has no clock guards.
+        """
         dbm_op_seq = DBMOperationSequence()
-        state = transition.target_state
 
-        # Execute "reset" statements
-        reset_operations = []
+        # Get clock guard operations (the variable guards are evaluated beforehand)
+        grd_operations = [dbm_op_gen.generate_constraint(**constr_data)
+                          for constr_data in self._get_clock_guard_data(transition=transition, state=state)]
+        if len(grd_operations) == 0:
+            return {"dbm_op_seq": dbm_op_seq, "dbm": None}
+
+        # Apply guards to a scratch DBM, and close it
+        dbm_op_seq.extend(grd_operations)
+        dbm_op_seq.append(dbm_op_gen.generate_close())
+        dbm = state.peek_dbm_state().copy()
+        self._apply_constraint_operations(constr_operations=grd_operations, dbm=dbm)
+
+        return {"dbm_op_seq": dbm_op_seq, "dbm": dbm}
+
+    def _get_clock_guard_data(self, transition: Transition, state):
+        """Gets the constraint data of the clock guards of all triggered edges of a transition.
+
+        The active scope of the state is restored afterwards, so that the guards can be evaluated on the source state.
+
+        Args:
+            transition: The transition.
+            state: The state on which the guards are evaluated.
+
+        Returns:
+            The list of constraint data dicts (see _evaluate_constraint_ast).
+        """
+        active_instance_name, access_instance_scopes = state.active_instance_name, state.access_instance_scopes
+        grd_data = []
         for inst_name, edge in transition.triggered_edges.items():
             if edge is None:
                 continue
+            state.activate_instance_scope(inst_name)
             has_edge_scope = inst_name in transition.edge_scopes
             if has_edge_scope:
                 state.add_local_scope(name="edge", scope=transition.edge_scopes[inst_name])
-            state.activate_instance_scope(inst_name)
-            for update in edge.updates:
-                self.c_evaluator.eval_ast(ast=update.ast, state=state)
-            for reset in edge.resets:
-                reset_operation = self._make_reset_operation_from_ast(reset_ast=reset.ast, state=state)
-                reset_operations.append(reset_operation)
+            clock_guards_func = self._get_generated_function("clock_guards", (inst_name, edge.id))
+            if clock_guards_func is not None:
+                grd_data.extend(clock_guards_func(state))
+            else:
+                for guard in edge.clock_guards:
+                    # if isinstance(guard, ClockGuard):
+                    # TODO: Remove distinguishing clock and variables guards in separate lists, as it affects the order
+
+                    grd_data.append(self._make_constraint_data(constr=guard, state=state))
             if has_edge_scope:
                 state.remove_local_scope()
+        state.active_instance_name, state.access_instance_scopes = active_instance_name, access_instance_scopes
+        return grd_data
+
+    def _evaluate_resets(self, transition: Transition):
+        dbm_op_seq = DBMOperationSequence()
+        state = transition.target_state
+
+        # Execute "reset" statements
+        reset_operations = [dbm_op_gen.generate_reset(**reset_data)
+                            for reset_data in self._execute_updates(transition=transition)]
 
         # Apply resets
         dbm_op_seq.extend(reset_operations)
@@ -465,6 +1056,44 @@ class Simulator:
 
         return {"dbm_op_seq": dbm_op_seq}
 
+    def _execute_updates(self, transition: Transition):
+        """Executes the updates of all triggered edges of a transition on its target state.
+
+        Args:
+            transition: The transition.
+
+        Returns:
+            The list of clock reset data dicts (i.e., the "clock" name and the reset "val").
+        """
+        state = transition.target_state
+        reset_data = []
+        for inst_name, edge in transition.triggered_edges.items():
+            if edge is None:
+                continue
+            has_edge_scope = inst_name in transition.edge_scopes
+            if has_edge_scope:
+                state.add_local_scope(name="edge", scope=transition.edge_scopes[inst_name])
+            state.activate_instance_scope(inst_name)
+            updates_func = self._get_generated_function("updates", (inst_name, edge.id))
+            if updates_func is not None:
+                updates_func(state)
+            else:
+                for update in edge.updates:
+                    compiled = self._get_compiled_label(update, inst_name, self.c_compiler.compile_ast)
+                    if compiled is not None:
+                        compiled(state)
+                    else:
+                        self.c_evaluator.eval_ast(ast=update.ast, state=state)
+            resets_func = self._get_generated_function("resets", (inst_name, edge.id))
+            if resets_func is not None:
+                reset_data.extend(resets_func(state))
+            else:
+                for reset in edge.resets:
+                    reset_data.append(self._make_reset_data(reset=reset, state=state))
+            if has_edge_scope:
+                state.remove_local_scope()
+        return reset_data
+
     def _evaluate_locations(self, state):
         all_pot_trans = self._get_all_potential_transitions(state=state)
         all_urgent_or_committed_trans = list(filter(lambda trans: trans.urgent or trans.committed, all_pot_trans))
@@ -476,32 +1105,129 @@ class Simulator:
 
         inv_res = self._evaluate_invariants(state)
         dbm_op_seq.extend(inv_res["dbm_op_seq"])
+
+        if self.extrapolation is not None:
+            extrapolation_operation = self._make_extrapolation_operation()
+            extrapolation_operation.apply(state.dbm_state)
+            dbm_op_seq.append(extrapolation_operation)
         return {"dbm_op_seq": dbm_op_seq}
 
     def _evaluate_invariants(self, state):
         dbm_op_seq = DBMOperationSequence()
 
         # Get invariant operations
-        inv_operations = []
+        inv_operations = [dbm_op_gen.generate_constraint(**constr_data)
+                          for constr_data in self._get_invariant_data(state)]
+
+        # Apply invariant operations, and close DBM if any invariants were applied
+        dbm_op_seq.extend(inv_operations)
+        if len(inv_operations) > 0:
+            dbm_op_seq.append(dbm_op_gen.generate_close())
+        self._apply_constraint_operations(constr_operations=inv_operations, dbm=state.dbm_state)
+
+        return {"dbm_op_seq": dbm_op_seq}
+
+    def _get_invariant_data(self, state):
+        """Gets the constraint data of the invariants of all active locations of a state.
+
+        Args:
+            state: The state.
+
+        Returns:
+            The list of constraint data dicts (see _evaluate_constraint_ast).
+        """
+        inv_data = []
         for inst_name, loc in state.location_state.items():
             state.activate_instance_scope(inst_name)
+            invariants_func = self._get_generated_function("invariants", (inst_name, loc.id))
+            if invariants_func is not None:
+                inv_data.extend(invariants_func(state))
+                continue
             for inv in loc.invariants:
-                constr_operation = self._make_constraint_operation_from_ast(constr_ast=inv.ast, state=state)
-                inv_operations.append(constr_operation)
+                inv_data.append(self._make_constraint_data(constr=inv, state=state))
+        return inv_data
 
-        # Apply invariant operations
-        dbm_op_seq.extend(inv_operations)
-        for inv in inv_operations:
-            # print(inv)
-            inv.apply(state.dbm_state)
+    @staticmethod
+    def _apply_constraint_operations(constr_operations, dbm):
+        """Applies constraint operations to a closed DBM, and restores its closed form.
 
-        # Close DBM if any invariants were applied
-        if len(inv_operations) > 0:
-            close_operation = dbm_op_gen.generate_close()
-            dbm_op_seq.append(close_operation)
-            close_operation.apply(state.dbm_state)
+        For few constraints, each constraint is applied with an incremental closure, stopping early once the DBM
+        becomes empty. Otherwise, all constraints are applied first, followed by a single full closure.
 
-        return {"dbm_op_seq": dbm_op_seq}
+        Args:
+            constr_operations: The list of constraint operations (or sequences thereof).
+            dbm: The target DBM.
+        """
+        constraints = DBMOperationSequence()
+        constraints.extend(constr_operations)
+        constraints = list(constraints)
+        if len(constraints) == 0:
+            return
+        if len(constraints) <= MAX_INCREMENTAL_CLOSE_CONSTRAINTS:
+            for constraint in constraints:
+                constraint.apply(dbm, close=True)
+                if dbm.is_empty():
+                    break
+        else:
+            for constraint in constraints:
+                constraint.apply(dbm)
+            dbm.canonicalize()
+
+    def compute_clock_bounds(self, state=None):
+        """Computes the maximal lower and upper bound constants of all clocks from clock guards and invariants.
+
+        Bound expressions are evaluated in the scope of each instance (and for each select value combination of an
+        edge) based on the given state, so the result is exact if they do not depend on changing variables. For
+        diagonal constraints "t1 - t2 ~ c", the constant |c| is considered as lower and upper bound of both clocks.
+
+        Args:
+            state: The state in which bound expressions are evaluated (the initial system state by default).
+
+        Returns:
+            A dict of maximal lower ("lower"), upper ("upper"), and overall ("max") bound constants per clock name.
+        """
+        state = (state if state else self.init_system_state).copy()
+        clock_bounds = {"lower": {}, "upper": {}, "max": {}}
+        for inst_name, inst_data in state.instance_data.items():
+            tmpl = self.system.get_template_by_name(inst_data["template_name"])
+            state.activate_instance_scope(inst_name)
+            for loc in tmpl.locations.values():
+                for inv in loc.invariants:
+                    constr_operation = self._make_constraint_operation(constr=inv, state=state)
+                    self._update_clock_bounds(clock_bounds, constr_operation)
+            for edge in tmpl.edges.values():
+                for select_val_comb in self._get_select_val_combinations(edge=edge, state=state):
+                    edge_scope = {k: UppaalVariable(name=k, val=v) for k, v in select_val_comb.items()}
+                    state.add_local_scope(name='edge', scope=edge_scope)
+                    for guard in edge.clock_guards:
+                        constr_operation = self._make_constraint_operation(constr=guard, state=state)
+                        self._update_clock_bounds(clock_bounds, constr_operation)
+                    state.remove_local_scope()
+        return clock_bounds
+
+    @staticmethod
+    def _update_clock_bounds(clock_bounds, constr_operation):
+        constraints = DBMOperationSequence()
+        constraints.append(constr_operation)
+        for constraint in constraints:
+            # Constraints are normalized to "clock1 - clock2 (<|<=) val"
+            if constraint.clock2 == "T0_REF":
+                bounds = [("upper", constraint.clock1, constraint.val)]
+            elif constraint.clock1 == "T0_REF":
+                bounds = [("lower", constraint.clock2, -constraint.val)]
+            else:
+                val = abs(constraint.val)
+                bounds = [(kind, clock, val) for kind in ["lower", "upper"]
+                          for clock in [constraint.clock1, constraint.clock2]]
+            for kind, clock, val in bounds:
+                for key in [kind, "max"]:
+                    clock_bounds[key][clock] = max(clock_bounds[key].get(clock, val), val)
+
+    def _make_extrapolation_operation(self):
+        if self.extrapolation == "max_bounds":
+            return dbm_op_gen.generate_extrapolate_max_bounds(max_bounds=self.clock_bounds["max"])
+        return dbm_op_gen.generate_extrapolate_lu(lower_bounds=self.clock_bounds["lower"],
+                                                  upper_bounds=self.clock_bounds["upper"])
 
     def get_transitions(self):
         """Gets all valid transitions for the current state.
@@ -511,7 +1237,22 @@ class Simulator:
         """
         return self._get_all_valid_transitions(state=self.system_state)
 
+    def _make_constraint_operation(self, constr, state):
+        constr_operation = dbm_op_gen.generate_constraint(**self._make_constraint_data(constr=constr, state=state))
+        return constr_operation
+
+    def _make_constraint_data(self, constr, state):
+        compiled = self._get_compiled_label(constr, state.active_instance_name, self._compile_constraint_ast)
+        if compiled is not None:
+            return compiled(state)
+        return self._evaluate_constraint_ast(constr_ast=constr.ast, state=state)
+
     def _make_constraint_operation_from_ast(self, constr_ast, state):
+        constr_data = self._evaluate_constraint_ast(constr_ast=constr_ast, state=state)
+        constr_operation = dbm_op_gen.generate_constraint(**constr_data)
+        return constr_operation
+
+    def _evaluate_constraint_ast(self, constr_ast, state):
         dbm_constr_ast = adapt_dbm_constraint_ast(constr_ast)
 
         # if dbm_constr_ast["clock1"] is not None:
@@ -529,17 +1270,69 @@ class Simulator:
         rel = relation_from_ast_op[dbm_constr_ast["rel"]]
         val = self.c_evaluator.eval_ast(dbm_constr_ast["val"], state)
 
-        constr_operation = dbm_op_gen.generate_constraint(clock1=clock1_name, clock2=clock2_name, rel=rel, val=val)
-        return constr_operation
+        return {"clock1": clock1_name, "clock2": clock2_name, "rel": rel, "val": val}
+
+    def _compile_constraint_ast(self, constr_ast):
+        """Compiles a clock constraint AST into a closure which yields the constraint data (see
+        _evaluate_constraint_ast).
+
+        Args:
+            constr_ast: The clock constraint AST.
+
+        Returns:
+            The closure "func(state)".
+        """
+        dbm_constr_ast = adapt_dbm_constraint_ast(constr_ast)
+        clock1_func = self.c_compiler.compile_ast(dbm_constr_ast["clock1"])
+        clock2_func = (self.c_compiler.compile_ast(dbm_constr_ast["clock2"])
+                       if dbm_constr_ast["clock2"] is not None else None)
+        rel = relation_from_ast_op[dbm_constr_ast["rel"]]
+        val_func = self.c_compiler.compile_ast(dbm_constr_ast["val"])
+
+        def constraint_func(state):
+            clock1_name = clock1_func(state).name
+            clock2_name = clock2_func(state).name if clock2_func is not None else "T0_REF"
+            return {"clock1": clock1_name, "clock2": clock2_name, "rel": rel, "val": val_func(state)}
+        return constraint_func
+
+    def _compile_reset_ast(self, reset_ast):
+        """Compiles a clock reset AST into a closure which yields the reset data (i.e., clock name and value).
+
+        Args:
+            reset_ast: The clock reset AST.
+
+        Returns:
+            The closure "func(state)".
+        """
+        dbm_reset_ast = adapt_dbm_reset_ast(reset_ast)
+        clock_func = self.c_compiler.compile_ast(dbm_reset_ast["clock"])
+        val_func = self.c_compiler.compile_ast(dbm_reset_ast["val"])
+
+        def reset_func(state):
+            clock_name = clock_func(state).name
+            return {"clock": clock_name, "val": val_func(state)}
+        return reset_func
+
+    def _make_reset_operation(self, reset, state):
+        reset_operation = dbm_op_gen.generate_reset(**self._make_reset_data(reset=reset, state=state))
+        return reset_operation
+
+    def _make_reset_data(self, reset, state):
+        compiled = self._get_compiled_label(reset, state.active_instance_name, self._compile_reset_ast)
+        if compiled is not None:
+            return compiled(state)
+        return self._evaluate_reset_ast(reset_ast=reset.ast, state=state)
 
     def _make_reset_operation_from_ast(self, reset_ast, state):
+        reset_operation = dbm_op_gen.generate_reset(**self._evaluate_reset_ast(reset_ast=reset_ast, state=state))
+        return reset_operation
+
+    def _evaluate_reset_ast(self, reset_ast, state):
         dbm_reset_ast = adapt_dbm_reset_ast(reset_ast)
         clock = self.c_evaluator.eval_ast(ast=dbm_reset_ast["clock"], state=state)
         clock_name = clock.name
         val = self.c_evaluator.eval_ast(dbm_reset_ast["val"], state)
-
-        reset_operation = dbm_op_gen.generate_reset(clock=clock_name, val=val)
-        return reset_operation
+        return {"clock": clock_name, "val": val}
 
     def execute_transition(self, transition):
         """Executes a given transition from the current state.
@@ -548,17 +1341,27 @@ class Simulator:
             transition: The transition that is executed.
         """
         self.system_state = transition.target_state
-        potential_transitions = self._get_all_potential_transitions(state=self.system_state)
-        enabled_transitions = self._get_all_enabled_transitions(state=self.system_state,
-                                                                all_pot_trans=potential_transitions)
-        valid_transitions = self._get_all_valid_transitions(state=self.system_state,
-                                                            all_enabled_trans=enabled_transitions)
+        if self.semantics == "concrete":
+            # The next transition (and the delay before it) is sampled on entering the state
+            _, next_transition = self.sample_concrete_step(state=self.system_state)
+            valid_transitions = [next_transition] if next_transition is not None else []
+            self.transition_counts = {
+                "potential": None,
+                "enabled": None,
+                "valid": len(valid_transitions)
+            }
+        else:
+            potential_transitions = self._get_all_potential_transitions(state=self.system_state)
+            enabled_transitions = self._get_all_enabled_transitions(state=self.system_state,
+                                                                    all_pot_trans=potential_transitions)
+            valid_transitions = self._get_all_valid_transitions(state=self.system_state,
+                                                                all_enabled_trans=enabled_transitions)
+            self.transition_counts = {
+                "potential": len(potential_transitions),
+                "enabled": len(enabled_transitions),
+                "valid": len(valid_transitions)
+            }
         self.system_state.transitions = valid_transitions
-        self.transition_counts = {
-            "potential": len(potential_transitions),
-            "enabled": len(enabled_transitions),
-            "valid": len(valid_transitions)
-        }
         self.transitions = valid_transitions
 
         self.transition_trace.append(transition)
@@ -589,15 +1392,208 @@ class Simulator:
         """
         if time_scope is None and max_steps is None:
             raise TypeError(f'Either of parameters "time_scope" or "steps" need to be set.')
-        global_time_interval = self.system_state.dbm_state.get_interval("T_GLOBAL")
+        global_time_interval = self.get_global_time_interval(self.system_state)
         step = 0
-        while ((time_scope is None or global_time_interval.lower.val <= time_scope) and
+        while ((time_scope is None or global_time_interval.lower_val <= time_scope) and
                (max_steps is None or step < max_steps)):
             self.simulate_step()
-            global_time_interval = self.system_state.dbm_state.get_interval("T_GLOBAL")
+            global_time_interval = self.get_global_time_interval(self.system_state)
             step += 1
             print(global_time_interval)
 
+    def simulate_batch(self, n_runs, max_steps=None, time_scope=None, seed=None, workers=None,
+                       chunk_size=DEFAULT_BATCH_CHUNK_SIZE):
+        """Simulates independent random runs of the system, each from the initial state, in a pool of worker processes.
+
+        Each worker process loads the (compiled) system once, and simulates the runs of each task sent to it. The run
+        results are yielded in run order as soon as they are available, so that large batches are never held in
+        memory. Each run ends after the maximum number of steps, once the lower bound of the global time "T_GLOBAL"
+        exceeds the time scope, or if no transition is possible. As the lower bound only grows if forced by guards or
+        invariants, a time scope is usually combined with a maximum number of steps. As the random seed of each run is
+        derived from the given seed, results do not depend on the number of workers.
+
+        Args:
+            n_runs: The number of runs.
+            max_steps: The maximum number of simulation steps per run.
+            time_scope: The maximum time scope per run.
+            seed: The random seed of the batch, or None for a random batch.
+            workers: The number of worker processes (defaults to the number of processors), or 0 to simulate all runs
+                within the current process.
+            chunk_size: The number of runs sent to a worker process as a single task.
+
+        Returns:
+            A generator of run results, i.e., dicts of the final location IDs per instance ("locations"), the final
+            compact variable state ("variables"), the step count ("steps"), and the final global time interval
+            ("global_time", or None if the system has no clock "T_GLOBAL").
+        """
+        if time_scope is None and max_steps is None:
+            raise TypeError(f'Either of parameters "time_scope" or "max_steps" need to be set.')
+        if time_scope is not None and "T_GLOBAL" not in self.system_state.peek_dbm_state().clocks:
+            raise Exception(f'Simulation with time scope requires the global clock "T_GLOBAL".')
+
+        seed_generator = random.Random(seed)
+        run_seeds = (seed_generator.getrandbits(64) for _ in range(n_runs))
+        tasks = ((chunk_seeds, max_steps, time_scope) for chunk_seeds in make_chunks(run_seeds, chunk_size))
+        init_args = (uppaal_system_to_compiled(self.system), self.get_settings())
+        return self._generate_batch_results(tasks=tasks, init_args=init_args, workers=workers)
+
+    @staticmethod
+    def _generate_batch_results(tasks, init_args, workers):
+        if workers == 0:
+            random_state = random.getstate()
+            _init_batch_worker(*init_args)
+            try:
+                for task in tasks:
+                    yield from _simulate_batch_task(task)
+            finally:
+                random.setstate(random_state)
+            return
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_batch_worker, initargs=init_args) as executor:
+            for results in map_bounded(executor, _simulate_batch_task, tasks, workers=workers):
+                yield from results
+
+    def simulate_run(self, max_steps=None, time_scope=None):
+        """Simulates a single random run of the system from the initial state, without printing any output.
+
+        Args:
+            max_steps: The maximum number of simulation steps.
+            time_scope: The maximum time scope of the simulation.
+
+        Returns:
+            The run result dict (see simulate_batch).
+        """
+        self.init_simulator()
+        has_global_time = "T_GLOBAL" in self.system_state.peek_dbm_state().clocks
+        global_time_interval = self.get_global_time_interval(self.system_state) if has_global_time else None
+        step = 0
+        while ((time_scope is None or global_time_interval.lower_val <= time_scope) and
+               (max_steps is None or step < max_steps) and self.transitions):
+            self.simulate_step()
+            if has_global_time:
+                global_time_interval = self.get_global_time_interval(self.system_state)
+            step += 1
+
+        return {
+            "locations": tuple(loc.id for loc in self.system_state.location_state.values()),
+            "variables": self.system_state.get_compact_variable_state()["variable"],
+            "steps": step,
+            "global_time": global_time_interval
+        }
+
+    def get_global_time_interval(self, state):
+        """Gets the interval of the global time "T_GLOBAL" of a state.
+
+        Args:
+            state: The (symbolic or concrete) state.
+
+        Returns:
+            The global time interval (i.e., a point interval in concrete states).
+        """
+        if state.clock_valuation is not None:
+            global_time = state.clock_valuation["T_GLOBAL"]
+            return Interval(lower_incl=True, lower_val=global_time, upper_val=global_time, upper_incl=True)
+        return state.peek_dbm_state().get_interval("T_GLOBAL")
+
+    def get_settings(self):
+        """Gets the settings of the simulator, i.e., the keyword arguments from which an equally configured simulator
+        can be constructed (e.g., in a worker process).
+
+        Returns:
+            The settings dict.
+        """
+        return {
+            "dbm_class": self.dbm_class,
+            "extrapolation": self.extrapolation,
+            "transition_cache_size": self.transition_cache_size,
+            "compact_variables": self.compact_variables,
+            "fold_constants": self.fold_constants,
+            "code_generation": self.code_generation,
+            "code_cache_dir": self.code_cache_dir,
+            "semantics": self.semantics,
+            "lazy_loading": self.lazy_loading
+        }
+
+    def generate_initial_concrete_state(self):
+        """Generates the initial state of a concrete-time run, i.e., the initial system state with concrete clock
+        values of 0 instead of a zone.
+
+        Returns:
+            The initial concrete state.
+        """
+        state = self.init_system_state.copy()
+        state.clock_valuation = dict.fromkeys(self.init_system_state.peek_dbm_state().clocks[1:], 0)
+        return state
+
+    def sample_concrete_step(self, state):
+        """Samples a random delay and a random transition from a concrete state (as in the stochastic semantics of
+        Uppaal SMC).
+
+        The delay is drawn uniformly from the delays after which any transition is enabled, bounded by the invariants
+        of the current locations (see draw_delay). If these delays are unbounded, the delay is drawn from an
+        exponential distribution instead. No delay is possible if urgent or committed transitions exist. Among all
+        transitions enabled after the delay, one is chosen uniformly.
+
+        Args:
+            state: The concrete source state.
+
+        Returns:
+            A tuple of the delay and the executed transition (whose target state is a concrete state), or a tuple of
+            the maximal delay (i.e., the invariant bound, which may be infinite) and None if no transition is possible.
+        """
+        potential_transitions = self._get_all_potential_transitions(state=state)
+        if any(trans.urgent or trans.committed for trans in potential_transitions):
+            inv_interval = Interval(lower_incl=True, lower_val=0, upper_val=0, upper_incl=True)
+        else:
+            inv_interval = get_delay_interval(self._get_invariant_data(state), state.clock_valuation)
+            if inv_interval is None:
+                raise Exception('Concrete state violates the invariants of its locations.')
+
+        # Get the delay intervals in which the guards of each transition hold
+        transition_intervals = []
+        for trans in potential_transitions:
+            if not self._evaluate_variable_guards(transition=trans, state=state):
+                continue
+            grd_data = self._get_clock_guard_data(transition=trans, state=state)
+            interval = get_delay_interval(grd_data, state.clock_valuation, interval=inv_interval)
+            if interval is not None:
+                transition_intervals.append((trans, interval))
+        if not transition_intervals:
+            return inv_interval.upper_val, None
+
+        # Draw a delay, and choose one of the transitions enabled after that delay
+        delay = draw_delay([interval for _, interval in transition_intervals])
+        candidates = [trans for trans, interval in transition_intervals if interval.contains(delay)]
+        while candidates:
+            trans = candidates.pop(random.randrange(len(candidates)))
+            if self._execute_concrete_transition(transition=trans, delay=delay):
+                return delay, trans
+        return inv_interval.upper_val, None
+
+    def _execute_concrete_transition(self, transition: Transition, delay):
+        """Creates the concrete target state of a transition taken after a given delay.
+
+        Args:
+            transition: The transition.
+            delay: The delay before the transition.
+
+        Returns:
+            True if the target state satisfies the invariants of its locations, False otherwise.
+        """
+        source_state = transition.source_state
+        transition.target_state = source_state.copy()
+        target_state = transition.target_state
+        transition.delay = delay
+        for inst_name, edge in transition.triggered_edges.items():
+            if edge is None:
+                continue
+            target_state.set_location(inst_name, edge.target)
+        target_state.clock_valuation = {clock: val + delay for clock, val in source_state.clock_valuation.items()}
+        for reset_data in self._execute_updates(transition=transition):
+            target_state.clock_valuation[reset_data["clock"]] = int(reset_data["val"])
+        return all(clock_constraint_holds(inv_data, target_state.clock_valuation)
+                   for inv_data in self._get_invariant_data(target_state))
+
     def revert_to_state_by_index(self, idx):
         """Reverts the simulation to the state at given index.
 
@@ -607,5 +1603,41 @@ class Simulator:
         trans = self.transition_trace[idx]
         self.transition_trace = self.transition_trace[:idx + 1]
         self.system_state = trans.target_state
+        if self.semantics == "concrete":
+            self.transitions = self.system_state.transitions  # Keep the sampled transition of the state
+            return
         valid_transitions = self._get_all_valid_transitions(state=self.system_state, all_enabled_trans=None)
         self.transitions = valid_transitions
+
+
+###########################
+# Batch Simulation Worker #
+###########################
+def _init_batch_worker(compiled_system, settings):
+    """Initializes the simulator of a batch simulation worker process.
+
+    Args:
+        compiled_system: The compiled system (see uppaal_system_to_compiled).
+        settings: The simulator settings (i.e., the arguments of Simulator).
+    """
+    global _batch_simulator
+    _batch_simulator = Simulator(**settings)
+    _batch_simulator.set_system(compiled_system)
+
+
+def _simulate_batch_task(task):
+    """Simulates the runs of a batch simulation task with the simulator of the worker process.
+
+    Args:
+        task: A tuple of the run seeds, the maximum number of steps, and the time scope.
+
+    Returns:
+        The list of run results.
+    """
+    run_seeds, max_steps, time_scope = task
+    results = []
+    for run_seed in run_seeds:
+        random.seed(run_seed)
+        results.append(_batch_simulator.simulate_run(max_steps=max_steps, time_scope=time_scope))
+    return results
+
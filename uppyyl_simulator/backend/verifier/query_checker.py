@@ -0,0 +1,358 @@
+"""A checker for Uppaal state-formula queries (E<> and A[]) based on symbolic reachability."""
+
+from uppyyl_simulator.backend.data_structures.dbm.dbm import DBMConstraint
+from uppyyl_simulator.backend.data_structures.dbm.dbm_operations.dbm_operations import DBMOperationGenerator
+from uppyyl_simulator.backend.data_structures.state.variable import UppaalVariable
+from uppyyl_simulator.backend.data_structures.types.clock import UppaalClock
+from uppyyl_simulator.backend.models.base.query import Query, QueryFormula
+from uppyyl_simulator.backend.simulator.simulator import relation_from_ast_op
+from uppyyl_simulator.backend.verifier.verifier import Verifier
+
+dbm_op_gen = DBMOperationGenerator()
+
+negated_relations = {
+    "<": ">=",
+    "<=": ">",
+    ">": "<=",
+    ">=": "<",
+    "==": "!=",
+    "!=": "==",
+}
+
+
+def subtract_zone(dbm, other):
+    """Subtracts a zone from another zone.
+
+    The difference is split into disjoint zones, each of which violates one constraint of the subtracted zone and
+    satisfies all of its preceding constraints.
+
+    Args:
+        dbm: The closed zone to subtract from.
+        other: The closed zone to subtract.
+
+    Returns:
+        A list of non-empty zones whose union contains exactly the clock valuations of dbm not contained in other.
+    """
+    zones = []
+    remaining = dbm.copy()
+    clock_num = len(other.clocks)
+    for i in range(clock_num):
+        for j in range(clock_num):
+            if i == j:
+                continue
+            entry = other.get_entry(i, j)
+            if not entry < remaining.get_entry(i, j):
+                continue
+            # "t_i - t_j (<|<=) c" is violated iff "t_j - t_i (<=|<) -c"
+            inv_constraint = DBMConstraint()
+            inv_constraint.clock1, inv_constraint.clock2 = other.clocks[j], other.clocks[i]
+            inv_constraint.rel, inv_constraint.val = ("<" if entry.rel == "<=" else "<="), -entry.val
+            zone = remaining.copy().conjugate_and_close(inv_constraint)
+            if not zone.is_empty():
+                zones.append(zone)
+            constraint = DBMConstraint()
+            constraint.clock1, constraint.clock2 = other.clocks[i], other.clocks[j]
+            constraint.rel, constraint.val = entry.rel, entry.val
+            remaining.conjugate_and_close(constraint)
+            if remaining.is_empty():
+                return zones
+    return zones
+
+
+#################
+# Query Checker #
+#################
+class QueryChecker:
+    """A checker for "E<> phi" and "A[] phi" queries.
+
+    Both query types are reduced to the reachability of a state satisfying phi (or "not phi", respectively), so that
+    the exploration stops as soon as a witness (or counterexample) is found. The state formula phi may combine
+    discrete expressions (e.g., "P.loc", "x > 2", "deadlock") and clock constraints "t1 (- t2) ~ c" with "and", "or",
+    "imply", and "not"; a symbolic state satisfies phi if any clock valuation of its zone does.
+    """
+
+    def __init__(self, verifier=None):
+        """Initializes QueryChecker.
+
+        Args:
+            verifier: The verifier used for state space exploration (a new one is created by default).
+        """
+        self.verifier = verifier if verifier else Verifier()
+
+    @property
+    def simulator(self):
+        """The simulator used for successor computation."""
+        return self.verifier.simulator
+
+    def load_system(self, system_path):
+        """Loads a system at a given path into the query checker.
+
+        Args:
+            system_path: The system path.
+        """
+        self.verifier.load_system(system_path)
+
+    def set_system(self, system):
+        """Sets the system of the query checker.
+
+        Args:
+            system: The system as string or system object.
+        """
+        self.verifier.set_system(system)
+
+    def check_queries(self, max_states=None):
+        """Checks all (non-empty) queries of the system.
+
+        Args:
+            max_states: An optional maximum number of explored states per query.
+
+        Returns:
+            The list of query results (see check_query); unsupported queries yield "satisfied" None and an error.
+        """
+        results = []
+        for query in self.simulator.system.queries:
+            if not query.formula.text or not query.formula.text.strip():
+                continue
+            try:
+                res = self.check_query(query, max_states=max_states)
+            except Exception as e:
+                res = {"query": query, "satisfied": None, "trace": None, "stats": None, "error": str(e)}
+            results.append(res)
+        return results
+
+    def check_query(self, query, max_states=None):
+        """Checks a single "E<> phi" or "A[] phi" query.
+
+        Args:
+            query: The query (as Query, QueryFormula, or formula string).
+            max_states: An optional maximum number of explored states.
+
+        Returns:
+            A dict containing the query ("query"), the verdict ("satisfied", or None if the exploration was aborted),
+            the witness or counterexample trace ("trace"), and the exploration statistics ("stats").
+        """
+        formula = query.formula if isinstance(query, Query) else query
+        if isinstance(formula, str):
+            formula = QueryFormula(formula)
+
+        formula_ast = formula.ast
+        if formula_ast is None:
+            raise Exception(f'Query "{formula.text}" is empty.')
+        quantifier = formula_ast["astType"]
+        operator = formula_ast["prop"]["astType"] if "prop" in formula_ast else None
+        if (quantifier, operator) not in [("PropExists", "PropFinally"), ("PropAll", "PropGlobally")]:
+            raise Exception(f'Query "{formula.text}" not supported (only "E<> phi" and "A[] phi" are supported).')
+        expr_ast = formula_ast["prop"]["prop"]["expr"]
+
+        # The zone extrapolation must preserve the clock constraints of the query
+        system_clock_bounds = self.simulator.clock_bounds
+        if system_clock_bounds is not None:
+            self.simulator.clock_bounds = self._get_clock_bounds_with_query(expr_ast)
+
+        # "A[] phi" is violated iff a state satisfying "not phi" is reachable
+        negated = (quantifier == "PropAll")
+        try:
+            reach_res = self.verifier.check_reachability(
+                predicate=lambda state: self.satisfies(expr_ast=expr_ast, state=state, negated=negated),
+                max_states=max_states)
+        finally:
+            self.simulator.clock_bounds = system_clock_bounds
+
+        if reach_res["reachable"]:
+            satisfied = not negated
+        elif reach_res["complete"]:
+            satisfied = negated
+        else:
+            satisfied = None
+        return {"query": query, "satisfied": satisfied, "trace": reach_res["trace"], "stats": reach_res["stats"]}
+
+    def satisfies(self, expr_ast, state, negated=False):
+        """Checks whether any clock valuation of a symbolic state satisfies a state formula.
+
+        Args:
+            expr_ast: The state formula expression AST.
+            state: The symbolic state.
+            negated: Choose whether the negated state formula is checked.
+
+        Returns:
+            The satisfaction checking result.
+        """
+        state.activate_system_scope(access_instance_scopes=True)
+        return len(self._get_satisfying_zones(expr_ast, state, state.peek_dbm_state(), negated)) > 0
+
+    def _get_satisfying_zones(self, expr_ast, state, dbm, negated):
+        """Restricts a zone to the clock valuations satisfying a state formula.
+
+        Args:
+            expr_ast: The state formula expression AST.
+            state: The symbolic state.
+            dbm: The zone to restrict.
+            negated: Choose whether the negated state formula is considered.
+
+        Returns:
+            A list of non-empty zones whose union contains exactly the satisfying clock valuations.
+        """
+        ast_type = expr_ast["astType"]
+        if ast_type == "BracketExpr":
+            return self._get_satisfying_zones(expr_ast["expr"], state, dbm, negated)
+        if ast_type == "UnaryExpr" and expr_ast["op"] == "LogNot":
+            return self._get_satisfying_zones(expr_ast["expr"], state, dbm, not negated)
+        if ast_type == "DeadlockExpr":
+            return self._get_deadlock_zones(state, dbm, negated)
+        if ast_type == "BinaryExpr":
+            op = expr_ast["op"]
+            if op in ["LogAnd", "LogOr", "LogImply"]:
+                left_ast, right_ast = expr_ast["left"], expr_ast["right"]
+                if op == "LogImply":
+                    # "a imply b" equals "not a or b", and "not (a imply b)" equals "a and not b"
+                    is_conjunction, left_negated = negated, not negated
+                else:
+                    # De Morgan: "not (a and b)" equals "not a or not b", and vice versa
+                    is_conjunction, left_negated = (op == "LogAnd") != negated, negated
+                if is_conjunction:
+                    zones = []
+                    for left_zone in self._get_satisfying_zones(left_ast, state, dbm, left_negated):
+                        zones.extend(self._get_satisfying_zones(right_ast, state, left_zone, negated))
+                    return zones
+                return (self._get_satisfying_zones(left_ast, state, dbm, left_negated) +
+                        self._get_satisfying_zones(right_ast, state, dbm, negated))
+            constr_expr_ast = self._get_clock_constraint_ast(expr_ast, state)
+            if constr_expr_ast is not None:
+                return self._get_constrained_zones(constr_expr_ast, state, dbm, negated)
+
+        res = bool(self.simulator.c_evaluator.eval_ast(expr_ast, state))
+        return [dbm] if res != negated else []
+
+    def _get_deadlock_zones(self, state, dbm, negated):
+        """Restricts a zone to the deadlocked clock valuations (i.e., from which no transition is enabled after any
+        delay).
+
+        Args:
+            state: The symbolic state.
+            dbm: The zone to restrict.
+            negated: Choose whether the non-deadlocked clock valuations are considered instead.
+
+        Returns:
+            A list of non-empty zones whose union contains exactly the (non-)deadlocked clock valuations.
+        """
+        # Get the delay predecessors of the guard zones of all enabled transitions within the zone
+        enabled_zones = []
+        for trans in self.simulator._get_all_potential_transitions(state=state):
+            if not self.simulator._evaluate_variable_guards(transition=trans, state=state):
+                continue
+            grd_res = self.simulator._evaluate_clock_guards(transition=trans, state=state)
+            if grd_res["dbm"] is None:
+                enabled_zones = [dbm.copy()]  # Note: The transition is enabled on the whole zone
+                break
+            if grd_res["dbm"].is_empty():
+                continue
+            enabled_zone = grd_res["dbm"].delay_past().close().intersect(dbm)
+            if not enabled_zone.is_empty():
+                enabled_zones.append(enabled_zone)
+        state.activate_system_scope(access_instance_scopes=True)
+
+        if negated:
+            return enabled_zones
+        deadlock_zones = [dbm]
+        for enabled_zone in enabled_zones:
+            deadlock_zones = [zone for deadlock_zone in deadlock_zones
+                              for zone in subtract_zone(deadlock_zone, enabled_zone)]
+        return deadlock_zones
+
+    def _get_constrained_zones(self, constr_expr_ast, state, dbm, negated):
+        """Restricts a zone by a clock constraint.
+
+        Args:
+            constr_expr_ast: The clock constraint expression AST.
+            state: The symbolic state.
+            dbm: The zone to restrict.
+            negated: Choose whether the negated clock constraint is applied.
+
+        Returns:
+            A list of the non-empty restricted zones.
+        """
+        constr_data = self.simulator._evaluate_constraint_ast(constr_ast={"expr": constr_expr_ast}, state=state)
+        rel = negated_relations[constr_data["rel"]] if negated else constr_data["rel"]
+        rels = ["<", ">"] if rel == "!=" else [rel]
+
+        zones = []
+        for rel in rels:
+            constr_operation = dbm_op_gen.generate_constraint(clock1=constr_data["clock1"],
+                                                              clock2=constr_data["clock2"],
+                                                              rel=rel, val=constr_data["val"])
+            zone = dbm.copy()
+            constr_operation.apply(zone)
+            zone.close()
+            if not zone.is_empty():
+                zones.append(zone)
+        return zones
+
+    def _get_clock_constraint_ast(self, expr_ast, state):
+        """Gets the clock constraint AST of a binary expression, if it is a clock constraint.
+
+        Args:
+            expr_ast: The binary expression AST.
+            state: The symbolic state.
+
+        Returns:
+            The clock constraint expression AST "t1 (- t2) ~ c", or None if the expression is no clock constraint.
+        """
+        if expr_ast["op"] not in relation_from_ast_op or not self._is_clock_expr(expr_ast["left"], state):
+            return None
+        if self._is_clock_expr(expr_ast["right"], state):
+            # Rewrite "t1 ~ t2" into "t1 - t2 ~ 0"
+            clock_diff_ast = {"left": expr_ast["left"], "op": "Sub", "right": expr_ast["right"],
+                              "astType": "BinaryExpr"}
+            return {"left": clock_diff_ast, "op": expr_ast["op"], "right": {"val": 0, "astType": "Integer"},
+                    "astType": "BinaryExpr"}
+        return expr_ast
+
+    def _get_clock_bounds_with_query(self, expr_ast):
+        """Extends the clock bounds of the simulator by the constants of all clock constraints of a state formula.
+
+        Args:
+            expr_ast: The state formula expression AST.
+
+        Returns:
+            The extended clock bounds.
+        """
+        state = self.simulator.init_system_state.copy()
+        state.activate_system_scope(access_instance_scopes=True)
+        clock_bounds = {kind: dict(bounds) for kind, bounds in self.simulator.clock_bounds.items()}
+
+        pending_asts = [expr_ast]
+        while pending_asts:
+            sub_ast = pending_asts.pop()
+            if sub_ast["astType"] == "BinaryExpr":
+                constr_expr_ast = self._get_clock_constraint_ast(sub_ast, state)
+                if constr_expr_ast is not None:
+                    constr_data = self.simulator._evaluate_constraint_ast(constr_ast={"expr": constr_expr_ast},
+                                                                          state=state)
+                    rels = ["<=", ">="] if constr_data["rel"] in ["==", "!="] else [constr_data["rel"]]
+                    for rel in rels:
+                        constr_operation = dbm_op_gen.generate_constraint(clock1=constr_data["clock1"],
+                                                                          clock2=constr_data["clock2"],
+                                                                          rel=rel, val=constr_data["val"])
+                        self.simulator._update_clock_bounds(clock_bounds, constr_operation)
+                    continue
+                pending_asts.extend([sub_ast["left"], sub_ast["right"]])
+            elif sub_ast["astType"] in ["BracketExpr", "UnaryExpr"]:
+                pending_asts.append(sub_ast["expr"])
+        return clock_bounds
+
+    def _is_clock_expr(self, expr_ast, state):
+        """Checks whether an expression is a clock or a clock difference (i.e., "t1" or "t1 - t2").
+
+        Args:
+            expr_ast: The expression AST.
+            state: The symbolic state.
+
+        Returns:
+            The clock expression checking result.
+        """
+        if expr_ast["astType"] == "BinaryExpr" and expr_ast["op"] == "Sub":
+            expr_ast = expr_ast["left"]
+        if expr_ast["astType"] not in ["Variable", "BinaryExpr"]:
+            return False
+        var = self.simulator.c_evaluator.eval_ast(expr_ast, state)
+        return isinstance(var, UppaalVariable) and isinstance(var.val, UppaalClock)
@@ -0,0 +1,581 @@
+"""A statistical model checker for Uppaal SMC queries based on concrete-time stochastic runs."""
+
+import collections
+import math
+import random
+import statistics
+from concurrent.futures import ProcessPoolExecutor
+
+from uppyyl_simulator.backend.ast.parsers.uppaal_compiled_model import uppaal_system_to_compiled
+from uppyyl_simulator.backend.data_structures.dbm.dbm import Interval
+from uppyyl_simulator.backend.data_structures.state.variable import UppaalVariable
+from uppyyl_simulator.backend.helper.helper import make_chunks, map_bounded
+from uppyyl_simulator.backend.models.base.query import Query, QueryFormula
+from uppyyl_simulator.backend.simulator.simulator import Simulator, get_delay_interval
+from uppyyl_simulator.backend.verifier.query_checker import QueryChecker, negated_relations
+from uppyyl_simulator.backend.verifier.verifier import Verifier
+
+DEFAULT_CHUNK_SIZE = 16
+DEFAULT_MAX_RUNS = 100000
+DEFAULT_MAX_RUN_STEPS = 100000
+
+_smc_worker_checker = None  # The SMC checker of a worker process
+
+
+###############
+# SMC Checker #
+###############
+class SMCChecker:
+    """A statistical model checker for the SMC queries of Uppaal.
+
+    Each sample is a concrete-time stochastic run of the system (see Simulator.sample_concrete_step), which is bounded
+    by the time bound of the query (i.e., the global time "<=T", the value of a clock "x<=T", or the number of steps
+    "#<=T"). State formulas are checked continuously along each run, i.e., also during delays. The queries are answered
+    as follows:
+
+    - "Pr[<=T](<> phi)" and "Pr[<=T]([] phi)" are estimated from the number of runs given by the Chernoff-Hoeffding
+      bound, so that the estimate deviates by more than epsilon with a probability of at most alpha.
+    - "Pr[<=T](<> phi) >= p" (or "<= p") is decided by Wald's sequential probability ratio test (SPRT) with the
+      indifference region [p - delta, p + delta] and the error probabilities alpha and beta.
+    - "Pr[<=T1](<> phi1) >= Pr[<=T2](<> phi2)" (or "<=") is decided by a SPRT on the run pairs in which only one of
+      both properties holds, with the odds ratio bounds u0 and u1 as indifference region.
+    - "E[<=T; N](max: expr)" (or "min") is estimated from N runs, with a confidence interval of level 1 - alpha.
+    - "simulate N [<=T] {expr, ...}" yields the value trajectories of N runs (with ": M : (phi)", only the first M
+      runs in which phi holds eventually).
+
+    The runs are sampled by a pool of worker processes, and sequential tests stop as soon as they reach a decision.
+    """
+
+    def __init__(self, simulator=None, alpha=0.05, beta=0.05, epsilon=0.05, delta=0.01, u0=0.9, u1=1.1,
+                 workers=None, chunk_size=DEFAULT_CHUNK_SIZE, seed=None, max_runs=DEFAULT_MAX_RUNS,
+                 max_run_steps=DEFAULT_MAX_RUN_STEPS):
+        """Initializes SMCChecker.
+
+        Args:
+            simulator: The simulator used for the stochastic runs (a new one is created by default).
+            alpha: The probability of false negatives (i.e., of rejecting a hypothesis that holds).
+            beta: The probability of false positives (i.e., of accepting a hypothesis that does not hold).
+            epsilon: The probability uncertainty of probability estimates.
+            delta: The half-width of the indifference region of hypothesis tests.
+            u0: The lower odds ratio bound of probability comparisons.
+            u1: The upper odds ratio bound of probability comparisons.
+            workers: The number of worker processes (defaults to the number of processors), or 0 to sample all runs
+                within the current process.
+            chunk_size: The number of runs sent to a worker process as a single task.
+            seed: The random seed of each query, or None for random runs.
+            max_runs: The maximum number of runs of sequential tests, after which they are inconclusive.
+            max_run_steps: The maximum number of steps of a run (i.e., a bound to detect Zeno runs).
+        """
+        self.simulator = simulator if simulator else Simulator()
+        self.query_checker = QueryChecker(verifier=Verifier(simulator=self.simulator))
+        self.alpha = alpha
+        self.beta = beta
+        self.epsilon = epsilon
+        self.delta = delta
+        self.u0 = u0
+        self.u1 = u1
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.seed = seed
+        self.max_runs = max_runs
+        self.max_run_steps = max_run_steps
+
+    def load_system(self, system_path):
+        """Loads a system at a given path into the SMC checker.
+
+        Args:
+            system_path: The system path.
+        """
+        self.simulator.load_system(system_path)
+
+    def set_system(self, system):
+        """Sets the system of the SMC checker.
+
+        Args:
+            system: The system as XML string, compiled system data, or system object.
+        """
+        self.simulator.set_system(system)
+
+    def check_queries(self):
+        """Checks all (non-empty) SMC queries of the system.
+
+        Returns:
+            The list of query results (see check_query); unsupported queries yield an error.
+        """
+        results = []
+        for query in self.simulator.system.queries:
+            if not query.formula.text or not query.formula.text.strip():
+                continue
+            try:
+                res = self.check_query(query)
+            except Exception as e:
+                res = {"query": query, "runs": None, "error": str(e)}
+            results.append(res)
+        return results
+
+    def check_query(self, query):
+        """Checks a single SMC query.
+
+        Args:
+            query: The query (as Query, QueryFormula, or formula string).
+
+        Returns:
+            A dict containing the query ("query"), the number of runs ("runs"), and the query type specific results
+            (see estimate_probability, test_hypothesis, compare_probabilities, estimate_value, and simulate).
+        """
+        formula = query.formula if isinstance(query, Query) else query
+        if isinstance(formula, str):
+            formula = QueryFormula(formula)
+
+        formula_ast = formula.ast
+        if formula_ast is None:
+            raise Exception(f'Query "{formula.text}" is empty.')
+        query_funcs = {
+            "PropSMCProbEstimate": self.estimate_probability,
+            "PropSMCHypothesisTest": self.test_hypothesis,
+            "PropSMCProbCompare": self.compare_probabilities,
+            "PropSMCValueEstimate": self.estimate_value,
+            "PropSMCSim": self.simulate,
+            "PropSMCSimAcceptRuns": self.simulate,
+        }
+        if formula_ast["astType"] not in query_funcs:
+            raise Exception(f'Query "{formula.text}" not supported (only SMC queries are supported).')
+        res = query_funcs[formula_ast["astType"]](formula_ast)
+        res["query"] = query
+        return res
+
+    def estimate_probability(self, prob_ast):
+        """Estimates the probability of "Pr[<=T](<> phi)" or "Pr[<=T]([] phi)".
+
+        Args:
+            prob_ast: The probability estimation query AST.
+
+        Returns:
+            A dict containing the estimated probability ("probability"), the interval which contains the probability
+            with a confidence of 1 - alpha ("interval"), and the number of runs ("runs").
+        """
+        run_count = math.ceil(math.log(2 / self.alpha) / (2 * self.epsilon ** 2))
+        run_spec = self._get_reachability_run_spec(prob_ast)
+        success_count = sum(self._sample_runs("reachability", run_spec, run_count=run_count))
+        probability = success_count / run_count
+        return {"probability": probability,
+                "interval": (max(probability - self.epsilon, 0), min(probability + self.epsilon, 1)),
+                "runs": run_count}
+
+    def test_hypothesis(self, hypothesis_ast):
+        """Decides "Pr[<=T](<> phi) >= p" (or "<= p") with a sequential probability ratio test.
+
+        Args:
+            hypothesis_ast: The hypothesis testing query AST.
+
+        Returns:
+            A dict containing the verdict ("satisfied", or None if the test was inconclusive after the maximum number
+            of runs) and the number of runs ("runs").
+        """
+        prob_val = float(self._evaluate_constant(hypothesis_ast["probVal"]))
+        upper_prob, lower_prob = prob_val + self.delta, prob_val - self.delta
+        if lower_prob <= 0 or upper_prob >= 1:
+            raise Exception(f'Indifference region [{lower_prob}, {upper_prob}] does not lie within (0, 1).')
+
+        # Test "p >= upper_prob" (H0) against "p <= lower_prob" (H1)
+        run_spec = self._get_reachability_run_spec(hypothesis_ast["prop"])
+        outcomes = self._sample_runs("reachability", run_spec)
+        accepted_hypothesis, run_count = self._run_sprt(outcomes, h0_prob=upper_prob, h1_prob=lower_prob)
+        satisfied = None
+        if accepted_hypothesis is not None:
+            satisfied = (accepted_hypothesis == 0) == (hypothesis_ast["op"] == ">=")
+        return {"satisfied": satisfied, "runs": run_count}
+
+    def compare_probabilities(self, compare_ast):
+        """Decides "Pr[<=T1](<> phi1) >= Pr[<=T2](<> phi2)" (or "<=") with a sequential probability ratio test.
+
+        Among the run pairs in which exactly one property holds, the left property holds with the probability
+        q = gamma / (1 + gamma), where gamma is the odds ratio p1 (1 - p2) / (p2 (1 - p1)).
+
+        Args:
+            compare_ast: The probability comparison query AST.
+
+        Returns:
+            A dict containing the verdict ("satisfied", or None if the test was inconclusive after the maximum number
+            of runs) and the number of run pairs ("runs").
+        """
+        run_spec = (self._get_reachability_run_spec(compare_ast["left"]),
+                    self._get_reachability_run_spec(compare_ast["right"]))
+        # Only the discordant pairs are passed to the test, so the maximum number of runs bounds the sampled pairs
+        outcome_pairs = self._sample_runs("comparison", run_spec, run_count=self.max_runs)
+        run_counter = collections.Counter()
+
+        def get_discordant_outcomes():
+            for left_outcome, right_outcome in outcome_pairs:
+                run_counter["pairs"] += 1
+                if left_outcome != right_outcome:
+                    yield left_outcome
+
+        # Test "gamma <= u0" (H0) against "gamma >= u1" (H1)
+        accepted_hypothesis, _ = self._run_sprt(get_discordant_outcomes(), h0_prob=self.u0 / (1 + self.u0),
+                                                h1_prob=self.u1 / (1 + self.u1))
+        satisfied = None
+        if accepted_hypothesis is not None:
+            satisfied = (accepted_hypothesis == 1) == (compare_ast["op"] == ">=")
+        return {"satisfied": satisfied, "runs": run_counter["pairs"]}
+
+    def estimate_value(self, value_ast):
+        """Estimates the expected maximum (or minimum) value of an expression "E[<=T; N](max: expr)".
+
+        Args:
+            value_ast: The value estimation query AST.
+
+        Returns:
+            A dict containing the estimated expected value ("value"), the interval which contains the expected value
+            with a confidence of 1 - alpha ("interval", based on the normal approximation), and the number of runs
+            ("runs").
+        """
+        run_count = int(self._evaluate_constant(value_ast["runCount"]))
+        run_spec = (self._get_time_bound(value_ast["timeBound"]), value_ast["op"], value_ast["expr"])
+        values = list(self._sample_runs("value", run_spec, run_count=run_count))
+        mean = statistics.fmean(values)
+        half_width = math.inf
+        if run_count > 1:
+            z_val = statistics.NormalDist().inv_cdf(1 - self.alpha / 2)
+            half_width = z_val * statistics.stdev(values) / math.sqrt(run_count)
+        return {"value": mean, "interval": (mean - half_width, mean + half_width), "runs": run_count}
+
+    def simulate(self, sim_ast):
+        """Simulates the runs of "simulate N [<=T] {expr, ...}" (optionally with ": M : (phi)").
+
+        Args:
+            sim_ast: The simulation query AST.
+
+        Returns:
+            A dict containing the value trajectories ("trajectories", i.e., lists of (time, values) tuples per run) and
+            the number of runs ("runs").
+        """
+        accept_count, predicate_ast = None, None
+        if sim_ast["astType"] == "PropSMCSimAcceptRuns":
+            accept_count = int(self._evaluate_constant(sim_ast["acceptBound"]))
+            predicate_ast = sim_ast["predicate"]["expr"]
+            sim_ast = sim_ast["simulate"]
+        run_count = int(self._evaluate_constant(sim_ast["runCount"]))
+        run_spec = (self._get_time_bound(sim_ast["timeBound"]), sim_ast["obsVars"], predicate_ast)
+
+        trajectories = []
+        runs = 0
+        for trajectory, accepted in self._sample_runs("trajectory", run_spec, run_count=run_count):
+            runs += 1
+            if accepted:
+                trajectories.append(trajectory)
+                if accept_count is not None and len(trajectories) >= accept_count:
+                    break
+        return {"trajectories": trajectories, "runs": runs}
+
+    def _run_sprt(self, outcomes, h0_prob, h1_prob):
+        """Runs Wald's sequential probability ratio test of the Bernoulli hypotheses "p = h0_prob" and "p = h1_prob".
+
+        Args:
+            outcomes: An iterable of boolean outcomes.
+            h0_prob: The probability of hypothesis H0.
+            h1_prob: The probability of hypothesis H1.
+
+        Returns:
+            A tuple of the accepted hypothesis (0, 1, or None if no hypothesis was accepted within the maximum number
+            of outcomes) and the number of consumed outcomes.
+        """
+        accept_h1_bound = math.log((1 - self.beta) / self.alpha)
+        accept_h0_bound = math.log(self.beta / (1 - self.alpha))
+        success_ratio = math.log(h1_prob / h0_prob)
+        failure_ratio = math.log((1 - h1_prob) / (1 - h0_prob))
+        log_likelihood_ratio = 0
+        outcome_count = 0
+        for outcome in outcomes:
+            outcome_count += 1
+            log_likelihood_ratio += success_ratio if outcome else failure_ratio
+            if log_likelihood_ratio >= accept_h1_bound:
+                return 1, outcome_count
+            if log_likelihood_ratio <= accept_h0_bound:
+                return 0, outcome_count
+            if outcome_count >= self.max_runs:
+                break
+        return None, outcome_count
+
+    ############
+    # Sampling #
+    ############
+    def _sample_runs(self, run_kind, run_spec, run_count=None):
+        """Samples random runs, and generates their outcomes in run order.
+
+        The runs are sampled in chunks by the worker processes, of which at most two per worker are sampled ahead.
+        The random seed of each run is derived from the seed of the checker, so that the outcomes do not depend on
+        the number of workers.
+
+        Args:
+            run_kind: The run kind (see _sample_run).
+            run_spec: The run specification (see _sample_run).
+            run_count: The number of runs (or None for an unbounded number of runs).
+
+        Returns:
+            A generator of the run outcomes.
+        """
+        seed_generator = random.Random(self.seed)
+        run_seeds = (seed_generator.getrandbits(64) for _ in (range(run_count) if run_count is not None
+                                                                else iter(int, 1)))
+        tasks = ((chunk_seeds, run_kind, run_spec) for chunk_seeds in make_chunks(run_seeds, self.chunk_size))
+
+        if self.workers == 0:
+            random_state = random.getstate()
+            try:
+                for task in tasks:
+                    yield from self._sample_task(task)
+            finally:
+                random.setstate(random_state)
+            return
+
+        init_args = (uppaal_system_to_compiled(self.simulator.system), self.simulator.get_settings(),
+                     self.max_run_steps)
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_smc_worker,
+                                 initargs=init_args) as executor:
+            for outcomes in map_bounded(executor, _sample_smc_task, tasks, workers=self.workers):
+                yield from outcomes
+
+    def _sample_task(self, task):
+        """Samples the runs of a task.
+
+        Args:
+            task: A tuple of the run seeds, the run kind, and the run specification.
+
+        Returns:
+            The list of run outcomes.
+        """
+        run_seeds, run_kind, run_spec = task
+        outcomes = []
+        for run_seed in run_seeds:
+            random.seed(run_seed)
+            outcomes.append(self._sample_run(run_kind, run_spec))
+        return outcomes
+
+    def _sample_run(self, run_kind, run_spec):
+        """Samples a single random run.
+
+        Args:
+            run_kind: The run kind, i.e., "reachability" (with outcome "<> phi" or "[] phi" holds), "comparison" (with
+                outcomes of two reachability runs), "value" (with the maximum or minimum expression value as outcome),
+                or "trajectory" (with the value trajectory and whether "<> phi" holds as outcome).
+            run_spec: The run specification, i.e., a tuple of the time bound and the kind specific query parts.
+
+        Returns:
+            The run outcome.
+        """
+        if run_kind == "reachability":
+            return self._sample_reachability_run(*run_spec)
+        if run_kind == "comparison":
+            return self._sample_reachability_run(*run_spec[0]), self._sample_reachability_run(*run_spec[1])
+        if run_kind == "value":
+            return self._sample_value_run(*run_spec)
+        if run_kind == "trajectory":
+            return self._sample_trajectory_run(*run_spec)
+        raise Exception(f'Run kind "{run_kind}" not supported.')
+
+    def _sample_reachability_run(self, time_bound, path_ast):
+        negated = (path_ast["astType"] == "PropGlobally")  # "[] phi" is violated iff "<> not phi" holds
+        expr_ast = path_ast["prop"]["expr"]
+        for state, _, delay in self._generate_run_segments(time_bound):
+            delay_interval = Interval(lower_incl=True, lower_val=0, upper_val=delay, upper_incl=True)
+            if self._get_satisfying_delays(expr_ast, state, delay_interval, negated):
+                return not negated
+        return negated
+
+    def _sample_value_run(self, time_bound, op, expr_ast):
+        select_func = max if op == "max" else min
+        value = None
+        for state, _, delay in self._generate_run_segments(time_bound):
+            # The expression values are linear in the delay, and thus extremal at the segment bounds
+            for segment_value in self._get_segment_values(expr_ast, state, delay):
+                value = segment_value if value is None else select_func(value, segment_value)
+        return value
+
+    def _sample_trajectory_run(self, time_bound, obs_var_asts, predicate_ast):
+        trajectory = []
+        accepted = predicate_ast is None
+        for state, time, delay in self._generate_run_segments(time_bound):
+            trajectory.append((time, [self._evaluate_value(expr_ast, state, 0) for expr_ast in obs_var_asts]))
+            if 0 < delay < math.inf:
+                trajectory.append((time + delay, [self._evaluate_value(expr_ast, state, delay)
+                                                  for expr_ast in obs_var_asts]))
+            if not accepted:
+                delay_interval = Interval(lower_incl=True, lower_val=0, upper_val=delay, upper_incl=True)
+                accepted = len(self._get_satisfying_delays(predicate_ast, state, delay_interval, False)) > 0
+        return trajectory, accepted
+
+    def _generate_run_segments(self, time_bound):
+        """Generates the segments of a random concrete-time run within a time bound.
+
+        Args:
+            time_bound: The time bound, i.e., a tuple of the bounded variable (None for the global time, a clock name,
+                or "#" for the number of steps) and the bound value.
+
+        Returns:
+            A generator of the run segments, i.e., tuples of a concrete state, the time of the state, and the delay
+            spent in the state.
+        """
+        bound_var, bound_val = time_bound
+        state = self.simulator.generate_initial_concrete_state()
+        time = 0
+        step = 0
+        while True:
+            if bound_var == "#":
+                if step >= bound_val:
+                    yield state, time, 0
+                    return
+                remaining_time = math.inf
+            elif bound_var is None:
+                remaining_time = max(bound_val - time, 0)
+            else:
+                remaining_time = max(bound_val - state.clock_valuation[bound_var], 0)
+
+            delay, transition = self.simulator.sample_concrete_step(state)
+            if transition is None or delay > remaining_time:
+                yield state, time, min(delay, remaining_time)
+                return
+            yield state, time, delay
+            state = transition.target_state
+            time += delay
+            step += 1
+            if step > self.max_run_steps:
+                raise Exception(f'Run exceeded the maximum number of {self.max_run_steps} steps.')
+
+    #####################
+    # Formula Semantics #
+    #####################
+    def _get_satisfying_delays(self, expr_ast, state, delay_interval, negated):
+        """Restricts a delay interval to the delays after which a concrete state satisfies a state formula.
+
+        Args:
+            expr_ast: The state formula expression AST.
+            state: The concrete state.
+            delay_interval: The delay interval to restrict.
+            negated: Choose whether the negated state formula is considered.
+
+        Returns:
+            A list of non-empty delay intervals whose union contains exactly the satisfying delays.
+        """
+        state.activate_system_scope(access_instance_scopes=True)
+        ast_type = expr_ast["astType"]
+        if ast_type == "BracketExpr":
+            return self._get_satisfying_delays(expr_ast["expr"], state, delay_interval, negated)
+        if ast_type == "UnaryExpr" and expr_ast["op"] == "LogNot":
+            return self._get_satisfying_delays(expr_ast["expr"], state, delay_interval, not negated)
+        if ast_type == "DeadlockExpr":
+            raise Exception('Deadlock expressions are not supported by the SMC checker.')
+        if ast_type == "BinaryExpr":
+            op = expr_ast["op"]
+            if op in ["LogAnd", "LogOr", "LogImply"]:
+                left_ast, right_ast = expr_ast["left"], expr_ast["right"]
+                if op == "LogImply":
+                    # "a imply b" equals "not a or b", and "not (a imply b)" equals "a and not b"
+                    is_conjunction, left_negated = negated, not negated
+                else:
+                    # De Morgan: "not (a and b)" equals "not a or not b", and vice versa
+                    is_conjunction, left_negated = (op == "LogAnd") != negated, negated
+                if is_conjunction:
+                    intervals = []
+                    for left_interval in self._get_satisfying_delays(left_ast, state, delay_interval, left_negated):
+                        intervals.extend(self._get_satisfying_delays(right_ast, state, left_interval, negated))
+                    return intervals
+                return (self._get_satisfying_delays(left_ast, state, delay_interval, left_negated) +
+                        self._get_satisfying_delays(right_ast, state, delay_interval, negated))
+            constr_expr_ast = self.query_checker._get_clock_constraint_ast(expr_ast, state)
+            if constr_expr_ast is not None:
+                constr_data = self.simulator._evaluate_constraint_ast(constr_ast={"expr": constr_expr_ast},
+                                                                      state=state)
+                rel = negated_relations[constr_data["rel"]] if negated else constr_data["rel"]
+                intervals = []
+                for rel in (["<", ">"] if rel == "!=" else [rel]):
+                    interval = get_delay_interval([dict(constr_data, rel=rel)], state.clock_valuation,
+                                                  interval=delay_interval)
+                    if interval is not None:
+                        intervals.append(interval)
+                return intervals
+
+        res = bool(self.simulator.c_evaluator.eval_ast(expr_ast, state))
+        return [delay_interval] if res != negated else []
+
+    def _get_segment_values(self, expr_ast, state, delay):
+        values = [self._evaluate_value(expr_ast, state, 0)]
+        if 0 < delay < math.inf:
+            values.append(self._evaluate_value(expr_ast, state, delay))
+        return values
+
+    def _evaluate_value(self, expr_ast, state, delay):
+        """Evaluates an expression (i.e., a clock, a clock difference, or a discrete expression) after a delay.
+
+        Args:
+            expr_ast: The expression AST.
+            state: The concrete state.
+            delay: The delay.
+
+        Returns:
+            The expression value.
+        """
+        state.activate_system_scope(access_instance_scopes=True)
+        if self.query_checker._is_clock_expr(expr_ast, state):
+            if expr_ast["astType"] == "BinaryExpr" and expr_ast["op"] == "Sub":
+                left_clock = self.simulator.c_evaluator.eval_ast(expr_ast["left"], state)
+                right_clock = self.simulator.c_evaluator.eval_ast(expr_ast["right"], state)
+                return state.clock_valuation[left_clock.name] - state.clock_valuation[right_clock.name]
+            clock = self.simulator.c_evaluator.eval_ast(expr_ast, state)
+            return state.clock_valuation[clock.name] + delay
+        res = self.simulator.c_evaluator.eval_ast(expr_ast, state)
+        if isinstance(res, UppaalVariable):
+            res = res.val
+        return res.get_raw_data() if hasattr(res, "get_raw_data") else res
+
+    def _get_reachability_run_spec(self, prob_ast):
+        path_ast = prob_ast["prop"]
+        if path_ast["astType"] not in ["PropFinally", "PropGlobally"]:
+            raise Exception(f'Path formula "{path_ast["astType"]}" not supported (only "<>" and "[]" are supported).')
+        return self._get_time_bound(prob_ast["timeBound"]), path_ast
+
+    def _get_time_bound(self, time_bound_ast):
+        bound_var = time_bound_ast.get("var")
+        bound_val = self._evaluate_constant(time_bound_ast["upperBound"])
+        if bound_var not in (None, "#") and bound_var not in self.simulator.init_system_state.peek_dbm_state().clocks:
+            raise Exception(f'Time bound variable "{bound_var}" is no clock.')
+        return bound_var, bound_val
+
+    def _evaluate_constant(self, expr_ast):
+        if expr_ast["astType"] == "Double":
+            return float(expr_ast["val"])  # Note: Doubles are not supported by the evaluator yet
+        state = self.simulator.init_system_state.copy()
+        state.activate_system_scope(access_instance_scopes=True)
+        res = self.simulator.c_evaluator.eval_ast(expr_ast, state)
+        if isinstance(res, UppaalVariable):
+            res = res.val
+        return res.get_raw_data() if hasattr(res, "get_raw_data") else res
+
+
+##############
+# SMC Worker #
+##############
+def _init_smc_worker(compiled_system, simulator_settings, max_run_steps):
+    """Initializes the SMC checker of a worker process.
+
+    Args:
+        compiled_system: The compiled system (see uppaal_system_to_compiled).
+        simulator_settings: The simulator settings (i.e., the arguments of Simulator).
+        max_run_steps: The maximum number of steps of a run.
+    """
+    global _smc_worker_checker
+    _smc_worker_checker = SMCChecker(simulator=Simulator(**simulator_settings), workers=0,
+                                     max_run_steps=max_run_steps)
+    _smc_worker_checker.set_system(compiled_system)
+
+
+def _sample_smc_task(task):
+    """Samples the runs of a task with the SMC checker of the worker process.
+
+    Args:
+        task: A tuple of the run seeds, the run kind, and the run specification.
+
+    Returns:
+        The list of run outcomes.
+    """
+    return _smc_worker_checker._sample_task(task)
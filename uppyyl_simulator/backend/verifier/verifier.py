@@ -0,0 +1,149 @@
+"""A symbolic reachability checker for Uppaal model systems."""
+
+import collections
+import tracemalloc
+
+from uppyyl_simulator.backend.simulator.simulator import Simulator
+
+
+############
+# Verifier #
+############
+class Verifier:
+    """A verifier which exhaustively explores the symbolic state space of a system.
+
+    Symbolic states (i.e., location vector, variable valuation, and DBM) are generated with the successor computation
+    of a Simulator. A passed list stores all zones per discrete state, and new states whose zone is included in a
+    stored zone of the same discrete state are dropped. To guarantee termination for unbounded clocks, the simulator
+    should apply zone extrapolation (e.g., Simulator(extrapolation="max_bounds")).
+    """
+
+    def __init__(self, simulator=None, search_order="bfs"):
+        """Initializes Verifier.
+
+        Args:
+            simulator: The simulator used for successor computation (a new one with max-bounds extrapolation is
+                created by default).
+            search_order: The exploration order ("bfs" for breadth-first, or "dfs" for depth-first search).
+        """
+        if search_order not in ("bfs", "dfs"):
+            raise Exception(f'Search order "{search_order}" not supported.')
+        self.simulator = simulator if simulator else Simulator(extrapolation="max_bounds")
+        self.search_order = search_order
+        self.stats = None
+
+    def load_system(self, system_path):
+        """Loads a system at a given path into the verifier.
+
+        Args:
+            system_path: The system path.
+        """
+        self.simulator.load_system(system_path)
+
+    def set_system(self, system):
+        """Sets the system of the verifier.
+
+        Args:
+            system: The system as string or system object.
+        """
+        self.simulator.set_system(system)
+
+    def check_reachability(self, predicate=None, max_states=None, track_memory=False):
+        """Explores the symbolic state space until a state satisfying the predicate is reached.
+
+        Args:
+            predicate: A function which checks whether a state is a goal state (if None, the whole state space is
+                explored).
+            max_states: An optional maximum number of explored states, after which the exploration is aborted.
+            track_memory: Choose whether the peak memory during exploration is measured (slows down exploration).
+
+        Returns:
+            A dict containing the reachability verdict ("reachable"), the transition trace to the reached state
+            ("trace"), whether the exploration was completed ("complete"), and exploration statistics ("stats").
+        """
+        if track_memory:
+            tracemalloc.start()
+        self.stats = {"explored": 0, "stored": 0, "subsumed": 0, "peak_memory": None}
+
+        passed = {}
+        waiting = collections.deque()
+        initial_transition = self.simulator.generate_initial_transition()
+        if self._add_to_passed(passed, initial_transition.target_state):
+            waiting.append((initial_transition, None))
+
+        res = {"reachable": False, "trace": None, "complete": True}
+        while waiting:
+            if max_states is not None and self.stats["explored"] >= max_states:
+                res["complete"] = False
+                break
+            trace_node = waiting.popleft() if self.search_order == "bfs" else waiting.pop()
+            transition, _ = trace_node
+            state = transition.target_state
+            self.stats["explored"] += 1
+
+            if predicate is not None and predicate(state):
+                res["reachable"] = True
+                res["trace"] = self._make_trace(trace_node)
+                break
+
+            for successor_transition in self.simulator._get_all_valid_transitions(state=state):
+                if self._add_to_passed(passed, successor_transition.target_state):
+                    waiting.append((successor_transition, trace_node))
+
+        if track_memory:
+            self.stats["peak_memory"] = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        res["stats"] = self.stats
+        return res
+
+    def explore(self, max_states=None, track_memory=False):
+        """Explores the whole symbolic state space.
+
+        Args:
+            max_states: An optional maximum number of explored states, after which the exploration is aborted.
+            track_memory: Choose whether the peak memory during exploration is measured (slows down exploration).
+
+        Returns:
+            The exploration result (see check_reachability).
+        """
+        return self.check_reachability(predicate=None, max_states=max_states, track_memory=track_memory)
+
+    def _add_to_passed(self, passed, state):
+        """Adds a state to the passed list, unless its zone is included in a stored zone of the same discrete state.
+
+        Args:
+            passed: The passed list (i.e., a dict of stored zones per discrete state).
+            state: The new state.
+
+        Returns:
+            Whether the state was added (i.e., is not subsumed by a stored state).
+        """
+        zones = passed.setdefault(state.get_discrete_state_key(), [])
+        dbm = state.peek_dbm_state()
+        if any(zone.includes(dbm) for zone in zones):
+            self.stats["subsumed"] += 1
+            return False
+
+        # Remove stored zones which are included in the new zone
+        kept_zones = [zone for zone in zones if not dbm.includes(zone)]
+        self.stats["stored"] += 1 - (len(zones) - len(kept_zones))
+        kept_zones.append(dbm)
+        zones[:] = kept_zones
+        return True
+
+    @staticmethod
+    def _make_trace(trace_node):
+        """Reconstructs the transition trace leading to the state of a trace node.
+
+        Args:
+            trace_node: The trace node (i.e., a pair of transition and parent trace node).
+
+        Returns:
+            The list of transitions, starting with the initial transition.
+        """
+        trace = []
+        while trace_node is not None:
+            transition, trace_node = trace_node
+            trace.append(transition)
+        trace.reverse()
+        return trace
@@ -152,7 +152,7 @@ class UppyylSimulatorCLI(Cmd):
             curr_loc_strs.append(f'{inst_name}: {loc.name if loc.name else "_"} ({loc.id})')
         string += f'{Fore.BLUE}Locations:{Fore.RESET} {" | ".join(curr_loc_strs)}\n'
         string += f'{Fore.BLUE}DBM:{Fore.RESET}\n'
-        string += str(state.dbm_state)
+        string += str(state.peek_dbm_state())
         return string
 
     def get_transitions_string(self):